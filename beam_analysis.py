@@ -0,0 +1,144 @@
+"""
+beam_analysis.py
+วิเคราะห์คานช่วงเดียวรองรับแบบธรรมดา (simple span) ด้วยการซ้อนทับ (superposition) แบบปิด
+
+แรงกระทำ:
+  - น้ำหนักแผ่สม่ำเสมอ w (กก./ม.)
+  - แรงกระทำเป็นจุด P_i ที่ตำแหน่ง a_i (กก., ม.)
+
+ฟังก์ชันอิทธิพลของแรงหนึ่งหน่วยที่ a (b = L - a) ณ ตำแหน่ง x:
+    M(x) = b x / L                        (x ≤ a)      ,   a (L - x) / L                 (x > a)
+    V(x) = b / L                          (x < a)      ,  -a / L                         (x ≥ a)
+    EI δ(x) = b x (L² - b² - x²) / (6L)   (x ≤ a)      ,   a (L-x) (L² - a² - (L-x)²) / (6L)  (x > a)
+
+คำนวณเป็นเมทริกซ์ K รูป (n_x, n_loads) แล้วคูณกับแรงรูป (n_loads, n_cases) ครั้งเดียว
+จึงเป็นเวกเตอร์ทั้งตามตำแหน่งแรงและตามกรณีน้ำหนัก
+
+Cb ตาม AISC 360-16 Eq. F1-1 จากแผนภาพโมเมนต์จริงของแต่ละช่วงไม่ค้ำยัน:
+    Cb = 12.5 M_max / (2.5 M_max + 3 M_A + 4 M_B + 3 M_C)
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+CB_MAX = 3.0
+
+
+def point_load_kernels(x, a, L: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    เมทริกซ์อิทธิพลของแรงหนึ่งหน่วย: (K_M, K_V, K_δ·EI) รูป (n_x, n_loads)
+    x, a ในหน่วยเดียวกับ L
+    """
+    x = np.asarray(x, dtype=float)[:, None]
+    a = np.asarray(a, dtype=float)[None, :]
+    b = L - a
+    left = x <= a
+    k_m = np.where(left, b * x, a * (L - x)) / L
+    k_v = np.where(x < a, b / L, np.where(a >= L, 0.0, -a / L))   # แรงบนจุดรองรับไม่ทำให้เกิดแรงเฉือนในคาน
+    xr = L - x
+    k_d = np.where(left, b * x * (L ** 2 - b ** 2 - x ** 2), a * xr * (L ** 2 - a ** 2 - xr ** 2)) / (6 * L)
+    return k_m, k_v, k_d
+
+
+def uniform_load_shapes(x, L: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """รูปแผนภาพต่อ w หนึ่งหน่วย: (M, V, δ·EI) รูป (n_x,)"""
+    x = np.asarray(x, dtype=float)
+    return x * (L - x) / 2, L / 2 - x, x * (L ** 3 - 2 * L * x ** 2 + x ** 3) / 24
+
+
+def sample_points(L: float, positions=(), n: int = 101) -> np.ndarray:
+    """จุดประเมินผล: กริดสม่ำเสมอ + ตำแหน่งแรง + จุดกึ่งกลางระหว่างจุดต่อเนื่อง (จับแรงเฉือนทุกช่วง)"""
+    pts = np.concatenate([np.linspace(0.0, L, n), np.clip(np.asarray(positions, dtype=float), 0.0, L)])
+    pts = np.unique(pts)
+    return np.unique(np.concatenate([pts, (pts[1:] + pts[:-1]) / 2]))
+
+
+def simple_span_response(x, L: float, w, positions=(), loads=None, EI: float = 1.0):
+    """
+    แผนภาพ M, V, δ ของคานช่วงเดียว
+
+    Args:
+        x: จุดประเมินผล (n_x,)
+        w: น้ำหนักแผ่ รูป (n_cases,) หรือสเกลาร์
+        positions: ตำแหน่งแรงจุด (n_loads,)
+        loads: แรงจุด รูป (n_loads, n_cases) หรือ (n_loads,)
+        EI: ความแข็งแรงดัด (หน่วยสอดคล้องกับ δ ที่ต้องการ)
+    Returns:
+        (M, V, δ) แต่ละตัวรูป (n_x, n_cases) (หรือ (n_x,) ถ้า w/loads เป็นเวกเตอร์หนึ่งกรณี)
+    """
+    w = np.asarray(w, dtype=float)
+    m_u, v_u, d_u = uniform_load_shapes(x, L)
+    expand = (lambda s: s[:, None]) if w.ndim else (lambda s: s)
+    M, V, D = expand(m_u) * w, expand(v_u) * w, expand(d_u) * w
+    if loads is not None and len(positions):
+        k_m, k_v, k_d = point_load_kernels(x, positions, L)
+        P = np.asarray(loads, dtype=float)
+        M = M + k_m @ P
+        V = V + k_v @ P
+        D = D + k_d @ P
+    return M, V, D / EI
+
+
+def unbraced_segments(L: float, Lb: float) -> np.ndarray:
+    """ขอบเขตช่วงไม่ค้ำยัน [x0, x1] จากปลาย x = 0 ทุกระยะ Lb (ช่วงสุดท้ายอาจสั้นกว่า)"""
+    if Lb <= 0 or Lb >= L:
+        return np.array([[0.0, L]])
+    edges = np.append(np.arange(0.0, L, Lb), L)
+    if edges[-1] - edges[-2] < 1e-9 * L:
+        edges = np.delete(edges, -2)
+    return np.column_stack([edges[:-1], edges[1:]])
+
+
+def cb_factor(m_max, m_a, m_b, m_c):
+    """AISC 360-16 Eq. F1-1 (ใช้ค่าสัมบูรณ์, จำกัดไม่เกิน 3.0)"""
+    m_max, m_a, m_b, m_c = (np.abs(np.asarray(v, dtype=float)) for v in (m_max, m_a, m_b, m_c))
+    den = 2.5 * m_max + 3 * m_a + 4 * m_b + 3 * m_c
+    cb = np.divide(12.5 * m_max, den, out=np.ones_like(den), where=den > 0)
+    return np.minimum(cb, CB_MAX)
+
+
+def segment_moments(moment_at, segments: np.ndarray, positions=(), shear_at=None, n: int = 21):
+    """
+    M_max และ Cb ของแต่ละช่วงไม่ค้ำยัน
+
+    Args:
+        moment_at: ฟังก์ชัน x → M(x) (รับ array)
+        segments: ขอบเขตช่วงจาก unbraced_segments
+        positions: ตำแหน่งแรงจุด (ค่าสูงสุดของโมเมนต์อาจอยู่ที่จุดเหล่านี้)
+        shear_at: ฟังก์ชัน x → V(x) ถ้าระบุ จะเพิ่มจุด V = 0 (แรงเฉือนเชิงเส้นระหว่างแรงจุด) ให้ได้ M_max ตรง
+    Returns:
+        (M_max, Cb) รูป (n_segments,)
+    """
+    positions = np.asarray(positions, dtype=float)
+    m_max = np.empty(len(segments))
+    cb = np.empty(len(segments))
+    for k, (x0, x1) in enumerate(segments):
+        inside = positions[(positions >= x0) & (positions <= x1)]
+        xs = np.unique(np.concatenate([np.linspace(x0, x1, n), inside]))
+        if shear_at is not None:
+            v = shear_at(xs)
+            cross = np.nonzero(v[:-1] * v[1:] < 0)[0]
+            xs = np.concatenate([xs, xs[cross] - v[cross] * (xs[cross + 1] - xs[cross]) / (v[cross + 1] - v[cross])])
+        m_max[k] = np.max(np.abs(moment_at(xs)))
+        quarter = moment_at(x0 + (x1 - x0) * np.array([0.25, 0.5, 0.75]))
+        cb[k] = cb_factor(m_max[k], *quarter)
+    return m_max, cb
+
+
+def uniform_cb(span, Lb):
+    """
+    Cb และความยาวของช่วงไม่ค้ำยันที่ครอบกลางช่วงคาน (ช่วงควบคุม) ภายใต้น้ำหนักแผ่สม่ำเสมอ — แบบเวกเตอร์
+    ช่วงเริ่มจากปลาย x = 0 ทุกระยะ Lb เหมือน unbraced_segments
+    """
+    span, Lb = np.broadcast_arrays(np.asarray(span, dtype=float), np.asarray(Lb, dtype=float))
+    Lb = np.where((Lb <= 0) | (Lb >= span), span, Lb)
+    x0 = np.floor(span / 2 / Lb) * Lb
+    x0 = np.where(x0 >= span - 1e-9 * span, x0 - Lb, x0)
+    x1 = np.minimum(x0 + Lb, span)
+    m = lambda x: x * (span - x) / 2  # noqa: E731
+    m_max = m(np.clip(span / 2, x0, x1))
+    seg = x1 - x0
+    return cb_factor(m_max, m(x0 + 0.25 * seg), m(x0 + 0.5 * seg), m(x0 + 0.75 * seg)), seg
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple, Union
 
-from design_logging import CalculationLogMixin
+import numpy as np
+
+from design_logging import CalculationLogMixin, CapacityCache, traced
+from effective_width import section_dimensions
+from finite_strip import FLEXURE_METHODS, flexural_ratio, log_flexure_steps
+from inverse_design import InverseDesignMixin
+from load_combinations import LoadCombinationSet, get_combination_set
+from serviceability import (DeflectionLimits, deflection_checks, deflection_detail, log_limit_steps,
+                            log_ponding_step, ponding_coefficient, ponding_ratio, uniform_deflection)
 
 
 def _ensure_positive(name: str, value: float) -> float:
@@ -13,18 +21,27 @@ def _ensure_positive(name: str, value: float) -> float:
     return value
 
 
+_CAPACITY_CACHE = CapacityCache("ColdFormedBeamDesign")
+
+
 @dataclass
-class ColdFormedBeamDesign(CalculationLogMixin):
+class ColdFormedBeamDesign(CalculationLogMixin, InverseDesignMixin):
     """LRFD beam design helper for cold-formed steel (TIS 1228-2549)."""
 
+    ENGINE = "beam"
+    LOAD_CASES = ("D", "L", "W")
+
     section: Dict[str, float]
     geometry: Dict[str, float]
     loads: Dict[str, float]
     material: Dict[str, float] = field(default_factory=lambda: {"Fy": 2450.0, "E": 2.04e6})
+    combinations: Optional[Union[str, LoadCombinationSet]] = None
+    limits: Optional[Union[str, DeflectionLimits]] = None
 
     def __post_init__(self) -> None:
         CalculationLogMixin.__init__(self)
 
+    @traced
     def run_design(self) -> Dict[str, Any]:
         self.reset_steps()
 
@@ -36,25 +53,24 @@ class ColdFormedBeamDesign(CalculationLogMixin):
         live = max(self.loads.get("L", 0.0), 0.0)
         wind = self.loads.get("W", 0.0)
 
-        wu1 = 1.4 * dead + 1.7 * live
-        wu2 = 0.75 * (1.4 * dead + 1.7 * live) + 1.6 * wind
-        wu = max(wu1, wu2)
-        controlling = "1.4D+1.7L" if wu == wu1 else "0.75(1.4D+1.7L)+1.6W"
+        # W มีเครื่องหมาย (+ กด / - ดูด) ชุด combo มีทั้งกรณี ±W จึงครอบคลุมการกลับทิศของลม
+        combos = get_combination_set(self.combinations)
+        case_values = combos.case_vector(D=dead, L=live, W=wind)
+        factored = combos.factored(case_values)
+        for combo, value in zip(combos.combinations, factored):
+            if combo.uplift:
+                continue
+            self.add_step(
+                f"{combo.title} ({combos.reference or combos.name})",
+                r"w_{u} = " + combo.latex(("D", "L", "W")),
+                combo.substitution(case_values),
+                f"= {value:.3f}\\,\\text{{kg/m}}",
+                note=combo.note
+            )
 
-        self.add_step(
-            "LC1: 1.4D + 1.7L (ตาม มอก. 1228-2549)",
-            r"w_{u1} = 1.4D + 1.7L",
-            f"1.4({dead:.3f}) + 1.7({live:.3f})",
-            f"= {wu1:.3f}\\,\\text{{kg/m}}",
-            note="โหลดแฟคเตอร์ตามหลัก LRFD ของไทย"
-        )
-        self.add_step(
-            "LC2: 0.75(1.4D+1.7L) + 1.6W (ตาม มอก. 1228-2549)",
-            r"w_{u2} = 0.75(1.4D + 1.7L) + 1.6W",
-            f"0.75(1.4({dead:.3f}) + 1.7({live:.3f})) + 1.6({wind:.3f})",
-            f"= {wu2:.3f}\\,\\text{{kg/m}}",
-            note="พิจารณาแรงลมร่วมตามมาตรฐานไทย"
-        )
+        gov = int(combos.governing(factored))
+        wu = float(factored[gov])
+        controlling = combos.combinations[gov].label
 
         Mu, Vu = self._ultimate_demand(wu, span_m)
         self.add_step(
@@ -70,6 +86,119 @@ class ColdFormedBeamDesign(CalculationLogMixin):
             f"= {Vu:.3f}\\,\\text{{kg}}"
         )
 
+        # กำลังรับขึ้นกับหน้าตัดและวัสดุเท่านั้น — แก้เฉพาะน้ำหนักจะใช้ค่าจาก cache
+        cap, steps = _CAPACITY_CACHE.get(self.capacity_key(), self._capacity)
+        self.extend_steps(steps)
+        phi_Mn, phi_Vn = cap["Phi_Mn"], cap["Phi_Vn"]
+        E, Ix = cap["E"], cap["Ix"]
+
+        ws = dead + live
+        ws_cm = ws / 100.0
+        delta = float(uniform_deflection(ws, span_cm, E, Ix))
+        live_cm = live / 100.0
+        delta_live = float(uniform_deflection(live, span_cm, E, Ix))
+        camber = float(self.geometry.get("camber", 0.0) or 0.0)
+        serv = deflection_checks(span_cm, delta, delta_live, uniform_deflection(wind, span_cm, E, Ix),
+                                 limits=self.limits, camber=camber)
+
+        self.add_step(
+            "การโก่งตัวรวมจาก DL+LL",
+            r"\Delta = \frac{5 w_s L^4}{384 E I_x}",
+            f"5 \\times {ws_cm:.4f} \\times {span_cm:.1f}^4 / (384 \\times {E:.2e} \\times {Ix:.2f})",
+            f"= {delta:.3f}\\,\\text{{cm}}",
+            note="สูตรการโก่งตัวคานรับแรงกระจาย (Simply Supported Beam)"
+        )
+        self.add_step(
+            "การโก่งตัวจาก Live Load",
+            r"\Delta_L = \frac{5 w_L L^4}{384 E I_x}",
+            f"5 \\times {live_cm:.4f} \\times {span_cm:.1f}^4 / (384 \\times {E:.2e} \\times {Ix:.2f})",
+            f"= {delta_live:.3f}\\,\\text{{cm}}",
+            note="คำนวณการโก่งตัวจาก Live Load เพียงอย่างเดียว"
+        )
+        log_limit_steps(self.add_step, span_cm, self.limits, serv, camber)
+        delta = float(serv["Delta_Total"])
+        limit_total = float(serv["Delta_Limit_Total"])
+        limit_live = float(serv["Delta_Limit_Live"])
+
+        # น้ำขัง: ตรวจเมื่อระบุ geometry['ponding'] (คานเป็นชิ้นส่วนหลัก, C_s ของชิ้นส่วนรองจาก geometry)
+        ponding = None
+        if self.geometry.get("ponding"):
+            cp = float(ponding_coefficient(spacing_m, span_m, E, Ix))
+            ponding = log_ponding_step(self.add_step, cp, float(self.geometry.get("Cs", 0.0) or 0.0), primary=True)
+
+        # combo ควบคุมเลือกจาก |w_u| — แรงยกให้ M_u, V_u ติดลบ จึงเทียบขนาด (เหมือน batch_checks)
+        moment_ok = abs(Mu) <= phi_Mn
+        shear_ok = abs(Vu) <= phi_Vn
+        deflection_ok = bool(serv["Pass"])
+
+        ratios = {
+            "Moment": abs(Mu) / phi_Mn if phi_Mn else float("inf"),
+            "Shear": abs(Vu) / phi_Vn if phi_Vn else float("inf"),
+            "Deflection": float(serv["Deflection"]),
+        }
+        status = {
+            "Moment": moment_ok,
+            "Shear": shear_ok,
+            "Deflection": deflection_ok,
+        }
+        capacity = {
+            "Phi_Mn": phi_Mn,
+            "Phi_Vn": phi_Vn,
+            "Delta_Limit_Total": limit_total,
+            "Delta_Limit_Live": limit_live,
+        }
+        demand = {
+            "Mu": Mu,
+            "Vu": Vu,
+            "Delta_Total": delta,
+            "Delta_Live": delta_live,
+        }
+        if "Delta_Wind" in serv:
+            capacity["Delta_Limit_Wind"] = float(serv["Delta_Limit_Wind"])
+            demand["Delta_Wind"] = float(serv["Delta_Wind"])
+        if ponding is not None:
+            capacity["Cp"] = cp
+            ratios["Ponding"] = ponding
+            status["Ponding"] = ponding <= 1.0
+
+        return {
+            "Inputs": {
+                "section": self.section,
+                "geometry": self.geometry,
+                "loads": self.loads,
+                "material": self.material,
+            },
+            "Steps": self.steps,
+            "Checks": {
+                "Status": status,
+                "Ratios": ratios,
+                "Capacity": capacity,
+                "Demand": demand,
+                "Deflection": deflection_detail(serv),
+                "Controlling_Load": controlling,
+            },
+        }
+
+    def batch_inputs(self) -> Dict[str, Any]:
+        """Inputs as batch_checks keyword arguments, used by the inverse solvers."""
+        from parametric_sweep import beam_inputs
+        return beam_inputs(self.section, self.geometry, self.loads, self.material,
+                           combinations=self.combinations, limits=self.limits)
+
+    def capacity_key(self) -> tuple:
+        """Every input of the capacity phase (section and material only)."""
+        dims = section_dimensions(self.section)
+        return (self.material.get("Fy"), self.material.get("E"), self.section.get("Zx"),
+                self.section.get("Ix"), self.section.get("Aw"), self.section.get("Area"),
+                tuple(dims.values()) if dims else None,
+                self.geometry.get("flexure_method", "effective_width"))
+
+    def capacity(self) -> Dict[str, Any]:
+        """Load-independent strengths (Phi_Mn, Phi_Vn, Aw) from the capacity cache."""
+        return _CAPACITY_CACHE.get(self.capacity_key(), self._capacity)[0]
+
+    def _capacity(self, log: CalculationLogMixin) -> Dict[str, Any]:
+        """Capacity phase: shear area, flexural and shear design strengths."""
         Fy = _ensure_positive("Fy", self.material.get("Fy"))
         E = _ensure_positive("E", self.material.get("E"))
         Zx = _ensure_positive("Zx", self.section.get("Zx"))
@@ -79,14 +208,14 @@ class ColdFormedBeamDesign(CalculationLogMixin):
         if Aw is None or Aw <= 0:
             area = _ensure_positive("Area", self.section.get("Area"))
             Aw = 0.85 * area
-            self.add_step(
+            log.add_step(
                 "คำนวณพื้นที่เฉือนแทน",
                 r"A_w \approx 0.85A",
                 f"0.85 \\times {area:.3f}",
                 f"= {Aw:.3f}\\,\\text{{cm}}^2"
             )
         else:
-            self.add_step(
+            log.add_step(
                 "พื้นที่เฉือนจากตาราง",
                 r"A_w = A_{tab}",
                 "--",
@@ -96,18 +225,24 @@ class ColdFormedBeamDesign(CalculationLogMixin):
         phi_m = 0.90  # ϕ = 0.90 สำหรับ bending (ตาม มอก. 1228-2549)
         phi_v = 0.95  # ϕ = 0.95 สำหรับ shear (ตาม มอก. 1228-2549)
 
-        phi_Mn = phi_m * Fy * Zx / 100.0
+        # Effective section modulus (effective width or DSM) when b and c are known
+        method = self.geometry.get("flexure_method", "effective_width")
+        reduction = log_flexure_steps(log, section_dimensions(self.section), Zx, Fy, E, method)
+        se_ratio = reduction.pop("ratio")
+        Se = se_ratio * Zx
+
+        phi_Mn = phi_m * Fy * Se / 100.0
         Vn = 0.6 * Fy * Aw
         phi_Vn = phi_v * Vn
 
-        self.add_step(
+        log.add_step(
             "กำลังดัดรับออกแบบ (ตาม มอก. 1228-2549)",
-            r"\phi M_n = \phi_m F_y Z_x",
-            f"{phi_m:.2f} \\times {Fy:.0f} \\times {Zx:.2f} / 100",
+            r"\phi M_n = \phi_m F_y S_e",
+            f"{phi_m:.2f} \\times {Fy:.0f} \\times {Se:.2f} / 100",
             f"= {phi_Mn:.3f}\\,\\text{{kg-m}}",
             note="ϕ = 0.90 สำหรับการดัด (LRFD)"
         )
-        self.add_step(
+        log.add_step(
             "กำลังเฉือนรับออกแบบ (ตาม มอก. 1228-2549)",
             r"\phi V_n = \phi_v 0.6 F_y A_w",
             f"{phi_v:.2f} \\times 0.6 \\times {Fy:.0f} \\times {Aw:.2f}",
@@ -115,98 +250,80 @@ class ColdFormedBeamDesign(CalculationLogMixin):
             note="ϕ = 0.95 สำหรับการเฉือน, V = 0.6FyAw (LRFD)"
         )
 
-        ws = dead + live
-        ws_cm = ws / 100.0
-        delta = (5 * ws_cm * span_cm**4) / (384 * E * Ix)
-        live_cm = live / 100.0
-        delta_live = (5 * live_cm * span_cm**4) / (384 * E * Ix)
-        limit_total = span_cm / 240.0
-        limit_live = span_cm / 360.0
-
-        self.add_step(
-            "การโก่งตัวรวมจาก DL+LL",
-            r"\Delta = \frac{5 w_s L^4}{384 E I_x}",
-            f"5 \\times {ws_cm:.4f} \\times {span_cm:.1f}^4 / (384 \\times {E:.2e} \\times {Ix:.2f})",
-            f"= {delta:.3f}\\,\\text{{cm}}",
-            note="สูตรการโก่งตัวคานรับแรงกระจาย (Simply Supported Beam)"
-        )
-        self.add_step(
-            "การโก่งตัวจาก Live Load",
-            r"\Delta_L = \frac{5 w_L L^4}{384 E I_x}",
-            f"5 \\times {live_cm:.4f} \\times {span_cm:.1f}^4 / (384 \\times {E:.2e} \\times {Ix:.2f})",
-            f"= {delta_live:.3f}\\,\\text{{cm}}",
-            note="คำนวณการโก่งตัวจาก Live Load เพียงอย่างเดียว"
-        )
-        self.add_step(
-            "เกณฑ์การโก่งตัวตาม กฎกระทรวง ฉบับที่ 55 (พ.ศ. 2543)",
-            r"\Delta_{allow,รวม} = \frac{L}{240}, \quad \Delta_{allow,L} = \frac{L}{360}",
-            f"{span_cm:.1f}/240,\\; {span_cm:.1f}/360",
-            f"= {limit_total:.3f},\\; {limit_live:.3f}\\,\\text{{cm}}",
-            note="หลักเกณฑ์ของ วิศวกรรมสถานแห่งประเทศไทย (วสท.)"
-        )
-
-        moment_ok = Mu <= phi_Mn
-        shear_ok = Vu <= phi_Vn
-        deflection_total_ok = delta <= limit_total
-        deflection_live_ok = delta_live <= limit_live
-        deflection_ok = deflection_total_ok and deflection_live_ok
-
-        ratios = {
-            "Moment": Mu / phi_Mn if phi_Mn else float("inf"),
-            "Shear": Vu / phi_Vn if phi_Vn else float("inf"),
-            "Deflection": max(
-                delta / limit_total if limit_total else float("inf"),
-                delta_live / limit_live if limit_live else float("inf"),
-            ),
-        }
-
-        return {
-            "Inputs": {
-                "section": self.section,
-                "geometry": self.geometry,
-                "loads": self.loads,
-                "material": self.material,
-            },
-            "Steps": self.steps,
-            "Checks": {
-                "Status": {
-                    "Moment": moment_ok,
-                    "Shear": shear_ok,
-                    "Deflection": deflection_ok,
-                },
-                "Ratios": ratios,
-                "Capacity": {
-                    "Phi_Mn": phi_Mn,
-                    "Phi_Vn": phi_Vn,
-                    "Delta_Limit_Total": limit_total,
-                    "Delta_Limit_Live": limit_live,
-                },
-                "Demand": {
-                    "Mu": Mu,
-                    "Vu": Vu,
-                    "Delta_Total": delta,
-                    "Delta_Live": delta_live,
-                },
-                "Deflection": {
-                    "Total": {
-                        "value": delta,
-                        "limit": limit_total,
-                        "ratio": delta / limit_total if limit_total else float("inf"),
-                        "pass": deflection_total_ok,
-                    },
-                    "Live": {
-                        "value": delta_live,
-                        "limit": limit_live,
-                        "ratio": delta_live / limit_live if limit_live else float("inf"),
-                        "pass": deflection_live_ok,
-                    },
-                },
-                "Controlling_Load": controlling,
-            },
-        }
+        return {"Phi_Mn": phi_Mn, "Phi_Vn": phi_Vn, "Aw": Aw, "E": E, "Ix": Ix, "Se": Se, "Se_Ratio": se_ratio,
+                "Flexure_Method": method, **reduction}
 
     def _ultimate_demand(self, wu: float, span_m: float) -> Tuple[float, float]:
         Mu = wu * span_m ** 2 / 8.0
         Vu = wu * span_m / 2.0
         return Mu, Vu
 
+
+
+def batch_checks(*, span, D, L, W, Zx, Ix, Fy=2450.0, E=2.04e6, Aw=None, Area=None,
+                 combinations=None, limits=None, camber=0.0, ponding=False, spacing=1.0,
+                 Cs=0.0, h=None, b=None, c=None, t=None,
+                 flexure_method="effective_width") -> Dict[str, np.ndarray]:
+    """
+    Vectorised counterpart of ColdFormedBeamDesign.run_design (no step log).
+
+    Every argument accepts a scalar or an array; arrays broadcast together.
+    Aw defaults to 0.85A as in the scalar engine. 'Controlling' is the index
+    into combos.strength of the governing combination. 'Ponding' is 0 unless
+    ponding=True (spacing = tributary width in m). With the C/Z dimensions
+    h, b, c, t (mm) the flexural strength uses the effective modulus Se from
+    flexure_method ('effective_width' or 'dsm').
+    """
+    if flexure_method not in FLEXURE_METHODS:
+        raise ValueError(f"ไม่รู้จักวิธีคำนวณกำลังดัด '{flexure_method}' (ที่รองรับ: {', '.join(FLEXURE_METHODS)})")
+    se_ratio = 1.0
+    if not any(v is None for v in (h, b, c, t)):
+        # before broadcasting: cached per section / catalog
+        se_ratio = flexural_ratio(h, b, c, t, Fy, E, flexure_method)
+    if Aw is None:
+        if Area is None:
+            raise ValueError("ต้องมีค่าบวกสำหรับ Area")
+        Aw = 0.85 * np.asarray(Area, dtype=float)
+    span, D, L, W, Zx, Ix, Fy, E, Aw = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (span, D, L, W, Zx, Ix, Fy, E, Aw))
+    )
+    dead = np.maximum(D, 0.0)
+    live = np.maximum(L, 0.0)
+
+    combos = get_combination_set(combinations)
+    factored = combos.factored(combos.case_vector(D=dead, L=live, W=W))[..., combos.strength_mask]
+    gov = np.argmax(np.abs(factored), axis=-1)
+    wu = np.take_along_axis(factored, gov[..., None], axis=-1)[..., 0]
+
+    Mu = wu * span ** 2 / 8.0
+    Vu = wu * span / 2.0
+    phi_Mn = 0.90 * Fy * se_ratio * Zx / 100.0
+    phi_Vn = 0.95 * 0.6 * Fy * Aw
+
+    span_cm = span * 100.0
+    serv = deflection_checks(
+        span_cm,
+        uniform_deflection(dead + live, span_cm, E, Ix),
+        uniform_deflection(live, span_cm, E, Ix),
+        uniform_deflection(W, span_cm, E, Ix),
+        limits=limits, camber=camber,
+    )
+    pond = ponding_ratio(ponding_coefficient(spacing, span, E, Ix), Cs) if ponding else np.zeros(span.shape)
+
+    out = {
+        "Wu_design": wu,
+        "Controlling": gov,
+        "Mu": Mu,
+        "Vu": Vu,
+        "Phi_Mn": phi_Mn,
+        "Phi_Vn": phi_Vn,
+        "Delta_Total": serv["Delta_Total"],
+        "Delta_Live": serv["Delta_Live"],
+        "Moment": Mu / phi_Mn,
+        "Shear": Vu / phi_Vn,
+        "Deflection": serv["Deflection"],
+        "Ponding": pond,
+    }
+    out["Max_Ratio"] = np.maximum.reduce([np.abs(out["Moment"]), np.abs(out["Shear"]), out["Deflection"], pond])
+    out["Pass"] = out["Max_Ratio"] <= 1.0
+    return out
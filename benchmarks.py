@@ -0,0 +1,502 @@
+"""
+benchmarks.py
+ชุดวัดประสิทธิภาพ (benchmark) ของ engine ออกแบบ, การโหลดตารางหน้าตัด, รายงาน PDF และโมเดล 3D
+
+แนวเดียวกับ asv: ทุกรายการลงทะเบียนใน BENCHMARKS ด้วย @benchmark(...) มี setup แยกจากส่วนที่จับเวลา
+  - จำนวนรอบต่อการวัด (number) ปรับอัตโนมัติให้แต่ละการวัดใช้เวลา ≥ 0.2 วินาที (timeit.autorange)
+  - วัดซ้ำ repeat ครั้ง รายงาน median, min และ IQR ต่อหนึ่งรอบ
+  - รายการ cold=True วัดในโปรเซสใหม่ทุกครั้ง (การเรียกครั้งแรกหลัง import — ไม่มี cache ภายในโปรเซส)
+
+ค่าอ้างอิง (baseline) เก็บใน benchmark_baseline.json พร้อมข้อมูลเครื่อง
+รายการที่ median และ min ช้ากว่าค่าอ้างอิงเกิน threshold (ค่าปริยาย 25%) ถือว่า "ถดถอย" และออกด้วยรหัส 1
+ค่าอ้างอิงจากเครื่องอื่นใช้เทียบได้เพียงคร่าว ๆ (มีคำเตือน)
+
+    python benchmarks.py                  # วัดทุกรายการแล้วเทียบกับ baseline
+    python benchmarks.py -k purlin -k pdf # เฉพาะรายการที่ชื่อมีคำเหล่านี้
+    python benchmarks.py --save           # บันทึกผลเป็น baseline ใหม่
+    python benchmarks.py --list
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(ROOT, "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+MIN_TIME = 0.2  # วินาทีต่อการวัดหนึ่งครั้ง
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[[Any], Any]            # รับผลของ setup
+    setup: Optional[Callable[[], Any]] = None
+    group: str = ""
+    cold: bool = False                    # True = วัดการเรียกครั้งแรกในโปรเซสใหม่
+
+
+@dataclass
+class Timing:
+    name: str
+    group: str
+    median: float    # วินาทีต่อรอบ
+    min: float
+    iqr: float
+    number: int      # จำนวนรอบต่อการวัด
+    repeat: int
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str, setup: Optional[Callable[[], Any]] = None, cold: bool = False):
+    """ลงทะเบียนฟังก์ชันใน BENCHMARKS"""
+    def register(func):
+        if name in BENCHMARKS:
+            raise ValueError(f"ชื่อ benchmark '{name}' ซ้ำ")
+        BENCHMARKS[name] = Benchmark(name, func, setup, group, cold)
+        return func
+    return register
+
+
+# ─────────────────────────────────────────────────────────────
+# อินพุตตัวอย่าง (ขนาดใช้งานจริงของหน้าออกแบบ)
+# ─────────────────────────────────────────────────────────────
+PURLIN_SECTION = {"name": "C-150x50x20x2.3", "Weight": 5.5, "Zx": 28.1, "Sx": 28.1, "Ix": 210.0,
+                  "Iy": 22.0, "Sy": 6.33, "Area": 7.012, "h": 150.0, "t": 2.3}
+PURLIN_GEOMETRY = {"span": 6.0, "spacing": 1.2, "slope": 10.0}
+RAFTER_SECTION = {"name": "H-300x150x6.5x9", "d": 30.0, "bf": 15.0, "tf": 0.9, "tw": 0.65, "Area": 46.78,
+                  "Ix": 7210.0, "Zx": 522.0, "Sx": 481.0, "ry": 3.29, "Weight": 36.7}
+RAFTER_GEOMETRY = {"span": 10.0, "spacing": 6.0, "slope": 15.0, "Lb": 1.2}
+COLUMN_SECTION = {"section_name": "H-200x200x8x12", "Ag": 63.53, "rx": 8.62, "ry": 5.02,
+                  "h": 200.0, "bf": 200.0, "tw": 8.0, "tf": 12.0, "Fy": 2500.0}
+ROOF_LOADS = {"DL": 15.0, "LL": 30.0, "WL": -60.0}
+MATERIALS = {"Fy": 2450.0, "E": 2.04e6}
+PROJECT_INFO = {"Project Name": "Benchmark", "Owner": "-", "Engineer": "-"}
+
+
+def _rafter_point_loads() -> Dict[str, Any]:
+    xs = np.linspace(0.0, RAFTER_GEOMETRY["span"], 10)
+    return {"DL": 0.0, "LL": 0.0, "WL": 0.0,
+            "point_loads": [{"x": float(x), "D": 120.0, "L": 180.0, "W": -300.0} for x in xs]}
+
+
+def _catalog(filename: str):
+    import pandas as pd
+    return pd.read_csv(os.path.join(ROOT, filename))
+
+
+@contextlib.contextmanager
+def _quiet():
+    """ปิดข้อความเตือนฟอนต์ของตัวสร้างรายงาน"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# ─────────────────────────────────────────────────────────────
+# engine ออกแบบ (run_design ค่าเดี่ยว)
+# ─────────────────────────────────────────────────────────────
+@benchmark("design.purlin", "design")
+def bench_purlin(_):
+    from purlin_design import PurlinDesign
+    return PurlinDesign(PURLIN_SECTION, PURLIN_GEOMETRY, ROOF_LOADS, MATERIALS).run_design()
+
+
+@benchmark("design.purlin_biaxial", "design")
+def bench_purlin_biaxial(_):
+    from purlin_design import PurlinDesign
+    geometry = {**PURLIN_GEOMETRY, "biaxial": True, "sag_rods": 1}
+    return PurlinDesign(PURLIN_SECTION, geometry, ROOF_LOADS, MATERIALS).run_design()
+
+
+@benchmark("design.rafter", "design")
+def bench_rafter(_):
+    from rafter_design import RafterDesign
+    return RafterDesign(RAFTER_SECTION, RAFTER_GEOMETRY, ROOF_LOADS, MATERIALS).run_design()
+
+
+@benchmark("design.rafter_point_loads", "design")
+def bench_rafter_points(_):
+    from rafter_design import RafterDesign
+    return RafterDesign(RAFTER_SECTION, RAFTER_GEOMETRY, _rafter_point_loads(), MATERIALS).run_design()
+
+
+@benchmark("design.beam", "design")
+def bench_beam(_):
+    from beam_design import ColdFormedBeamDesign
+    return ColdFormedBeamDesign(section=PURLIN_SECTION, geometry={"span": 4.0, "spacing": 1.0},
+                                loads={"D": 150.0, "L": 200.0, "W": 0.0}, material=MATERIALS).run_design()
+
+
+@benchmark("design.compression", "design")
+def bench_compression(_):
+    from compression_design import CompressionDesign
+    return CompressionDesign(**COLUMN_SECTION, Lx=6.0, Ly=6.0, Pu=25000.0).run_design()
+
+
+@benchmark("design.tension", "design")
+def bench_tension(_):
+    from tension_design import TensionDesign
+    return TensionDesign(section_name="L-65x65x6", Ag=7.527, r_min=1.27, L=3.0, Tu=12000.0).run_design()
+
+
+@benchmark("design.building", "design")
+def bench_building(_):
+    """ทั้งอาคาร 6 ช่วงโครง หลังคาจั่ว (แป จันทัน เสา)"""
+    from load_path import BuildingLayout, design_building
+    layout = BuildingLayout(bays=[6.0] * 6, width=20.0, purlin_spacing=1.2, slope=10.0)
+    return design_building(layout, purlin_section=PURLIN_SECTION, rafter_section=RAFTER_SECTION,
+                           column_section=COLUMN_SECTION, loads=ROOF_LOADS, materials=MATERIALS)
+
+
+# ─────────────────────────────────────────────────────────────
+# ตารางหน้าตัด
+# ─────────────────────────────────────────────────────────────
+def _load_tis_1228(_):
+    from data_utils import DEFAULT_FILENAME, load_data
+    return load_data(os.path.join(ROOT, DEFAULT_FILENAME))
+
+
+benchmark("data.load_data_cold", "data", cold=True)(_load_tis_1228)
+benchmark("data.load_data_warm", "data")(_load_tis_1228)
+
+
+# ─────────────────────────────────────────────────────────────
+# คัดกรองทั้งตารางและ parametric sweep
+# ─────────────────────────────────────────────────────────────
+@benchmark("sweep.purlin_catalog", "sweep", setup=lambda: _catalog("tis_1228_steel.csv"))
+def bench_purlin_catalog(df):
+    from purlin_design import screen_catalog
+    return screen_catalog(df, PURLIN_GEOMETRY, ROOF_LOADS, MATERIALS)
+
+
+@benchmark("sweep.purlin_max_spacing", "sweep", setup=lambda: _catalog("tis_1228_steel.csv"))
+def bench_purlin_max_spacing(df):
+    from inverse_design import solve_catalog
+    return solve_catalog("purlin", df, PURLIN_GEOMETRY, ROOF_LOADS, MATERIALS, "spacing")
+
+
+@benchmark("sweep.purlin_recommend", "sweep", setup=lambda: _catalog("tis_1228_steel.csv"))
+def bench_purlin_recommend(df):
+    from section_recommender import recommend
+    return recommend("purlin", df, str(df["Section"].iloc[0]), PURLIN_GEOMETRY, ROOF_LOADS, MATERIALS)
+
+
+def _hot_rolled_index():
+    from catalog_index import CatalogIndex
+    return CatalogIndex(_catalog("tis_1227_steel.csv"))
+
+
+@benchmark("sweep.catalog_query", "sweep", setup=_hot_rolled_index)
+def bench_catalog_query(index):
+    return index.names(types="HN", h=(150, 400), Weight=(10.0, 60.0))
+
+
+@benchmark("section.lipped_channel_catalog", "section", setup=lambda: _catalog("tis_1228_steel.csv"))
+def bench_lipped_channel_catalog(df):
+    from section_properties import lipped_channel_catalog
+    return lipped_channel_catalog(df, r="t")
+
+
+def _channel_members():
+    from built_up import channel_members
+    return channel_members(_catalog("tis_1228_steel.csv"))
+
+
+@benchmark("section.built_up_pairs", "section", setup=_channel_members)
+def bench_built_up_pairs(members):
+    from built_up import compose_channels, pairings
+    return [compose_channels(members, *pairings(members, arr), arrangement=arr) for arr in ("back_to_back", "boxed")]
+
+
+def _catalog_dimensions():
+    from effective_width import catalog_dimensions
+    return catalog_dimensions(_catalog("tis_1228_steel.csv"))
+
+
+@benchmark("section.effective_width_catalog", "section", setup=_catalog_dimensions)
+def bench_effective_width_catalog(dims):
+    from effective_width import effective_section
+    return effective_section(*(dims[k].to_numpy() for k in ("h", "b", "c", "t")), 2450.0)
+
+
+def _strip_model():
+    from finite_strip import lipped_channel
+    return lipped_channel(150.0, 50.0, 20.0, 2.3)
+
+
+@benchmark("section.finite_strip_curve", "section", setup=_strip_model)
+def bench_finite_strip_curve(model):
+    from finite_strip import LENGTHS, load_factors
+    return load_factors(model, LENGTHS)
+
+
+def _dump_rows():
+    with open(os.path.join(ROOT, "tables_dump.txt"), encoding="utf-8") as f:
+        return [line for line in f if line.startswith("[")]
+
+
+@benchmark("catalog.parse_dump", "catalog", setup=_dump_rows)
+def bench_parse_dump(lines):
+    from pdf_tables import parse_row
+    return [parse_row(line) for line in lines]
+
+
+def _rafter_catalog_inputs():
+    from parametric_sweep import rafter_inputs
+    df = _catalog("tis_1227_steel.csv")
+    section = {"d": df["h"].to_numpy() / 10, "bf": df["b"].to_numpy() / 10, "tf": df["tf"].to_numpy() / 10,
+               "tw": df["tw"].to_numpy() / 10, **{k: df[k].to_numpy() for k in ("Zx", "Sx", "Ix", "ry", "Weight", "Area")}}
+    return rafter_inputs(section, RAFTER_GEOMETRY, ROOF_LOADS, MATERIALS)
+
+
+@benchmark("sweep.rafter_catalog", "sweep", setup=_rafter_catalog_inputs)
+def bench_rafter_catalog(inputs):
+    from rafter_design import batch_checks
+    return batch_checks(**inputs)
+
+
+def _purlin_grid_inputs():
+    from parametric_sweep import purlin_inputs
+    return purlin_inputs(PURLIN_SECTION, PURLIN_GEOMETRY, ROOF_LOADS, MATERIALS)
+
+
+@benchmark("sweep.purlin_grid_100x100", "sweep", setup=_purlin_grid_inputs)
+def bench_purlin_grid(base):
+    from parametric_sweep import sweep
+    return sweep("purlin", base, {"span": np.linspace(3.0, 9.0, 100), "spacing": np.linspace(0.6, 1.8, 100)})
+
+
+# ─────────────────────────────────────────────────────────────
+# แผนภาพ รายงาน และโมเดล 3D
+# ─────────────────────────────────────────────────────────────
+def _rafter_design_case():
+    from rafter_design import RafterDesign
+    inputs = {"section_data": RAFTER_SECTION, "geometry": RAFTER_GEOMETRY, "loads": _rafter_point_loads(),
+              "materials": MATERIALS}
+    return inputs, RafterDesign(**inputs).run_design()
+
+
+@benchmark("diagram.rafter_adaptive", "diagram", setup=_rafter_design_case)
+def bench_rafter_diagram(case):
+    from diagrams import diagram, member_loading
+    return diagram(member_loading("rafter", *case))
+
+
+def _purlin_report_case():
+    from purlin_design import PurlinDesign
+    inputs = {"geometry": PURLIN_GEOMETRY, "loads": ROOF_LOADS, "materials": MATERIALS}
+    results = PurlinDesign(PURLIN_SECTION, PURLIN_GEOMETRY, ROOF_LOADS, MATERIALS).run_design()
+    return inputs, results, tempfile.mkdtemp(prefix="roof_bench_")
+
+
+@benchmark("report.render_latex", "report", setup=_purlin_report_case)
+def bench_render_latex(case):
+    from report_generator import PurlinReportGenerator
+    inputs, results, tmp = case
+    with _quiet():
+        gen = PurlinReportGenerator(PROJECT_INFO, inputs, results, PURLIN_SECTION)
+    return gen._render_latex(r"M_u = \frac{w_u L^2}{8} = \frac{1.2(15) + 1.6(30)}{8}(6.0)^2",
+                             os.path.join(tmp, "eq.png"))
+
+
+@benchmark("report.purlin_pdf", "report", setup=_purlin_report_case)
+def bench_purlin_pdf(case):
+    from report_generator import PurlinReportGenerator
+    inputs, results, tmp = case
+    with _quiet():
+        ok, path = PurlinReportGenerator(PROJECT_INFO, inputs, results, PURLIN_SECTION).generate(
+            os.path.join(tmp, "purlin.pdf"))
+    if not ok:
+        raise RuntimeError(path)
+    return path
+
+
+@benchmark("3d.c_channel", "3d")
+def bench_c_channel(_):
+    from section_3d import create_c_channel_3d
+    return create_c_channel_3d(150.0, 50.0, 20.0, 2.3, length=6000.0)
+
+
+@benchmark("3d.i_beam", "3d")
+def bench_i_beam(_):
+    from section_3d import create_i_beam_3d
+    return create_i_beam_3d(300.0, 150.0, 9.0, 6.5, length=10000.0)
+
+
+# ─────────────────────────────────────────────────────────────
+# ตัววัด
+# ─────────────────────────────────────────────────────────────
+def _summarize(bench: Benchmark, samples: Sequence[float], number: int) -> Timing:
+    q1, _, q3 = statistics.quantiles(samples, n=4) if len(samples) > 1 else (samples[0],) * 3
+    return Timing(bench.name, bench.group, statistics.median(samples), min(samples), q3 - q1, number, len(samples))
+
+
+def _time_cold(bench: Benchmark, repeat: int) -> Timing:
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--cold-child", bench.name],
+                             capture_output=True, text=True, check=True, cwd=ROOT)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return _summarize(bench, samples, 1)
+
+
+def time_benchmark(bench: Benchmark, repeat: int = 5) -> Timing:
+    """วัดเวลาต่อรอบของ benchmark หนึ่งรายการ"""
+    if bench.cold:
+        return _time_cold(bench, repeat)
+    state = bench.setup() if bench.setup else None
+    bench.func(state)  # อุ่นเครื่อง: import และ cache ของไลบรารีไม่นับรวม
+    timer = timeit.Timer(lambda: bench.func(state))
+    number = 1
+    while True:  # เหมือน timeit.autorange แต่ใช้ MIN_TIME
+        if timer.timeit(number) >= MIN_TIME or number >= 1_000_000:
+            break
+        number *= 10 if number < 10 else 2
+    return _summarize(bench, [t / number for t in timer.repeat(repeat, number)], number)
+
+
+def select(patterns: Sequence[str] = ()) -> List[Benchmark]:
+    """รายการที่ชื่อมีคำใดคำหนึ่งใน patterns (ว่าง = ทั้งหมด)"""
+    return [b for name, b in BENCHMARKS.items() if not patterns or any(p in name for p in patterns)]
+
+
+def run(patterns: Sequence[str] = (), repeat: int = 5,
+        progress: Optional[Callable[[Timing], None]] = None) -> List[Timing]:
+    timings = []
+    for bench in select(patterns):
+        timing = time_benchmark(bench, repeat)
+        timings.append(timing)
+        if progress:
+            progress(timing)
+    return timings
+
+
+# ─────────────────────────────────────────────────────────────
+# baseline
+# ─────────────────────────────────────────────────────────────
+def machine_info() -> Dict[str, Any]:
+    return {"platform": platform.platform(), "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(), "python": platform.python_version(), "numpy": np.__version__}
+
+
+def save_baseline(timings: Sequence[Timing], path: str = BASELINE_FILE, merge: bool = True) -> None:
+    """บันทึกผล (merge=True คงรายการเดิมที่ไม่ได้วัดรอบนี้)"""
+    results = load_baseline(path).get("results", {}) if merge else {}
+    results.update({t.name: {k: v for k, v in asdict(t).items() if k != "name"} for t in timings})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"machine": machine_info(), "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                   "results": dict(sorted(results.items()))}, f, indent=2)
+        f.write("\n")
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(timings: Sequence[Timing], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    เทียบกับ baseline: status = 'regressed' | 'improved' | 'ok' | 'new'
+    ถดถอยเมื่อทั้ง median และ min ช้ากว่าค่าอ้างอิงเกิน threshold (กันสัญญาณรบกวนจากการวัดครั้งเดียว)
+    """
+    ref = baseline.get("results", {})
+    rows = []
+    for t in timings:
+        base = ref.get(t.name)
+        if base is None:
+            rows.append({"name": t.name, "median": t.median, "baseline": None, "ratio": None, "status": "new"})
+            continue
+        ratio = t.median / base["median"]
+        if ratio > 1 + threshold and t.min / base["min"] > 1 + threshold:
+            status = "regressed"
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": t.name, "median": t.median, "baseline": base["median"], "ratio": ratio, "status": status})
+    return rows
+
+
+def _fmt(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="วัดประสิทธิภาพ engine ออกแบบ รายงาน และโมเดล 3D")
+    parser.add_argument("-k", dest="patterns", action="append", default=[], help="เลือกรายการที่ชื่อมีคำนี้")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="สัดส่วนที่ถือว่าถดถอย")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="บันทึกผลเป็น baseline")
+    parser.add_argument("--json", metavar="PATH", help="เขียนผลและการเทียบเป็น JSON")
+    parser.add_argument("--list", action="store_true")
+    parser.add_argument("--cold-child", metavar="NAME", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.cold_child:
+        bench = BENCHMARKS[args.cold_child]
+        state = bench.setup() if bench.setup else None
+        t0 = time.perf_counter()
+        bench.func(state)
+        print(time.perf_counter() - t0)
+        return 0
+    if args.list:
+        for bench in select(args.patterns):
+            print(f"{bench.name:<28} {bench.group}{'  (cold)' if bench.cold else ''}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline and baseline.get("machine", {}) != machine_info():
+        print("คำเตือน: baseline มาจากเครื่อง/เวอร์ชันอื่น ผลการเทียบใช้ได้เพียงคร่าว ๆ", file=sys.stderr)
+
+    def progress(t: Timing) -> None:
+        print(f"{t.name:<28} {_fmt(t.median):>10}  ±{_fmt(t.iqr):>9}  (n={t.number}×{t.repeat})", flush=True)
+
+    timings = run(args.patterns, args.repeat, progress)
+    rows = compare(timings, baseline, args.threshold)
+    if baseline:
+        print()
+        for row in rows:
+            ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+            print(f"{row['name']:<28} {_fmt(row['baseline']):>10} → {_fmt(row['median']):>10}  {ratio:>6}  {row['status']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine_info(), "timings": [asdict(t) for t in timings], "compare": rows}, f, indent=2)
+    if args.save:
+        save_baseline(timings, args.baseline)
+        print(f"บันทึก baseline: {args.baseline}")
+
+    regressed = [r["name"] for r in rows if r["status"] == "regressed"]
+    if regressed and not args.save:
+        print(f"ถดถอยเกิน {args.threshold:.0%}: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
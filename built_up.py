@@ -0,0 +1,309 @@
+"""
+built_up.py
+หน้าตัดประกอบจากเหล็กขึ้นรูปเย็นในตาราง (มอก. 1228): ตัวซีประกบหลัง, ตัวซีประกบปลาย (กล่อง)
+และเหล็กฉากคู่
+
+รวมคุณสมบัติของชิ้นส่วนด้วยทฤษฎีแกนขนาน (parallel-axis) พร้อมกันทุกคู่ในรูป array:
+
+  back_to_back  — ตัวซีสองตัวหันเอวชนกัน (เว้นช่อง gap สำหรับแผ่นประกับได้) ได้หน้าตัดคล้าย I
+  boxed         — ตัวซีสองตัวหันปลายปีกชนกันแล้วเชื่อมต่อเนื่อง ได้หน้าตัดกล่องปิด (J แบบ Bredt)
+  double_angle  — เหล็กฉากขาเท่าสองตัวประกบขาตั้ง (ไม่มีตารางเหล็กฉาก จึงรับขนาด b, t เป็น array)
+
+Ix, Area, Zx, Weight ของตัวซีใช้ค่าจากตาราง ส่วนตำแหน่งศูนย์ถ่วงและ Iy รอบศูนย์ถ่วงของตัวเอง
+คำนวณจากเส้นกึ่งกลางด้วย section_properties (ตารางไม่มีระยะศูนย์ถ่วง และ Iy ในตารางไม่สม่ำเสมอ)
+ตารางที่ไม่มีคอลัมน์ b, c (เช่น Data Steel) อ่านขนาดจากชื่อหน้าตัด C-h×b×c×t
+
+ผลเป็นตารางแบบเดียวกับตารางหน้าตัด (Section, Type, Weight, Area, Ix, Iy, Sx, Sy, Zx, rx, ry, J, Cw,
+rts, h0, Aw, h, b, t, tw, tf) จึงใช้กับ CatalogIndex / section_recommender ได้ทันที:
+
+    built = built_up_catalog(df_1228, ("back_to_back", "boxed"))
+    recommend("rafter", built, name, ..., columns=rafter_columns)
+    recommend("beam", built, name, ...)                     # catalog_columns (Zx, Ix, Area, Aw)
+    compression_design.batch_checks(Pu=..., **compression_columns(built))
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from section_properties import batch_properties, dimensions_from_names, lipped_channel_catalog
+
+ARRANGEMENTS = {
+    "back_to_back": "2C-BB",
+    "boxed": "2C-BOX",
+    "double_angle": "2L",
+}
+ARRANGEMENT_LABELS = {
+    "back_to_back": "ประกบหลัง",
+    "boxed": "ประกบปลาย (กล่อง)",
+    "double_angle": "เหล็กฉากคู่",
+}
+_MAX_CACHED = 16
+
+
+# ─────────────────────────────────────────────────────────────
+# คุณสมบัติของชิ้นส่วนเดี่ยว
+# ─────────────────────────────────────────────────────────────
+def _dimensions(df: pd.DataFrame) -> pd.DataFrame:
+    """h, b, c, t (mm) ของตัวซี — คอลัมน์หรือค่าที่ขาดอ่านจากชื่อหน้าตัด C-h×b×c×t"""
+    out = pd.DataFrame({col: pd.to_numeric(df[col], errors="coerce") if col in df else np.nan
+                        for col in ("h", "b", "c", "t")}, index=df.index)
+    if out.isna().any(axis=None) and "Section" in df:
+        out = out.fillna(dimensions_from_names(df["Section"]))
+    if out.isna().any(axis=None):
+        bad = df.loc[out.isna().any(axis=1), "Section"].head(3).tolist() if "Section" in df else []
+        raise ValueError(f"อ่านขนาดหน้าตัดตัวซีไม่ได้: {bad}")
+    return out
+
+
+def channel_members(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    คุณสมบัติของตัวซีแต่ละแถวสำหรับการประกอบ
+
+    Returns:
+        DataFrame: Section, h, b, c, t (mm), Area, Weight, Ix, Zx (จากตาราง ถ้ามี),
+        Iy (รอบศูนย์ถ่วงของตัวเอง ซม.⁴), e (ระยะผิวนอกเอว → ศูนย์ถ่วง ซม.), J (ซม.⁴)
+    """
+    dims = _dimensions(df)
+    geometry = pd.DataFrame(index=df.index, columns=["Area", "Ix", "Iy", "Zx", "Sx", "J", "xc", "Weight"],
+                            dtype=float)
+    lipped = dims["c"] > 0
+    for mask in (lipped, ~lipped):  # มีขอบพับกับไม่มีขอบพับมีจำนวนโหนดต่างกัน
+        if mask.any():
+            props = lipped_channel_catalog(dims[mask])
+            geometry.loc[mask, geometry.columns] = props[geometry.columns].to_numpy()
+    out = dims.copy()
+    if "Section" in df:
+        out.insert(0, "Section", df["Section"].astype(str))
+    for col in ("Area", "Weight", "Ix", "Zx", "Sx"):
+        table = pd.to_numeric(df[col], errors="coerce") if col in df else None
+        out[col] = geometry[col] if table is None else table.fillna(geometry[col])
+    out["Iy"] = geometry["Iy"]
+    out["e"] = geometry["xc"] + dims["t"] / 20.0  # xc วัดจากเส้นกึ่งกลางเอว (ซม.)
+    out["J"] = geometry["J"]
+    return out
+
+
+def angle_members(b, t) -> Dict[str, np.ndarray]:
+    """คุณสมบัติของเหล็กฉากขาเท่า b × b × t (mm) — มุมแหลม, ระยะ e, ey วัดจากผิวนอกของขา (ซม.)"""
+    b, t = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float)) for v in (b, t)))
+    if (t <= 0).any() or (2 * t >= b).any():
+        raise ValueError("ขนาดเหล็กฉากไม่ถูกต้อง")
+    leg = b - t / 2
+    zero = np.zeros_like(b)
+    nodes = np.stack([np.stack(p, axis=-1) for p in ((zero, leg), (zero, zero), (leg, zero))], axis=1)
+    props = batch_properties(nodes, np.array([(0, 1), (1, 2)]), t)
+    return {
+        "b": b, "t": t,
+        "Area": props["Area"], "Weight": props["Weight"],
+        "Ix": props["Ix"], "Iy": props["Iy"], "J": props["J"],
+        "e": props["xc"] + t / 20.0, "ey": props["yc"] + t / 20.0,
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# การรวมด้วยทฤษฎีแกนขนาน
+# ─────────────────────────────────────────────────────────────
+def _parallel_axis(area: Sequence[np.ndarray], inertia: Sequence[np.ndarray],
+                   offset: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ΣA, ศูนย์ถ่วงรวม และ Σ(I + A·d²) ของชิ้นส่วนที่ศูนย์ถ่วงอยู่ที่ระยะ offset"""
+    total = sum(area)
+    centroid = sum(a * x for a, x in zip(area, offset)) / total
+    return total, centroid, sum(i + a * (x - centroid) ** 2 for a, i, x in zip(area, inertia, offset))
+
+
+def pairings(members: pd.DataFrame, arrangement: str = "back_to_back",
+             identical: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    คู่ดัชนี (i, j), i ≤ j ของตัวซีที่ประกอบกันได้: ความลึกเท่ากัน
+    และสำหรับกล่องต้องมีความกว้างปีกเท่ากัน (ปลายปีกชนกัน) — identical=True เฉพาะคู่ตัวเดียวกัน
+    """
+    n = len(members)
+    if identical:
+        idx = np.arange(n)
+        return idx, idx.copy()
+    i, j = np.triu_indices(n)
+    h, b = members["h"].to_numpy(dtype=float), members["b"].to_numpy(dtype=float)
+    keep = np.isclose(h[i], h[j])
+    if arrangement == "boxed":
+        keep &= np.isclose(b[i], b[j])
+    return i[keep], j[keep]
+
+
+def compose_channels(members: pd.DataFrame, i: np.ndarray, j: np.ndarray,
+                     arrangement: str = "back_to_back", gap: float = 0.0) -> pd.DataFrame:
+    """
+    คุณสมบัติของตัวซีประกอบทุกคู่ (i[k], j[k]) พร้อมกัน
+
+    Args:
+        members: ผลของ channel_members
+        arrangement: 'back_to_back' หรือ 'boxed'
+        gap: ช่องระหว่างเอว (mm) สำหรับประกบหลัง เช่นความหนาแผ่นประกับ
+    """
+    if arrangement not in ("back_to_back", "boxed"):
+        raise ValueError(f"การประกอบตัวซีต้องเป็น 'back_to_back' หรือ 'boxed' (ได้ '{arrangement}')")
+    m = {c: members[c].to_numpy(dtype=float) for c in ("h", "b", "t", "Area", "Weight", "Ix", "Iy", "Zx", "e", "J")}
+    p = {c: v[i] for c, v in m.items()}
+    q = {c: v[j] for c, v in m.items()}
+    h = np.maximum(p["h"], q["h"])
+    boxed = arrangement == "boxed"
+    gap = 0.0 if boxed else float(gap)
+
+    # ศูนย์ถ่วงตามแกน x (ซม.) — จุดอ้างอิงที่กึ่งกลางช่อง (ประกบหลัง) หรือรอยต่อปลายปีก (กล่อง)
+    if boxed:
+        left, right = -p["b"] / 10, q["b"] / 10
+        x_p, x_q = left + p["e"], right - q["e"]
+    else:
+        left, right = -(gap / 2 + p["b"]) / 10, (gap / 2 + q["b"]) / 10
+        x_p, x_q = -(gap / 20 + p["e"]), gap / 20 + q["e"]
+    area, xbar, Iy = _parallel_axis((p["Area"], q["Area"]), (p["Iy"], q["Iy"]), (x_p, x_q))
+    Ix = p["Ix"] + q["Ix"]  # ศูนย์ถ่วงทั้งสองตัวอยู่ที่กึ่งความลึก
+    Sx = Ix / (h / 20)
+    Sy = Iy / np.maximum(xbar - left, right - xbar)
+    h0 = (h - np.maximum(p["t"], q["t"])) / 10
+
+    if boxed:
+        # Bredt: 4A₀² / Σ(L/t) — เอวสองข้างและปีกบน/ล่างที่ต่อกันเป็นแผ่นเดียว
+        width0 = (p["b"] + q["b"] - (p["t"] + q["t"]) / 2) / 10
+        sum_lt = (h0 / (p["t"] / 10) + h0 / (q["t"] / 10)
+                  + 2 * ((p["b"] - p["t"] / 2) / p["t"] + (q["b"] - q["t"] / 2) / q["t"]))
+        J = 4 * (h0 * width0) ** 2 / sum_lt
+        Cw = np.zeros_like(Ix)
+    else:
+        J = p["J"] + q["J"]
+        Cw = Iy * h0 ** 2 / 4  # หน้าตัดคล้าย I สมมาตรสองแกน
+    # rts ตามนิยามของหน้าตัด I (AISC F2) — กล่องมี J สูงมาก การโก่งเดาะด้านข้างจึงไม่ควบคุม
+    rts = np.sqrt(np.sqrt(Iy * Iy * h0 ** 2 / 4) / Sx)
+
+    names = members["Section"].to_numpy(dtype=object) if "Section" in members else np.arange(len(members)).astype(str)
+    name_p, name_q = names[i], names[j]
+    suffix = "BB" if not boxed else "BOX"
+    name_p, name_q = name_p.astype(str), name_q.astype(str)
+    label = np.where(i == j, np.char.add("2×", name_p), np.char.add(np.char.add(name_p, " + "), name_q))
+    return pd.DataFrame({
+        "Section": np.char.add(label, f" ({suffix})"),
+        "Type": ARRANGEMENTS[arrangement],
+        "Weight": p["Weight"] + q["Weight"],
+        "Area": area,
+        "Ix": Ix, "Iy": Iy, "Sx": Sx, "Sy": Sy,
+        "Zx": p["Zx"] + q["Zx"],
+        "rx": np.sqrt(Ix / area), "ry": np.sqrt(Iy / area),
+        "J": J, "Cw": Cw, "rts": rts, "h0": h0,
+        "Aw": ((p["h"] - 2 * p["t"]) * p["t"] + (q["h"] - 2 * q["t"]) * q["t"]) / 100,
+        "h": h, "b": (right - left) * 10,
+        "t": np.minimum(p["t"], q["t"]),
+        "tw": p["t"] + q["t"], "tf": np.minimum(p["t"], q["t"]),
+        "gap": gap,
+        "Member_1": name_p, "Member_2": name_q,
+    })
+
+
+def double_angles(b, t, gap: float = 0.0, names: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    เหล็กฉากคู่ขาเท่า 2L-b×b×t ประกบขาตั้งห่างกัน gap (mm) — หนึ่งแถวต่อขนาด
+
+    แกน x ขนานกับขานอนของเหล็กฉาก (Ix = 2 Ix ของตัวเดียว), แกน y ผ่านกึ่งกลางช่อง
+    """
+    m = angle_members(b, t)
+    area, _, Iy = _parallel_axis((m["Area"], m["Area"]), (m["Iy"], m["Iy"]),
+                                 (-(gap / 20 + m["e"]), gap / 20 + m["e"]))
+    Ix = 2 * m["Ix"]
+    Sx = Ix / np.maximum(m["ey"], m["b"] / 10 - m["ey"])
+    half = (gap / 2 + m["b"]) / 10
+    if names is None:
+        names = [f"2L-{bb:g}x{bb:g}x{tt:g}" for bb, tt in zip(m["b"], m["t"])]
+    return pd.DataFrame({
+        "Section": list(names),
+        "Type": ARRANGEMENTS["double_angle"],
+        "Weight": 2 * m["Weight"],
+        "Area": area,
+        "Ix": Ix, "Iy": Iy, "Sx": Sx, "Sy": Iy / half,
+        "rx": np.sqrt(Ix / area), "ry": np.sqrt(Iy / area),
+        "J": 2 * m["J"], "Cw": np.zeros_like(Ix),
+        "h": m["b"], "b": 2 * half * 10,
+        "t": m["t"], "tw": 2 * m["t"], "tf": m["t"],
+        "gap": float(gap),
+    })
+
+
+# ─────────────────────────────────────────────────────────────
+# ทั้งตาราง (มี cache)
+# ─────────────────────────────────────────────────────────────
+_CATALOGS: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+
+
+def built_up_catalog(df: pd.DataFrame, arrangements: Sequence[str] = ("back_to_back", "boxed"),
+                     gap: float = 0.0, identical: bool = False) -> pd.DataFrame:
+    """
+    ตารางหน้าตัดประกอบของทุกคู่ตัวซีใน df (เก็บ cache ตามเนื้อหาของตาราง)
+
+    คืนสำเนา — เรียงตาม Type แล้วตาม Weight เหมือนตารางหน้าตัดปกติ
+    """
+    cols = [c for c in ("Section", "h", "b", "c", "t", "Area", "Weight", "Ix", "Zx", "Sx") if c in df]
+    key = (tuple(arrangements), float(gap), bool(identical), tuple(cols),
+           int(pd.util.hash_pandas_object(df[cols], index=False).sum()))
+    out = _CATALOGS.get(key)
+    if out is None:
+        members = channel_members(df.reset_index(drop=True))
+        parts = [compose_channels(members, *pairings(members, arr, identical), arrangement=arr, gap=gap)
+                 for arr in arrangements]
+        out = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+        if not out.empty:
+            out = out.sort_values(["Type", "Weight"], kind="stable", ignore_index=True)
+        _CATALOGS[key] = out
+        if len(_CATALOGS) > _MAX_CACHED:
+            _CATALOGS.popitem(last=False)
+    else:
+        _CATALOGS.move_to_end(key)
+    return out.copy()
+
+
+def compose_pair(row_1: pd.Series, row_2: Optional[pd.Series] = None,
+                 arrangement: str = "back_to_back", gap: float = 0.0) -> pd.Series:
+    """หน้าตัดประกอบของตัวซีหนึ่งคู่ (row_2 = None คือตัวเดียวกันสองตัว)"""
+    rows = pd.DataFrame([row_1] if row_2 is None else [row_1, row_2]).reset_index(drop=True)
+    members = channel_members(rows)
+    index = np.array([0]), np.array([0 if row_2 is None else 1])
+    return compose_channels(members, *index, arrangement=arrangement, gap=gap).iloc[0]
+
+
+# ─────────────────────────────────────────────────────────────
+# ตัวแปลงตารางหน้าตัดประกอบ → section_data ของแต่ละ engine (คอลัมน์ array)
+# ─────────────────────────────────────────────────────────────
+def rafter_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """→ section_data ของ RafterDesign (d, bf, tf, tw เป็น ซม.; tw คือความหนาเอวรวม)"""
+    cols = {c: df[c].to_numpy(dtype=float) for c in ("h", "b", "tf", "tw")}
+    out = {"d": cols["h"] / 10.0, "bf": cols["b"] / 10.0, "tf": cols["tf"] / 10.0, "tw": cols["tw"] / 10.0}
+    out.update({k: df[k].to_numpy(dtype=float)
+                for k in ("Area", "Ix", "Zx", "Sx", "ry", "Weight", "Iy", "J", "h0", "rts") if k in df})
+    return out
+
+
+def beam_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """→ section_data ของ ColdFormedBeamDesign (Aw คือพื้นที่เอวทั้งสองตัว)"""
+    return {k: df[k].to_numpy(dtype=float) for k in ("Zx", "Ix", "Area", "Aw", "Weight") if k in df}
+
+
+def compression_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """→ ฟิลด์หน้าตัดของ CompressionDesign (Ag ซม.², rx / ry ซม., h / bf / tw / tf มม.)"""
+    out = {"Ag": df["Area"].to_numpy(dtype=float)}
+    out.update({k: df[k].to_numpy(dtype=float) for k in ("rx", "ry", "h", "tw", "tf")})
+    out["bf"] = df["b"].to_numpy(dtype=float)
+    return out
+
+
+def section_data(row: pd.Series, engine: str) -> Dict[str, float]:
+    """แถวหน้าตัดประกอบ → section_data ของ 'rafter', 'beam' หรือ 'compression' (ค่า float)"""
+    converters = {"rafter": rafter_columns, "beam": beam_columns, "compression": compression_columns}
+    if engine not in converters:
+        raise ValueError(f"หน้าตัดประกอบรองรับ engine: {', '.join(converters)}")
+    data = {k: float(v[0]) for k, v in converters[engine](pd.DataFrame([row])).items()}
+    if engine == "compression":
+        data["section_name"] = str(row.get("Section", ""))
+    else:
+        data["name"] = str(row.get("Section", ""))
+    return data
@@ -0,0 +1,166 @@
+"""
+catalog_index.py
+ดัชนีสำหรับค้นหา/กรองตารางหน้าตัด (มอก. 1227, มอก. 1228 และตารางจากผู้ผลิตอื่น)
+
+สร้างครั้งเดียวต่อตาราง: เรียงลำดับคอลัมน์ตัวเลข (h, Weight, Zx, Ix) ไว้ล่วงหน้า
+และจัดกลุ่มตำแหน่งแถวตามชนิดหน้าตัด (Type) — การกรองช่วงค่าตอบด้วย binary search
+(np.searchsorted) และการกรองชนิดใช้กลุ่มที่คำนวณไว้ แทนการสร้าง boolean mask ทั้งตารางทุกรอบ
+
+    index = CatalogIndex(df)
+    index.groups()                              # ['HN', 'HM', 'HW', 'I']
+    index.values("h", types="HN")               # ค่าความลึกที่มี (สำหรับ select_slider)
+    index.query(types="HN", h=(150, 300))       # DataFrame ตามลำดับเดิมของตาราง
+    index.row("HN-200x100x5.5x8")               # แถวของหน้าตัด (แถวแรกถ้าชื่อซ้ำ)
+
+ในหน้า Streamlit เก็บดัชนีด้วย st.cache_resource (อ่านอย่างเดียว ไม่ต้องคัดลอกทุกรอบ)
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+SORT_KEYS = ("h", "Weight", "Zx", "Ix")
+GROUP_KEY = "Type"
+
+Types = Optional[Union[str, Iterable[str]]]
+
+
+class CatalogIndex:
+    """
+    ดัชนีอ่านอย่างเดียวของตารางหน้าตัด
+
+    Attributes:
+        frame: ตารางต้นฉบับ (ไม่คัดลอก — ห้ามแก้ไขหลังสร้างดัชนี)
+        keys: คอลัมน์ตัวเลขที่มีดัชนีเรียงลำดับ
+    """
+
+    def __init__(self, df: pd.DataFrame, keys: Iterable[str] = SORT_KEYS, group: str = GROUP_KEY) -> None:
+        self.frame = df
+        self.group = group
+        self.keys = tuple(k for k in keys if k in df and pd.api.types.is_numeric_dtype(df[k]))
+        self._values: Dict[str, np.ndarray] = {}
+        self._order: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        for key in self.keys:
+            values = df[key].to_numpy(dtype=float)
+            order = np.argsort(values, kind="stable")
+            order = order[~np.isnan(values[order])]  # NaN ไม่อยู่ในช่วงใด
+            self._values[key] = values
+            self._order[key] = order
+            self._sorted[key] = values[order]
+        # กลุ่มชนิดหน้าตัด: ชื่อกลุ่ม → ตำแหน่งแถว (เรียงตามลำดับในตาราง)
+        self._groups: Dict[str, np.ndarray] = {}
+        if group in df:
+            codes, labels = pd.factorize(df[group].astype(str))
+            order = np.argsort(codes, kind="stable")
+            splits = np.searchsorted(codes[order], np.arange(1, len(labels)))
+            for label, positions in zip(labels, np.split(order, splits)):
+                self._groups[str(label)] = positions
+        names = df["Section"].astype(str).to_numpy() if "Section" in df else np.array([], dtype=str)
+        self._names = names
+        self._positions: Dict[str, int] = {}
+        for position, name in enumerate(names):
+            self._positions.setdefault(name, position)
+        self._distinct: Dict[Tuple, list] = {}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    # ── กลุ่มและค่าที่มี ────────────────────────────────────
+    def groups(self, preferred: Iterable[str] = ()) -> List[str]:
+        """ชนิดหน้าตัดที่มีในตาราง — เรียงตาม preferred ก่อน แล้วตามลำดับที่พบในตาราง"""
+        preferred = [g for g in preferred if g in self._groups]
+        return preferred + [g for g in self._groups if g not in preferred]
+
+    def names(self, types: Types = None, **ranges: Tuple[float, float]) -> List[str]:
+        """ชื่อหน้าตัด (ไม่ซ้ำ ตามลำดับในตาราง) ที่ตรงเงื่อนไข — ใช้เป็นตัวเลือกของ selectbox"""
+        return list(dict.fromkeys(self._names[self.positions(types, **ranges)]))
+
+    def values(self, key: str, types: Types = None) -> list:
+        """ค่าไม่ซ้ำที่เรียงแล้วของคอลัมน์ key (ในชนิดที่เลือก) สำหรับ select_slider"""
+        types = self._types(types)
+        cache_key = (key, types)
+        if cache_key not in self._distinct:
+            self._require(key)
+            if types is None:
+                distinct = np.unique(self._sorted[key])
+            else:
+                values = self._values[key][self._group_positions(types)]
+                distinct = np.unique(values[~np.isnan(values)])
+            # คงชนิดข้อมูลเดิมของคอลัมน์ (เช่น h เป็น int) เพื่อให้ตรงกับค่าใน session_state
+            self._distinct[cache_key] = distinct.astype(self.frame[key].dtype, copy=False).tolist()
+        return self._distinct[cache_key]
+
+    def bounds(self, key: str, types: Types = None) -> Tuple[float, float]:
+        """(ค่าต่ำสุด, ค่าสูงสุด) ของคอลัมน์ key"""
+        distinct = self.values(key, types)
+        if not distinct:
+            raise ValueError(f"ไม่มีค่า {key} ในตารางหน้าตัด")
+        return distinct[0], distinct[-1]
+
+    # ── การค้นหา ─────────────────────────────────────────────
+    def positions(self, types: Types = None, **ranges: Tuple[float, float]) -> np.ndarray:
+        """
+        ตำแหน่งแถว (เรียงตามลำดับในตาราง) ที่อยู่ในชนิด types และทุกช่วง lo ≤ ค่า ≤ hi
+
+        ช่วงที่แคบที่สุด (นับจาก binary search) เป็นผู้สมัครตั้งต้น
+        เงื่อนไขที่เหลือตรวจเฉพาะแถวผู้สมัคร
+        """
+        spans = []
+        for key, (lo, hi) in ranges.items():
+            self._require(key)
+            sorted_values = self._sorted[key]
+            start = int(np.searchsorted(sorted_values, lo, side="left"))
+            stop = int(np.searchsorted(sorted_values, hi, side="right"))
+            spans.append((max(stop - start, 0), key, start, stop))
+        spans.sort()
+        types = self._types(types)
+        group = self._group_positions(types) if types is not None else None
+
+        if spans and (group is None or spans[0][0] <= len(group)):
+            _, key, start, stop = spans.pop(0)
+            candidates = self._order[key][start:stop]
+            if group is not None:
+                candidates = candidates[np.isin(candidates, group, assume_unique=True)]
+        elif group is not None:
+            candidates = group
+        else:
+            return np.arange(len(self.frame))
+        for _, key, _, _ in spans:
+            lo, hi = ranges[key]
+            values = self._values[key][candidates]
+            candidates = candidates[(values >= lo) & (values <= hi)]
+        return np.sort(candidates)
+
+    def query(self, types: Types = None, **ranges: Tuple[float, float]) -> pd.DataFrame:
+        """แถวที่ตรงเงื่อนไขตามลำดับเดิมของตาราง (ดู positions)"""
+        return self.frame.iloc[self.positions(types, **ranges)]
+
+    def row(self, section: str) -> pd.Series:
+        """แถวของหน้าตัดชื่อ section (แถวแรกถ้ามีชื่อซ้ำ)"""
+        position = self._positions.get(str(section))
+        if position is None:
+            raise ValueError(f"ไม่พบหน้าตัด '{section}' ในตาราง")
+        return self.frame.iloc[position]
+
+    # ── ภายใน ────────────────────────────────────────────────
+    def _require(self, key: str) -> None:
+        if key not in self._order:
+            raise ValueError(f"ไม่มีดัชนีของคอลัมน์ '{key}' (มี: {', '.join(self.keys) or '-'})")
+
+    @staticmethod
+    def _types(types: Types) -> Optional[Tuple[str, ...]]:
+        if types is None:
+            return None
+        if isinstance(types, str):
+            return (types,)
+        return tuple(sorted(set(map(str, types))))
+
+    def _group_positions(self, types: Tuple[str, ...]) -> np.ndarray:
+        parts = [self._groups[t] for t in types if t in self._groups]
+        if not parts:
+            return np.array([], dtype=np.intp)
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
@@ -0,0 +1,477 @@
+"""
+catalog_store.py
+นำเข้าตารางหน้าตัดจากผู้ผลิต (CSV / XLSX) และเก็บเป็น shard ตามตระกูลหน้าตัดและช่วงความลึก
+
+ขั้นตอน:
+  1. read_vendor_tables — อ่านไฟล์ (แยกตารางตาม sheet ของ XLSX) หาแถวหัวตารางเอง (ข้ามแถวชื่อบริษัท/หมายเหตุ)
+  2. normalize — จับคู่ชื่อคอลัมน์ (COLUMN_ALIASES) แปลงหน่วยจากหัวคอลัมน์ เช่น "Ix (mm⁴)" → cm⁴
+     แยกตระกูล (C, Z, Hat, H) จากคอลัมน์ Type หรือชื่อหน้าตัด แล้วจัดรูปเป็น schema เดียวกับ
+     load_data / tis_1228_steel.csv (ขึ้นรูปเย็น) หรือ tis_1227_steel.csv (รีดร้อน)
+  3. CatalogStore.ingest — แบ่งแถวเป็น shard catalogs/<ตระกูล>/<ตระกูล>_<ช่วง h>.csv
+     เขียนเฉพาะ shard ที่เปลี่ยน และบันทึก manifest.json (ช่วง h / น้ำหนัก / ผู้ผลิตของแต่ละ shard)
+
+หน้าเพจโหลดเฉพาะตระกูลที่ใช้ (extend_catalog) และ CatalogStore.load เลือก shard จาก manifest
+ตามช่วงความลึกโดยไม่ต้องเปิดไฟล์อื่น — shard ที่อ่านแล้วเก็บใน cache จำกัดจำนวนแถว
+
+    python catalog_store.py ingest vendor_c.xlsx --vendor "ACME Steel"
+    python catalog_store.py list
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_ROOT = "catalogs"
+MANIFEST = "manifest.json"
+
+# ขอบเขตช่วงความลึก h (mm) ของ shard: [0, 100), [100, 150), ..., [600, ∞)
+DEPTH_BANDS = (100, 150, 200, 300, 400, 600)
+
+FAMILIES = ("C", "Z", "Hat", "H")
+COLD_FORMED = ("C", "Z", "Hat")
+
+# schema ปลายทางของแต่ละตระกูล (ลำดับคอลัมน์) และคอลัมน์ที่ต้องมี
+COLD_FORMED_COLUMNS = ("Section", "Type", "Weight", "Ix", "Sx", "Zx", "Iy", "Sy", "Area", "h", "b", "c", "t")
+HOT_ROLLED_COLUMNS = ("Section", "Type", "Weight", "Area", "Ix", "Iy", "Sx", "Zx", "rx", "ry",
+                      "h", "b", "tw", "tf", "J", "h0", "Cw", "rts")
+REQUIRED = {
+    "cold": ("Section", "Weight", "Ix", "Zx", "Area", "h", "t"),  # เหมือน data_utils.load_data
+    "hot": ("Section", "Weight", "Area", "Ix", "Iy", "Sx", "Zx", "ry", "h", "b", "tw", "tf"),
+}
+
+# ชื่อหัวคอลัมน์ของผู้ผลิต (ตัวพิมพ์เล็ก ไม่มีช่องว่าง/หน่วย) → ชื่อมาตรฐาน
+COLUMN_ALIASES = {
+    "Section": ("section", "designation", "profile", "name", "size", "หน้าตัด", "ขนาด"),
+    "Type": ("type", "shape", "family", "ชนิด"),
+    "Weight": ("weight", "mass", "wt", "unitweight", "น้ำหนัก"),
+    "Area": ("area", "a", "ag", "พื้นที่"),
+    "Ix": ("ix",), "Iy": ("iy",),
+    "Sx": ("sx", "wx", "wel,x", "welx"), "Sy": ("sy", "wy", "wel,y", "wely"),
+    "Zx": ("zx", "wpl,x", "wplx"), "Zy": ("zy", "wpl,y", "wply"),
+    "rx": ("rx",), "ry": ("ry",),
+    "h": ("h", "d", "depth", "height", "ความลึก"),
+    "b": ("b", "bf", "width", "flange", "ความกว้าง"),
+    "c": ("c", "lip", "ขอบพับ"),
+    "t": ("t", "thickness", "ความหนา"),
+    "tw": ("tw", "t1", "web"), "tf": ("tf", "t2"),
+    "J": ("j", "it"), "Cw": ("cw", "iw"),
+}
+
+# หน่วยมาตรฐาน: ความยาวหน้าตัด mm, r cm, A cm², S/Z cm³, I/J cm⁴, Cw cm⁶, น้ำหนัก kg/m
+_LENGTH_MM = ("h", "b", "c", "t", "tw", "tf")
+_UNIT_FACTORS = {
+    "mm": {"mm": 1.0, "cm": 10.0, "m": 1000.0, "in": 25.4},
+    "cm": {"mm": 0.1, "cm": 1.0, "m": 100.0, "in": 2.54},
+    "cm2": {"mm2": 1e-2, "cm2": 1.0, "m2": 1e4, "in2": 6.4516},
+    "cm3": {"mm3": 1e-3, "cm3": 1.0, "in3": 16.387064},
+    "cm4": {"mm4": 1e-4, "cm4": 1.0, "in4": 41.623143},
+    "cm6": {"mm6": 1e-6, "cm6": 1.0},
+    "kg/m": {"kg/m": 1.0, "n/m": 1 / 9.80665, "kn/m": 1000 / 9.80665, "lb/ft": 1.488164},
+}
+_CANONICAL_UNIT = {
+    **{k: "mm" for k in _LENGTH_MM}, "rx": "cm", "ry": "cm", "Area": "cm2",
+    "Sx": "cm3", "Sy": "cm3", "Zx": "cm3", "Zy": "cm3",
+    "Ix": "cm4", "Iy": "cm4", "J": "cm4", "Cw": "cm6", "Weight": "kg/m",
+}
+_SUPERSCRIPTS = str.maketrans("²³⁴⁶", "2346")
+
+# ตระกูลจากคำนำหน้าชื่อหน้าตัด (ตรวจตามลำดับ)
+_FAMILY_PATTERNS = (
+    ("Hat", re.compile(r"^\s*(HAT|Ω|OMEGA)", re.IGNORECASE)),
+    ("H", re.compile(r"^\s*(HN|HM|HW|HP|H|I|W|UB|UC|IPE|HE[ABM]?)\s*[-_ ]?\d", re.IGNORECASE)),
+    ("Z", re.compile(r"^\s*(Z|LZ)\s*[-_ ]?\d", re.IGNORECASE)),
+    ("C", re.compile(r"^\s*(C|LC|CL|U)\s*[-_ ]?\d", re.IGNORECASE)),
+)
+_HOT_ROLLED_TYPES = ("HN", "HM", "HW", "I")
+
+
+# ─────────────────────────────────────────────────────────────
+# อ่านและจัดรูปตารางของผู้ผลิต
+# ─────────────────────────────────────────────────────────────
+def _header_key(label) -> Tuple[str, str]:
+    """แยกหัวคอลัมน์เป็น (ชื่อ, หน่วย) เช่น 'Ix (mm⁴)' → ('ix', 'mm4')"""
+    text = str(label).strip().translate(_SUPERSCRIPTS)
+    unit = ""
+    match = re.search(r"[\(\[]([^\)\]]*)[\)\]]", text)
+    if match:
+        unit = match.group(1).strip().lower().replace(" ", "").replace("^", "")
+        text = text[:match.start()] + text[match.end():]
+    name = re.sub(r"[\s_\.]+", "", text.lower())
+    return name, unit
+
+
+def _canonical(label) -> Optional[str]:
+    name, _ = _header_key(label)
+    for canonical, aliases in COLUMN_ALIASES.items():
+        if name == canonical.lower() or name in aliases:
+            return canonical
+    return None
+
+
+def _find_header(raw: pd.DataFrame) -> int:
+    """แถวแรกที่มีคอลัมน์ Section และคอลัมน์มาตรฐานอื่นอย่างน้อย 3 คอลัมน์"""
+    for i in range(min(len(raw), 50)):
+        found = {_canonical(v) for v in raw.iloc[i] if pd.notna(v)}
+        if "Section" in found and len(found - {None, "Section"}) >= 3:
+            return i
+    raise ValueError("ไม่พบแถวหัวตาราง (ต้องมีคอลัมน์ชื่อหน้าตัดและคุณสมบัติอย่างน้อย 3 คอลัมน์)")
+
+
+def read_vendor_tables(path: str) -> List[pd.DataFrame]:
+    """อ่านไฟล์ CSV / XLSX ของผู้ผลิตเป็นตารางดิบ (หัวคอลัมน์เดิม) หนึ่งตารางต่อ sheet ที่มีหัวตาราง"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm", ".xls"):
+        sheets = pd.read_excel(path, sheet_name=None, header=None, dtype=object)
+    elif ext in (".csv", ".txt"):
+        # แถวหมายเหตุก่อนหัวตารางมีจำนวนช่องไม่เท่ากัน — อ่านด้วย csv แล้วเติมช่องว่างเอง
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            text = f.read()
+        try:
+            dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        sheets = {"": pd.DataFrame(list(csv.reader(io.StringIO(text), dialect)), dtype=object)}
+    else:
+        raise ValueError(f"ไม่รองรับไฟล์ชนิด '{ext}' (ใช้ .csv หรือ .xlsx)")
+    tables = []
+    for name, raw in sheets.items():
+        try:
+            header = _find_header(raw)
+        except ValueError:
+            continue  # sheet หมายเหตุ / ปก
+        table = raw.iloc[header + 1:].reset_index(drop=True)
+        table.columns = [str(c).strip() for c in raw.iloc[header]]
+        tables.append(table.loc[:, [c for c in table.columns if c and c.lower() not in ("nan", "none")]])
+    if not tables:
+        raise ValueError(f"ไม่พบตารางหน้าตัดในไฟล์ {os.path.basename(path)}")
+    return tables
+
+
+def family_of(section: str, type_hint: str = "") -> Optional[str]:
+    """ตระกูลหน้าตัด (C, Z, Hat, H) จากชนิดที่ระบุหรือคำนำหน้าชื่อหน้าตัด"""
+    hint = str(type_hint or "").strip()
+    for family in FAMILIES:
+        if hint.lower() == family.lower():
+            return family
+    if hint.upper() in _HOT_ROLLED_TYPES:
+        return "H"
+    for family, pattern in _FAMILY_PATTERNS:
+        if pattern.match(str(section)):
+            return family
+    return None
+
+
+def normalize(raw: pd.DataFrame, vendor: str, family: Optional[str] = None) -> pd.DataFrame:
+    """
+    จัดรูปตารางของผู้ผลิตเป็น schema มาตรฐาน (หน่วยตาม tis_1227 / tis_1228) พร้อมคอลัมน์ Vendor, Family
+
+    Args:
+        raw: ตารางหนึ่งตารางจาก read_vendor_tables (หรือ DataFrame ที่มีหัวคอลัมน์แล้ว)
+        vendor: ชื่อผู้ผลิต
+        family: บังคับตระกูลทุกแถว (ถ้า None แยกจากคอลัมน์ Type / ชื่อหน้าตัด)
+
+    Raises:
+        ValueError: ไม่มีคอลัมน์ที่จำเป็น หรือแยกตระกูลหน้าตัดไม่ได้
+    """
+    if not str(vendor).strip():
+        raise ValueError("ต้องระบุชื่อผู้ผลิต")
+    if family is not None and family not in FAMILIES:
+        raise ValueError(f"ไม่รู้จักตระกูลหน้าตัด '{family}' (มี: {', '.join(FAMILIES)})")
+    data: Dict[str, pd.Series] = {}
+    for label in raw.columns:
+        canonical = _canonical(label)
+        if canonical is None or canonical in data:
+            continue
+        column = raw[label]
+        if canonical in ("Section", "Type"):
+            data[canonical] = column.astype(str).str.strip()
+            continue
+        _, unit = _header_key(label)
+        target = _CANONICAL_UNIT.get(canonical)
+        factor = 1.0
+        if unit and target:
+            factor = _UNIT_FACTORS[target].get(unit)
+            if factor is None:
+                raise ValueError(f"ไม่รู้จักหน่วย '{unit}' ของคอลัมน์ {label}")
+        text = column.astype(str).str.replace(",", "", regex=False).str.strip()
+        data[canonical] = pd.to_numeric(text, errors="coerce") * factor
+    if "Section" not in data:
+        raise ValueError("ไม่พบคอลัมน์ชื่อหน้าตัด (Section)")
+    df = pd.DataFrame(data)
+    df = df[df["Section"].notna() & ~df["Section"].isin(["", "nan", "None"])].reset_index(drop=True)
+
+    if family is not None:
+        families = pd.Series(family, index=df.index)
+    else:
+        hints = df["Type"] if "Type" in df else pd.Series("", index=df.index)
+        families = pd.Series([family_of(s, t) for s, t in zip(df["Section"], hints)], index=df.index)
+        unknown = df.loc[families.isna(), "Section"]
+        if len(unknown):
+            raise ValueError(f"แยกตระกูลหน้าตัดไม่ได้ {len(unknown)} แถว เช่น {', '.join(unknown.head(3))} "
+                             "— ระบุ family เอง")
+    df["Family"] = families.to_numpy()
+
+    # คุณสมบัติที่อนุมานได้
+    hot = df["Family"] == "H"
+    # ตาราง มอก. 1228 ใช้ Zx = Sx (โมดูลัสหน้าตัดยืดหยุ่น) — รีดร้อนต้องมีทั้งสองค่า
+    if "Zx" not in df and "Sx" in df:
+        df["Zx"] = df["Sx"].where(~hot)
+    if "Sx" not in df and "Zx" in df:
+        df["Sx"] = df["Zx"].where(~hot)
+    if "Weight" not in df and "Area" in df:
+        df["Weight"] = df["Area"] * 0.785  # ρ = 7,850 kg/m³
+    if "Area" in df:
+        for axis in ("x", "y"):
+            if f"r{axis}" not in df and f"I{axis}" in df:
+                df[f"r{axis}"] = np.sqrt(df[f"I{axis}"] / df["Area"])
+    if hot.any() and {"h", "b", "tw", "tf", "Iy", "Sx"} <= set(df):
+        # สูตรเดียวกับ generate_tis_hotrolled.py (J, h0 ซม., Cw ซม.⁶, rts ซม.)
+        if "J" not in df:
+            df["J"] = (2 * df["b"] * df["tf"] ** 3 + (df["h"] - 2 * df["tf"]) * df["tw"] ** 3) / 3 / 1e4
+        df["h0"] = (df["h"] - df["tf"]) / 10.0
+        if "Cw" not in df:
+            df["Cw"] = df["Iy"] * df["h0"] ** 2 / 4
+        df["rts"] = np.sqrt(np.sqrt(df["Iy"] * df["Cw"]) / df["Sx"])
+    if "Type" not in df:
+        df["Type"] = df["Family"]
+    prefix = df["Section"].str.extract(r"^\s*([A-Za-z]+)", expand=False).str.upper()
+    df.loc[hot, "Type"] = np.where(prefix[hot].isin(_HOT_ROLLED_TYPES), prefix[hot], "H")
+    df.loc[~hot, "Type"] = df.loc[~hot, "Family"]
+    df["Vendor"] = str(vendor).strip()
+
+    parts = []
+    for kind, fams, columns in (("cold", COLD_FORMED, COLD_FORMED_COLUMNS), ("hot", ("H",), HOT_ROLLED_COLUMNS)):
+        part = df[df["Family"].isin(fams)]
+        if part.empty:
+            continue
+        missing = [c for c in REQUIRED[kind] if c not in part]
+        if missing:
+            raise ValueError(f"ตารางหน้าตัด{'ขึ้นรูปเย็น' if kind == 'cold' else 'รีดร้อน'}ขาดคอลัมน์: "
+                             f"{', '.join(missing)}")
+        part = part.dropna(subset=list(REQUIRED[kind]))
+        parts.append(part[[c for c in columns if c in part] + ["Vendor", "Family"]])
+    if not parts:
+        raise ValueError("ไม่มีแถวหน้าตัดที่ใช้ได้")
+    return pd.concat(parts, ignore_index=True).drop_duplicates("Section", keep="last")
+
+
+# ─────────────────────────────────────────────────────────────
+# ที่เก็บแบบ shard
+# ─────────────────────────────────────────────────────────────
+def depth_band(h) -> Tuple[int, Optional[int]]:
+    """ช่วงความลึก (lo, hi) ของ h (mm) — hi = None คือไม่มีขอบบน"""
+    i = int(np.searchsorted(DEPTH_BANDS, float(h), side="right"))
+    lo = 0 if i == 0 else DEPTH_BANDS[i - 1]
+    return lo, DEPTH_BANDS[i] if i < len(DEPTH_BANDS) else None
+
+
+class CatalogStore:
+    """
+    ตารางหน้าตัดจากผู้ผลิตแบบ shard (ตระกูล × ช่วงความลึก) บนดิสก์
+
+    Args:
+        root: โฟลเดอร์ที่เก็บ (manifest.json + <ตระกูล>/*.csv)
+        cache_rows: จำนวนแถวสูงสุดของ shard ที่เก็บไว้ในหน่วยความจำ
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT, cache_rows: int = 200_000) -> None:
+        self.root = root
+        self.cache_rows = int(cache_rows)
+        self._cache: "OrderedDict[Tuple[str, int], pd.DataFrame]" = OrderedDict()
+        self._cached_rows = 0
+
+    # ── manifest ─────────────────────────────────────────────
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def shards(self, family: Optional[str] = None) -> List[dict]:
+        """รายการ shard จาก manifest (ไม่เปิดไฟล์ shard)"""
+        if not self.exists():
+            return []
+        with open(self.manifest_path, encoding="utf-8") as f:
+            shards = json.load(f).get("shards", [])
+        return [s for s in shards if family is None or s["family"] == family]
+
+    def summary(self) -> pd.DataFrame:
+        """ตารางสรุป shard: ตระกูล ช่วงความลึก จำนวนแถว และผู้ผลิต"""
+        rows = [{"Family": s["family"], "Band": f"{s['band'][0]}–{s['band'][1] or '∞'}", "Rows": s["rows"],
+                 "h_min": s["h_min"], "h_max": s["h_max"], "Vendors": ", ".join(s["vendors"])}
+                for s in self.shards()]
+        return pd.DataFrame(rows, columns=["Family", "Band", "Rows", "h_min", "h_max", "Vendors"])
+
+    def _write_manifest(self, shards: List[dict]) -> None:
+        shards = sorted(shards, key=lambda s: (FAMILIES.index(s["family"]), s["band"][0]))
+        self._atomic_write(self.manifest_path,
+                           lambda f: json.dump({"version": 1, "bands": DEPTH_BANDS, "shards": shards},
+                                               f, ensure_ascii=False, indent=1))
+
+    @staticmethod
+    def _atomic_write(path: str, write) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    # ── เขียน ───────────────────────────────────────────────
+    def ingest(self, tables: Iterable[Union[str, pd.DataFrame]], vendor: str,
+               family: Optional[str] = None, replace: bool = True) -> pd.DataFrame:
+        """
+        นำเข้าตารางของผู้ผลิตหนึ่งราย (ไฟล์หรือ DataFrame หลายตาราง)
+
+        replace=True แทนที่หน้าตัดเดิมทั้งหมดของผู้ผลิตนี้ (นำเข้าแคตตาล็อกฉบับใหม่)
+        คืน summary() หลังนำเข้า
+        """
+        raws = [raw for t in tables for raw in (read_vendor_tables(t) if isinstance(t, str) else [t])]
+        frames = [normalize(raw, vendor, family) for raw in raws]
+        new = pd.concat(frames, ignore_index=True).drop_duplicates("Section", keep="last")
+        vendor = new["Vendor"].iloc[0]
+        bands = new["h"].map(depth_band)
+        band_lo = bands.map(lambda b: b[0])
+
+        shards = {(s["family"], s["band"][0]): s for s in self.shards()}
+        touched = {(f, b[0]): b for f, b in zip(new["Family"], bands)}
+        if replace:
+            touched.update({key: tuple(s["band"]) for key, s in shards.items() if vendor in s["vendors"]})
+        for (fam, lo), band in touched.items():
+            entry = shards.get((fam, lo))
+            current = self._read(entry["path"]) if entry else pd.DataFrame()
+            if replace and not current.empty:
+                current = current[current["Vendor"] != vendor]
+            incoming = new[(new["Family"] == fam) & (band_lo == lo)]
+            merged = pd.concat([current, incoming], ignore_index=True)
+            merged = merged.drop_duplicates(["Vendor", "Section"], keep="last").sort_values(["h", "Weight"])
+            path = entry["path"] if entry else os.path.join(fam, f"{fam}_{lo}-{band[1] or 'up'}.csv")
+            if merged.empty:
+                if entry:
+                    os.remove(os.path.join(self.root, path))
+                shards.pop((fam, lo), None)
+                continue
+            columns = [c for c in (HOT_ROLLED_COLUMNS if fam == "H" else COLD_FORMED_COLUMNS) if c in merged]
+            merged = merged[columns + ["Vendor", "Family"]]
+            self._atomic_write(os.path.join(self.root, path), lambda f: merged.to_csv(f, index=False))
+            shards[(fam, lo)] = {
+                "family": fam, "band": [lo, band[1]], "path": path.replace(os.sep, "/"), "rows": len(merged),
+                "h_min": float(merged["h"].min()), "h_max": float(merged["h"].max()),
+                "weight_min": float(merged["Weight"].min()), "weight_max": float(merged["Weight"].max()),
+                "vendors": sorted(merged["Vendor"].unique().tolist()),
+            }
+        self._write_manifest(list(shards.values()))
+        return self.summary()
+
+    # ── อ่าน ─────────────────────────────────────────────────
+    def _read(self, path: str) -> pd.DataFrame:
+        full = os.path.join(self.root, path)
+        key = (full, os.stat(full).st_mtime_ns)
+        df = self._cache.get(key)
+        if df is not None:
+            self._cache.move_to_end(key)
+            return df
+        df = pd.read_csv(full)
+        self._cache[key] = df
+        self._cached_rows += len(df)
+        while self._cached_rows > self.cache_rows and len(self._cache) > 1:
+            _, old = self._cache.popitem(last=False)
+            self._cached_rows -= len(old)
+        return df
+
+    def load(self, families: Union[str, Sequence[str]], h: Optional[Tuple[float, float]] = None,
+             vendors: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        หน้าตัดของตระกูลที่เลือก — อ่านเฉพาะ shard ที่ช่วง h ใน manifest ซ้อนกับช่วงที่ขอ
+
+        Args:
+            families: ตระกูลเดียวหรือหลายตระกูล เช่น "C" หรือ ("C", "Z")
+            h: ช่วงความลึก (lo, hi) mm — None = ทุกความลึก
+            vendors: จำกัดผู้ผลิต — None = ทุกราย
+        """
+        families = (families,) if isinstance(families, str) else tuple(families)
+        frames = []
+        for shard in self.shards():
+            if shard["family"] not in families:
+                continue
+            if h is not None and (shard["h_max"] < h[0] or shard["h_min"] > h[1]):
+                continue
+            if vendors is not None and not set(vendors) & set(shard["vendors"]):
+                continue
+            df = self._read(shard["path"])
+            if h is not None:
+                df = df[(df["h"] >= h[0]) & (df["h"] <= h[1])]
+            if vendors is not None:
+                df = df[df["Vendor"].isin(vendors)]
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+
+def extend_catalog(base: pd.DataFrame, families: Union[str, Sequence[str]],
+                   root: str = DEFAULT_ROOT) -> pd.DataFrame:
+    """
+    ต่อหน้าตัดจากผู้ผลิต (ตระกูลที่หน้าเพจใช้) ท้ายตารางมาตรฐาน — ไม่มีที่เก็บ = คืน base เดิม
+
+    หน้าตัดที่ชื่อซ้ำกับตารางเดิมต่อท้ายชื่อด้วยชื่อผู้ผลิต เช่น "C-100x50x20x2.3 (ACME)"
+    """
+    store = CatalogStore(root)
+    if not store.exists():
+        return base
+    extra = store.load(families)
+    if extra.empty:
+        return base
+    extra = extra.copy()
+    taken = set(base["Section"].astype(str)) if "Section" in base else set()
+    clash = extra["Section"].astype(str).isin(taken) | extra["Section"].duplicated(keep=False)
+    extra.loc[clash, "Section"] = extra.loc[clash, "Section"] + " (" + extra.loc[clash, "Vendor"] + ")"
+    return pd.concat([base, extra[[c for c in extra.columns if c != "Family"]]], ignore_index=True)
+
+
+# ─────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="นำเข้าตารางหน้าตัดของผู้ผลิตเป็น shard")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="โฟลเดอร์ที่เก็บ")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="นำเข้าไฟล์ CSV / XLSX")
+    ingest.add_argument("files", nargs="+")
+    ingest.add_argument("--vendor", required=True)
+    ingest.add_argument("--family", choices=FAMILIES, default=None)
+    ingest.add_argument("--append", action="store_true", help="ไม่ลบหน้าตัดเดิมของผู้ผลิตนี้")
+    sub.add_parser("list", help="แสดง shard ทั้งหมด")
+    args = parser.parse_args(argv)
+
+    store = CatalogStore(args.root)
+    try:
+        if args.command == "ingest":
+            summary = store.ingest(args.files, args.vendor, args.family, replace=not args.append)
+        else:
+            summary = store.summary()
+    except ValueError as err:
+        print(f"ผิดพลาด: {err}", file=sys.stderr)
+        return 1
+    print(summary.to_string(index=False) if not summary.empty else "ยังไม่มีข้อมูล")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,7 +16,9 @@ import math
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
-from design_logging import CalculationLogMixin
+import numpy as np
+
+from design_logging import CalculationLogMixin, CapacityCache, traced
 
 
 def _pos(name: str, value: float) -> float:
@@ -25,6 +27,9 @@ def _pos(name: str, value: float) -> float:
     return float(value)
 
 
+_CAPACITY_CACHE = CapacityCache("CompressionDesign")
+
+
 @dataclass
 class CompressionDesign(CalculationLogMixin):
     """
@@ -69,10 +74,59 @@ class CompressionDesign(CalculationLogMixin):
     steps: List[Dict[str, Any]] = field(default_factory=list)
 
     # ------------------------------------------------------------------
+    @traced
     def run_design(self) -> Dict[str, Any]:
-        """คำนวณและตรวจสอบกำลังรับแรงอัด — คืนค่า dict ผลลัพธ์ครบถ้วน"""
+        """
+        คำนวณและตรวจสอบกำลังรับแรงอัด — คืนค่า dict ผลลัพธ์ครบถ้วน
+
+        เฟสกำลังรับ (KL/r, Q, Fcr, φcPn) มาจาก _CAPACITY_CACHE ตามหน้าตัด วัสดุ และความยาวไม่ค้ำยัน
+        เปลี่ยนเฉพาะ Pu จึงคำนวณเฉพาะขั้นตอนตรวจสอบ
+        """
         self.reset_steps()
+        capacity, steps = _CAPACITY_CACHE.get(self.capacity_key(), self._capacity)
+        self.extend_steps(steps)
+        Pu = max(self.Pu, 0.0)
+        phi_Pn = capacity["Capacity"]["phi_Pn"]
+
+        # ══════════════════════════════════════════════════════════════
+        # 6. ตรวจสอบ Pu ≤ φcPn
+        # ══════════════════════════════════════════════════════════════
+        ratio = Pu / phi_Pn if phi_Pn > 0 else 999.0
+        comp_pass = ratio <= 1.0
+
+        self.add_step(
+            "ตรวจสอบความปลอดภัย Pu ≤ φcPn (Compression Check)",
+            r"\frac{P_u}{\phi_c P_n} \leq 1.0",
+            rf"\frac{{{Pu:,.2f}}}{{{phi_Pn:,.2f}}} = {ratio:.4f}",
+            rf"{ratio:.4f} \;{'\\leq' if comp_pass else '>'}\; 1.0 "
+            rf"\;\Rightarrow\; \text{{{'PASS ✓' if comp_pass else 'FAIL ✗'}}}",
+            status="PASS" if comp_pass else "FAIL",
+            note="AISC 360-16 Chapter E: ต้องการ Pu ≤ φcPn",
+        )
+
+        # ══════════════════════════════════════════════════════════════
+        # Return
+        # ══════════════════════════════════════════════════════════════
+        return {
+            **capacity,
+            "Demand": {"Pu": Pu},
+            "Ratio":  ratio,
+            "Status": comp_pass,          # True = ผ่าน
+            "SlendernessOK": capacity["Slenderness"]["OK"],
+            "Steps":  self.steps,
+        }
+
+    def capacity_key(self) -> tuple:
+        """อินพุตทั้งหมดของเฟสกำลังรับ (ทุกฟิลด์ยกเว้น Pu และชื่อหน้าตัด)"""
+        return (self.Ag, self.rx, self.ry, self.h, self.bf, self.tw, self.tf, self.Fy, self.E,
+                self.Lx, self.Ly, self.Kx, self.Ky)
+
+    def capacity(self) -> Dict[str, Any]:
+        """ผลของเฟสกำลังรับ (Slenderness, LocalBuckling, Buckling, Capacity) จาก cache"""
+        return _CAPACITY_CACHE.get(self.capacity_key(), self._capacity)[0]
 
+    def _capacity(self, log: CalculationLogMixin) -> Dict[str, Any]:
+        """เฟสกำลังรับ: ความชะลูด, local buckling (Q = Qs × Qa), Fe, Fcr และ φcPn"""
         Fy  = _pos("Fy", self.Fy)
         E   = _pos("E",  self.E)
         Ag  = _pos("Ag", self.Ag)
@@ -81,7 +135,6 @@ class CompressionDesign(CalculationLogMixin):
         Lx_cm = self.Lx * 100.0
         Ly_cm = self.Ly * 100.0
         Kx, Ky = self.Kx, self.Ky
-        Pu = max(self.Pu, 0.0)
         phi_c = 0.90
 
         # ══════════════════════════════════════════════════════════════
@@ -93,7 +146,7 @@ class CompressionDesign(CalculationLogMixin):
         gov_axis = "x-x" if KLx_rx >= KLy_ry else "y-y"
         slenderness_ok = KL_r <= 200.0
 
-        self.add_step(
+        log.add_step(
             "อัตราส่วนความชะลูดประสิทธิผล KL/r",
             r"\frac{KL}{r} = \max\!\left(\frac{K_x L_x}{r_x},\;\frac{K_y L_y}{r_y}\right)",
             (
@@ -125,7 +178,7 @@ class CompressionDesign(CalculationLogMixin):
             flange_ok = lam_f <= lam_rf
 
             _f_cmp = r"\leq" if flange_ok else ">"
-            self.add_step(
+            log.add_step(
                 "ตรวจสอบ Local Buckling ปีก (Flange, Unstiffened)",
                 r"\lambda_f = \frac{b_f}{2t_f},\quad \lambda_{rf} = 0.56\sqrt{\frac{E}{F_y}}",
                 (
@@ -148,7 +201,7 @@ class CompressionDesign(CalculationLogMixin):
                     Qs = 0.69 * E / (Fy * lam_f ** 2)
                     qs_expr = rf"Q_s = \frac{{0.69E}}{{F_y\lambda_f^2}} = \frac{{0.69\times{E:.3e}}}{{{Fy:.0f}\times{lam_f:.3f}^2}}"
                 Qs = max(Qs, 0.0)
-                self.add_step(
+                log.add_step(
                     "ตัวคูณลดกำลังปีกชะลูด Qs (AISC 360-16 Sec. E7.1a)",
                     r"Q_s = \begin{cases}1.415-0.74\lambda\sqrt{F_y/E} & 0.56<\lambda\leq 1.03\sqrt{E/F_y}\\"
                     r"\dfrac{0.69E}{F_y\lambda^2} & \lambda>1.03\sqrt{E/F_y}\end{cases}",
@@ -165,7 +218,7 @@ class CompressionDesign(CalculationLogMixin):
             lam_rw  = 1.49 * math.sqrt(E / Fy)
             web_ok  = lam_w <= lam_rw
 
-            self.add_step(
+            log.add_step(
                 "ตรวจสอบ Local Buckling แผ่นเอว (Web, Stiffened)",
                 r"\lambda_w = \frac{h}{t_w},\quad \lambda_{rw} = 1.49\sqrt{\frac{E}{F_y}}",
                 (
@@ -192,7 +245,7 @@ class CompressionDesign(CalculationLogMixin):
                 A_eff = max(A_eff, 0.0)
                 Qa = A_eff / Ag if Ag > 0 else 1.0
 
-                self.add_step(
+                log.add_step(
                     "ตัวคูณลดกำลังเอวชะลูด Qa (AISC 360-16 Sec. E7.2a)",
                     r"b_e = 1.92t\sqrt{\frac{E}{f}}\!\left[1-\frac{0.34}{(b/t)\sqrt{E/f}}\right]\leq b"
                     r",\quad Q_a = \frac{A_{eff}}{A_g}",
@@ -210,7 +263,7 @@ class CompressionDesign(CalculationLogMixin):
 
         Q = Qs * Qa
         if has_dim and Q < 1.0:
-            self.add_step(
+            log.add_step(
                 "ตัวคูณลดกำลังรวม Q = Qs × Qa",
                 r"Q = Q_s \times Q_a",
                 rf"= {Qs:.4f} \times {Qa:.4f}",
@@ -229,7 +282,7 @@ class CompressionDesign(CalculationLogMixin):
         # 3. หน่วยแรงโก่งเดาะยืดหยุ่น Fe
         # ══════════════════════════════════════════════════════════════
         Fe = (math.pi ** 2 * E) / (KL_r ** 2)
-        self.add_step(
+        log.add_step(
             "หน่วยแรงโก่งเดาะยืดหยุ่น Fe (Elastic Critical Stress)",
             r"F_e = \frac{\pi^2 E}{(KL/r)^2}",
             rf"= \frac{{\pi^2 \times {E:.4e}}}{{{KL_r:.3f}^2}}",
@@ -247,7 +300,7 @@ class CompressionDesign(CalculationLogMixin):
             # Inelastic buckling (AISC E7-2 / E3-2)
             Fcr = Q * (0.658 ** (Q * Fy / Fe)) * Fy
             mode = "Inelastic Buckling (โก่งเดาะแบบอไนลาสติก)"
-            self.add_step(
+            log.add_step(
                 "หน่วยแรงวิกฤติ Fcr — Inelastic Buckling",
                 r"F_{cr} = Q\!\left[0.658^{QF_y/F_e}\right]\!F_y",
                 rf"= {Q:.4f}\!\left[0.658^{{{Q:.4f}\times{Fy:.0f}/{Fe:.3f}}}\right]\!\times{Fy:.0f}",
@@ -261,7 +314,7 @@ class CompressionDesign(CalculationLogMixin):
             # Elastic buckling (AISC E7-3 / E3-3)
             Fcr = 0.877 * Fe
             mode = "Elastic Buckling (โก่งเดาะแบบยืดหยุ่น)"
-            self.add_step(
+            log.add_step(
                 "หน่วยแรงวิกฤติ Fcr — Elastic Buckling",
                 r"F_{cr} = 0.877\,F_e",
                 rf"= 0.877 \times {Fe:.2f}",
@@ -278,14 +331,14 @@ class CompressionDesign(CalculationLogMixin):
         Pn     = Fcr * Ag        # kg
         phi_Pn = phi_c * Pn      # kg
 
-        self.add_step(
+        log.add_step(
             "กำลังรับแรงอัดตามชื่อ Pn",
             r"P_n = F_{cr} \times A_g",
             rf"= {Fcr:.3f} \times {Ag:.4f}",
             rf"= {Pn:.2f}\;\text{{kg}}",
             note="Nominal Compressive Strength (AISC 360-16 Sec. E7)",
         )
-        self.add_step(
+        log.add_step(
             "กำลังรับแรงอัดออกแบบ φcPn",
             r"\phi_c P_n = 0.90 \times P_n",
             rf"= 0.90 \times {Pn:.2f}",
@@ -293,25 +346,6 @@ class CompressionDesign(CalculationLogMixin):
             note="φc = 0.90 ตาม AISC 360-16 Section E1 (LRFD)",
         )
 
-        # ══════════════════════════════════════════════════════════════
-        # 6. ตรวจสอบ Pu ≤ φcPn
-        # ══════════════════════════════════════════════════════════════
-        ratio = Pu / phi_Pn if phi_Pn > 0 else 999.0
-        comp_pass = ratio <= 1.0
-
-        self.add_step(
-            "ตรวจสอบความปลอดภัย Pu ≤ φcPn (Compression Check)",
-            r"\frac{P_u}{\phi_c P_n} \leq 1.0",
-            rf"\frac{{{Pu:,.2f}}}{{{phi_Pn:,.2f}}} = {ratio:.4f}",
-            rf"{ratio:.4f} \;{'\\leq' if comp_pass else '>'}\; 1.0 "
-            rf"\;\Rightarrow\; \text{{{'PASS ✓' if comp_pass else 'FAIL ✗'}}}",
-            status="PASS" if comp_pass else "FAIL",
-            note="AISC 360-16 Chapter E: ต้องการ Pu ≤ φcPn",
-        )
-
-        # ══════════════════════════════════════════════════════════════
-        # Return
-        # ══════════════════════════════════════════════════════════════
         return {
             "Slenderness": {
                 "KLx_rx": KLx_rx,
@@ -338,9 +372,69 @@ class CompressionDesign(CalculationLogMixin):
                 "phi_Pn": phi_Pn,
                 "phi_c":  phi_c,
             },
-            "Demand": {"Pu": Pu},
-            "Ratio":  ratio,
-            "Status": comp_pass,          # True = ผ่าน
-            "SlendernessOK": slenderness_ok,
-            "Steps":  self.steps,
         }
+
+
+# ─────────────────────────────────────────────────────────────
+# ตรวจสอบแบบเวกเตอร์ (ไม่บันทึกขั้นตอน)
+# ─────────────────────────────────────────────────────────────
+def batch_checks(*, Ag, rx, ry, Pu, Lx=3.0, Ly=3.0, Kx=1.0, Ky=1.0, h=0.0, bf=0.0, tw=0.0, tf=0.0,
+                 Fy=2500.0, E=2.04e6) -> Dict[str, np.ndarray]:
+    """
+    CompressionDesign.run_design แบบ NumPy broadcasting — สูตรเดียวกันทุกขั้น
+    ทุกอาร์กิวเมนต์รับค่าเดี่ยวหรือ array (หน่วยเดียวกับฟิลด์ของ CompressionDesign)
+    """
+    Ag, rx, ry, Pu, Lx, Ly, Kx, Ky, h, bf, tw, tf, Fy, E = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (Ag, rx, ry, Pu, Lx, Ly, Kx, Ky, h, bf, tw, tf, Fy, E))
+    )
+    if np.any(Ag <= 0) or np.any(rx <= 0) or np.any(ry <= 0):
+        raise ValueError("ต้องระบุ 'Ag', 'rx', 'ry' เป็นค่าบวก")
+    Pu = np.maximum(Pu, 0.0)
+
+    KLx_rx = Kx * Lx * 100.0 / rx
+    KLy_ry = Ky * Ly * 100.0 / ry
+    KL_r = np.maximum(KLx_rx, KLy_ry)
+
+    has_dim = (bf > 0) & (tf > 0) & (tw > 0) & (h > 0)
+    safe_tf = np.where(has_dim, tf, 1.0)
+    safe_tw = np.where(has_dim, tw, 1.0)
+
+    # ปีก — Qs (Sec. E7.1a)
+    lam_f = bf / (2.0 * safe_tf)
+    slender_f = has_dim & (lam_f > 0.56 * np.sqrt(E / Fy))
+    Qs = np.where(
+        lam_f <= 1.03 * np.sqrt(E / Fy),
+        1.415 - 0.74 * lam_f * np.sqrt(Fy / E),
+        0.69 * E / (Fy * np.where(lam_f > 0, lam_f, 1.0) ** 2),
+    )
+    Qs = np.where(slender_f, np.maximum(Qs, 0.0), 1.0)
+
+    # เอว — Qa (Sec. E7.2a, f = Fy)
+    h_clear = h - 2.0 * safe_tf
+    lam_w = h_clear / safe_tw
+    slender_w = has_dim & (lam_w > 1.49 * np.sqrt(E / Fy))
+    sqrt_Ef = np.sqrt(E / Fy)
+    be = 1.92 * safe_tw * sqrt_Ef * (1.0 - (0.34 / np.where(slender_w, lam_w, 1.0)) * sqrt_Ef)
+    be = np.clip(be, 0.0, np.maximum(h_clear, 0.0))
+    A_eff = np.maximum(Ag - (h_clear - be) * safe_tw / 100.0, 0.0)
+    Qa = np.where(slender_w, A_eff / Ag, 1.0)
+    Q = Qs * Qa
+
+    Fe = np.pi ** 2 * E / KL_r ** 2
+    with np.errstate(divide="ignore"):
+        lim_KLr = np.where(Q > 0, 4.71 * np.sqrt(E / (np.where(Q > 0, Q, 1.0) * Fy)), np.inf)
+    Fcr = np.where(KL_r <= lim_KLr, Q * 0.658 ** (Q * Fy / Fe) * Fy, 0.877 * Fe)
+    phi_Pn = 0.90 * Fcr * Ag
+    ratio = np.where(phi_Pn > 0, Pu / np.where(phi_Pn > 0, phi_Pn, 1.0), 999.0)
+
+    return {
+        "KL_r": KL_r,
+        "Q": Q,
+        "Fe": Fe,
+        "Fcr": Fcr,
+        "phi_Pn": phi_Pn,
+        "Slenderness": KL_r / 200.0,
+        "Ratio": ratio,
+        "Max_Ratio": ratio,
+        "Pass": ratio <= 1.0,
+    }
@@ -93,7 +93,7 @@ def load_data(filepath=DEFAULT_FILENAME):
             df = df.rename(columns=rename_map)
         
         # Ensure numeric columns are numeric
-        numeric_cols = ['Weight', 'Ix', 'Zx', 'Area', 'h', 't']
+        numeric_cols = ['Weight', 'Ix', 'Zx', 'Area', 'h', 't', 'Sx', 'Iy', 'Sy']
         for col in numeric_cols:
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors='coerce')
@@ -0,0 +1,69 @@
+"""
+debug_panel.py
+โหมดดีบักของหน้า Streamlit: จับเวลาแต่ละขั้นตอนการคำนวณและการสร้างรายงาน
+
+ใช้คู่กัน — debug_profiler() ต้นหน้า (หลังอินพุตใน sidebar) และ timing_panel() ท้ายหน้า:
+
+    prof = debug_profiler("purlin")
+    ...  # run_design / report.generate ตามปกติ
+    timing_panel(prof, "purlin")
+
+ปิด toggle = ไม่มี Profiler ทำงาน (add_step ไม่มีต้นทุนเพิ่ม)
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+import pandas as pd
+import streamlit as st
+
+from design_logging import Profiler, set_active_profiler
+
+
+def debug_profiler(key: str) -> Optional[Profiler]:
+    """แสดง toggle ใน sidebar และเปิด Profiler สำหรับการรันสคริปต์รอบนี้ถ้าเปิดใช้"""
+    on = st.sidebar.toggle("⏱️ โหมดดีบัก: จับเวลาการคำนวณ", value=False, key=f"{key}_debug")
+    memory = on and st.sidebar.checkbox("วัดการจองหน่วยความจำ (tracemalloc, ช้าลง)", value=False,
+                                        key=f"{key}_debug_mem")
+    profiler = Profiler(memory=memory) if on else None
+    set_active_profiler(profiler)  # ตั้งทุกรอบ เพื่อไม่ให้ Profiler ของรอบก่อนค้างอยู่ในเธรดเดิม
+    return profiler
+
+
+def timing_panel(profiler: Optional[Profiler], key: str) -> None:
+    """ปิด Profiler แล้วแสดงตารางเวลาแต่ละ phase/ขั้นตอน พร้อมดาวน์โหลด Chrome trace"""
+    if profiler is None:
+        return
+    set_active_profiler(None)
+    profiler.close()
+    with st.expander("⏱️ เวลาการคำนวณแต่ละขั้นตอน (ดีบัก)", expanded=True):
+        rows = profiler.stats()
+        if not rows:
+            st.info("ยังไม่มีการคำนวณในรอบนี้")
+            return
+        df = pd.DataFrame(rows)
+        phases = df[df["Kind"] == "phase"]
+        c1, c2, c3 = st.columns(3)
+        c1.metric("เวลารวม (phase นอกสุด)", f"{_outer_total_ms(profiler):.1f} ms")
+        c2.metric("จำนวน phase", f"{int(phases['Calls'].sum()):,}")
+        c3.metric("จำนวนขั้นตอน", f"{int(df.loc[df['Kind'] == 'step', 'Calls'].sum()):,}")
+        columns = ["Kind", "Name", "Calls", "Total_ms", "Mean_ms", "Max_ms"]
+        if profiler.memory:
+            columns += ["Alloc_KiB", "Peak_KiB"]
+        st.dataframe(df[columns].style.format({c: "{:.3f}" for c in columns[3:]}),
+                     use_container_width=True, hide_index=True)
+        st.download_button("⬇️ ดาวน์โหลด Chrome trace (JSON)", json.dumps(profiler.to_chrome_trace()),
+                           file_name=f"{key}_trace.json", mime="application/json", key=f"{key}_trace_dl")
+        st.caption("เปิดไฟล์ trace ด้วย chrome://tracing หรือ https://ui.perfetto.dev")
+
+
+def _outer_total_ms(profiler: Profiler) -> float:
+    """เวลารวมของ phase ที่ไม่ซ้อนอยู่ใน phase อื่น (ไม่นับซ้ำ)"""
+    total, end = 0.0, float("-inf")
+    for e in sorted((e for e in profiler.events if e["kind"] == "phase"), key=lambda e: e["start"]):
+        if e["start"] >= end:
+            total += e["dur"]
+            end = e["start"] + e["dur"]
+    return total * 1e3
@@ -0,0 +1,342 @@
+"""
+design_graph.py
+คำนวณซ้ำแบบเพิ่มส่วน (incremental) ด้วยกราฟการพึ่งพาของอินพุตออกแบบ
+
+โมเดลประกอบด้วย:
+  - พารามิเตอร์ร่วม (key → ค่า) เช่น 'roof.DL', 'grade', 'section:C-100x50x20x2.3'
+  - ชิ้นส่วน (member) ซึ่งอินพุตอ้างอิงพารามิเตอร์ด้วย Ref และผลของชิ้นส่วนต้นทางด้วย Upstream
+    (เช่นแรงปฏิกิริยาแป → จันทัน → เสา)
+
+เมื่อแก้พารามิเตอร์ จะทำเครื่องหมายเฉพาะชิ้นส่วนที่อ้างอิงผ่านดัชนีย้อนกลับ (key → ชิ้นส่วน)
+แล้ว recompute() ไล่ตามลำดับ topological เฉพาะชิ้นส่วนที่ถูกทำเครื่องหมาย
+ชิ้นส่วนที่อินพุตหลังแทนค่าไม่เปลี่ยน (เช่นแรงปฏิกิริยาต้นทางเท่าเดิม) จะไม่คำนวณซ้ำและไม่ส่งต่อ
+เวลาคำนวณจึงแปรตามจำนวนชิ้นส่วนที่ได้รับผลกระทบ ไม่ใช่ขนาดของทั้งโมเดล
+"""
+
+from __future__ import annotations
+
+import copy
+import heapq
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from parametric_sweep import DESIGN_CLASSES
+
+
+@dataclass(frozen=True)
+class Ref:
+    """อ้างอิงพารามิเตอร์ร่วมของโมเดล"""
+
+    key: str
+
+
+@dataclass(frozen=True)
+class Upstream:
+    """
+    อ้างอิงผลลัพธ์ของชิ้นส่วนต้นทางตาม path แบบจุด เช่น Upstream('P1', 'Forces.Vu_kg')
+    scale ใช้คูณค่า (เช่นแปสองข้างของจันทัน = 2 × แรงปฏิกิริยา)
+    """
+
+    member: str
+    path: str
+    scale: float = 1.0
+
+
+@dataclass(frozen=True)
+class Derived:
+    """ค่าที่คำนวณจากอ้างอิงอื่น เช่น Derived(sum, Upstream('P1', ...), Upstream('P2', ...))"""
+
+    func: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+
+    def __init__(self, func: Callable[..., Any], *args: Any) -> None:
+        object.__setattr__(self, "func", func)
+        object.__setattr__(self, "args", args)
+
+
+def _walk(spec: Any, refs: Set[str], upstream: Set[str]) -> None:
+    """เก็บ key ของ Ref และชื่อชิ้นส่วนของ Upstream ทั้งหมดใน spec"""
+    if isinstance(spec, Ref):
+        refs.add(spec.key)
+    elif isinstance(spec, Upstream):
+        upstream.add(spec.member)
+    elif isinstance(spec, Derived):
+        for arg in spec.args:
+            _walk(arg, refs, upstream)
+    elif isinstance(spec, Mapping):
+        for v in spec.values():
+            _walk(v, refs, upstream)
+    elif isinstance(spec, (list, tuple)):
+        for v in spec:
+            _walk(v, refs, upstream)
+
+
+def _lookup(result: Mapping[str, Any], path: str) -> Any:
+    value: Any = result
+    for part in path.split("."):
+        try:
+            value = value[part]
+        except (KeyError, TypeError):
+            raise ValueError(f"ไม่พบ '{path}' ในผลลัพธ์ต้นทาง") from None
+    return value
+
+
+def _same(a: Any, b: Any) -> bool:
+    """เทียบอินพุต — ตกไปเทียบ JSON เมื่อมี NaN (แถวตารางหน้าตัดที่ไม่มีค่า) หรือ array"""
+    try:
+        if bool(a == b):
+            return True
+    except (ValueError, TypeError):
+        pass
+    try:
+        return json.dumps(a, sort_keys=True, default=repr) == json.dumps(b, sort_keys=True, default=repr)
+    except (ValueError, TypeError):
+        return False
+
+
+@dataclass
+class MemberNode:
+    """ชิ้นส่วนในกราฟ"""
+
+    name: str
+    engine: str
+    spec: Dict[str, Any]
+    refs: Set[str] = field(default_factory=set)
+    upstream: Set[str] = field(default_factory=set)
+    section: str = ""
+    resolved: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class RecomputeReport:
+    """สรุปการคำนวณซ้ำหนึ่งรอบ"""
+
+    recomputed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)    # อินพุตหลังแทนค่าเท่าเดิม (ตัดการส่งต่อ)
+    failed: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class DesignModel:
+    """โมเดลหลายชิ้นส่วนพร้อมการคำนวณซ้ำเฉพาะส่วนที่ได้รับผลกระทบ"""
+
+    def __init__(self) -> None:
+        self.params: Dict[str, Any] = {}
+        self.members: Dict[str, MemberNode] = {}
+        self._param_dependents: Dict[str, Set[str]] = {}
+        self._downstream: Dict[str, Set[str]] = {}
+        self._rank: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+
+    # ─────────────────────────────────────────────────────────
+    # พารามิเตอร์
+    # ─────────────────────────────────────────────────────────
+    def set(self, key: str, value: Any) -> bool:
+        """กำหนดค่าพารามิเตอร์ คืน True ถ้าค่าเปลี่ยน (และทำเครื่องหมายชิ้นส่วนที่อ้างอิง)"""
+        if key in self.params and _same(self.params[key], value):
+            return False
+        self.params[key] = copy.deepcopy(value)
+        self._dirty.update(self._param_dependents.get(key, ()))
+        return True
+
+    def update(self, values: Mapping[str, Any]) -> List[str]:
+        """กำหนดหลายพารามิเตอร์ คืนรายการ key ที่ค่าเปลี่ยน"""
+        return [k for k, v in values.items() if self.set(k, v)]
+
+    def set_catalog(self, catalog, key_column: str = "Section", prefix: str = "section:") -> List[str]:
+        """
+        กำหนดแถวตารางหน้าตัด (DataFrame) เป็นพารามิเตอร์ '<prefix><ชื่อหน้าตัด>'
+        แถวที่ค่าไม่เปลี่ยนจะไม่กระทบชิ้นส่วนที่ใช้
+        """
+        changed = []
+        for row in catalog.to_dict("records"):
+            key = f"{prefix}{row[key_column]}"
+            if self.set(key, row):
+                changed.append(key)
+        return changed
+
+    # ─────────────────────────────────────────────────────────
+    # ชิ้นส่วน
+    # ─────────────────────────────────────────────────────────
+    def add_member(self, name: str, engine: str, spec: Mapping[str, Any], section: str = "") -> MemberNode:
+        """
+        เพิ่ม (หรือแทนที่) ชิ้นส่วน
+
+        Args:
+            name: ชื่อชิ้นส่วน (ไม่ซ้ำ)
+            engine: 'purlin', 'rafter', 'beam', 'compression' หรือ 'tension'
+            spec: keyword arguments ของคลาสออกแบบ โดยค่าใด ๆ (รวมใน dict ซ้อน) เป็น Ref / Upstream / Derived ได้
+            section: ชื่อหน้าตัดสำหรับแสดงผล
+        """
+        if engine not in DESIGN_CLASSES:
+            raise ValueError(f"ไม่รู้จัก engine '{engine}' (ที่รองรับ: {', '.join(DESIGN_CLASSES)})")
+        refs: Set[str] = set()
+        upstream: Set[str] = set()
+        _walk(spec, refs, upstream)
+        missing = upstream - set(self.members)
+        if missing:
+            raise ValueError(f"ชิ้นส่วน '{name}' อ้างอิงชิ้นส่วนต้นทางที่ยังไม่มี: {', '.join(sorted(missing))}")
+        if name in self.members and (name in upstream or upstream & self.downstream_of(name)):
+            raise ValueError(f"ชิ้นส่วน '{name}' อ้างอิงเป็นวง (cycle)")
+
+        if name in self.members:
+            self._unlink(self.members[name])
+        node = MemberNode(name, engine, dict(spec), refs, upstream, section)
+        self.members[name] = node
+        for key in refs:
+            self._param_dependents.setdefault(key, set()).add(name)
+        for up in upstream:
+            self._downstream.setdefault(up, set()).add(name)
+        self._downstream.setdefault(name, set())
+        self._rank.clear()
+        self._dirty.add(name)
+        return node
+
+    def remove_member(self, name: str) -> None:
+        node = self._node(name)
+        if self._downstream.get(name):
+            raise ValueError(f"ลบ '{name}' ไม่ได้: มีชิ้นส่วนปลายทาง {', '.join(sorted(self._downstream[name]))}")
+        self._unlink(node)
+        del self.members[name]
+        self._downstream.pop(name, None)
+        self._dirty.discard(name)
+        self._rank.clear()
+
+    def _unlink(self, node: MemberNode) -> None:
+        for key in node.refs:
+            self._param_dependents.get(key, set()).discard(node.name)
+        for up in node.upstream:
+            self._downstream.get(up, set()).discard(node.name)
+
+    def _node(self, name: str) -> MemberNode:
+        try:
+            return self.members[name]
+        except KeyError:
+            raise ValueError(f"ไม่พบชิ้นส่วน '{name}'") from None
+
+    # ─────────────────────────────────────────────────────────
+    # การพึ่งพา
+    # ─────────────────────────────────────────────────────────
+    def downstream_of(self, name: str) -> Set[str]:
+        """ชิ้นส่วนปลายทางทั้งหมด (transitive) ของชิ้นส่วน"""
+        seen: Set[str] = set()
+        stack = list(self._downstream.get(name, ()))
+        while stack:
+            n = stack.pop()
+            if n not in seen:
+                seen.add(n)
+                stack.extend(self._downstream.get(n, ()))
+        return seen
+
+    def affected_by(self, key: str) -> Set[str]:
+        """ชิ้นส่วนทั้งหมดที่อาจเปลี่ยนเมื่อแก้พารามิเตอร์ key (ก่อนตัดด้วยการเทียบอินพุต)"""
+        direct = self._param_dependents.get(key, set())
+        out = set(direct)
+        for name in direct:
+            out |= self.downstream_of(name)
+        return out
+
+    @property
+    def dirty(self) -> Set[str]:
+        return set(self._dirty)
+
+    def _ranks(self) -> Dict[str, int]:
+        """ลำดับ topological (Kahn) — คำนวณใหม่เฉพาะเมื่อโครงสร้างกราฟเปลี่ยน"""
+        if len(self._rank) != len(self.members):
+            indeg = {n: len(m.upstream) for n, m in self.members.items()}
+            ready = [n for n, d in indeg.items() if d == 0]
+            rank: Dict[str, int] = {}
+            while ready:
+                n = ready.pop()
+                rank[n] = len(rank)
+                for d in self._downstream.get(n, ()):
+                    indeg[d] -= 1
+                    if indeg[d] == 0:
+                        ready.append(d)
+            self._rank = rank
+        return self._rank
+
+    # ─────────────────────────────────────────────────────────
+    # คำนวณ
+    # ─────────────────────────────────────────────────────────
+    def _resolve(self, spec: Any) -> Any:
+        if isinstance(spec, Ref):
+            try:
+                return copy.deepcopy(self.params[spec.key])
+            except KeyError:
+                raise ValueError(f"ยังไม่ได้กำหนดพารามิเตอร์ '{spec.key}'") from None
+        if isinstance(spec, Upstream):
+            up = self.members[spec.member]
+            if up.result is None:
+                raise ValueError(f"ชิ้นส่วนต้นทาง '{spec.member}' ไม่มีผลคำนวณ ({up.error})")
+            value = _lookup(up.result, spec.path)
+            return value * spec.scale if spec.scale != 1.0 else value
+        if isinstance(spec, Derived):
+            return spec.func(*(self._resolve(a) for a in spec.args))
+        if isinstance(spec, Mapping):
+            return {k: self._resolve(v) for k, v in spec.items()}
+        if isinstance(spec, list):
+            return [self._resolve(v) for v in spec]
+        if isinstance(spec, tuple):
+            return tuple(self._resolve(v) for v in spec)
+        return spec
+
+    def recompute(self, force: bool = False) -> RecomputeReport:
+        """คำนวณชิ้นส่วนที่ถูกทำเครื่องหมาย (force=True = ทุกชิ้นส่วน) ตามลำดับ topological"""
+        start = time.perf_counter()
+        report = RecomputeReport()
+        rank = self._ranks()
+        if force:
+            self._dirty = set(self.members)
+        heap = [(rank[n], n) for n in self._dirty]
+        heapq.heapify(heap)
+        queued = set(self._dirty)
+        self._dirty = set()
+
+        while heap:
+            _, name = heapq.heappop(heap)
+            node = self.members[name]
+            try:
+                resolved = self._resolve(node.spec)
+            except ValueError as exc:
+                changed = node.result is not None or node.error != str(exc)
+                node.resolved, node.result, node.error = None, None, str(exc)
+                report.failed[name] = str(exc)
+            else:
+                if not force and node.result is not None and _same(resolved, node.resolved):
+                    report.unchanged.append(name)
+                    continue
+                changed = True
+                node.resolved = resolved
+                try:
+                    result = DESIGN_CLASSES[node.engine](**copy.deepcopy(resolved)).run_design()
+                except (ValueError, TypeError, KeyError) as exc:
+                    node.result, node.error = None, str(exc)
+                    report.failed[name] = str(exc)
+                else:
+                    node.result, node.error = result, None
+                    report.recomputed.append(name)
+            if changed:
+                for d in self._downstream.get(name, ()):
+                    if d not in queued:
+                        queued.add(d)
+                        heapq.heappush(heap, (rank[d], d))
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def result(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._node(name).result
+
+    def records(self, names: Optional[Iterable[str]] = None):
+        """MemberRecord สำหรับ project_store (ค่าปริยาย = ทุกชิ้นส่วนที่มีผลคำนวณ)"""
+        from project_store import MemberRecord
+
+        names = self.members if names is None else names
+        return [MemberRecord(n, self.members[n].engine, self.members[n].resolved or {},
+                             self.members[n].result, self.members[n].section)
+                for n in names if self.members[n].result is not None]
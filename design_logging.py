@@ -1,7 +1,18 @@
 from __future__ import annotations
 
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
 
 
 def _aligned_latex(expression: str, substitution: Optional[str], result: Optional[str]) -> str:
@@ -59,6 +70,255 @@ class CalculationLogMixin:
             metadata=metadata or {},
         )
         self.steps.append(step.to_dict())
+        profiler = _ACTIVE_PROFILER.get()
+        if profiler is not None:
+            profiler.step(title, status)
 
     def reset_steps(self) -> None:
         self.steps = []
+
+    def extend_steps(self, steps: Iterable[Dict[str, Any]], **overrides: Any) -> None:
+        """เพิ่มขั้นตอนที่บันทึกไว้แล้ว (เช่นจาก CapacityCache) โดยแทนค่าบางฟิลด์ได้ เช่น status"""
+        self.steps.extend({**step, **overrides} for step in steps)
+
+
+# ─────────────────────────────────────────────────────────────
+# จับเวลา/หน่วยความจำรายขั้นตอน (เปิดใช้เมื่อมี Profiler ทำงานอยู่เท่านั้น)
+# ─────────────────────────────────────────────────────────────
+_ACTIVE_PROFILER: ContextVar[Optional["Profiler"]] = ContextVar("active_profiler", default=None)
+
+
+@dataclass
+class _Frame:
+    name: str
+    start: float
+    last_mark: float
+    mem_start: int = 0
+    mem_mark: int = 0
+    peak: int = 0
+
+
+class Profiler:
+    """
+    บันทึกเวลา (และการจองหน่วยความจำถ้า memory=True) ของแต่ละ phase และแต่ละ add_step
+
+    เวลาของขั้นตอน = ช่วงตั้งแต่ขั้นตอนก่อนหน้า (หรือจุดเริ่ม phase) ถึงการเรียก add_step
+    ส่งออกเป็น Chrome trace JSON (chrome://tracing, ui.perfetto.dev) ด้วย to_chrome_trace()
+    """
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._stacks: Dict[int, List[_Frame]] = {}
+        self._lock = threading.Lock()
+        self._owns_tracemalloc = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def close(self) -> None:
+        """หยุด tracemalloc ถ้า Profiler นี้เป็นผู้เริ่ม"""
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def _stack(self) -> List[_Frame]:
+        tid = threading.get_ident()
+        if tid not in self._stacks:
+            now = time.perf_counter()
+            mem = self._memory()[0]
+            self._stacks[tid] = [_Frame("", now, now, mem, mem)]
+        return self._stacks[tid]
+
+    def _memory(self):
+        """(current, peak ตั้งแต่การอ่านครั้งก่อน) หน่วยไบต์"""
+        if not self.memory or not tracemalloc.is_tracing():
+            return 0, 0
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return current, peak
+
+    def _record(self, kind: str, name: str, start: float, end: float, alloc: int, peak: int,
+                **args: Any) -> None:
+        event = {"kind": kind, "name": name, "start": start - self._origin, "dur": end - start,
+                 "tid": threading.get_ident(), "args": {k: v for k, v in args.items() if v is not None}}
+        if self.memory:
+            event["alloc"] = alloc
+            event["peak"] = peak
+        with self._lock:
+            self.events.append(event)
+
+    def step(self, title: str, status: Optional[str] = None) -> None:
+        stack = self._stack()
+        frame = stack[-1]
+        now = time.perf_counter()
+        current, peak = self._memory()
+        for f in stack:
+            f.peak = max(f.peak, peak)
+        self._record("step", title, frame.last_mark, now, current - frame.mem_mark,
+                     max(peak - frame.mem_mark, 0), phase=frame.name or None, status=status)
+        frame.last_mark = now
+        frame.mem_mark = current
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stack = self._stack()
+        now = time.perf_counter()
+        current, peak = self._memory()
+        for f in stack:
+            f.peak = max(f.peak, peak)
+        stack.append(_Frame(name, now, now, current, current))
+        try:
+            yield
+        finally:
+            frame = stack.pop()
+            end = time.perf_counter()
+            current, peak = self._memory()
+            for f in stack:
+                f.peak = max(f.peak, peak)
+            self._record("phase", name, frame.start, end, current - frame.mem_start,
+                         max(max(frame.peak, peak) - frame.mem_start, 0))
+            stack[-1].last_mark = end
+            stack[-1].mem_mark = current
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """สรุปต่อ (ประเภท, ชื่อ): จำนวนครั้ง เวลารวม/เฉลี่ย/สูงสุด (ms) และหน่วยความจำ (KiB) เรียงตามเวลารวม"""
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for e in self.events:
+            row = groups.setdefault((e["kind"], e["name"]), {
+                "Kind": e["kind"], "Name": e["name"], "Calls": 0, "Total_ms": 0.0, "Max_ms": 0.0,
+                **({"Alloc_KiB": 0.0, "Peak_KiB": 0.0} if self.memory else {})})
+            ms = e["dur"] * 1e3
+            row["Calls"] += 1
+            row["Total_ms"] += ms
+            row["Max_ms"] = max(row["Max_ms"], ms)
+            if self.memory:
+                row["Alloc_KiB"] += e["alloc"] / 1024
+                row["Peak_KiB"] = max(row["Peak_KiB"], e["peak"] / 1024)
+        rows = sorted(groups.values(), key=lambda r: r["Total_ms"], reverse=True)
+        for row in rows:
+            row["Mean_ms"] = row["Total_ms"] / row["Calls"]
+        return rows
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format: เหตุการณ์แบบ complete ('X') หน่วยไมโครวินาที"""
+        pid = os.getpid()
+        events = []
+        for e in sorted(self.events, key=lambda e: (e["start"], -e["dur"])):
+            args = dict(e["args"])
+            if self.memory:
+                args.update(alloc_bytes=e["alloc"], peak_bytes=e["peak"])
+            events.append({"name": e["name"], "cat": e["kind"], "ph": "X", "ts": e["start"] * 1e6,
+                           "dur": e["dur"] * 1e6, "pid": pid, "tid": e["tid"], "args": args})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_trace(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def active_profiler() -> Optional[Profiler]:
+    return _ACTIVE_PROFILER.get()
+
+
+def set_active_profiler(profiler: Optional[Profiler]) -> None:
+    """กำหนด Profiler ของบริบทปัจจุบัน (None = ปิด) — ใช้ในหน้า Streamlit ที่ต้องครอบทั้งสคริปต์"""
+    _ACTIVE_PROFILER.set(profiler)
+
+
+@contextlib.contextmanager
+def profiling(memory: bool = False) -> Iterator[Profiler]:
+    """เปิดการจับเวลาภายในบล็อก with"""
+    profiler = Profiler(memory)
+    token = _ACTIVE_PROFILER.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE_PROFILER.reset(token)
+        profiler.close()
+
+
+def phase(name: str):
+    """บล็อก with ที่บันทึกเป็น phase เมื่อมี Profiler ทำงานอยู่ (ไม่เช่นนั้นไม่ทำอะไร)"""
+    profiler = _ACTIVE_PROFILER.get()
+    return profiler.phase(name) if profiler is not None else contextlib.nullcontext()
+
+
+def traced(func: F) -> F:
+    """decorator: บันทึกการเรียกฟังก์ชันเป็น phase ชื่อ <Class>.<method>"""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = _ACTIVE_PROFILER.get()
+        if profiler is None:
+            return func(*args, **kwargs)
+        with profiler.phase(name):
+            return func(*args, **kwargs)
+    return wrapper  # type: ignore[return-value]
+
+
+# ─────────────────────────────────────────────────────────────
+# cache ของเฟสกำลังรับ (capacity) แยกจากเฟสแรงกระทำ (demand)
+# ─────────────────────────────────────────────────────────────
+CapacityEntry = Tuple[Dict[str, Any], List[Dict[str, Any]]]
+
+
+class CapacityCache:
+    """
+    LRU cache ของเฟสกำลังรับ: ค่าที่ขึ้นกับหน้าตัด วัสดุ และความยาวไม่ค้ำยันเท่านั้น พร้อมขั้นตอนที่บันทึกไว้
+
+    run_design ที่แก้เฉพาะน้ำหนัก/ชุด load combination จึงคำนวณเฉพาะเฟสแรงกระทำ
+    ค่าที่คืนเป็นสำเนา (dict สองชั้นและทุกขั้นตอน) แก้ไขได้โดยไม่กระทบ cache
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, Any], Tuple[Dict[str, Any], ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        CAPACITY_CACHES[name] = self
+
+    def get(self, key: Hashable, compute: Callable[[CalculationLogMixin], Dict[str, Any]]) -> CapacityEntry:
+        """
+        คืน (values, steps) ของ key — ถ้าไม่มีใน cache เรียก compute(log) ที่บันทึกขั้นตอนลง log
+        แล้วคืนค่ากำลังรับเป็น dict (ข้อผิดพลาดจาก compute ไม่ถูกเก็บ)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is None:
+            log = CalculationLogMixin()
+            with phase(f"{self.name}.capacity"):
+                values = compute(log)
+            entry = (values, tuple(log.steps))
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = entry
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        values, steps = entry
+        return ({k: dict(v) if isinstance(v, dict) else v for k, v in values.items()},
+                [dict(step) for step in steps])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+CAPACITY_CACHES: Dict[str, CapacityCache] = {}
+
+
+def clear_capacity_caches() -> None:
+    """ล้าง cache กำลังรับของทุก engine"""
+    for cache in CAPACITY_CACHES.values():
+        cache.clear()
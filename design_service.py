@@ -0,0 +1,420 @@
+"""
+design_service.py
+บริการ HTTP/JSON ภายในเครื่องสำหรับเรียกใช้โมดูลออกแบบจากโปรแกรมอื่น (ตารางประมาณราคา, BIM exporter)
+
+โครงสร้าง:
+  - ส่วนหน้า asyncio (HTTP/1.1 keep-alive, ไลบรารีมาตรฐานเท่านั้น)
+  - ส่วนหลัง ProcessPoolExecutor
+  - micro-batching: รวมคำขอที่เข้ามาพร้อมกัน (ภายใน max_wait_ms) ที่มีอินพุตไม่ใช่ตัวเลขเหมือนกัน
+    เป็นการเรียก batch_checks แบบเวกเตอร์ครั้งเดียว แล้วแยกผลคืนทีละคำขอ
+
+Endpoints:
+  GET  /health                  สถานะบริการ
+  GET  /stats                   จำนวนการตรวจสอบ, อัตราต่อวินาที, latency p50 / p95 / p99 (ms)
+  POST /check/<engine>          ตรวจสอบแบบเร็ว (batch_checks) — body เป็น object หรือ {"items": [...]}
+  POST /design/<engine>         รายการคำนวณเต็ม (run_design พร้อมขั้นตอน)
+
+engine: purlin, rafter, beam, compression, tension
+
+ใช้งาน:
+  python design_service.py --port 8765 --workers 4
+  python design_service.py --bench 20000      (วัดอัตราการตรวจสอบและ p99 latency)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from parametric_sweep import DESIGN_CLASSES, ENGINES
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+MAX_BODY = 16 * 1024 * 1024
+
+
+class RequestError(Exception):
+    """ข้อผิดพลาดจากคำขอ พร้อมรหัส HTTP"""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _jsonable(value):
+    """แปลงผลลัพธ์ (numpy / dataclass) เป็นค่าที่ JSON รองรับ — NaN/inf เป็น null"""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        return _jsonable(value.item())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if is_dataclass(value) and not isinstance(value, type):
+        return _jsonable(asdict(value))
+    return value
+
+
+# ─────────────────────────────────────────────────────────────
+# งานใน worker process (ต้องเป็นฟังก์ชันระดับโมดูลเพื่อ pickle ได้)
+# ─────────────────────────────────────────────────────────────
+def _run_batch(engine: str, static: Dict[str, Any], columns: Dict[str, List[float]], n: int) -> List[Dict[str, Any]]:
+    """รัน batch_checks หนึ่งครั้งสำหรับ n คำขอ แล้วแยกผลเป็นรายการ"""
+    func = ENGINES[engine]
+    try:
+        res = func(**static, **{k: np.asarray(v, dtype=float) for k, v in columns.items()})
+    except (ValueError, TypeError, KeyError) as exc:
+        if n == 1:
+            return [{"error": str(exc)}]
+        # แยกคำขอที่ผิดพลาดออกจากคำขออื่นใน batch
+        return [_run_batch(engine, static, {k: [v[i]] for k, v in columns.items()}, 1)[0] for i in range(n)]
+    columns = {str(k): _column(v, n) for k, v in res.items() if np.ndim(v) <= 1}
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+def _column(value, n: int) -> List[Any]:
+    """แปลงผลลัพธ์หนึ่งคอลัมน์เป็น list ทีเดียว (เร็วกว่าแปลงทีละค่าหลายเท่า)"""
+    arr = np.broadcast_to(np.asarray(value), (n,))
+    if arr.dtype.kind == "f":
+        finite = np.isfinite(arr)
+        values = arr.tolist()
+        return values if finite.all() else [v if ok else None for v, ok in zip(values, finite.tolist())]
+    if arr.dtype.kind in "biu":
+        return arr.tolist()
+    return [_jsonable(v) for v in arr.tolist()]
+
+
+def _run_design(engine: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """รายการคำนวณเต็มของคลาสออกแบบ — payload คือ keyword arguments ของคลาส"""
+    return _jsonable(DESIGN_CLASSES[engine](**payload).run_design())
+
+
+# ─────────────────────────────────────────────────────────────
+# micro-batching
+# ─────────────────────────────────────────────────────────────
+# อินพุตตัวเลขที่ใช้เปิดตาราง (ไม่ใช่ปริมาณต่อเนื่อง) — ต้องอยู่ในคีย์กลุ่ม ไม่รวมเป็นคอลัมน์
+STATIC_KEYS = frozenset({"sag_rods"})
+
+
+def _split_inputs(item: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dict[str, float]]:
+    """แยกอินพุตตัวเลข (รวมเป็นคอลัมน์ได้) ออกจากอินพุตอื่น และคืนคีย์กลุ่มของ batch"""
+    numeric = {k: float(v) for k, v in item.items()
+               if isinstance(v, (int, float)) and not isinstance(v, bool) and k not in STATIC_KEYS}
+    static = {k: v for k, v in item.items() if k not in numeric}
+    key = json.dumps([sorted(numeric), static], sort_keys=True, default=str)
+    return key, static, numeric
+
+
+class MicroBatcher:
+    """รวมคำขอของ engine เดียวกันที่มาถึงภายใน max_wait_ms เป็นการเรียกแบบเวกเตอร์"""
+
+    def __init__(self, engine: str, pool: ProcessPoolExecutor, max_batch: int = 1024,
+                 max_wait_ms: float = 2.0) -> None:
+        self.engine = engine
+        self.pool = pool
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.batches = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+    def submit(self, item: Dict[str, Any]) -> asyncio.Future:
+        """เข้าคิวหนึ่งรายการ คืน future ของผลตรวจสอบ"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((item, future))
+        return future
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            # รอให้คำขออื่นที่มาพร้อมกันเข้าคิว แล้วดึงออกทั้งหมดในครั้งเดียว
+            await asyncio.sleep(self.max_wait)
+            while len(pending) < self.max_batch and not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+
+            groups: Dict[str, Tuple[Dict[str, Any], List]] = {}
+            for item, future in pending:
+                try:
+                    key, static, numeric = _split_inputs(item)
+                except (TypeError, ValueError) as exc:
+                    future.set_exception(RequestError(400, str(exc)))
+                    continue
+                groups.setdefault(key, (static, []))[1].append((numeric, future))
+            for static, members in groups.values():
+                columns = {k: [m[0][k] for m in members] for k in members[0][0]}
+                self.batches += 1
+                job = loop.run_in_executor(self.pool, _run_batch, self.engine, static, columns, len(members))
+                job.add_done_callback(lambda f, fs=[m[1] for m in members]: self._resolve(f, fs))
+
+    @staticmethod
+    def _resolve(job: asyncio.Future, futures: List[asyncio.Future]) -> None:
+        if job.exception() is not None:
+            for f in futures:
+                if not f.done():
+                    f.set_exception(job.exception())
+            return
+        for f, result in zip(futures, job.result()):
+            if not f.done():
+                f.set_result(result)
+
+
+# ─────────────────────────────────────────────────────────────
+# บริการ HTTP
+# ─────────────────────────────────────────────────────────────
+class DesignService:
+    """บริการ HTTP/JSON ของโมดูลออกแบบทั้งห้า"""
+
+    def __init__(self, workers: Optional[int] = None, max_batch: int = 1024, max_wait_ms: float = 2.0,
+                 latency_window: int = 100_000) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.batchers: Dict[str, MicroBatcher] = {}
+        self.latencies: deque = deque(maxlen=latency_window)
+        self.checks = 0
+        self.requests = 0
+        self.started = time.perf_counter()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # -------------------------------------------------------------
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        for engine in ENGINES:
+            batcher = MicroBatcher(engine, self.pool, self.max_batch, self.max_wait_ms)
+            batcher.start()
+            self.batchers[engine] = batcher
+        self.started = time.perf_counter()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.stop()
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+
+    # -------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        lat = np.asarray(self.latencies) * 1000.0
+        pct = np.percentile(lat, [50, 95, 99]) if lat.size else [None] * 3
+        return {
+            "requests": self.requests,
+            "checks": self.checks,
+            "batches": sum(b.batches for b in self.batchers.values()),
+            "uptime_s": elapsed,
+            "checks_per_s": self.checks / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {"p50": pct[0], "p95": pct[1], "p99": pct[2]},
+            "workers": self.workers,
+        }
+
+    async def check(self, engine: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """ตรวจสอบหลายรายการผ่าน micro-batcher (เรียกในโปรเซสเดียวกันได้โดยไม่ผ่าน HTTP)"""
+        if engine not in self.batchers:
+            raise RequestError(404, f"ไม่รู้จัก engine '{engine}' (ที่รองรับ: {', '.join(self.batchers)})")
+        if not all(isinstance(i, dict) for i in items):
+            raise RequestError(400, "แต่ละรายการต้องเป็น JSON object")
+        batcher = self.batchers[engine]
+        futures = [batcher.submit(i) for i in items]
+        results = [await f for f in futures]
+        self.checks += len(items)
+        return results
+
+    async def design(self, engine: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if engine not in DESIGN_CLASSES:
+            raise RequestError(404, f"ไม่รู้จัก engine '{engine}' (ที่รองรับ: {', '.join(DESIGN_CLASSES)})")
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.pool, _run_design, engine, payload)
+        except (ValueError, TypeError, KeyError) as exc:
+            raise RequestError(400, str(exc)) from None
+        self.checks += 1
+        return result
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Any:
+        parts = [p for p in path.split("?", 1)[0].split("/") if p]
+        if parts == ["health"]:
+            return {"status": "ok", "engines": list(ENGINES)}
+        if parts == ["stats"]:
+            return self.stats()
+        if len(parts) == 2 and parts[0] in ("check", "design"):
+            if method != "POST":
+                raise RequestError(405, "ใช้ POST สำหรับ endpoint นี้")
+            try:
+                payload = json.loads(body or b"{}")
+            except json.JSONDecodeError as exc:
+                raise RequestError(400, f"JSON ไม่ถูกต้อง: {exc}") from None
+            if not isinstance(payload, dict):
+                raise RequestError(400, "body ต้องเป็น JSON object")
+            if parts[0] == "design":
+                return await self.design(parts[1], payload)
+            if "items" in payload:
+                return {"results": await self.check(parts[1], payload["items"])}
+            return (await self.check(parts[1], [payload]))[0]
+        raise RequestError(404, f"ไม่พบ {path}")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                start = time.perf_counter()
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, _ = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {k.strip().lower(): v.strip() for k, v in
+                           (line.split(":", 1) for line in lines[1:] if ":" in line)}
+                length = int(headers.get("content-length", 0) or 0)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    if length > MAX_BODY:
+                        raise RequestError(413, "body มีขนาดเกินกำหนด")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = 200, await self.dispatch(method, path, body)
+                except RequestError as exc:
+                    status, payload = exc.status, {"error": str(exc)}
+                except Exception as exc:  # noqa: BLE001 — คืนข้อผิดพลาดให้ผู้เรียกแทนการปิดการเชื่อมต่อ
+                    status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                self.requests += 1
+                self.latencies.append(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+
+# ─────────────────────────────────────────────────────────────
+# วัดประสิทธิภาพ
+# ─────────────────────────────────────────────────────────────
+BENCH_PURLIN = {
+    "span": 6.0, "spacing": 1.2, "slope": 10.0, "DL": 15.0, "LL": 30.0, "WL": -60.0,
+    "Weight": 5.5, "Zx": 20.0, "Ix": 150.0, "h": 125.0, "t": 2.3, "Fy": 2450.0, "E": 2.04e6,
+}
+
+
+async def _bench_client(host: str, port: int, n: int, latencies: List[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    for i in range(n):
+        body = json.dumps({**BENCH_PURLIN, "span": 4.0 + (i % 50) * 0.08}).encode()
+        t0 = time.perf_counter()
+        writer.write(b"POST /check/purlin HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+                     + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int([h for h in head.split(b"\r\n") if h.lower().startswith(b"content-length")][0].split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - t0)
+    writer.close()
+
+
+def _bench_process(port: int, n: int, clients: int) -> List[float]:
+    """ผู้เรียกจำลองในโปรเซสแยก (ไม่แย่ง event loop กับบริการ)"""
+    latencies: List[float] = []
+
+    async def run() -> None:
+        await asyncio.gather(*(_bench_client("127.0.0.1", port, n, latencies) for _ in range(clients)))
+
+    asyncio.run(run())
+    return latencies
+
+
+async def run_benchmark(total: int = 20_000, clients: int = 64, client_procs: int = 2,
+                        workers: Optional[int] = None, port: int = 0) -> Dict[str, Any]:
+    """
+    เปิดบริการชั่วคราวแล้วยิงคำขอตรวจสอบแปทีละรายการ (หนึ่งคำขอ = หนึ่งการตรวจสอบ)
+    จาก clients การเชื่อมต่อ keep-alive กระจายใน client_procs โปรเซส
+    """
+    service = DesignService(workers=workers)
+    server = await service.start("127.0.0.1", port)
+    port = server.sockets[0].getsockname()[1]
+    await service.check("purlin", [BENCH_PURLIN])  # อุ่นเครื่อง worker
+    per_client = max(total // (clients * client_procs), 1)
+    loop = asyncio.get_running_loop()
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=client_procs) as procs:
+        parts = await asyncio.gather(*(loop.run_in_executor(procs, _bench_process, port, per_client, clients)
+                                       for _ in range(client_procs)))
+    elapsed = time.perf_counter() - t0
+    batches = service.stats()["batches"]
+    await service.close()
+    lat = np.concatenate([np.asarray(p) for p in parts]) * 1000.0
+    return {
+        "checks": int(lat.size),
+        "elapsed_s": elapsed,
+        "checks_per_s": lat.size / elapsed,
+        "latency_ms": {"p50": float(np.percentile(lat, 50)), "p95": float(np.percentile(lat, 95)),
+                       "p99": float(np.percentile(lat, 99))},
+        "batches": batches,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="บริการ HTTP/JSON สำหรับโมดูลออกแบบ")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--bench", type=int, metavar="N", help="วัดประสิทธิภาพด้วย N คำขอแล้วออก")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        print(json.dumps(asyncio.run(run_benchmark(args.bench, workers=args.workers)), indent=2))
+        return
+
+    async def serve() -> None:
+        service = DesignService(args.workers, args.max_batch, args.max_wait_ms)
+        server = await service.start(args.host, args.port)
+        print(f"Design service: http://{args.host}:{args.port} ({service.workers} workers)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
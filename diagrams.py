@@ -0,0 +1,290 @@
+"""
+diagrams.py
+แผนภาพโมเมนต์ แรงเฉือน และการโก่งตัว M(x), V(x), δ(x) ของแป คาน และจันทัน
+
+ทุกชิ้นส่วนเป็นคานช่วงเดียวรองรับแบบธรรมดา จึงใช้สูตรปิดจาก beam_analysis (superposition)
+ประเมินทั้งแผนภาพด้วยการคูณเมทริกซ์ครั้งเดียว ไม่มีลูปรายจุด
+
+จุดประเมินผลแบบปรับตัว (adaptive):
+  - เริ่มจากกริดหยาบ + ตำแหน่งแรงจุด + จุด V = 0 (โมเมนต์สูงสุด หาแบบตรงเพราะ V เป็นเส้นตรงระหว่างแรงจุด)
+  - แบ่งครึ่งช่วงที่ค่ากึ่งกลางต่างจากเส้นตรงเกิน tol × ค่าสูงสุด (ทั้ง M และ δ)
+    ความโค้งของ δ แปรตาม M จึงได้จุดหนาแน่นบริเวณค่าสูงสุด และห่างที่ปลายคาน
+
+แผนภาพแต่ละชิ้นส่วนเก็บใน DiagramCache ตามชื่อชิ้นส่วน + ลายนิ้วมือของแรงและหน้าตัด
+วาดทั้งโครงการใหม่จึงคำนวณเฉพาะชิ้นส่วนที่เปลี่ยน
+
+หน่วย: x (ม.), M (กก.-ม.), V (กก.), δ (ซม.) — แรงแฟคเตอร์ของ combo ควบคุม, การโก่งตัวใช้น้ำหนักใช้งาน
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from beam_analysis import simple_span_response
+from load_combinations import get_combination_set
+
+ADAPTIVE_TOL = 1e-3
+
+
+@dataclass(frozen=True)
+class SpanLoading:
+    """คานช่วงเดียวพร้อมแรง: น้ำหนักแผ่ + แรงจุด ของกรณีกำลัง (1 กรณี) และใช้งาน (รวม, LL)"""
+
+    span: float                    # ม.
+    EI: float                      # E·Ix / 1e6 → δ เป็น ซม.
+    w_u: float                     # กก./ม.  (combo ควบคุม มีเครื่องหมาย)
+    w_service: tuple               # (w_total, w_live) กก./ม.
+    positions: tuple = ()          # ม.
+    p_u: tuple = ()                # กก.
+    p_service: tuple = ()          # ((P_total, P_live), ...) กก.
+    combo: str = ""
+
+    def fingerprint(self) -> str:
+        data = np.concatenate([
+            [self.span, self.EI, self.w_u], np.ravel(self.w_service), np.ravel(self.positions),
+            np.ravel(self.p_u), np.ravel(self.p_service),
+        ]).astype(float)
+        return hashlib.sha1(data.tobytes() + self.combo.encode()).hexdigest()
+
+    def strength(self, x):
+        """(M, V) ของ combo ควบคุม"""
+        m, v, _ = simple_span_response(x, self.span, self.w_u, self.positions,
+                                       np.asarray(self.p_u, dtype=float) if self.positions else None)
+        return m, v
+
+    def deflection(self, x):
+        """δ รูป (n_x, 2): คอลัมน์ 0 = DL+LL, 1 = LL"""
+        p = np.asarray(self.p_service, dtype=float).reshape(len(self.positions), 2)
+        _, _, d = simple_span_response(x, self.span, np.asarray(self.w_service, dtype=float),
+                                       self.positions, p if self.positions else None, EI=self.EI)
+        return d
+
+
+@dataclass
+class MemberDiagram:
+    """แผนภาพของชิ้นส่วนหนึ่ง"""
+
+    name: str
+    engine: str
+    x: np.ndarray
+    M: np.ndarray
+    V: np.ndarray
+    delta: np.ndarray              # DL+LL
+    delta_live: np.ndarray
+    combo: str = ""
+
+    @property
+    def M_max(self) -> float:
+        return float(np.max(np.abs(self.M)))
+
+    @property
+    def V_max(self) -> float:
+        return float(np.max(np.abs(self.V)))
+
+    @property
+    def delta_max(self) -> float:
+        return float(np.max(np.abs(self.delta)))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"x": self.x, "M": self.M, "V": self.V,
+                             "delta": self.delta, "delta_live": self.delta_live})
+
+
+# ─────────────────────────────────────────────────────────────
+# จุดประเมินผลแบบปรับตัว
+# ─────────────────────────────────────────────────────────────
+def _shear_zeros(loading: SpanLoading, x: np.ndarray) -> np.ndarray:
+    """ตำแหน่ง V = 0 ภายในแต่ละช่วง (V เชิงเส้นระหว่างจุดแตกหัก x ที่รวมตำแหน่งแรงไว้แล้ว)"""
+    mid = (x[1:] + x[:-1]) / 2
+    _, v = loading.strength(np.concatenate([x[:-1], mid]))
+    v0, vm = v[:len(mid)], v[len(mid):]
+    slope = (vm - v0) / (mid - x[:-1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = x[:-1] - v0 / slope
+    ok = (slope != 0) & (root > x[:-1]) & (root < x[1:])
+    return root[ok]
+
+
+def adaptive_points(loading: SpanLoading, n0: int = 17, tol: float = ADAPTIVE_TOL,
+                    max_rounds: int = 10) -> np.ndarray:
+    """
+    จุดประเมินผลที่ให้ M และ δ ระหว่างจุดต่อเนื่องคลาดจากเส้นตรงไม่เกิน tol × ค่าสูงสุด
+    (รวมปลายคาน ตำแหน่งแรงจุด และตำแหน่ง M สูงสุดแบบตรง)
+    """
+    L = loading.span
+    x = np.unique(np.concatenate([np.linspace(0.0, L, n0), np.clip(loading.positions, 0.0, L)]))
+    x = np.unique(np.concatenate([x, _shear_zeros(loading, x)]))
+
+    def values(xs):
+        return np.column_stack([loading.strength(xs)[0], loading.deflection(xs)])
+
+    f = values(x)
+    for _ in range(max_rounds):
+        scale = np.max(np.abs(f), axis=0)
+        scale[scale == 0] = 1.0
+        mid = (x[1:] + x[:-1]) / 2
+        f_mid = values(mid)
+        err = np.max(np.abs(f_mid - (f[1:] + f[:-1]) / 2) / scale, axis=1)
+        split = err > tol
+        if not split.any():
+            break
+        order = np.argsort(np.concatenate([x, mid[split]]), kind="stable")
+        x = np.concatenate([x, mid[split]])[order]
+        f = np.concatenate([f, f_mid[split]])[order]
+    return x
+
+
+def diagram(loading: SpanLoading, name: str = "", engine: str = "", **kwargs) -> MemberDiagram:
+    """แผนภาพ M, V, δ จากแบบจำลองคาน (kwargs ส่งต่อให้ adaptive_points)"""
+    x = adaptive_points(loading, **kwargs)
+    m, v = loading.strength(x)
+    d = loading.deflection(x)
+    return MemberDiagram(name, engine, x, m, v, d[:, 0], d[:, 1], loading.combo)
+
+
+# ─────────────────────────────────────────────────────────────
+# แบบจำลองคานจากอินพุต / ผลของแต่ละโมดูลออกแบบ
+# inputs = keyword arguments ของคลาสออกแบบ (เหมือน parametric_sweep.DESIGN_CLASSES)
+# ─────────────────────────────────────────────────────────────
+def purlin_loading(inputs: Mapping[str, Any], result: Mapping[str, Any]) -> SpanLoading:
+    """แป: แกนหลัก (แรงฉากผิว) ตาม PurlinDesign — ไม่รวมโมเมนต์แกนอ่อนของกรณี biaxial"""
+    loads = result["Loads"]
+    combos = result["Combinations"]
+    return SpanLoading(
+        span=float(inputs["geometry"]["span"]),
+        EI=float(inputs["materials"]["E"]) * float(inputs["section_data"]["Ix"]) / 1e6,
+        w_u=float(combos["Wu_design"]),
+        w_service=(loads["DL_line"] + loads["LL_line"], loads["LL_line"]),
+        combo=str(combos.get("Controlling", "")),
+    )
+
+
+def beam_loading(inputs: Mapping[str, Any], result: Mapping[str, Any]) -> SpanLoading:
+    """คานขึ้นรูปเย็น: w_u ย้อนจาก M_u = w_u L² / 8 ของ ColdFormedBeamDesign"""
+    span = float(inputs["geometry"]["span"])
+    loads = inputs["loads"]
+    dead, live = max(loads.get("D", 0.0), 0.0), max(loads.get("L", 0.0), 0.0)
+    material = inputs.get("material") or {"E": 2.04e6}
+    checks = result["Checks"]
+    return SpanLoading(
+        span=span,
+        EI=float(material["E"]) * float(inputs["section"]["Ix"]) / 1e6,
+        w_u=8.0 * checks["Demand"]["Mu"] / span ** 2,
+        w_service=(dead + live, live),
+        combo=str(checks.get("Controlling_Load", "")),
+    )
+
+
+def rafter_loading(inputs: Mapping[str, Any], result: Mapping[str, Any]) -> SpanLoading:
+    """จันทัน: แรงฉากกับแนวจันทันตาม RafterDesign ความยาวตามลาด รวมแรงจุดจากแป"""
+    geo = inputs["geometry"]
+    cos_theta = math.cos(math.radians(geo["slope"]))
+    span_slope = geo["span"] / cos_theta
+    loads = result["Loads"]
+    combos = get_combination_set(inputs.get("combinations"))
+    label = result["Combinations"]["Controlling"]
+    gov = next((i for i, c in enumerate(combos.combinations) if c.label == label), 0)
+    factors = combos.matrix[gov]
+
+    w_case = (loads["w_dl_vert"] * cos_theta, loads["w_ll_vert"] * cos_theta, loads["w_wl_norm"])
+    points = loads.get("PointLoads") or []
+    positions = tuple(float(p["x"]) for p in points)
+    p_case = np.array([[p.get("D", 0.0) * cos_theta, p.get("L", 0.0) * cos_theta, p.get("W", 0.0)]
+                       for p in points], dtype=float).reshape(len(points), 3)
+    return SpanLoading(
+        span=span_slope,
+        EI=float(inputs["materials"]["E"]) * float(inputs["section_data"]["Ix"]) / 1e6,
+        w_u=float(np.dot(factors, w_case)),
+        w_service=((loads["w_dl_vert"] + loads["w_ll_vert"]) * cos_theta, loads["w_ll_vert"] * cos_theta),
+        positions=positions,
+        p_u=tuple(p_case @ factors),
+        p_service=tuple(map(tuple, np.column_stack([p_case[:, 0] + p_case[:, 1], p_case[:, 1]]))),
+        combo=label,
+    )
+
+
+LOADING_BUILDERS: Dict[str, Callable[[Mapping[str, Any], Mapping[str, Any]], SpanLoading]] = {
+    "purlin": purlin_loading,
+    "beam": beam_loading,
+    "rafter": rafter_loading,
+}
+
+
+def member_loading(engine: str, inputs: Mapping[str, Any], result: Mapping[str, Any]) -> SpanLoading:
+    if engine not in LOADING_BUILDERS:
+        raise ValueError(f"ไม่มีแผนภาพสำหรับ engine '{engine}' (ที่รองรับ: {', '.join(LOADING_BUILDERS)})")
+    return LOADING_BUILDERS[engine](inputs, result)
+
+
+# ─────────────────────────────────────────────────────────────
+# แคชรายชิ้นส่วน
+# ─────────────────────────────────────────────────────────────
+@dataclass
+class DiagramCache:
+    """แผนภาพตามชื่อชิ้นส่วน — คำนวณใหม่เมื่อแรง ช่วง หรือหน้าตัดเปลี่ยนเท่านั้น"""
+
+    entries: Dict[str, tuple] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    def get(self, name: str, engine: str, inputs: Mapping[str, Any],
+            result: Mapping[str, Any]) -> MemberDiagram:
+        loading = member_loading(engine, inputs, result)
+        key = loading.fingerprint()
+        cached = self.entries.get(name)
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        diag = diagram(loading, name=name, engine=engine)
+        self.entries[name] = (key, diag)
+        return diag
+
+    def discard(self, name: str) -> None:
+        self.entries.pop(name, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+
+def project_diagrams(model, cache: Optional[DiagramCache] = None,
+                     names: Optional[Iterable[str]] = None) -> Dict[str, MemberDiagram]:
+    """
+    แผนภาพของทุกชิ้นส่วนแป / คาน / จันทันใน DesignModel (design_graph) ที่มีผลคำนวณแล้ว
+    ส่ง cache เดิมกลับมาเพื่อใช้ผลเดิมของชิ้นส่วนที่ไม่เปลี่ยน
+    """
+    cache = cache if cache is not None else DiagramCache()
+    out: Dict[str, MemberDiagram] = {}
+    for name in (names if names is not None else model.members):
+        node = model.members[name]
+        if node.engine in LOADING_BUILDERS and node.result is not None:
+            out[name] = cache.get(name, node.engine, node.resolved, node.result)
+    for name in set(cache.entries) - set(model.members):
+        cache.discard(name)
+    return out
+
+
+def diagram_figure(diag: MemberDiagram, title: Optional[str] = None) -> go.Figure:
+    """กราฟ M, V, δ เรียงแนวตั้ง แกน x ร่วมกัน (โมเมนต์บวกวาดด้านล่างตามแบบวิศวกรรม)"""
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.06,
+                        subplot_titles=("โมเมนต์ M (กก.-ม.)", "แรงเฉือน V (กก.)", "การโก่งตัว δ (ซม.)"))
+    fig.add_trace(go.Scatter(x=diag.x, y=diag.M, fill="tozeroy", name="M", line=dict(color="#2563eb")), 1, 1)
+    fig.add_trace(go.Scatter(x=diag.x, y=diag.V, fill="tozeroy", name="V", line=dict(color="#dc2626")), 2, 1)
+    fig.add_trace(go.Scatter(x=diag.x, y=diag.delta, name="DL+LL", line=dict(color="#16a34a")), 3, 1)
+    fig.add_trace(go.Scatter(x=diag.x, y=diag.delta_live, name="LL", line=dict(color="#16a34a", dash="dot")), 3, 1)
+    fig.update_yaxes(autorange="reversed", row=1, col=1)
+    fig.update_yaxes(autorange="reversed", row=3, col=1)
+    fig.update_xaxes(title_text="x (ม.)", row=3, col=1)
+    fig.update_layout(height=620, showlegend=False,
+                      title=title or (f"{diag.name} — {diag.combo}" if diag.combo else diag.name),
+                      margin=dict(l=40, r=20, t=70, b=40))
+    return fig
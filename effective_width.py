@@ -0,0 +1,296 @@
+"""
+effective_width.py
+โมดูลัสหน้าตัดประสิทธิผล Se ของเหล็กตัวซี / ตัวแซดมีขอบพับ ตามวิธีความกว้างประสิทธิผล (AISI S100-16)
+
+หน้าตัดบาง (t = 1.6–2.3 mm ใน มอก. 1228) โก่งเดาะเฉพาะที่ก่อนถึงจุดคราก กำลังดัดจึงเป็น
+Mn = Se·Fy (F3.1 / Procedure I — ปีกรับแรงอัดถึง Fy ก่อน) แทน Fy·Zx ของหน้าตัดเต็ม:
+
+  ปีกรับแรงอัด — ชิ้นส่วนมีขอบพับ (S100 1.3): S = 1.28√(E/f), Ia, RI = Is/Ia → k ≤ 4
+                 (ไม่มีขอบพับ: ชิ้นส่วนไม่มีขอบยึด k = 0.43)
+  ขอบพับ       — ชิ้นส่วนไม่มีขอบยึด k = 0.43 แล้วลดด้วย RI: ds = d's·RI
+  เอว          — ชิ้นส่วนรับหน่วยแรงเปลี่ยนแปลง (S100 1.1.2): ψ = |f2/f1|, k = 4 + 2(1+ψ)³ + 2(1+ψ)
+  ρ = (1 − 0.22/λ)/λ เมื่อ λ = (1.052/√k)(w/t)√(f/E) > 0.673
+
+ตำแหน่งแกนสะเทินของหน้าตัดประสิทธิผลขึ้นกับความกว้างประสิทธิผลของเอว จึงวนซ้ำจนลู่เข้า
+ทุกขั้นเป็น NumPy array — ทั้งตารางคำนวณพร้อมกันในการวนรอบเดียว
+
+แบบจำลองเส้นกึ่งกลางมุมแหลม (เหมือน section_properties และตาราง มอก. 1228) ผลที่ใช้ในคลาสออกแบบคือ
+อัตราส่วน Se/S ของแบบจำลอง คูณกับ Zx / Sx ของตาราง — หน้าตัดที่ไม่โก่งเดาะเฉพาะที่ได้ค่าเดิมทุกประการ
+ผลเก็บ cache ต่อ (หน้าตัด, Fy, E) และต่อทั้งตาราง
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from section_properties import dimensions_from_names, name_dimensions
+
+DIMENSIONS = ("h", "b", "c", "t")
+_MAX_ITERATIONS = 30
+_TOLERANCE = 1e-6  # สัดส่วนของความลึก h
+_GRID_POINTS = 64  # จำนวนจุด √(Fy/E) เมื่อหน้าตัดเดียวมีค่า Fy จำนวนมาก (Monte Carlo)
+_THICKNESS_POINTS = 16  # จำนวนจุด t เมื่อความหนาสุ่มด้วย (ความคลาดเคลื่อนจากการผลิต)
+_MAX_CACHED = 512
+_MAX_CATALOGS = 16
+
+
+# ─────────────────────────────────────────────────────────────
+# ความกว้างประสิทธิผลของชิ้นส่วน
+# ─────────────────────────────────────────────────────────────
+def reduction_factor(w_t, k, f, E) -> np.ndarray:
+    """ρ ของชิ้นส่วนสัดส่วน w/t, สัมประสิทธิ์ k ที่หน่วยแรง f (S100 1.1.1)"""
+    lam = 1.052 / np.sqrt(k) * w_t * np.sqrt(np.maximum(f, 0.0) / E)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = (1.0 - 0.22 / lam) / lam
+    return np.where(lam <= 0.673, 1.0, np.clip(rho, 0.0, 1.0))
+
+
+def _edge_stiffened_flange(w, d, D, t, f, E) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ปีกรับแรงอัดสม่ำเสมอที่มีขอบพับตั้งฉาก (S100 1.3) → (ความกว้างปีก b, ความยาวขอบพับ ds, k)
+
+    w, d: ความกว้างเรียบของปีกและขอบพับ, D: ความลึกขอบพับทั้งหมด, f: หน่วยแรงในปีก (ksc)
+    """
+    w_t = w / t
+    S = 1.28 * np.sqrt(E / f)
+    d_s = reduction_factor(d / t, 0.43, f, E) * d  # d's: ขอบพับเป็นชิ้นส่วนไม่มีขอบยึด
+    Ia = np.minimum(399.0 * t ** 4 * np.maximum(w_t / S - 0.328, 0.0) ** 3, t ** 4 * (115.0 * w_t / S + 5.0))
+    Is = d ** 3 * t / 12.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        RI = np.where(Ia > 0, np.minimum(Is / Ia, 1.0), 1.0)
+    n = np.maximum(0.582 - w_t / (4.0 * S), 1.0 / 3.0)
+    D_w = np.minimum(D / w, 0.8)
+    k = np.minimum(np.where(D_w <= 0.25, 3.57, 4.82 - 5.0 * D_w) * RI ** n + 0.43, 4.0)
+    full = w_t <= 0.328 * S  # ปีกมีประสิทธิผลเต็มโดยไม่ต้องพึ่งขอบพับ
+    b = np.where(full, w, reduction_factor(w_t, k, f, E) * w)
+    ds = np.where(full, d_s, d_s * RI)
+    return b, ds, np.where(full, 4.0, k)
+
+
+def _web(w, f1, f2, t, E, h_over_b) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    เอวรับหน่วยแรงเปลี่ยนแปลง (S100 1.1.2) → (b1, b2, ความยาวส่วนรับแรงอัด)
+
+    f1 แรงอัดที่ขอบบนของส่วนเรียบ (บวก), f2 ที่ขอบล่าง (ลบ = แรงดึง)
+    """
+    psi = np.abs(f2 / f1)
+    k = 4.0 + 2.0 * (1.0 + psi) ** 3 + 2.0 * (1.0 + psi)
+    be = reduction_factor(w / t, k, f1, E) * w
+    b1 = be / (3.0 + psi)
+    b2 = np.where(h_over_b <= 4.0, np.where(psi > 0.236, be / 2.0, be - b1), be / (1.0 + psi) - b1)
+    compression = np.where(f2 < 0, w * f1 / (f1 - f2), w)
+    return b1, b2, compression
+
+
+# ─────────────────────────────────────────────────────────────
+# หน้าตัดประสิทธิผล
+# ─────────────────────────────────────────────────────────────
+def effective_section(h, b, c, t, Fy, E=2.04e6) -> Dict[str, np.ndarray]:
+    """
+    หน้าตัดประสิทธิผลของตัวซี / ตัวแซดดัดรอบแกน x (ปีกบนรับแรงอัดที่ Fy)
+
+    Args:
+        h, b, c, t: ขนาดภายนอก mm (c = 0 คือไม่มีขอบพับ) — array ที่ broadcast กันได้
+        Fy, E: ksc
+
+    Returns:
+        dict ของ array: S, Se (ซม.³), Ie (ซม.⁴), ratio = Se/S, ycg (ระยะแกนสะเทินใต้กึ่งความลึก mm),
+        b_flange, ds_lip, b1, b2 (mm), k_flange, iterations
+    """
+    h, b, c, t, Fy, E = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (h, b, c, t, Fy, E)))
+    if (np.minimum(np.minimum(h, b), t) <= 0).any() or (c < 0).any() or (2 * t >= h).any():
+        raise ValueError("ขนาดหน้าตัดไม่ถูกต้องสำหรับวิธีความกว้างประสิทธิผล")
+    if (Fy <= 0).any() or (E <= 0).any():
+        raise ValueError("ต้องมีค่าบวกสำหรับ F_y และ E")
+    lipped = c > 0
+
+    # หน้าตัดเต็ม (เส้นกึ่งกลาง มุมแหลม): เอว, ปีกสองข้าง, ขอบพับสองข้าง
+    yf = (h - t) / 2
+    L_web, L_flange, L_lip = h - t, b - t, np.where(lipped, c - t / 2, 0.0)
+    y_lip = yf - L_lip / 2
+    area = t * (L_web + 2 * L_flange + 2 * L_lip)
+    inertia = (t * L_web ** 3 / 12 + 2 * (L_flange * t ** 3 / 12 + L_flange * t * yf ** 2)
+               + 2 * (t * L_lip ** 3 / 12 + t * L_lip * y_lip ** 2))
+    S = inertia / (h / 2)
+
+    # ความกว้างเรียบ (มุมแหลม)
+    w_web = h - 2 * t
+    w_flange = np.where(lipped, b - 2 * t, b - t)
+    d_lip = np.where(lipped, c - t, 0.0)
+    top_flat = h / 2 - t  # ขอบบนของส่วนเรียบของเอว
+
+    ycg = np.zeros_like(h)
+    active = np.ones(h.shape, dtype=bool)
+    out = {}
+    iterations = 0
+    for iterations in range(1, _MAX_ITERATIONS + 1):
+        y_c = h / 2 - ycg  # ระยะแกนสะเทิน → ผิวรับแรงอัด
+
+        # ปีกและขอบพับ (หน่วยแรงในปีก = Fy)
+        b_st, ds_st, k_st = _edge_stiffened_flange(w_flange, np.maximum(d_lip, 1e-9), c, t, Fy, E)
+        b_un = reduction_factor(w_flange / t, 0.43, Fy, E) * w_flange
+        b_flange = np.where(lipped, b_st, b_un)
+        ds_lip = np.where(lipped, ds_st, 0.0)
+        lost_flange = w_flange - b_flange
+        lost_lip = d_lip - ds_lip
+        y_lost_lip = yf - L_lip + lost_lip / 2  # ส่วนที่ไม่มีประสิทธิผลอยู่ที่ปลายขอบพับ
+
+        # เอว
+        # หน่วยแรงเชิงเส้นตามความลึก (อัดเป็นบวก) ที่ขอบบนและล่างของส่วนเรียบ
+        f1, f2 = Fy * (top_flat - ycg) / y_c, Fy * (-top_flat - ycg) / y_c
+        b1, b2, compression = _web(w_web, f1, f2, t, E, h / b)
+        lost_web = np.maximum(compression - b1 - b2, 0.0)
+        y_lost_web = top_flat - b1 - lost_web / 2
+
+        lost_area = t * (lost_flange + lost_lip + lost_web)
+        first = t * (lost_flange * yf + lost_lip * y_lost_lip + lost_web * y_lost_web)
+        new_ycg = -first / (area - lost_area)
+        converged = np.abs(new_ycg - ycg) <= _TOLERANCE * h
+        ycg = np.where(active, new_ycg, ycg)
+        out = dict(b_flange=b_flange, ds_lip=ds_lip, b1=b1, b2=b2, k_flange=np.where(lipped, k_st, 0.43),
+                   lost=(lost_flange, lost_lip, lost_web, y_lost_lip, y_lost_web, lost_area))
+        active &= ~converged
+        if not active.any():
+            break
+
+    lost_flange, lost_lip, lost_web, y_lost_lip, y_lost_web, lost_area = out.pop("lost")
+    removed = t * (lost_flange * yf ** 2 + lost_lip * (lost_lip ** 2 / 12 + y_lost_lip ** 2)
+                   + lost_web * (lost_web ** 2 / 12 + y_lost_web ** 2))
+    Ie = inertia - removed - (area - lost_area) * ycg ** 2
+    Se = Ie / (h / 2 - ycg)
+    out.update({"S": S / 1e3, "Se": Se / 1e3, "Ie": Ie / 1e4, "ratio": np.minimum(Se / S, 1.0),
+                "ycg": -ycg, "iterations": np.full(h.shape, iterations)})
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# อัตราส่วน Se/S สำหรับคลาสออกแบบ (มี cache)
+# ─────────────────────────────────────────────────────────────
+_CACHE: "OrderedDict[Tuple, float]" = OrderedDict()
+_CATALOGS: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+
+
+def _remember(cache: OrderedDict, key, compute, limit: int):
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache[key] = value
+        if len(cache) > limit:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return value
+
+
+def _grid(values: np.ndarray, points: int) -> np.ndarray:
+    """จุดห่างเท่ากัน points จุดครอบช่วงของ values (ค่าเดียว → จุดเดียว)"""
+    lo, hi = float(values.min()), float(values.max())
+    return np.linspace(lo, hi, points) if hi > lo else np.array([lo])
+
+
+def _interp_weights(values: np.ndarray, grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ดัชนีจุดล่างและน้ำหนักเชิงเส้นของ values บน grid (จุดเดียว → น้ำหนัก 0)"""
+    if grid.size == 1:
+        return np.zeros(values.shape, dtype=np.intp), np.zeros(values.shape)
+    i = np.clip(np.searchsorted(grid, values) - 1, 0, grid.size - 2)
+    return i, np.clip((values - grid[i]) / (grid[i + 1] - grid[i]), 0.0, 1.0)
+
+
+def _grid_ratio(h: float, b: float, c: float, t: np.ndarray, slenderness: np.ndarray) -> np.ndarray:
+    """Se/S ของหน้าตัดเดียวที่ t และ √(Fy/E) หลายค่า — คำนวณบนตาราง t × √(Fy/E) แล้วประมาณค่าแบบ bilinear"""
+    t_grid = _grid(t, _THICKNESS_POINTS)
+    s_grid = _grid(slenderness, _GRID_POINTS)
+    table = effective_section(h, b, c, t_grid[:, None], s_grid[None, :] ** 2, 1.0)["ratio"]
+    table = np.broadcast_to(table, (t_grid.size, s_grid.size))
+    i, u = _interp_weights(t, t_grid)
+    j, v = _interp_weights(slenderness, s_grid)
+    i1, j1 = np.minimum(i + 1, t_grid.size - 1), np.minimum(j + 1, s_grid.size - 1)
+    return ((1 - u) * ((1 - v) * table[i, j] + v * table[i, j1])
+            + u * ((1 - v) * table[i1, j] + v * table[i1, j1]))
+
+
+def effective_ratio(h, b, c, t, Fy, E=2.04e6) -> np.ndarray:
+    """
+    Se/S ของหน้าตัด (array ที่ broadcast กันได้ — ขนาดหน้าตัด mm, Fy / E ksc)
+
+      หน้าตัดเดียว + Fy เดียว  → cache ต่อ (หน้าตัด, Fy, E)
+      หลายหน้าตัด + Fy เดียว   → cache ต่อทั้งตาราง
+      h, b, c เดียว + t / Fy หลายค่า (Monte Carlo) → คำนวณบนตาราง t × √(Fy/E) แล้วประมาณค่าในช่วง
+      (Se/S ขึ้นกับ Fy / E ผ่าน √(Fy/E) เท่านั้น)
+    """
+    dims = [np.asarray(v, dtype=float) for v in (h, b, c, t)]
+    Fy, E = np.broadcast_arrays(np.asarray(Fy, dtype=float), np.asarray(E, dtype=float))
+    shape = np.broadcast_shapes(*(v.shape for v in dims), Fy.shape)
+    single = all(v.size == 1 for v in dims)
+
+    if single and Fy.size == 1:
+        key = tuple(float(v.flat[0]) for v in dims) + (float(Fy.flat[0]), float(E.flat[0]))
+        ratio = _remember(_CACHE, key, lambda: float(effective_section(*key)["ratio"]), _MAX_CACHED)
+        return np.full(shape, ratio)
+
+    if all(v.size == 1 for v in dims[:3]) and max(dims[3].size, Fy.size) > _GRID_POINTS:
+        t_all = np.broadcast_to(dims[3], shape)
+        slenderness = np.broadcast_to(np.sqrt(Fy / E), shape)
+        return _grid_ratio(*(float(v.flat[0]) for v in dims[:3]), t_all, slenderness)
+
+    dims = np.broadcast_arrays(*dims)
+    if Fy.size == 1:
+        fy, e = float(Fy.flat[0]), float(E.flat[0])
+        key = tuple(v.tobytes() for v in dims) + (dims[0].shape, fy, e)
+        ratio = _remember(_CATALOGS, key, lambda: effective_section(*dims, fy, e)["ratio"], _MAX_CATALOGS)
+        return np.broadcast_to(ratio, shape)
+
+    return effective_section(*dims, Fy, E)["ratio"]
+
+
+def section_dimensions(section: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    h, b, c, t ของหน้าตัดใน section_data — None ถ้าไม่ใช่ตัวซี / ตัวแซดที่ทราบขนาด
+
+    ใช้คีย์ h, b, c, t ถ้ามีครบ มิฉะนั้นอ่านจากชื่อ (name / Section) รูปแบบ C-h×b×c×t หรือ Z-h×b×c×t
+    """
+    if all(section.get(k) is not None for k in DIMENSIONS):
+        return {k: section[k] for k in DIMENSIONS}
+    name = section.get("name") or section.get("Section")
+    if not isinstance(name, str) or name.strip()[:1].upper() not in ("C", "Z") or "+" in name:
+        return None  # ไม่ใช่ตัวซี / ตัวแซดเดี่ยว (เช่นหน้าตัดประกอบ)
+    dims = name_dimensions(name)
+    if dims is None:
+        return None
+    dims.update({k: section[k] for k in ("h", "t") if section.get(k) is not None})
+    return dims
+
+
+def catalog_dimensions(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    h, b, c, t ของทุกแถว (คอลัมน์ของตาราง ค่าที่ขาดอ่านจากชื่อหน้าตัด)
+
+    None ถ้ามีแถวที่ไม่ทราบขนาด หรือเป็นตารางหน้าตัดประกอบ (มีคอลัมน์ b แต่ไม่มี c)
+    """
+    if "b" in df and "c" not in df:
+        return None
+    dims = pd.DataFrame({k: pd.to_numeric(df[k], errors="coerce") if k in df else np.nan for k in DIMENSIONS},
+                        index=df.index)
+    if dims.isna().any(axis=None) and "Section" in df:
+        dims = dims.fillna(dimensions_from_names(df["Section"]))
+    return None if dims.empty or dims.isna().any(axis=None) else dims
+
+
+def catalog_effective(df: pd.DataFrame, Fy: float, E: float = 2.04e6) -> pd.DataFrame:
+    """หน้าตัดประสิทธิผลของทั้งตาราง (คอลัมน์ h, b, c, t หรือชื่อหน้าตัด) — Se = (Se/S)·Sx ของตาราง"""
+    dims = catalog_dimensions(df)
+    if dims is None:
+        raise ValueError("ตารางต้องมีขนาด h, b, c, t (คอลัมน์หรือชื่อหน้าตัด)")
+    res = effective_section(*(dims[k].to_numpy() for k in DIMENSIONS), Fy, E)
+    out = pd.DataFrame({k: res[k] for k in ("ratio", "b_flange", "ds_lip", "b1", "b2", "k_flange")},
+                       index=df.index)
+    table_s = df["Sx"] if "Sx" in df else df["Zx"] if "Zx" in df else None
+    if table_s is not None:
+        out.insert(0, "Se", table_s.to_numpy(dtype=float) * res["ratio"])
+    if "Section" in df:
+        out.insert(0, "Section", df["Section"])
+    return out
@@ -1,16 +1,6 @@
-import pdfplumber
+from pdf_tables import PDF_PATH, DUMP_FILE, extract, write_dump
 
-pdf_path = "มอก. 1228-2549 เหล็กโครงสร้างรูปพรรณขึ้นรูปเย็น.pdf"
+pdf_path = PDF_PATH
 
-with open("tables_dump.txt", "w", encoding="utf-8") as f:
-    with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages):
-            tables = page.extract_tables()
-            if tables:
-                f.write(f"\n--- Page {i+1} Found {len(tables)} tables ---\n")
-                for j, table in enumerate(tables):
-                    f.write(f"Table {j+1}:\n")
-                    for row in table:
-                        # Clean row for readability
-                        clean_row = [str(cell).replace('\n', ' ') if cell else "" for cell in row]
-                        f.write(str(clean_row) + "\n")
+# ดึงแบบขนานและใช้ cache ต่อหน้า (.pdf_cache) — รันซ้ำไม่ต้องเปิด PDF อีก
+write_dump(extract(pdf_path), DUMP_FILE)
@@ -0,0 +1,472 @@
+"""
+finite_strip.py
+แรงโก่งเดาะยืดหยุ่นของหน้าตัดขึ้นรูปเย็นด้วยวิธี finite strip กึ่งวิเคราะห์ (แบบ CUFSM)
+และกำลังรับตาม Direct Strength Method (AISI S100-16 E2–E4, F2–F4)
+
+  - lipped_channel: แบ่งเส้นกึ่งกลางตัวซีมีขอบพับ (มุมแหลม เหมือน effective_width) เป็น strip
+  - load_factors: strip ปลายยึดหมุน (sin(πy/L) หนึ่งครึ่งคลื่น) — แต่ละ strip มี u, v เชิงเส้นและ w แบบ Hermite
+    เมทริกซ์ความแข็ง K(L) = K0 + kK1 + k²K2 + k⁴K4 (k = π/L) ประกอบครั้งเดียวต่อหน้าตัด
+    ปัญหาค่าเฉพาะ K φ = λ Kg φ แก้แบบ Cholesky: K = LLᵀ → eigvalsh(L⁻¹ Kg L⁻ᵀ) ทุกความยาวพร้อมกัน
+    (โนดเรียงตามเส้นรอบหน้าตัด เมทริกซ์จึงเป็นแถบกว้าง 8 DOF — ขนาด ~80 DOF ใช้ stack แบบหนาแน่นของ NumPy)
+  - signature_curve: Fcr/E ที่ความยาวครึ่งคลื่น 5 mm – 20 m คำนวณครั้งเดียวต่อ (หน้าตัด, ชนิดแรง)
+    เก็บใน .fsm_cache/<sha256 ของคีย์>.json และ LRU ในหน่วยความจำ — Fcr/E ไม่ขึ้นกับ Fy และ E
+  - critical_stresses: local = จุดต่ำสุดแรก (ครึ่งคลื่นสั้น), distortional = จุดต่ำสุดถัดไป,
+    global = ค่าบน curve ที่ความยาวชิ้นส่วน (ไม่ระบุ = ยึดรั้งต่อเนื่อง)
+  - dsm_flexure / dsm_compression: อัตราส่วน Mn/My และ Pn/Py — คลาสออกแบบคูณกับ Fy·Zx ของตารางแบบเดียวกับ Se/S
+
+ตัวแซดใช้แบบจำลองตัวซีขนาดเดียวกัน (ดัดแบบยึดรั้งรอบแกนเรขาคณิต — local และ distortional ใกล้เคียงกัน)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from effective_width import effective_ratio
+
+LOAD_TYPES = {
+    "bending": "ดัดรอบแกน x (ปีกบนรับแรงอัด)",
+    "compression": "แรงอัดสม่ำเสมอ",
+}
+FLEXURE_METHODS = {
+    "effective_width": "วิธีความกว้างประสิทธิผล (AISI S100 F3.1)",
+    "dsm": "Direct Strength Method (finite strip, AISI S100 F3.2 / F4)",
+}
+POISSON = 0.3
+LENGTHS = np.geomspace(5.0, 20000.0, 90)  # ความยาวครึ่งคลื่น (mm) ของ signature curve
+STRIPS = {"web": 8, "flange": 4, "lip": 2}
+CACHE_DIR = ".fsm_cache"
+CACHE_VERSION = 1  # เพิ่มเมื่อเปลี่ยนสูตร strip / การแบ่ง / ช่วงความยาว (cache เดิมจะไม่ถูกใช้)
+_GAUSS = np.polynomial.legendre.leggauss(4)
+_PROMINENCE = 1.01  # จุดต่ำสุดต้องมีค่าที่สูงกว่า ≥ 1% ทางความยาวที่ยาวกว่า (ตัดสัญญาณรบกวนเชิงตัวเลข)
+_SHOULDER_SLOPE = 0.5  # ความชัน log–log สูงสุดของไหล่ curve ที่ถือเป็น distortional เมื่อไม่มีจุดต่ำสุดที่สอง
+_THICKNESS_STEP = np.log(1.04)  # ระยะจุด log t ที่คงที่เมื่อความหนาสุ่ม (Monte Carlo) — จุดเดิมทุกรอบ จึงใช้ cache ได้
+_MAX_CACHED = 256
+
+
+# ─────────────────────────────────────────────────────────────
+# แบบจำลอง strip
+# ─────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class StripModel:
+    """โนด (x, y mm) เรียงตามเส้นรอบหน้าตัด, strip (โนดต้น, โนดปลาย), ความหนา และหน่วยแรงอ้างอิงที่โนด (อัดเป็นบวก)"""
+
+    nodes: np.ndarray
+    elements: np.ndarray
+    t: float
+    stress: np.ndarray
+
+
+def _polyline(points: List[Tuple[float, float]], divisions: List[int]) -> np.ndarray:
+    out = [np.asarray(points[0], dtype=float)]
+    for p0, p1, n in zip(points[:-1], points[1:], divisions):
+        steps = np.linspace(0.0, 1.0, n + 1)[1:, None]
+        out.extend(np.asarray(p0) + steps * (np.asarray(p1) - np.asarray(p0)))
+    return np.vstack(out)
+
+
+def lipped_channel(h: float, b: float, c: float, t: float, load: str = "bending") -> StripModel:
+    """
+    ตัวซีมีขอบพับ (c = 0 คือไม่มีขอบพับ) ขนาดภายนอก mm — เส้นกึ่งกลางมุมแหลม
+
+    load: 'bending' หน่วยแรง = y/(h/2) (ผิวนอกปีกบน = 1), 'compression' หน่วยแรง = 1 ทุกโนด
+    """
+    if load not in LOAD_TYPES:
+        raise ValueError(f"ไม่รู้จักชนิดแรง '{load}' (ที่รองรับ: {', '.join(LOAD_TYPES)})")
+    if min(h, b, t) <= 0 or c < 0 or 2 * t >= min(h, b):
+        raise ValueError("ขนาดหน้าตัดไม่ถูกต้องสำหรับ finite strip")
+    yf, xf = (h - t) / 2, b - t
+    points = [(xf, yf), (0.0, yf), (0.0, -yf), (xf, -yf)]
+    divisions = [STRIPS["flange"], STRIPS["web"], STRIPS["flange"]]
+    if c > 0:
+        lip = c - t / 2
+        points = [(xf, yf - lip)] + points + [(xf, -yf + lip)]
+        divisions = [STRIPS["lip"]] + divisions + [STRIPS["lip"]]
+    nodes = _polyline(points, divisions)
+    elements = np.column_stack([np.arange(len(nodes) - 1), np.arange(1, len(nodes))])
+    stress = nodes[:, 1] / (h / 2) if load == "bending" else np.ones(len(nodes))
+    return StripModel(nodes, elements, float(t), stress)
+
+
+# ─────────────────────────────────────────────────────────────
+# เมทริกซ์ของ strip (E = 1, หน่วย mm)
+# ─────────────────────────────────────────────────────────────
+def _local_matrices(width: np.ndarray, t: float, s1: np.ndarray, s2: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    เมทริกซ์ของ strip ในพิกัดเฉพาะที่ [u1 v1 w1 θ1 u2 v2 w2 θ2] แยกตามกำลังของ k = π/L
+
+    u (ตามความกว้าง) = N·u sin ky, v (ตามยาว) = N·v cos ky, w (ตั้งฉาก) = H·w sin ky
+    ตัวประกอบ L/2 จากการอินทิเกรตตามยาวตัดกันระหว่าง K และ Kg จึงไม่ใส่
+    """
+    xi, weight = _GAUSS
+    s = (xi + 1.0) / 2.0
+    w = weight / 2.0
+    b = width[:, None]
+    ones = np.ones_like(b)
+    n1, n2 = (1.0 - s) * ones, s * ones
+    h1, h2 = 1 - 3 * s ** 2 + 2 * s ** 3, b * (s - 2 * s ** 2 + s ** 3)
+    h3, h4 = 3 * s ** 2 - 2 * s ** 3, b * (s ** 3 - s ** 2)
+    d1, d2 = (6 * s ** 2 - 6 * s) / b, 1 - 4 * s + 3 * s ** 2
+    d3, d4 = (6 * s - 6 * s ** 2) / b, 3 * s ** 2 - 2 * s
+    dd1, dd2 = (12 * s - 6) / b ** 2, (6 * s - 4) / b
+    dd3, dd4 = (6 - 12 * s) / b ** 2, (6 * s - 2) / b
+
+    def dofs(**entries) -> np.ndarray:
+        out = np.zeros(b.shape[:1] + s.shape + (8,))
+        index = {"u1": 0, "v1": 1, "w1": 2, "t1": 3, "u2": 4, "v2": 5, "w2": 6, "t2": 7}
+        for name, value in entries.items():
+            out[..., index[name]] = value * ones
+        return out
+
+    a = dofs(u1=-1 / b, u2=1 / b)                       # εx = a·d
+    bv = dofs(v1=-n1, v2=-n2)                           # εy = k bv·d
+    c1, c0 = dofs(u1=n1, u2=n2), dofs(v1=-1 / b, v2=1 / b)  # γxy = (k c1 + c0)·d
+    ex = dofs(w1=-dd1, t1=-dd2, w2=-dd3, t2=-dd4)      # κx = ex·d
+    fy = dofs(w1=h1, t1=h2, w2=h3, t2=h4)               # κy = k² fy·d
+    gxy = dofs(w1=-2 * d1, t1=-2 * d2, w2=-2 * d3, t2=-2 * d4)  # κxy = k gxy·d
+    nu_, nv_ = c1, dofs(v1=n1, v2=n2)
+
+    def integral(p, q):
+        return np.einsum("egi,egj,g->eij", p, q, w) * width[:, None, None]
+
+    def weighted(p, q, field):
+        return np.einsum("egi,egj,eg,g->eij", p, q, field, w) * width[:, None, None]
+
+    em = t / (1 - POISSON ** 2)
+    g = t / (2 * (1 + POISSON))
+    d = t ** 3 / (12 * (1 - POISSON ** 2))
+    gt3 = t ** 3 / (24 * (1 + POISSON))
+
+    def sym(p, q):
+        return integral(p, q) + integral(q, p)
+
+    sigma = s1[:, None] * n1 + s2[:, None] * n2
+    return {
+        "K0": em * integral(a, a) + g * integral(c0, c0) + d * integral(ex, ex),
+        "K1": em * POISSON * sym(a, bv) + g * sym(c1, c0),
+        "K2": em * integral(bv, bv) + g * integral(c1, c1) + d * POISSON * sym(ex, fy) + gt3 * integral(gxy, gxy),
+        "K4": d * integral(fy, fy),
+        "G2": t * (weighted(nu_, nu_, sigma) + weighted(nv_, nv_, sigma) + weighted(fy, fy, sigma)),
+    }
+
+
+def global_matrices(model: StripModel) -> Dict[str, np.ndarray]:
+    """ประกอบเมทริกซ์ทั้งหน้าตัด (DOF ต่อโนด: X, Y, v, θ)"""
+    i, j = model.elements[:, 0], model.elements[:, 1]
+    delta = model.nodes[j] - model.nodes[i]
+    width = np.hypot(delta[:, 0], delta[:, 1])
+    cos, sin = delta[:, 0] / width, delta[:, 1] / width
+    local = _local_matrices(width, model.t, model.stress[i], model.stress[j])
+
+    # local [u, v, w, θ] = R · global [X, Y, v, θ]
+    R = np.zeros((len(width), 4, 4))
+    R[:, 0, 0], R[:, 0, 1] = cos, sin
+    R[:, 1, 2] = 1.0
+    R[:, 2, 0], R[:, 2, 1] = -sin, cos
+    R[:, 3, 3] = 1.0
+    T = np.zeros((len(width), 8, 8))
+    T[:, :4, :4] = T[:, 4:, 4:] = R
+
+    n = 4 * len(model.nodes)
+    index = np.concatenate([4 * i[:, None] + np.arange(4), 4 * j[:, None] + np.arange(4)], axis=1)
+    rows, cols = index[:, :, None], index[:, None, :]
+    out = {}
+    for name, k in local.items():
+        assembled = np.zeros((n, n))
+        np.add.at(assembled, (rows, cols), np.einsum("eki,ekl,elj->eij", T, k, T))
+        out[name] = assembled
+    return out
+
+
+def load_factors(model: StripModel, lengths) -> np.ndarray:
+    """
+    ตัวคูณแรงวิกฤตต่ำสุด (= Fcr/E ของหน่วยแรงอ้างอิง) ที่แต่ละความยาวครึ่งคลื่น (mm)
+
+    K ของ strip ปลายยึดหมุนเป็นบวกแน่นอนทุกความยาว จึงใช้ Cholesky แปลงเป็นปัญหามาตรฐานสมมาตร
+    แล้วหา 1/λ ที่มากที่สุด (ไม่มีค่าบวก = ไม่โก่งเดาะภายใต้แรงนี้ → inf)
+    """
+    lengths = np.atleast_1d(np.asarray(lengths, dtype=float))
+    m = global_matrices(model)
+    k = (np.pi / lengths)[:, None, None]
+    K = m["K0"] + k * m["K1"] + k ** 2 * m["K2"] + k ** 4 * m["K4"]
+    Kg = k ** 2 * m["G2"]
+    inverse = np.linalg.inv(np.linalg.cholesky(K))
+    standard = inverse @ Kg @ np.swapaxes(inverse, 1, 2)
+    mu = np.linalg.eigvalsh(standard)[:, -1]
+    with np.errstate(divide="ignore"):
+        return np.where(mu > 0, 1.0 / mu, np.inf)
+
+
+# ─────────────────────────────────────────────────────────────
+# signature curve (cache บนดิสก์ + หน่วยความจำ)
+# ─────────────────────────────────────────────────────────────
+class CurveCache:
+    """cache ของ signature curve: <root>/<sha256 ของคีย์>.json (เขียนแบบ atomic เหมือน pdf_tables.PageCache)"""
+
+    def __init__(self, root: str = CACHE_DIR) -> None:
+        self.root = root
+
+    def _path(self, key: Tuple) -> str:
+        digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, f"{digest[:24]}.json")
+
+    def get(self, key: Tuple) -> Optional[np.ndarray]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None  # ไม่มีหรือไฟล์เสีย → คำนวณใหม่
+        if entry.get("key") != list(key) or len(entry.get("factors", ())) != len(LENGTHS):
+            return None
+        return np.array([np.inf if v is None else v for v in entry["factors"]], dtype=float)
+
+    def put(self, key: Tuple, factors: np.ndarray) -> None:
+        entry = {"key": list(key), "lengths": LENGTHS.tolist(),
+                 "factors": [None if not np.isfinite(v) else float(v) for v in factors]}
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            pass  # โฟลเดอร์เขียนไม่ได้ — ยังใช้ cache ในหน่วยความจำได้
+
+
+_CURVES: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+_DISK = CurveCache()
+
+
+def _curve_key(h: float, b: float, c: float, t: float, load: str) -> Tuple:
+    dims = tuple(round(float(v), 4) for v in (h, b, c, t))
+    return ("C",) + dims + (load, CACHE_VERSION, *sorted(STRIPS.values()), len(LENGTHS))
+
+
+def signature_curve(h: float, b: float, c: float, t: float, load: str = "bending",
+                    persist: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (ความยาวครึ่งคลื่น mm, Fcr/E) ของตัวซี — คำนวณครั้งเดียวต่อ (หน้าตัด, ชนิดแรง)
+
+    persist=False: ไม่อ่าน/เขียน cache บนดิสก์ (เช่นทดลองขนาดชั่วคราว)
+    """
+    key = _curve_key(h, b, c, t, load)
+    factors = _CURVES.get(key)
+    if factors is None:
+        factors = _DISK.get(key) if persist else None
+        if factors is None:
+            factors = load_factors(lipped_channel(*key[1:5], load), LENGTHS)
+            if persist:
+                _DISK.put(key, factors)
+        _CURVES[key] = factors
+        while len(_CURVES) > _MAX_CACHED:
+            _CURVES.popitem(last=False)
+    else:
+        _CURVES.move_to_end(key)
+    return LENGTHS, factors
+
+
+def buckling_minima(lengths: np.ndarray, factors: np.ndarray) -> List[Tuple[float, float]]:
+    """
+    จุดต่ำสุดเฉพาะที่ของ signature curve [(ความยาวครึ่งคลื่น, Fcr/E), ...] เรียงตามความยาว
+
+    ปรับตำแหน่งด้วยพาราโบลาผ่านสามจุดในสเกล log–log
+    """
+    x, y = np.log(lengths), np.log(factors)
+    out = []
+    for i in range(1, len(y) - 1):
+        if not (y[i] < y[i - 1] and y[i] <= y[i + 1]):
+            continue
+        if np.exp(y[i + 1:].max() - y[i]) < _PROMINENCE:
+            continue
+        a, b, c = np.polyfit(x[i - 1:i + 2], y[i - 1:i + 2], 2)
+        xm = -b / (2 * a) if a > 0 else x[i]
+        xm = float(np.clip(xm, x[i - 1], x[i + 1]))
+        out.append((float(np.exp(xm)), float(np.exp(min(np.polyval((a, b, c), xm), y[i])))))
+    return out
+
+
+def _shoulder(lengths: np.ndarray, factors: np.ndarray, start: float) -> Optional[Tuple[float, float]]:
+    """
+    ไหล่ของ curve หลังจุดต่ำสุดแรก (จุดที่ชันน้อยที่สุดก่อนยอด) — distortional ที่ไม่แยกเป็นจุดต่ำสุด
+
+    ตัวซีบางรับแรงอัด (เช่น 9CS2.5x059) curve ขึ้นต่อจาก local โดยไม่ลดลงก่อนถึง global
+    จึงอ่านค่าที่จุดเปลี่ยนความโค้งแบบเดียวกับการอ่าน signature curve ของ CUFSM
+    """
+    x, y = np.log(lengths), np.log(factors)
+    lo = int(np.searchsorted(lengths, start)) + 1
+    hi = lo + int(np.argmax(y[lo:])) if lo < len(y) else lo
+    slope = np.gradient(y, x)
+    inner = [i for i in range(lo + 1, hi - 1)
+             if slope[i] < slope[i - 1] and slope[i] <= slope[i + 1] and 0 <= slope[i] < _SHOULDER_SLOPE]
+    if not inner:
+        return None
+    i = min(inner, key=lambda j: slope[j])
+    return float(lengths[i]), float(factors[i])
+
+
+def critical_stresses(h: float, b: float, c: float, t: float, load: str = "bending",
+                      length: Optional[float] = None, persist: bool = True) -> Dict[str, float]:
+    """
+    Fcr/E ของการโก่งเดาะแต่ละแบบ (หน่วยแรงอ้างอิง: ผิวนอกปีกบนเมื่อดัด, หน่วยแรงเฉลี่ยเมื่อรับแรงอัด)
+
+    Returns:
+        dict: local, distortional, global และ L_local, L_distortional (mm)
+              ไม่มีจุดต่ำสุดที่สอง → ใช้ไหล่ของ curve, ไม่มีไหล่ (เช่นไม่มีขอบพับ) → distortional = inf
+              length = None → global = inf (ยึดรั้งต่อเนื่อง)
+    """
+    lengths, factors = signature_curve(h, b, c, t, load, persist)
+    minima = buckling_minima(lengths, factors)
+    if not minima:
+        i = int(np.argmin(factors))
+        minima = [(float(lengths[i]), float(factors[i]))]
+    (l_local, local) = minima[0]
+    dist = minima[1] if len(minima) > 1 else (_shoulder(lengths, factors, l_local) or (np.nan, np.inf))
+    glob = np.inf
+    if length is not None:
+        if lengths[0] <= length <= lengths[-1]:
+            glob = float(np.exp(np.interp(np.log(length), np.log(lengths), np.log(factors))))
+        else:
+            glob = float(load_factors(lipped_channel(h, b, c, t, load), [length])[0])
+    return {"local": local, "distortional": dist[1], "global": glob,
+            "L_local": l_local, "L_distortional": dist[0]}
+
+
+# ─────────────────────────────────────────────────────────────
+# Direct Strength Method
+# ─────────────────────────────────────────────────────────────
+def _flexure_ratios(local, dist, glob, Fy, E) -> Dict[str, np.ndarray]:
+    """Mn/My จาก Fcr/E (array ที่ broadcast กันได้) — AISI S100-16 F2.1, F3.2.1, F4.1"""
+    mcrl, mcrd, mcre = (np.asarray(v, dtype=float) * E / Fy for v in (local, dist, glob))
+    mne = np.where(mcre > 2.78, 1.0,
+                   np.where(mcre > 0.56, 10.0 / 9.0 * (1.0 - 10.0 / (36.0 * mcre)), mcre))
+    with np.errstate(divide="ignore"):
+        rl = (mcrl / mne) ** 0.4
+        rd = mcrd ** 0.5
+    mnl = np.where(np.sqrt(mne / mcrl) <= 0.776, mne, (1.0 - 0.15 * rl) * rl * mne)
+    mnd = np.where(np.sqrt(1.0 / mcrd) <= 0.673, 1.0, (1.0 - 0.22 * rd) * rd)
+    return {"Mcrl_My": mcrl, "Mcrd_My": mcrd, "Mcre_My": mcre, "Mne_My": mne, "Mnl_My": mnl,
+            "Mnd_My": mnd, "ratio": np.minimum(mnl, mnd)}
+
+
+def dsm_flexure(h: float, b: float, c: float, t: float, Fy: float, E: float = 2.04e6,
+                length: Optional[float] = None) -> Dict[str, float]:
+    """
+    กำลังดัดระบุตาม DSM ในรูปอัตราส่วนต่อ My = Fy·S (ปีกบนรับแรงอัด)
+
+    length: ระยะไม่ค้ำยันด้านข้าง mm (None = ปีกรับแรงอัดยึดกับแผ่นหลังคา / พื้น → Mne = My)
+
+    Returns:
+        dict: Mcrl_My, Mcrd_My, Mcre_My, Mne_My, Mnl_My, Mnd_My, ratio = Mn/My, L_local, L_distortional
+    """
+    cr = critical_stresses(h, b, c, t, "bending", length)
+    out = {k: float(v) for k, v in _flexure_ratios(cr["local"], cr["distortional"], cr["global"], Fy, E).items()}
+    out.update(L_local=cr["L_local"], L_distortional=cr["L_distortional"])
+    return out
+
+
+def dsm_compression(h: float, b: float, c: float, t: float, Fy: float, E: float = 2.04e6,
+                    length: Optional[float] = None) -> Dict[str, float]:
+    """
+    กำลังรับแรงอัดระบุตาม DSM ในรูปอัตราส่วนต่อ Py = Fy·A — AISI S100-16 E2, E3.2, E4.1
+
+    length: ความยาวประสิทธิผล mm (None = ยึดรั้งต่อเนื่อง → Pne = Py)
+
+    Returns:
+        dict: Pcrl_Py, Pcrd_Py, Pcre_Py, Pne_Py, Pnl_Py, Pnd_Py, ratio = Pn/Py, L_local, L_distortional
+    """
+    cr = critical_stresses(h, b, c, t, "compression", length)
+    pcrl, pcrd, pcre = (cr[k] * E / Fy for k in ("local", "distortional", "global"))
+    lam_c = np.sqrt(1.0 / pcre)
+    pne = 0.658 ** (lam_c ** 2) if lam_c <= 1.5 else 0.877 / lam_c ** 2
+    rl, rd = (pcrl / pne) ** 0.4, pcrd ** 0.6
+    pnl = pne if np.sqrt(pne / pcrl) <= 0.776 else (1.0 - 0.15 * rl) * rl * pne
+    pnd = 1.0 if np.sqrt(1.0 / pcrd) <= 0.561 else (1.0 - 0.25 * rd) * rd
+    return {"Pcrl_Py": pcrl, "Pcrd_Py": pcrd, "Pcre_Py": pcre, "Pne_Py": float(pne), "Pnl_Py": float(pnl),
+            "Pnd_Py": float(pnd), "ratio": float(min(pnl, pnd)),
+            "L_local": cr["L_local"], "L_distortional": cr["L_distortional"]}
+
+
+def _critical_arrays(h, b, c, t) -> Tuple[np.ndarray, np.ndarray]:
+    """Fcr/E (local, distortional) ของหน้าตัดดัดแบบ array — หนึ่ง curve ต่อหน้าตัดที่ไม่ซ้ำกัน"""
+    dims = [np.asarray(v, dtype=float) for v in (h, b, c, t)]
+    logs = np.log(dims[3])
+    steps = np.arange(np.floor(logs.min() / _THICKNESS_STEP), np.ceil(logs.max() / _THICKNESS_STEP) + 1)
+    if all(v.size == 1 for v in dims[:3]) and dims[3].size > steps.size:
+        # ความหนาสุ่ม: ประมาณค่าในช่วงแบบ log–log จาก curve ที่ t = exp(kΔ) ครอบช่วงตัวอย่าง
+        fixed = [float(v.flat[0]) for v in dims[:3]]
+        grid = np.exp(steps * _THICKNESS_STEP)
+        table = np.array([[critical_stresses(*fixed, tg)[k] for k in ("local", "distortional")] for tg in grid])
+        table = np.where(np.isfinite(table), table, 1.0)  # ไม่มีแบบ distortional ที่บางจุด → Fcr ≫ Fy
+        return tuple(np.exp(np.interp(logs, np.log(grid), np.log(col))) for col in table.T)
+    dims = np.broadcast_arrays(*dims)
+    rows, inverse = np.unique(np.stack([v.ravel() for v in dims], axis=1), axis=0, return_inverse=True)
+    table = np.array([[critical_stresses(*row)[k] for k in ("local", "distortional")] for row in rows])
+    inverse = inverse.reshape(-1)
+    return tuple(col[inverse].reshape(dims[0].shape) for col in table.T)
+
+
+def flexural_ratio(h, b, c, t, Fy, E=2.04e6, method: str = "effective_width") -> np.ndarray:
+    """
+    Mn/(Fy·S) ของตัวซี / ตัวแซดดัดรอบแกน x ตามวิธีที่เลือก (array ที่ broadcast กันได้)
+
+      effective_width → Se/S (effective_width.effective_ratio)
+      dsm             → min(Mnl, Mnd)/My ตาม DSM โดยปีกรับแรงอัดยึดรั้ง (Mne = My)
+    """
+    if method == "effective_width":
+        return effective_ratio(h, b, c, t, Fy, E)
+    if method != "dsm":
+        raise ValueError(f"ไม่รู้จักวิธีคำนวณกำลังดัด '{method}' (ที่รองรับ: {', '.join(FLEXURE_METHODS)})")
+    local, dist = _critical_arrays(h, b, c, t)
+    return _flexure_ratios(local, dist, np.inf, np.asarray(Fy, dtype=float), np.asarray(E, dtype=float))["ratio"]
+
+
+def log_flexure_steps(log, dims: Optional[Mapping[str, Any]], Zx: float, Fy: float, E: float,
+                      method: str = "effective_width") -> Dict[str, float]:
+    """
+    ขั้นตอนลดกำลังดัดจากการโก่งเดาะเฉพาะที่ของคลาสออกแบบ → {'ratio', ...} (ratio = 1 ถ้าไม่ทราบขนาดหน้าตัด)
+
+    ผลคูณ ratio·Zx ใช้แทน Zx ในกำลังดัด (Se เทียบเท่า)
+    """
+    if method not in FLEXURE_METHODS:
+        raise ValueError(f"ไม่รู้จักวิธีคำนวณกำลังดัด '{method}' (ที่รองรับ: {', '.join(FLEXURE_METHODS)})")
+    if dims is None:
+        return {"ratio": 1.0}
+    h, b, c, t = (float(dims[k]) for k in ("h", "b", "c", "t"))
+    if method == "effective_width":
+        ratio = float(effective_ratio(h, b, c, t, Fy, E))
+        log.add_step(
+            "โมดูลัสหน้าตัดประสิทธิผล (AISI S100 วิธีความกว้างประสิทธิผล)",
+            r"S_e = \frac{S_e}{S} \times Z_x",
+            f"= {ratio:.3f} \\times {Zx:.2f}",
+            f"= {ratio * Zx:.2f}\\,\\text{{cm}}^3",
+            note=("ปีก ขอบพับ และเอวมีประสิทธิผลเต็มที่ F_y" if ratio >= 1.0
+                  else "ชิ้นส่วนบางโก่งเดาะเฉพาะที่ก่อนคราก — ใช้หน้าตัดประสิทธิผล")
+        )
+        return {"ratio": ratio}
+
+    dsm = dsm_flexure(h, b, c, t, Fy, E)
+    dist = (f"{dsm['Mcrd_My']:.2f}\\;(L = {dsm['L_distortional']:.0f}\\,\\text{{mm}})"
+            if np.isfinite(dsm["Mcrd_My"]) else r"\infty")
+    log.add_step(
+        "แรงโก่งเดาะยืดหยุ่นจาก finite strip (signature curve)",
+        r"M_{crl}/M_y,\; M_{crd}/M_y",
+        f"= {dsm['Mcrl_My']:.2f}\\;(L = {dsm['L_local']:.0f}\\,\\text{{mm}}),\\; {dist}",
+        f"M_y = F_y Z_x = {Fy * Zx / 100.0:.1f}\\,\\text{{kg-m}}",
+        note="local = จุดต่ำสุดแรกของ signature curve, distortional = จุดต่ำสุดถัดไป"
+    )
+    ratio = dsm["ratio"]
+    log.add_step(
+        "กำลังดัดระบุตาม Direct Strength Method (AISI S100 F3.2 / F4)",
+        r"S_e = \frac{\min(M_{nl}, M_{nd})}{M_y} \times Z_x",
+        f"= \\min({dsm['Mnl_My']:.3f}, {dsm['Mnd_My']:.3f}) \\times {Zx:.2f}",
+        f"= {ratio * Zx:.2f}\\,\\text{{cm}}^3",
+        note="ปีกรับแรงอัดยึดรั้งด้านข้าง (M_ne = M_y)"
+    )
+    return {"ratio": ratio, **{k: dsm[k] for k in ("Mcrl_My", "Mcrd_My", "Mnl_My", "Mnd_My")}}
@@ -0,0 +1,250 @@
+"""
+inverse_design.py
+ออกแบบย้อนกลับ (Inverse Design): หาค่าสูงสุดของช่วงพาด ระยะห่าง หรือน้ำหนักบรรทุก
+ที่ทุกสภาวะขีดจำกัดของหน้าตัดยังผ่าน — เช่น "C-125x50x20x3.2 ระยะแป 1.2 ม. พาดได้ไกลสุดเท่าไร"
+
+    PurlinDesign(section, geometry, loads, materials).max_span()        # ค่าเดี่ยว
+    solve_catalog("purlin", df, geometry, loads, materials, "span")     # ทั้งตารางหน้าตัดในครั้งเดียว
+
+ใช้ batch_checks ของแต่ละโมดูล (NumPy broadcasting) ทุกหน้าตัดแก้พร้อมกัน:
+  - รูปปิด (closed form): อัตราส่วนที่แปรตามกำลังของพารามิเตอร์ r(x) = r(x0)·(x/x0)^p
+      ช่วงพาดแป/คาน: M ∝ L², V ∝ L, Δ/(L/n) ∝ L³, น้ำขัง ∝ L⁴, แรงลมดูด ∝ L²
+      → x_max = min_k x0 · r_k^(-1/p_k)  แล้วตรวจซ้ำที่ x_max อีกครั้ง
+  - หน้าตัดที่รูปปิดใช้ไม่ได้ (camber, C_p/C_s ของชิ้นส่วนอื่น, ปีกไม่ค้ำยัน, LTB ของจันทัน,
+    ระยะห่าง/น้ำหนักที่มีน้ำหนักตัวเองหรือ combo ควบคุมเปลี่ยน) ใช้ regula falsi แบบ Illinois
+    บน f(x) = Max_Ratio(x) − 1 ภายในช่วง [lo, hi] ที่ครอบคำตอบ
+
+สมมติ Max_Ratio ไม่ลดลงเมื่อพารามิเตอร์เพิ่มขึ้นภายในช่วง [lo, hi]
+ผลลัพธ์เป็นค่าที่ตรวจแล้วว่าผ่าน (ด้านปลอดภัยของช่วงที่ครอบคำตอบ)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# สภาวะขีดจำกัดที่รวมอยู่ใน Max_Ratio ของ batch_checks
+CHECKS = ("Moment", "Shear", "Deflection", "Ponding", "Uplift", "WeakAxis", "Biaxial")
+
+# เลขชี้กำลังของอัตราส่วนแต่ละรายการเทียบกับพารามิเตอร์ (เฉพาะกรณีที่เป็น monomial)
+MONOMIAL_EXPONENTS: Dict[Tuple[str, str], Dict[str, float]] = {
+    ("purlin", "span"): {"Moment": 2, "Shear": 1, "Deflection": 3, "Ponding": 4, "Uplift": 2,
+                         "WeakAxis": 2, "Biaxial": 2},
+    ("beam", "span"): {"Moment": 2, "Shear": 1, "Deflection": 3, "Ponding": 4},
+}
+
+# ช่วงค้นหาปริยาย [lo, hi] (ม. หรือ กก./ตร.ม.; D, L, W ของคานเป็น กก./ม.)
+PARAMETER_BOUNDS: Dict[str, Tuple[float, float]] = {
+    "span": (0.3, 30.0),
+    "spacing": (0.05, 6.0),
+    "Lb": (0.1, 30.0),
+    "DL": (0.0, 2000.0),
+    "LL": (0.0, 2000.0),
+    "WL": (0.0, 2000.0),
+    "D": (0.0, 10000.0),
+    "L": (0.0, 10000.0),
+    "W": (0.0, 10000.0),
+}
+
+METHOD_LABELS = {
+    "closed-form": "รูปปิด",
+    "bracketed": "หารากในช่วง",
+    "upper-bound": "ผ่านถึงขอบบนของช่วงค้นหา",
+    "infeasible": "ไม่ผ่านแม้ขอบล่างของช่วงค้นหา",
+}
+
+
+def _engine(engine: str):
+    from parametric_sweep import ENGINES
+
+    try:
+        return ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"ไม่รู้จัก engine '{engine}' (ที่รองรับ: {', '.join(ENGINES)})") from None
+
+
+def _shape(base: Mapping[str, Any], parameter: str) -> Tuple[int, ...]:
+    shapes = [np.shape(v) for k, v in base.items()
+              if k != parameter and isinstance(v, (np.ndarray, pd.Series))]
+    return np.broadcast_shapes(*shapes) if shapes else ()
+
+
+def solve_max(engine: str, base: Mapping[str, Any], parameter: str, lo: Optional[float] = None,
+              hi: Optional[float] = None, *, rtol: float = 1e-6, max_iter: int = 60) -> Dict[str, np.ndarray]:
+    """
+    หาค่าสูงสุดของพารามิเตอร์ที่ Max_Ratio ≤ 1.0 (ทุกหน้าตัด/ทุกจุดพร้อมกัน)
+
+    Args:
+        engine: ชื่อ engine ใน parametric_sweep.ENGINES ('purlin', 'beam', 'rafter', ...)
+        base: อาร์กิวเมนต์ของ batch_checks (เช่นผลจาก purlin_inputs) — คุณสมบัติหน้าตัดเป็น array ได้
+        parameter: ชื่ออาร์กิวเมนต์ที่ต้องการหาค่าสูงสุด เช่น 'span', 'spacing', 'LL'
+        lo, hi: ช่วงค้นหา (ค่าปริยายจาก PARAMETER_BOUNDS)
+        rtol: ความคลาดเคลื่อนสัมพัทธ์ของคำตอบ
+        max_iter: จำนวนรอบสูงสุดของการหาราก
+
+    Returns:
+        dict ของ array รูปเดียวกับอินพุต: Value (NaN = ไม่ผ่านแม้ที่ lo), Max_Ratio ที่ Value,
+        Governing (สภาวะที่ควบคุม), Method (closed-form / bracketed / upper-bound / infeasible)
+        และ Iterations (จำนวนครั้งที่เรียก batch_checks)
+    """
+    func = _engine(engine)
+    if parameter not in base:
+        raise ValueError(f"อินพุตของ engine '{engine}' ไม่มีพารามิเตอร์ '{parameter}'")
+    default_lo, default_hi = PARAMETER_BOUNDS.get(parameter, (0.0, None))
+    lo = default_lo if lo is None else lo
+    hi = default_hi if hi is None else hi
+    if hi is None or not hi > lo:
+        raise ValueError(f"ช่วงค้นหาของ '{parameter}' ต้องมีขอบบนมากกว่าขอบล่าง")
+
+    shape = _shape(base, parameter)
+    calls = 0
+
+    def evaluate(x: np.ndarray) -> Dict[str, np.ndarray]:
+        nonlocal calls
+        calls += 1
+        return func(**{**base, parameter: x})
+
+    def ratio(res: Dict[str, np.ndarray]) -> np.ndarray:
+        return np.broadcast_to(np.asarray(res["Max_Ratio"], dtype=float), shape)
+
+    lo_arr = np.full(shape, float(lo))
+    hi_arr = np.full(shape, float(hi))
+    value = np.full(shape, np.nan)
+    method = np.full(shape, "", dtype=object)
+
+    # 1) รูปปิด: ประเมินที่ค่าปัจจุบัน x0 แล้วกลับสมการ r_k(x) = 1 ของแต่ละรายการ
+    exponents = MONOMIAL_EXPONENTS.get((engine, parameter))
+    x0 = np.broadcast_to(np.asarray(base[parameter], dtype=float), shape)
+    if exponents and np.all(x0 > 0):
+        res0 = evaluate(x0)
+        checks = [k for k in CHECKS if k in res0]
+        if all(k in exponents for k in checks):
+            with np.errstate(divide="ignore"):
+                limits = [x0 * np.abs(np.broadcast_to(res0[k], shape)) ** (-1.0 / exponents[k]) for k in checks]
+            candidate = np.clip(np.min(np.stack(limits), axis=0), lo_arr, hi_arr)
+            r = ratio(evaluate(candidate))
+            ok = (r <= 1.0 + rtol) & ((r >= 1.0 - rtol) | (candidate >= hi_arr))
+            value = np.where(ok, candidate, value)
+            method[ok] = np.where(candidate[ok] >= hi_arr[ok], "upper-bound", "closed-form")
+
+    # 2) หาราก Illinois สำหรับจุดที่เหลือ
+    todo = method == ""
+    if todo.any():
+        r_lo = ratio(evaluate(lo_arr))
+        r_hi = ratio(evaluate(hi_arr))
+        infeasible = todo & ~(r_lo <= 1.0)
+        unbounded = todo & ~infeasible & (r_hi <= 1.0)
+        method[infeasible] = "infeasible"
+        method[unbounded] = "upper-bound"
+        value = np.where(unbounded, hi_arr, value)
+        bracket = todo & ~infeasible & ~unbounded
+        if bracket.any():
+            a, b = lo_arr.copy(), hi_arr.copy()
+            fa, fb = r_lo - 1.0, r_hi - 1.0
+            ra = r_lo.copy()
+            side = np.zeros(shape, dtype=int)
+            for _ in range(max_iter):
+                active = bracket & (b - a > rtol * np.abs(b)) & (ra < 1.0 - rtol)
+                if not active.any():
+                    break
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    x = b - fb * (b - a) / (fb - fa)
+                x = np.where(np.isfinite(x) & (x > a) & (x < b), x, 0.5 * (a + b))
+                x = np.where(active, x, a)
+                rx = ratio(evaluate(x))
+                passed = active & (rx <= 1.0)
+                failed = active & ~passed
+                # Illinois: ปลายช่วงที่ค้างอยู่ซ้ำสองรอบลดค่า f ลงครึ่งหนึ่ง
+                fb = np.where(passed & (side == 1), 0.5 * fb, fb)
+                fa = np.where(failed & (side == -1), 0.5 * fa, fa)
+                a, fa, ra = np.where(passed, x, a), np.where(passed, rx - 1.0, fa), np.where(passed, rx, ra)
+                b, fb = np.where(failed, x, b), np.where(failed, rx - 1.0, fb)
+                side = np.where(passed, 1, np.where(failed, -1, side))
+            value = np.where(bracket, a, value)
+            method[bracket] = "bracketed"
+
+    final = evaluate(np.where(np.isnan(value), lo_arr, value))
+    checks = [k for k in CHECKS if k in final]
+    stacked = np.stack([np.abs(np.broadcast_to(np.asarray(final[k], dtype=float), shape)) for k in checks])
+    governing = np.asarray(checks, dtype=object)[np.argmax(stacked, axis=0)]
+    governing = np.where(method == "upper-bound", "", governing)
+    return {
+        "Value": value,
+        "Max_Ratio": np.where(np.isnan(value), np.nan, ratio(final)),
+        "Governing": governing,
+        "Method": method,
+        "Iterations": calls,
+    }
+
+
+def solve_catalog(engine: str, sections: pd.DataFrame, geometry: Mapping[str, Any], loads: Mapping[str, Any],
+                  materials: Mapping[str, Any], parameter: str, combinations=None, limits=None,
+                  lo: Optional[float] = None, hi: Optional[float] = None) -> pd.DataFrame:
+    """
+    ค่าสูงสุดของพารามิเตอร์สำหรับทุกหน้าตัดในตาราง (เรียก batch_checks ทั้งตารางต่อหนึ่งรอบ)
+
+    Args:
+        engine: 'purlin', 'beam' หรือ 'rafter'
+        sections: ตารางหน้าตัด คอลัมน์ตรงกับ section_data ของคลาสออกแบบ (หน่วยเดียวกัน)
+        geometry, loads, materials: อินพุตแบบเดียวกับคลาสออกแบบ (ค่าของ parameter ใช้เป็นจุดเริ่มของรูปปิด)
+        parameter: 'span', 'spacing', 'LL', ...
+
+    Returns:
+        DataFrame: Section, Weight, Max_<parameter>, Governing, Method เรียงตามน้ำหนัก
+    """
+    from parametric_sweep import beam_inputs, purlin_inputs, rafter_inputs
+
+    builders = {"purlin": purlin_inputs, "rafter": rafter_inputs, "beam": beam_inputs}
+    if engine not in builders:
+        raise ValueError(f"ออกแบบย้อนกลับทั้งตารางรองรับ engine: {', '.join(builders)}")
+    columns = {c: sections[c].to_numpy(dtype=float) for c in sections.columns
+               if pd.api.types.is_numeric_dtype(sections[c])}
+    base = builders[engine](columns, geometry, loads, materials, combinations=combinations, limits=limits)
+    res = solve_max(engine, base, parameter, lo, hi)
+    n = len(sections)
+    out = pd.DataFrame({
+        f"Max_{parameter}": np.broadcast_to(res["Value"], (n,)),
+        "Max_Ratio": np.broadcast_to(res["Max_Ratio"], (n,)),
+        "Governing": np.broadcast_to(res["Governing"], (n,)),
+        "Method": np.broadcast_to(res["Method"], (n,)),
+    }, index=sections.index)
+    for col in ("Weight", "Section"):
+        if col in sections:
+            out.insert(0, col, sections[col].to_numpy())
+    return out.sort_values("Weight", kind="stable") if "Weight" in out else out
+
+
+class InverseDesignMixin:
+    """
+    เมธอดออกแบบย้อนกลับของคลาสออกแบบที่มี batch_checks
+
+    คลาสที่ใช้ต้องกำหนด ENGINE (ชื่อใน parametric_sweep.ENGINES), LOAD_CASES
+    และ batch_inputs() ที่แปลงอินพุตของตัวเองเป็นอาร์กิวเมนต์ batch_checks
+    """
+
+    ENGINE = ""
+    LOAD_CASES: Tuple[str, ...] = ()
+
+    def batch_inputs(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def max_value(self, parameter: str, lo: Optional[float] = None, hi: Optional[float] = None) -> Dict[str, Any]:
+        """ค่าสูงสุดของพารามิเตอร์หนึ่งตัว (ค่าอื่นคงเดิม) → {'Value', 'Max_Ratio', 'Governing', 'Method', 'Iterations'}"""
+        res = solve_max(self.ENGINE, self.batch_inputs(), parameter, lo, hi)
+        return {k: (v.item() if isinstance(v, np.ndarray) else v) for k, v in res.items()}
+
+    def max_span(self, lo: Optional[float] = None, hi: Optional[float] = None) -> Dict[str, Any]:
+        return self.max_value("span", lo, hi)
+
+    def max_spacing(self, lo: Optional[float] = None, hi: Optional[float] = None) -> Dict[str, Any]:
+        return self.max_value("spacing", lo, hi)
+
+    def max_load(self, case: Optional[str] = None, lo: Optional[float] = None,
+                 hi: Optional[float] = None) -> Dict[str, Any]:
+        """น้ำหนักบรรทุกสูงสุดของกรณีเดียว (ค่าปริยาย = น้ำหนักจร)"""
+        case = case or self.LOAD_CASES[1]
+        if case not in self.LOAD_CASES:
+            raise ValueError(f"กรณีน้ำหนักต้องเป็นหนึ่งใน {', '.join(self.LOAD_CASES)}")
+        return self.max_value(case, lo, hi)
@@ -0,0 +1,218 @@
+"""
+load_combinations.py
+ชุดการรวมน้ำหนักบรรทุก (Load Combinations) แบบเมทริกซ์ตัวคูณ
+อ้างอิง: หลัก LRFD ของ วสท. (มอก. 1228-2549), ASCE 7-16 Section 2.3
+
+แต่ละชุดเก็บตัวคูณเป็นเมทริกซ์ F ขนาด (จำนวน combo × จำนวน load case)
+ค่าที่แฟคเตอร์แล้วของทุก combo และทุกกรณีน้ำหนักได้จากการคูณเมทริกซ์ครั้งเดียว:
+
+    w_u = w_cases @ F.T      (w_cases รูป (..., n_cases) → w_u รูป (..., n_combos))
+
+ลำดับ load case มาตรฐาน: D (น้ำหนักคงที่), L (น้ำหนักใช้งาน / Lr), W (แรงลม)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_CASES: Tuple[str, ...] = ("D", "L", "W")
+GRAVITY_CASES: Tuple[str, ...] = ("D", "L")
+
+_TERM = re.compile(r"([+-]?)\s*(\d*\.?\d*)\s*([A-Za-z]+)")
+
+
+@dataclass(frozen=True)
+class LoadCombination:
+    """combo เดียว: ตัวคูณต่อ load case ตามลำดับของชุด"""
+
+    key: str                      # คีย์ผลลัพธ์ เช่น 'Wu1'
+    label: str                    # ป้ายที่แสดงผล เช่น '1.4D+1.7L'
+    factors: Tuple[float, ...]
+    name: str = ""                # ชื่อย่อในรายการคำนวณ เช่น 'LC1'
+    uplift: bool = False          # True = combo ตรวจแรงยก (ไม่ใช้เลือก combo ควบคุมด้านแรงโน้มถ่วง)
+    note: Optional[str] = None
+
+    @property
+    def title(self) -> str:
+        return f"{self.name}: {self.label}" if self.name else self.label
+
+    def latex(self, symbols: Sequence[str]) -> str:
+        """นิพจน์ LaTeX เช่น 1.4w_{DL} + 1.7w_{LL}"""
+        return _signed_sum((f, f"{abs(f):g}{sym}") for f, sym in zip(self.factors, symbols))
+
+    def substitution(self, values: Sequence[float]) -> str:
+        return "= " + _signed_sum((f, f"{abs(f):g}({v:.2f})") for f, v in zip(self.factors, values))
+
+
+def _signed_sum(terms) -> str:
+    out = ""
+    for f, text in terms:
+        if f == 0:
+            continue
+        if not out:
+            out = ("-" if f < 0 else "") + text
+        else:
+            out += (" - " if f < 0 else " + ") + text
+    return out or "0"
+
+
+@dataclass(frozen=True)
+class LoadCombinationSet:
+    """ชุด combo พร้อมเมทริกซ์ตัวคูณสำหรับประเมินแบบเวกเตอร์"""
+
+    name: str
+    combinations: Tuple[LoadCombination, ...]
+    cases: Tuple[str, ...] = DEFAULT_CASES
+    reference: str = ""
+
+    def __post_init__(self) -> None:
+        for combo in self.combinations:
+            if len(combo.factors) != len(self.cases):
+                raise ValueError(
+                    f"combo '{combo.label}' มีตัวคูณ {len(combo.factors)} ค่า "
+                    f"แต่ชุด '{self.name}' มี load case {len(self.cases)} กรณี"
+                )
+
+    # ------------------------------------------------------------------
+    @cached_property
+    def matrix(self) -> np.ndarray:
+        """เมทริกซ์ตัวคูณ F รูป (n_combos, n_cases)"""
+        return np.array([c.factors for c in self.combinations], dtype=float)
+
+    @cached_property
+    def strength_mask(self) -> np.ndarray:
+        return np.array([not c.uplift for c in self.combinations])
+
+    @property
+    def strength(self) -> Tuple[LoadCombination, ...]:
+        return tuple(c for c in self.combinations if not c.uplift)
+
+    @property
+    def uplift(self) -> Tuple[LoadCombination, ...]:
+        return tuple(c for c in self.combinations if c.uplift)
+
+    def case_vector(self, **loads) -> np.ndarray:
+        """
+        สร้างเวกเตอร์ load case ตามลำดับชุด (กรณีที่ไม่ระบุ = 0)
+        รับค่าเดี่ยวหรือ array ที่ broadcast กันได้ คืนรูป (..., n_cases)
+        """
+        unknown = set(loads) - set(self.cases)
+        if unknown:
+            raise ValueError(f"ชุด '{self.name}' ไม่มี load case: {', '.join(sorted(unknown))}")
+        values = np.broadcast_arrays(*(np.asarray(loads.get(c, 0.0), dtype=float) for c in self.cases))
+        return np.stack(values, axis=-1)
+
+    # ------------------------------------------------------------------
+    def factored(self, cases) -> np.ndarray:
+        """
+        แรงแฟคเตอร์ของทุก combo: รับ array รูป (..., n_cases) คืนรูป (..., n_combos)
+        """
+        return np.asarray(cases, dtype=float) @ self.matrix.T
+
+    def split_factored(self, cases, gravity: Iterable[str] = GRAVITY_CASES) -> Tuple[np.ndarray, np.ndarray]:
+        """แยกผลแฟคเตอร์เป็นส่วนแรงโน้มถ่วงและส่วนแรงด้านข้าง (ใช้กับการแตกแรงตามความชัน)"""
+        cols = np.array([c in tuple(gravity) for c in self.cases])
+        cases = np.asarray(cases, dtype=float)
+        return cases[..., cols] @ self.matrix[:, cols].T, cases[..., ~cols] @ self.matrix[:, ~cols].T
+
+    def governing(self, factored, include_uplift: bool = False) -> np.ndarray:
+        """ดัชนี combo ที่ค่าสัมบูรณ์มากสุดตามแกนสุดท้าย (ไม่รวม combo แรงยกโดยปริยาย)"""
+        mag = np.abs(np.asarray(factored, dtype=float))
+        if not include_uplift:
+            mag = np.where(self.strength_mask, mag, -np.inf)
+        return np.argmax(mag, axis=-1)
+
+    def evaluate(self, **loads: float) -> Dict[str, float]:
+        """ค่าแฟคเตอร์ของทุก combo สำหรับ load case เดี่ยว คืน dict ตาม combo.key"""
+        values = self.factored(self.case_vector(**loads))
+        return {c.key: float(v) for c, v in zip(self.combinations, values)}
+
+    def with_combination(self, combo: LoadCombination) -> "LoadCombinationSet":
+        return LoadCombinationSet(self.name, self.combinations + (combo,), self.cases, self.reference)
+
+
+def parse_combination(label: str, cases: Sequence[str] = DEFAULT_CASES, *, key: Optional[str] = None,
+                      name: str = "", uplift: bool = False) -> LoadCombination:
+    """
+    แปลงข้อความ เช่น '1.2D+1.6L+0.5W' หรือ '0.9D-1.0W' เป็น LoadCombination
+    """
+    factors = dict.fromkeys(cases, 0.0)
+    text = label.replace(" ", "")
+    pos = 0
+    for m in _TERM.finditer(text):
+        if m.start() != pos or not m.group(3):
+            raise ValueError(f"รูปแบบ combo ไม่ถูกต้อง: '{label}'")
+        pos = m.end()
+        case = m.group(3)
+        if case not in factors:
+            raise ValueError(f"ไม่รู้จัก load case '{case}' ใน '{label}' (ที่รองรับ: {', '.join(cases)})")
+        coeff = float(m.group(2)) if m.group(2) else 1.0
+        factors[case] += -coeff if m.group(1) == "-" else coeff
+    if pos != len(text):
+        raise ValueError(f"รูปแบบ combo ไม่ถูกต้อง: '{label}'")
+    return LoadCombination(key or label, label, tuple(factors[c] for c in cases), name, uplift=uplift)
+
+
+def custom_set(name: str, labels: Sequence[str], uplift: Sequence[str] = (),
+               cases: Sequence[str] = DEFAULT_CASES) -> LoadCombinationSet:
+    """สร้างชุด combo กำหนดเองจากรายการข้อความ"""
+    combos = [parse_combination(lb, cases, key=f"Wu{i + 1}", name=f"LC{i + 1}") for i, lb in enumerate(labels)]
+    combos += [parse_combination(lb, cases, key=f"Wu_uplift{i + 1}", name=f"LCU{i + 1}", uplift=True)
+               for i, lb in enumerate(uplift)]
+    return LoadCombinationSet(name, tuple(combos), tuple(cases), "กำหนดเอง")
+
+
+# ─────────────────────────────────────────────────────────────
+# ชุดมาตรฐาน
+# ─────────────────────────────────────────────────────────────
+EIT_LRFD = LoadCombinationSet(
+    name="วสท. LRFD (มอก. 1228-2549)",
+    reference="หลัก LRFD ของ วสท.",
+    combinations=(
+        LoadCombination("Wu1", "1.4D+1.7L", (1.4, 1.7, 0.0), "LC1",
+                        note="โหลดแฟคเตอร์ตามหลัก LRFD ของ วสท."),
+        LoadCombination("Wu2_pos", "0.75(1.4D+1.7L)+1.6W", (1.05, 1.275, 1.6), "LC2+",
+                        note="พิจารณาแรงลมกดตามมาตรฐานไทย"),
+        LoadCombination("Wu2_neg", "0.75(1.4D+1.7L)-1.6W", (1.05, 1.275, -1.6), "LC2-",
+                        note="พิจารณาแรงลมดูดตามมาตรฐานไทย"),
+        LoadCombination("Wu3_uplift", "0.9D-1.6W", (0.9, 0.0, -1.6), "LC3", uplift=True,
+                        note="ค่าติดลบ = แรงยกสุทธิ ปีกล่างรับแรงอัด"),
+    ),
+)
+
+ASCE7_LRFD = LoadCombinationSet(
+    name="ASCE 7-16 LRFD",
+    reference="ASCE 7-16 Section 2.3.1",
+    combinations=(
+        LoadCombination("Wu1", "1.4D", (1.4, 0.0, 0.0), "LC1"),
+        LoadCombination("Wu2", "1.2D+1.6L", (1.2, 1.6, 0.0), "LC2"),
+        LoadCombination("Wu3_pos", "1.2D+1.6L+0.5W", (1.2, 1.6, 0.5), "LC3+"),
+        LoadCombination("Wu3_neg", "1.2D+1.6L-0.5W", (1.2, 1.6, -0.5), "LC3-"),
+        LoadCombination("Wu4_pos", "1.2D+1.0W+0.5L", (1.2, 0.5, 1.0), "LC4+"),
+        LoadCombination("Wu4_neg", "1.2D-1.0W+0.5L", (1.2, 0.5, -1.0), "LC4-"),
+        LoadCombination("Wu5_uplift", "0.9D-1.0W", (0.9, 0.0, -1.0), "LC5", uplift=True,
+                        note="ASCE 7-16 Eq. 2.3.1-7 (แรงลมระดับกำลัง)"),
+    ),
+)
+
+COMBINATION_SETS: Dict[str, LoadCombinationSet] = {
+    "EIT": EIT_LRFD,
+    "ASCE7": ASCE7_LRFD,
+}
+
+
+def get_combination_set(name_or_set=None) -> LoadCombinationSet:
+    """คืนชุด combo จากชื่อ ('EIT', 'ASCE7') หรือชุดที่ส่งเข้ามา ค่าปริยาย = EIT"""
+    if name_or_set is None:
+        return EIT_LRFD
+    if isinstance(name_or_set, LoadCombinationSet):
+        return name_or_set
+    try:
+        return COMBINATION_SETS[name_or_set]
+    except KeyError:
+        raise ValueError(f"ไม่พบชุด load combination '{name_or_set}'") from None
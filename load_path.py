@@ -0,0 +1,191 @@
+"""
+load_path.py
+เส้นทางถ่ายแรงของหลังคา: แป → จันทัน → เสา
+
+สร้าง DesignModel (design_graph) ของทั้งอาคารจากผังโครงข้อแข็ง แล้วออกแบบทุกชิ้นส่วนในรอบเดียว
+ตามลำดับ topological:
+  - แป: ช่วงพาด = ระยะโครงข้อแข็ง, ระยะรับน้ำหนัก = ระยะแป (แปขอบรับครึ่งหนึ่ง)
+  - จันทัน: รับแรงปฏิกิริยาปลายแปจากช่วงโครงทั้งสองข้าง R = w_line × L_bay / 2 แยกตาม load case
+    เป็นแรงจุด ณ ตำแหน่งแนวแป (RafterDesign แบบ point_loads)
+  - เสา: Pu = แรงปฏิกิริยาแฟคเตอร์ของจันทัน (combo ที่ให้แรงกดรวมสูงสุด)
+    หลังคาจั่ว (gable) จันทันสองข้างถ่ายแรงผ่านสันหลังคา เสาแต่ละต้นรับน้ำหนักครึ่งโครง = R_eave + R_ridge
+    หลังคาเพิงรับ R_eave
+
+หน่วย: ระยะ ม., น้ำหนักผิว กก./ตร.ม., แรง กก.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from design_graph import DesignModel, Derived, RecomputeReport, Ref, Upstream
+from project_store import summarize_result
+
+
+@dataclass
+class BuildingLayout:
+    """ผังหลังคา: โครงข้อแข็งเรียงตามยาวอาคาร แปวางขวางบนจันทัน"""
+
+    bays: Sequence[float]          # ม.  ระยะระหว่างโครงข้อแข็ง (= ช่วงพาดแป)
+    width: float                   # ม.  ความกว้างอาคาร (แนวราบ)
+    purlin_spacing: float          # ม.  ระยะแปสูงสุดตามลาด
+    slope: float                   # องศา
+    eave_height: float = 6.0       # ม.  ความสูงเสา
+    gable: bool = True             # True = หลังคาจั่ว (จันทันสองข้าง), False = หลังคาเพิง
+
+    def __post_init__(self) -> None:
+        if not self.bays or min(self.bays) <= 0:
+            raise ValueError("ต้องมีช่วงโครงข้อแข็งอย่างน้อยหนึ่งช่วงและทุกช่วงต้องเป็นค่าบวก")
+        if self.width <= 0 or self.purlin_spacing <= 0:
+            raise ValueError("ความกว้างอาคารและระยะแปต้องเป็นค่าบวก")
+        if not 0 <= self.slope < 90:
+            raise ValueError("ความชันหลังคาต้องอยู่ระหว่าง 0 ถึง 90 องศา")
+
+    @property
+    def sides(self) -> Tuple[str, ...]:
+        return ("L", "R") if self.gable else ("",)
+
+    @property
+    def rafter_span(self) -> float:
+        """ความยาวจันทันแนวราบ (ม.)"""
+        return self.width / 2 if self.gable else self.width
+
+    @property
+    def rafter_slope_length(self) -> float:
+        return self.rafter_span / math.cos(math.radians(self.slope))
+
+    def purlin_positions(self) -> np.ndarray:
+        """ตำแหน่งแปตามลาดจากชายคา (ม.) ระยะเท่ากันไม่เกิน purlin_spacing"""
+        n = math.ceil(self.rafter_slope_length / self.purlin_spacing - 1e-9) + 1
+        return np.linspace(0.0, self.rafter_slope_length, max(n, 2))
+
+    def tributary_widths(self) -> np.ndarray:
+        """ระยะรับน้ำหนักของแปแต่ละแนว (แปขอบ = ครึ่งระยะ)"""
+        x = self.purlin_positions()
+        edges = np.concatenate([[x[0]], (x[1:] + x[:-1]) / 2, [x[-1]]])
+        return np.diff(edges)
+
+
+def _rafter_point_loads(positions: Tuple[float, ...], *args) -> Dict[str, Any]:
+    """
+    รวมแรงปฏิกิริยาปลายแปเป็นแรงจุดบนจันทัน ณ ตำแหน่งแนวแป
+    args เรียงเป็นคู่ (Loads ของแป, ช่วงพาดแป) ตามลำดับเดียวกับ positions
+    """
+    points: Dict[float, Dict[str, float]] = {}
+    for x, loads, span in zip(positions, args[0::2], args[1::2]):
+        p = points.setdefault(x, {"x": x, "D": 0.0, "L": 0.0, "W": 0.0})
+        p["D"] += loads["DL_line"] * span / 2
+        p["L"] += loads["LL_line"] * span / 2
+        p["W"] += loads["Wind_line"] * span / 2
+    return {"DL": 0.0, "LL": 0.0, "WL": 0.0, "point_loads": [points[x] for x in sorted(points)]}
+
+
+def _half_sum(*spans: float) -> float:
+    """ระยะรับน้ำหนักของจันทัน = ครึ่งหนึ่งของช่วงโครงทั้งสองข้าง (ใช้ตรวจน้ำขัง)"""
+    return sum(spans) / 2
+
+
+def _pick(key: str, values: Mapping[str, Any]) -> Any:
+    return values[key]
+
+
+def build_model(layout: BuildingLayout, *, purlin_section: Mapping[str, Any],
+                rafter_section: Mapping[str, Any], column_section: Mapping[str, Any],
+                loads: Mapping[str, float], materials: Mapping[str, float],
+                combinations=None, limits=None, rafter_Lb: Optional[float] = None,
+                purlin_geometry: Optional[Mapping[str, Any]] = None) -> DesignModel:
+    """
+    สร้างโมเดลของทั้งอาคาร
+
+    Args:
+        layout: ผังหลังคา
+        purlin_section / rafter_section: คุณสมบัติหน้าตัดแบบเดียวกับหน้าออกแบบแป / จันทัน
+        column_section: keyword arguments ของ CompressionDesign (Ag, rx, ry, h, bf, tw, tf, Fy, ...)
+        loads: น้ำหนักผิวหลังคา {'DL', 'LL', 'WL'} (กก./ตร.ม.)
+        materials: {'Fy', 'E'} ของแปและจันทัน
+        limits: ชุดเกณฑ์การโก่งตัวของแปและจันทัน (serviceability.LIMIT_PROFILES)
+        rafter_Lb: ระยะค้ำยันด้านข้างจันทัน (ม., ค่าปริยาย = ระยะแป)
+        purlin_geometry: ค่าเพิ่มเติมของแป เช่น sag_rods, restraint, biaxial
+    """
+    model = DesignModel()
+    model.update({
+        "roof.DL": loads.get("DL", 0.0), "roof.LL": loads.get("LL", 0.0), "roof.WL": loads.get("WL", 0.0),
+        "roof.slope": layout.slope, "grade": dict(materials), "combinations": combinations, "limits": limits,
+        "section:purlin": dict(purlin_section), "section:rafter": dict(rafter_section),
+        "section:column": dict(column_section), "column.height": layout.eave_height,
+    })
+    for j, span in enumerate(layout.bays):
+        model.set(f"bay{j}.span", float(span))
+
+    tributary = layout.tributary_widths()
+    positions = layout.purlin_positions()
+    Lb = rafter_Lb if rafter_Lb is not None else float(np.max(np.diff(positions)))
+    frames = range(len(layout.bays) + 1)
+
+    for side in layout.sides:
+        # แป
+        for j in range(len(layout.bays)):
+            for i, trib in enumerate(tributary):
+                model.add_member(f"P{side}{j}-{i}", "purlin", {
+                    "section_data": Ref("section:purlin"),
+                    "geometry": {**(purlin_geometry or {}), "span": Ref(f"bay{j}.span"),
+                                 "spacing": float(trib), "slope": Ref("roof.slope")},
+                    "loads": {"DL": Ref("roof.DL"), "LL": Ref("roof.LL"), "WL": Ref("roof.WL")},
+                    "materials": Ref("grade"),
+                    "combinations": Ref("combinations"),
+                    "limits": Ref("limits"),
+                }, section=purlin_section.get("name", ""))
+
+        # จันทัน: แปจากช่วงโครงทั้งสองข้างของโครงที่ k
+        for k in frames:
+            args: List[Any] = []
+            xs: List[float] = []
+            for j in (k - 1, k):
+                if 0 <= j < len(layout.bays):
+                    for i in range(len(tributary)):
+                        args += [Upstream(f"P{side}{j}-{i}", "Loads"), Ref(f"bay{j}.span")]
+                        xs.append(float(positions[i]))
+            spans = [Ref(f"bay{j}.span") for j in (k - 1, k) if 0 <= j < len(layout.bays)]
+            model.add_member(f"R{side}{k}", "rafter", {
+                "section_data": Ref("section:rafter"),
+                "geometry": {"span": layout.rafter_span, "spacing": 1.0, "slope": Ref("roof.slope"), "Lb": Lb,
+                             "tributary": Derived(_half_sum, *spans)},
+                "loads": Derived(partial(_rafter_point_loads, tuple(xs)), *args),
+                "materials": Ref("grade"),
+                "combinations": Ref("combinations"),
+                "limits": Ref("limits"),
+            }, section=rafter_section.get("name", ""))
+
+        # เสา
+        for k in frames:
+            model.add_member(f"C{side}{k}", "compression", {
+                **{key: Derived(partial(_pick, key), Ref("section:column")) for key in column_section},
+                "Lx": Ref("column.height"), "Ly": Ref("column.height"),
+                "Pu": (Derived(operator.add, Upstream(f"R{side}{k}", "Forces.R_eave"),
+                               Upstream(f"R{side}{k}", "Forces.R_ridge"))
+                       if layout.gable else Upstream(f"R{side}{k}", "Forces.R_eave")),
+            }, section=column_section.get("section_name", ""))
+    return model
+
+
+def design_building(layout: BuildingLayout, **kwargs) -> Tuple[DesignModel, RecomputeReport]:
+    """สร้างโมเดลและออกแบบทุกชิ้นส่วนในรอบเดียว (อาร์กิวเมนต์เหมือน build_model)"""
+    model = build_model(layout, **kwargs)
+    return model, model.recompute()
+
+
+def summary_frame(model: DesignModel) -> pd.DataFrame:
+    """ตารางสรุปทุกชิ้นส่วน: ประเภท, อัตราส่วนสูงสุด, รายการควบคุม, ผ่าน/ไม่ผ่าน"""
+    rows = []
+    for name, node in model.members.items():
+        ratio, governing, passed = summarize_result(node.result) if node.result else (None, node.error, False)
+        rows.append({"Member": name, "Engine": node.engine, "Section": node.section,
+                     "Max_Ratio": ratio, "Governing": governing, "Pass": passed})
+    return pd.DataFrame(rows)
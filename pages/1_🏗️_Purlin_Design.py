@@ -1,14 +1,32 @@
 import streamlit as st # type: ignore
 import pandas as pd # type: ignore
 import os
-from purlin_design import PurlinDesign
-from data_utils import load_data, SteelMaterial
+import numpy as np
+import plotly.graph_objects as go
+from purlin_design import (PurlinDesign, SAG_ROD_LABELS, RESTRAINT_LABELS, batch_checks, screen_catalog,
+                           uplift_grid)
+from load_combinations import COMBINATION_SETS
+from serviceability import LIMIT_PROFILES
+from reliability import monte_carlo
+from parametric_sweep import PARAMETER_LABELS, heatmap_figure, purlin_inputs, sweep, sweep_range
+from inverse_design import METHOD_LABELS, solve_catalog
+from section_recommender import recommend
+from diagrams import diagram, diagram_figure, member_loading
+from wind_load import (RoofWindLoad, WIND_REGIONS, TERRAIN_LABELS, IMPORTANCE_FACTORS,
+                       INTERNAL_PRESSURE, ROOF_ZONE_LABELS)
+from data_utils import load_data, SteelMaterial, DEFAULT_FILENAME
+from effective_width import section_dimensions
+from finite_strip import FLEXURE_METHODS
+from catalog_store import extend_catalog
 from report_generator import PurlinReportGenerator
+from project_store import ProjectStore, MemberRecord
 from theme_manager import use_theme
+from debug_panel import debug_profiler, timing_panel
 from section_3d import create_c_channel_3d, create_purlin_system_3d
 
 st.set_page_config(page_title="ออกแบบแปเหล็ก", layout="wide")
 use_theme()
+profiler = debug_profiler("purlin")
 
 st.title("🏗️ โมดูลออกแบบแปเหล็กขึ้นรูปเย็น")
 
@@ -22,7 +40,14 @@ with st.expander("📝 Project Information", expanded=True):
 # --- 2. Load Data ---
 @st.cache_data
 def get_data():
-    return load_data("Roof-by-Sarayut-LRFD-V.1.0.3.xlsx - Data Steel.csv")
+    df = load_data("Roof-by-Sarayut-LRFD-V.1.0.3.xlsx - Data Steel.csv")
+    # ตาราง Data Steel ไม่มี Iy/Sy — เติมจาก มอก. 1228 สำหรับโหมดดัดสองแกน
+    if not df.empty and 'Sy' not in df.columns:
+        ref = load_data(DEFAULT_FILENAME)
+        if 'Sy' in ref.columns:
+            df = df.merge(ref[['Section', 'Iy', 'Sy']], on='Section', how='left')
+    # หน้าตัดจากผู้ผลิตที่นำเข้าด้วย catalog_store.py (เฉพาะตระกูลที่ใช้เป็นแป)
+    return extend_catalog(df, ("C", "Z")) if not df.empty else df
 
 df = get_data()
 
@@ -48,12 +73,60 @@ with col_in1:
     span = st.number_input("ช่วงพาดแป (เมตร)", value=6.0, step=0.5, key="span")
     spacing = st.number_input("ระยะแป (เมตร)", value=1.5, step=0.1, key="spacing")
     slope = st.number_input("ความชันหลังคา (องศา)", value=5.0, step=0.5, key="slope")
+    biaxial = st.checkbox("ตรวจสอบการดัดสองแกน (Biaxial)", value=False, key="biaxial")
+    sag_rods = 0
+    if biaxial:
+        sag_rods = st.selectbox(
+            "เหล็กยึดแป (Sag Rod)", list(SAG_ROD_LABELS.keys()),
+            format_func=lambda n: SAG_ROD_LABELS[n], key="sag_rods"
+        )
     
     # Loads
     st.subheader("2. น้ำหนักบรรทุก")
     dl = st.number_input("น้ำหนักบรรทุกคงที่ DL (กก./ตร.ม.)", value=20.0, step=5.0, key="dl")
     ll = st.number_input("น้ำหนักใช้งาน LL (กก./ตร.ม.)", value=30.0, step=5.0, key="ll")
-    wl = st.number_input("แรงลม WL (กก./ตร.ม.)", value=50.0, step=5.0, key="wl")
+    wind_calc = None
+    if st.checkbox("คำนวณแรงลมตาม มยผ. 1311-50", value=False, key="wind_auto"):
+        wc1, wc2 = st.columns(2)
+        eave_h = wc1.number_input("ความสูงชายคา (ม.)", value=6.0, step=0.5, key="wind_eave")
+        bldg_w = wc2.number_input("ความกว้างอาคาร (ม.)", value=20.0, step=1.0, key="wind_width")
+        bldg_l = wc1.number_input("ความยาวอาคาร (ม.)", value=40.0, step=1.0, key="wind_length")
+        region = wc2.selectbox("กลุ่มพื้นที่", list(WIND_REGIONS.keys()),
+                               format_func=lambda k: WIND_REGIONS[k][2], key="wind_region")
+        terrain = wc1.selectbox("ภูมิประเทศ", list(TERRAIN_LABELS.keys()),
+                                format_func=lambda k: TERRAIN_LABELS[k], key="wind_terrain")
+        importance = wc2.selectbox("ความสำคัญ", list(IMPORTANCE_FACTORS.keys()), index=1,
+                                   format_func=lambda k: IMPORTANCE_FACTORS[k][2], key="wind_importance")
+        openings = st.selectbox("ช่องเปิดของอาคาร", list(INTERNAL_PRESSURE.keys()),
+                                format_func=lambda k: INTERNAL_PRESSURE[k][2], key="wind_openings")
+        zone = st.selectbox("โซนหลังคาที่ออกแบบ", list(ROOF_ZONE_LABELS.keys()),
+                            format_func=lambda k: f"{k} — {ROOF_ZONE_LABELS[k]}", key="wind_zone")
+        try:
+            wind_calc = RoofWindLoad(eave_h, bldg_w, bldg_l, slope, region, terrain, importance,
+                                     openings).run_design()
+        except ValueError as err:
+            st.error(str(err))
+            st.stop()
+        wl = wind_calc['Zones'][zone]['p_design']
+        st.metric("แรงลม WL ออกแบบ (กก./ตร.ม.)", f"{wl:.2f}")
+    else:
+        wl = st.number_input("แรงลม WL (กก./ตร.ม.)", value=50.0, step=5.0, key="wl")
+    restraint = st.selectbox(
+        "การยึดรั้งปีกเมื่อรับแรงลมดูด", list(RESTRAINT_LABELS.keys()),
+        format_func=lambda k: RESTRAINT_LABELS[k], key="restraint"
+    )
+    flexure_method = st.selectbox(
+        "วิธีคำนวณกำลังดัด (การโก่งเดาะเฉพาะที่)", list(FLEXURE_METHODS.keys()),
+        format_func=lambda k: FLEXURE_METHODS[k], key="flexure_method"
+    )
+    combo_set = st.selectbox(
+        "ชุด Load Combination", list(COMBINATION_SETS.keys()),
+        format_func=lambda k: COMBINATION_SETS[k].name, key="combo_set"
+    )
+    limit_set = st.selectbox(
+        "เกณฑ์การโก่งตัว", list(LIMIT_PROFILES.keys()),
+        format_func=lambda k: LIMIT_PROFILES[k].name, key="limit_set"
+    )
     
     # Materials
     st.subheader("3. วัสดุ")
@@ -92,16 +165,25 @@ with col_in2:
             'Weight': row.get('Weight', 0),
             'h': row.get('h', 0),
             't': row.get('t', 0),
-            'Area': row.get('Area', 0) 
+            'Area': row.get('Area', 0),
+            'Sy': row.get('Sy', 0),
+            'Iy': row.get('Iy', 0),
         }
         
-        geometry = {'span': span, 'spacing': spacing, 'slope': slope}
+        geometry = {'span': span, 'spacing': spacing, 'slope': slope,
+                    'biaxial': biaxial, 'sag_rods': sag_rods, 'restraint': restraint,
+                    'flexure_method': flexure_method}
         loads = {'DL': dl, 'LL': ll, 'WL': wl}
         materials = {'Fy': fy, 'E': E}
         
         # Run Design
-        designer = PurlinDesign(section_data, geometry, loads, materials)
-        res = designer.run_design()
+        designer = PurlinDesign(section_data, geometry, loads, materials, combinations=combo_set,
+                                limits=limit_set)
+        try:
+            res = designer.run_design()
+        except ValueError as err:
+            st.error(str(err))
+            st.stop()
         
         checks = res['Checks']['Status']
         ratios = res['Checks']['Ratios']
@@ -185,8 +267,185 @@ with col_in2:
                 return 'color: #ef4444; font-weight: 700;'
             return ''
         
+        if 'Uplift' in ratios:
+            summary_df.loc[len(summary_df)] = [
+                f"แรงลมดูด ({res['Combinations']['Controlling_Uplift']})",
+                f"{demand['Mu_Uplift']:.2f} กก.-ม.",
+                f"{capacity['Phi_Mn_Uplift']:.2f} กก.-ม. (R = {capacity['R']:.2f})",
+                ratios['Uplift'],
+                "✅ ผ่าน" if checks['Uplift'] else "❌ ไม่ผ่าน",
+            ]
+        if biaxial:
+            summary_df.loc[len(summary_df)] = [
+                "ดัดสองแกน",
+                f"{demand['Mu']:.2f} / {demand['Muy']:.2f} กก.-ม.",
+                f"{capacity['Phi_Mn']:.2f} / {capacity['Phi_Mny']:.2f} กก.-ม.",
+                ratios['Biaxial'],
+                "✅ ผ่าน" if checks['Biaxial'] else "❌ ไม่ผ่าน",
+            ]
+        if 'Wind' in defl_detail:
+            summary_df.loc[len(summary_df)] = [
+                "การโก่งตัวจากแรงลม",
+                f"{defl_detail['Wind']['value']:.3f} ซม.",
+                f"{defl_detail['Wind']['limit']:.3f} ซม.",
+                defl_detail['Wind']['ratio'],
+                "✅ ผ่าน" if defl_detail['Wind']['pass'] else "❌ ไม่ผ่าน",
+            ]
+        if 'Ponding' in ratios:
+            summary_df.loc[len(summary_df)] = [
+                "น้ำขัง (Ponding)",
+                f"C_s = {capacity['Cs']:.4f}",
+                "C_p + 0.9C_s ≤ 0.25",
+                ratios['Ponding'],
+                "✅ ผ่าน" if checks['Ponding'] else "❌ ไม่ผ่าน",
+            ]
+
         styled_df = summary_df.style.format({"อัตราส่วน": "{:.2f}"}).map(style_result, subset=['ผล'])
         st.dataframe(styled_df, use_container_width=True)
+        if 'Uplift' not in ratios:
+            st.caption("แรงลมดูด: ชุด load combination ที่เลือกไม่มี combo แรงยก — ไม่ต้องตรวจ")
+
+        if not all(checks.values()):
+            alt_df = df.dropna(subset=['Sy']) if biaxial else df
+            if restraint == 'unbraced':
+                alt_df = alt_df.dropna(subset=['Iy'])
+            alternatives = recommend("purlin", alt_df, section_name, geometry, loads, materials,
+                                     combinations=combo_set, limits=limit_set)
+            st.markdown("**💡 หน้าตัดทางเลือกที่ใกล้เคียงที่สุดที่ผ่านทุกเกณฑ์**")
+            if alternatives.empty:
+                st.info("ไม่มีหน้าตัดที่หนักกว่าในตารางที่ผ่านทุกเกณฑ์")
+            else:
+                st.dataframe(alternatives.style.format(precision=2), use_container_width=True, hide_index=True)
+
+        if 'Uplift' in ratios:
+            with st.expander("🌬️ แผนที่แรงลมดูด (ความชัน × แรงลม)", expanded=False):
+                slopes_grid = np.arange(0.0, 31.0, 2.5)
+                wl_grid = np.arange(0.0, 205.0, 10.0)
+                grid = uplift_grid(section_data, geometry, loads, materials, slopes_grid, wl_grid,
+                                   combinations=combo_set)
+                fig_up = go.Figure(go.Heatmap(
+                    z=grid['Uplift'], x=grid['WL'], y=grid['slope'],
+                    colorscale="RdYlGn_r", zmin=0.0, zmax=1.5,
+                    colorbar=dict(title="Uplift ratio"),
+                ))
+                fig_up.add_trace(go.Contour(
+                    z=grid['Uplift'], x=grid['WL'], y=grid['slope'],
+                    contours=dict(start=1.0, end=1.0, coloring="none", showlabels=True),
+                    line=dict(color="black", width=2), showscale=False,
+                ))
+                fig_up.update_layout(xaxis_title="แรงลมดูด WL (กก./ตร.ม.)", yaxis_title="ความชัน (องศา)", height=420)
+                st.plotly_chart(fig_up, use_container_width=True)
+                governs = grid['Suction_Governs']
+                st.caption(f"แรงลมดูดควบคุมการออกแบบ {int(governs.sum())} จาก {governs.size} กรณีในกริด")
+
+        if wind_calc is not None:
+            with st.expander("🌀 แรงลมตามโซนหลังคา (มยผ. 1311-50)", expanded=False):
+                zone_keys = list(wind_calc['Zones'].keys())
+                zone_wl = np.array([wind_calc['Zones'][z]['p_design'] for z in zone_keys])
+                zone_res = batch_checks(
+                    span=span, spacing=spacing, slope=slope, DL=dl, LL=ll, WL=zone_wl,
+                    Weight=section_data['Weight'], Zx=section_data['Zx'], Ix=section_data['Ix'],
+                    h=section_data['h'], t=section_data['t'], Fy=fy, E=E,
+                    Sy=section_data['Sy'] if biaxial else None, biaxial=biaxial, sag_rods=sag_rods,
+                    Iy=section_data['Iy'] or None, restraint=restraint, combinations=combo_set,
+                    limits=limit_set, flexure_method=flexure_method,
+                    **{k: v for k, v in (section_dimensions(section_data) or {}).items() if k in ('b', 'c')},
+                )
+                st.dataframe(pd.DataFrame({
+                    "โซน": [f"{z} — {ROOF_ZONE_LABELS[z]}" for z in zone_keys],
+                    "C_pC_g": [wind_calc['Zones'][z]['CpCg'] for z in zone_keys],
+                    "p_max": [wind_calc['Zones'][z]['p_max'] for z in zone_keys],
+                    "p_min": [wind_calc['Zones'][z]['p_min'] for z in zone_keys],
+                    "WL ออกแบบ": zone_wl,
+                    "อัตราส่วนสูงสุด": zone_res['Max_Ratio'],
+                }).style.format(precision=2), use_container_width=True, hide_index=True)
+                ref = wind_calc['Reference']
+                st.caption(f"q = {ref['q']:.2f} กก./ตร.ม., h = {ref['h']:.2f} ม., "
+                           f"C_e = {ref['C_e']:.3f}, ความกว้างโซนขอบ y = {ref['y_end']:.1f} ม.")
+
+        with st.expander("📉 แผนภาพโมเมนต์ แรงเฉือน และการโก่งตัว", expanded=False):
+            purlin_diag = diagram(member_loading("purlin", {'section_data': section_data, 'geometry': geometry,
+                                                            'materials': materials}, res), name="แป")
+            st.plotly_chart(diagram_figure(purlin_diag), use_container_width=True)
+
+        with st.expander("📈 วิเคราะห์พาราเมตริก (Parametric Sweep)", expanded=False):
+            sweep_base = purlin_inputs(section_data, geometry, loads, materials,
+                                       combinations=combo_set, limits=limit_set)
+            sweep_params = ['span', 'spacing', 'slope', 'DL', 'LL', 'WL', 'Fy']
+            sc1, sc2, sc3 = st.columns([2, 2, 1])
+            x_param = sc1.selectbox("แกน X", sweep_params, index=0,
+                                    format_func=lambda k: PARAMETER_LABELS.get(k, k), key="sweep_x")
+            y_param = sc2.selectbox("แกน Y", sweep_params, index=1,
+                                    format_func=lambda k: PARAMETER_LABELS.get(k, k), key="sweep_y")
+            n_pts = sc3.number_input("จุด/แกน", min_value=10, max_value=100, value=50, step=10, key="sweep_n")
+            if x_param == y_param:
+                st.warning("เลือกพารามิเตอร์แกน X และแกน Y ให้ต่างกัน")
+            else:
+                swept = sweep("purlin", sweep_base, {
+                    y_param: sweep_range(y_param, sweep_base[y_param], int(n_pts)),
+                    x_param: sweep_range(x_param, sweep_base[x_param], int(n_pts)),
+                }, outputs=("Max_Ratio", "Pass"))
+                st.plotly_chart(heatmap_figure(swept, title="อัตราส่วนสูงสุด (เส้นดำ = 1.0)"), use_container_width=True)
+                sens = swept.sensitivity()
+                st.dataframe(pd.DataFrame({
+                    "พารามิเตอร์": [PARAMETER_LABELS.get(k, k) for k in sens],
+                    "ความไวเชิงสัมพัทธ์": list(sens.values()),
+                }).style.format(precision=2), use_container_width=True, hide_index=True)
+                st.caption(f"ประเมิน {swept['Max_Ratio'].size:,} กรณีใน {swept.elapsed * 1000:.1f} ms — "
+                           f"ผ่าน {swept.pass_fraction():.0%} ของกริด")
+
+        with st.expander("🎲 ความน่าจะเป็นของการวิบัติ (Monte Carlo)", expanded=False):
+            mc1, mc2 = st.columns(2)
+            n_mc = mc1.selectbox("จำนวนตัวอย่าง", [100_000, 1_000_000, 5_000_000], index=1,
+                                 format_func=lambda n: f"{n:,}", key="mc_n")
+            seed_mc = mc2.number_input("Seed", min_value=0, value=0, step=1, key="mc_seed")
+            st.caption("สุ่ม Fy, E, คุณสมบัติหน้าตัด และน้ำหนักบรรทุกจากค่าสถิติมาตรฐาน "
+                       "(ไม่มีตัวคูณ φ และตัวคูณน้ำหนัก)")
+            if st.button("เริ่มจำลอง", key="mc_run"):
+                mc = monte_carlo("purlin", purlin_inputs(section_data, geometry, loads, materials), n_samples=int(n_mc), seed=int(seed_mc))
+                r1, r2, r3 = st.columns(3)
+                r1.metric("ดัชนีความเชื่อถือได้ β", f"{mc.beta:.2f}")
+                r2.metric("Pf", f"{mc.pf:.2e}" if mc.failures else f"< {mc.pf_upper:.1e}")
+                r3.metric("β (Cornell)", f"{mc.beta_cornell:.2f}")
+                if mc.governing:
+                    st.markdown("**สภาวะขีดจำกัดที่ควบคุมการวิบัติ:** " + ", ".join(
+                        f"{k} {v:,}" for k, v in mc.governing.items() if v))
+                st.caption(f"วิบัติ {mc.failures:,} จาก {mc.n_samples:,} ตัวอย่าง ใช้เวลา {mc.elapsed:.2f} วินาที")
+
+        with st.expander("📏 ช่วงพาด / ระยะแป / น้ำหนักสูงสุด (ออกแบบย้อนกลับ)", expanded=False):
+            inv_param = st.radio("หาค่าสูงสุดของ", ['span', 'spacing', 'LL'], horizontal=True,
+                                 format_func=lambda k: PARAMETER_LABELS.get(k, k), key="inverse_param")
+            inv_unit = "กก./ตร.ม." if inv_param == 'LL' else "ม."
+            inv = PurlinDesign(section_data, geometry, loads, materials, combinations=combo_set,
+                               limits=limit_set).max_value(inv_param)
+            if inv['Method'] == 'infeasible':
+                st.warning(f"{section_name} ไม่ผ่านแม้ที่ค่าต่ำสุดของช่วงค้นหา (ควบคุมโดย {inv['Governing']})")
+            else:
+                i1, i2 = st.columns(2)
+                i1.metric(f"{PARAMETER_LABELS.get(inv_param, inv_param)} สูงสุดของ {section_name}",
+                          f"{inv['Value']:.2f} {inv_unit}")
+                i2.metric("ควบคุมโดย", inv['Governing'] or "—", METHOD_LABELS[inv['Method']], delta_color="off")
+            inv_df = df.dropna(subset=['Sy']) if biaxial else df
+            if restraint == 'unbraced':
+                inv_df = inv_df.dropna(subset=['Iy'])
+            inv_table = solve_catalog("purlin", inv_df, geometry, loads, materials, inv_param,
+                                      combinations=combo_set, limits=limit_set)
+            inv_table['Method'] = inv_table['Method'].map(METHOD_LABELS)
+            st.dataframe(inv_table.style.format(precision=2), use_container_width=True, hide_index=True)
+            st.caption("ค่าอื่นคงเดิมตามอินพุต — ทุกหน้าตัดในตารางแก้พร้อมกันในครั้งเดียว")
+
+        with st.expander("🔎 คัดกรองหน้าตัดทั้งตาราง", expanded=False):
+            screen_df = df.dropna(subset=['Sy']) if biaxial else df
+            if restraint == 'unbraced':
+                screen_df = screen_df.dropna(subset=['Iy'])
+            screened = screen_catalog(screen_df, geometry, loads, materials,
+                                      combinations=combo_set, limits=limit_set)
+            passing = screened[screened['Pass']]
+            if passing.empty:
+                st.warning("ไม่มีหน้าตัดในตารางที่ผ่านทุกเกณฑ์")
+            else:
+                st.markdown(f"**หน้าตัดเบาที่สุดที่ผ่าน:** {passing.iloc[0]['Section']}")
+            st.dataframe(screened.style.format(precision=2), use_container_width=True, hide_index=True)
 
         st.divider()
         
@@ -253,4 +512,22 @@ with col_in2:
             else:
                 st.error(f"ไม่สามารถสร้างรายงานได้: {result_path}")
                 # Print exception for valid string debugging
-                print(f"PDF Error: {result_path}")
\ No newline at end of file
+                print(f"PDF Error: {result_path}")
+
+        # Save to project store
+        with st.expander("💾 บันทึกลงโครงการ"):
+            pc1, pc2 = st.columns(2)
+            building_name = pc1.text_input("อาคาร", value=project_name or "อาคาร 1", key="store_building")
+            member_name = pc2.text_input("ชื่อชิ้นส่วน", value=f"P-{section_name}", key="store_member")
+            if st.button("บันทึก", key="store_save"):
+                with ProjectStore() as store:
+                    building_id = store.create_building(building_name, owner=owner, engineer=engineer)
+                    store.save_member(building_id, MemberRecord(
+                        member_name, "purlin",
+                        {"section_data": section_data, **inputs_dict, "combinations": combo_set,
+                         "limits": limit_set},
+                        res, section=section_name,
+                    ))
+                st.success(f"บันทึก {member_name} ลงอาคาร {building_name} แล้ว")
+
+timing_panel(profiler, "purlin")
@@ -1,10 +1,21 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from rafter_design import RafterDesign
+from load_combinations import COMBINATION_SETS
+from serviceability import LIMIT_PROFILES
+from parametric_sweep import PARAMETER_LABELS, heatmap_figure, rafter_inputs, sweep, sweep_range
+from diagrams import diagram, diagram_figure, member_loading
+from section_recommender import cold_formed_rafter_columns, hot_rolled_rafter_columns, recommend
+from catalog_index import CatalogIndex
+from built_up import ARRANGEMENT_LABELS, built_up_catalog, rafter_columns, section_data as built_up_section_data
+from catalog_store import extend_catalog
 from theme_manager import use_theme
+from debug_panel import debug_profiler, timing_panel
 
 st.set_page_config(page_title="ออกแบบจันทัน", layout="wide")
 use_theme()
+profiler = debug_profiler("rafter")
 
 st.title("🏠 โมดูลออกแบบจันทันเหล็ก")
 st.markdown("**อ้างอิง:** AISC 360-16 · วิธี LRFD · รองรับ มอก. 1227 (รีดร้อน) และ มอก. 1228 (ขึ้นรูปเย็น)")
@@ -24,7 +35,7 @@ def _load_hr():
         # fallback: ถ้าไม่มีคอลัมน์ Type ให้เพิ่มเป็น HN ทั้งหมด
         if "Type" not in df.columns:
             df["Type"] = "HN"
-        return df
+        return extend_catalog(df, "H")
     return pd.DataFrame()
 
 
@@ -35,11 +46,28 @@ def _load_cf():
     # ถ้า load_data ไม่ได้ข้อมูล ให้ลอง tis_1228 โดยตรง
     if df.empty and pd.io.common.file_exists("tis_1228_steel.csv"):
         df = pd.read_csv("tis_1228_steel.csv")
-    return df
+    return extend_catalog(df, "C") if not df.empty else df
 
 
-df_hr = _load_hr()
-df_cf = _load_cf()
+@st.cache_resource
+def _index_hr():
+    return CatalogIndex(_load_hr())
+
+
+@st.cache_resource
+def _index_cf():
+    return CatalogIndex(_load_cf())
+
+
+@st.cache_resource
+def _index_built_up(arrangement):
+    return CatalogIndex(built_up_catalog(_load_cf(), (arrangement,)))
+
+
+hr_index = _index_hr()
+cf_index = _index_cf()
+df_hr = hr_index.frame
+df_cf = cf_index.frame
 
 # ─────────────────────────────────────────────────────────────
 # SIDEBAR — Inputs
@@ -55,6 +83,18 @@ with st.sidebar:
     dl = st.number_input("น้ำหนักคงที่ DL (กก./ตร.ม.)",  value=20.0, step=5.0, key="rf_dl")
     ll = st.number_input("น้ำหนักใช้งาน LL (กก./ตร.ม.)", value=30.0, step=5.0, key="rf_ll")
     wl = st.number_input("แรงลม WL (กก./ตร.ม.)",         value=50.0, step=5.0, key="rf_wl")
+    combo_set = st.selectbox(
+        "ชุด Load Combination", list(COMBINATION_SETS.keys()),
+        format_func=lambda k: COMBINATION_SETS[k].name, key="rf_combo_set"
+    )
+    limit_set = st.selectbox(
+        "เกณฑ์การโก่งตัว", list(LIMIT_PROFILES.keys()),
+        format_func=lambda k: LIMIT_PROFILES[k].name, key="rf_limit_set"
+    )
+    point_mode = st.checkbox("รับน้ำหนักเป็นแรงจุดจากแป", value=False, key="rf_point_mode",
+                             help="แปลงน้ำหนักผิวเป็นแรงปฏิกิริยาแป ณ แนวแป แทนน้ำหนักแผ่ตามลาด")
+    purlin_spacing = st.number_input("ระยะแปตามลาด (เมตร)", value=1.0, min_value=0.1, step=0.1,
+                                     format="%.2f", key="rf_purlin_spacing", disabled=not point_mode)
 
     st.header("🔩 3. เลือกหน้าตัด")
 
@@ -65,6 +105,7 @@ with st.sidebar:
         key="rf_std",
     )
     is_hr = std_choice.startswith("🏗")
+    arrangement = None
 
     if is_hr:
         # ── ข. ชนิดหน้าตัด H-Beam ─────────────────────────────
@@ -78,7 +119,7 @@ with st.sidebar:
             "HW": "HW — ปีกกว้าง (เสา)",
             "I":  "I  — I-Beam ปีกลิ่ม",
         }
-        available_types = [t for t in ["HN", "HM", "HW", "I"] if t in df_hr["Type"].values]
+        available_types = hr_index.groups(["HN", "HM", "HW", "I"])
         type_sel = st.selectbox(
             "ชนิดหน้าตัด",
             available_types,
@@ -86,31 +127,25 @@ with st.sidebar:
             key="rf_type",
         )
 
-        df_filtered = df_hr[df_hr["Type"] == type_sel].copy()
-
         # ── ค. กรองตามความลึก ─────────────────────────────────
-        h_vals = sorted(df_filtered["h"].unique())
-        h_min, h_max = int(min(h_vals)), int(max(h_vals))
         depth_range = st.select_slider(
             "กรองตามความลึก h (mm)",
-            options=sorted(df_filtered["h"].unique().tolist()),
-            value=(h_min, h_max),
+            options=hr_index.values("h", types=type_sel),
+            value=hr_index.bounds("h", types=type_sel),
             key="rf_depth",
         )
-        df_show = df_filtered[
-            (df_filtered["h"] >= depth_range[0]) & (df_filtered["h"] <= depth_range[1])
-        ]
+        section_options = hr_index.names(types=type_sel, h=depth_range)
 
-        if df_show.empty:
+        if not section_options:
             st.warning("ไม่พบหน้าตัดในช่วงที่เลือก")
             st.stop()
 
         section_name = st.selectbox(
             "เลือกหน้าตัด",
-            df_show["Section"].astype(str).unique(),
+            section_options,
             key="rf_sec_hr",
         )
-        row = df_hr[df_hr["Section"] == section_name].iloc[0]
+        row = hr_index.row(section_name)
 
         # ── ง. คุณสมบัติวัสดุ SS400 / SM490 ──────────────────
         grade_map = {
@@ -134,28 +169,33 @@ with st.sidebar:
             st.error("ไม่พบข้อมูล มอก. 1228")
             st.stop()
 
+        arrangement = st.radio(
+            "รูปแบบหน้าตัด", [None, "back_to_back", "boxed"], horizontal=True,
+            format_func=lambda a: "ตัวซีเดี่ยว" if a is None else f"2C {ARRANGEMENT_LABELS[a]}",
+            key="rf_builtup",
+        )
+        if arrangement is not None:
+            cf_index = _index_built_up(arrangement)
+            df_cf = cf_index.frame
+
         # กรองตามความลึก
-        h_col = "h" if "h" in df_cf.columns else df_cf.columns[0]
-        h_vals_cf = sorted(df_cf[h_col].unique().tolist()) if h_col in df_cf.columns else []
-        if h_vals_cf:
+        if "h" in cf_index.keys:
             depth_range_cf = st.select_slider(
                 "กรองตามความลึก h (mm)",
-                options=h_vals_cf,
-                value=(min(h_vals_cf), max(h_vals_cf)),
+                options=cf_index.values("h"),
+                value=cf_index.bounds("h"),
                 key="rf_depth_cf",
             )
-            df_show_cf = df_cf[
-                (df_cf[h_col] >= depth_range_cf[0]) & (df_cf[h_col] <= depth_range_cf[1])
-            ]
+            section_options_cf = cf_index.names(h=depth_range_cf)
         else:
-            df_show_cf = df_cf
+            section_options_cf = cf_index.names()
 
         section_name = st.selectbox(
             "เลือกหน้าตัด C-Channel",
-            df_show_cf["Section"].astype(str).unique(),
+            section_options_cf,
             key="rf_sec_cf",
         )
-        row = df_cf[df_cf["Section"] == section_name].iloc[0]
+        row = cf_index.row(section_name)
 
         # วัสดุ SSC400 มอก. 1228
         st.markdown("**เกรดเหล็ก:** SSC400 (มอก. 1228-2549)")
@@ -210,6 +250,24 @@ if is_hr:
             use_container_width=True,
         )
 
+elif arrangement is not None:
+    built = built_up_section_data(row, "rafter")
+    d_cm, bf_cm, tf_cm, tw_cm = built["d"], built["bf"], built["tf"], built["tw"]
+    area, Ix_v, Sx_v, Zx_v = built["Area"], built["Ix"], built["Sx"], built["Zx"]
+    ry_v, rts_v, J_v, h0_v = built["ry"], built["rts"], built["J"], built["h0"]
+    wt_v  = built["Weight"]
+
+    prop_cols = st.columns(4)
+    prop_cols[0].metric("น้ำหนัก", f"{wt_v:.2f} kg/m")
+    prop_cols[1].metric("Area",   f"{area:.3f} cm²")
+    prop_cols[2].metric("Ix",     f"{Ix_v:.1f} cm⁴")
+    prop_cols[3].metric("Zx",     f"{Zx_v:.2f} cm³")
+    prop_cols2 = st.columns(4)
+    prop_cols2[0].metric("ry",  f"{ry_v:.3f} cm")
+    prop_cols2[1].metric("rts", f"{rts_v:.3f} cm")
+    prop_cols2[2].metric("J",   f"{J_v:.4f} cm⁴")
+    prop_cols2[3].metric("tw รวม", f"{tw_cm * 10:.1f} mm")
+
 else:
     d_cm  = _fv("h")  / 10.0
     bf_cm = _fv("b")  / 10.0
@@ -278,7 +336,19 @@ if should_calc:
     load_input = {"DL": dl, "LL": ll, "WL": wl}
     materials  = {"Fy": fy, "E": E}
 
-    design = RafterDesign(section_data, geometry, load_input, materials)
+    design_loads = load_input
+    if point_mode:
+        # แรงปฏิกิริยาแป = น้ำหนักผิว × ระยะจันทัน × ระยะรับน้ำหนักตามลาด (แปขอบรับครึ่งหนึ่ง)
+        slope_len = span / np.cos(np.radians(slope))
+        x_purlin  = np.linspace(0.0, slope_len, max(int(np.ceil(slope_len / purlin_spacing - 1e-9)) + 1, 2))
+        trib      = np.diff(np.concatenate([[0.0], (x_purlin[1:] + x_purlin[:-1]) / 2, [slope_len]]))
+        design_loads = {"DL": 0.0, "LL": 0.0, "WL": 0.0, "point_loads": [
+            {"x": float(x), "D": dl * spacing * t, "L": ll * spacing * t, "W": wl * spacing * t}
+            for x, t in zip(x_purlin, trib)
+        ]}
+
+    design = RafterDesign(section_data, geometry, design_loads, materials, combinations=combo_set,
+                          limits=limit_set)
     res    = design.run_design()
 
     checks = res["Checks"]["Status"]
@@ -350,10 +420,63 @@ if should_calc:
             "✅ ผ่าน" if dl_["pass"]      else "❌ ไม่ผ่าน",
         ],
     })
+    if "Wind" in defl_detail:
+        dw = defl_detail["Wind"]
+        summary.loc[len(summary)] = ["การโก่งตัวจากแรงลม", f"{dw['value']:.3f} ซม.", f"{dw['limit']:.3f} ซม.",
+                                     dw["ratio"], "✅ ผ่าน" if dw["pass"] else "❌ ไม่ผ่าน"]
+    if "Ponding" in ratios:
+        summary.loc[len(summary)] = ["น้ำขัง (Ponding)", f"C_p = {capacity['Cp']:.4f}", "C_p + 0.9C_s ≤ 0.25",
+                                     ratios["Ponding"], "✅ ผ่าน" if checks["Ponding"] else "❌ ไม่ผ่าน"]
     st.dataframe(
         summary.style.format({"อัตราส่วน": "{:.3f}"}).map(_rs, subset=["ผล"]),
         use_container_width=True,
     )
+    st.caption(f"Cb = {capacity['Cb']:.3f} (AISC F1-1 จากแผนภาพโมเมนต์ของช่วงไม่ค้ำยันที่ควบคุม)"
+               + (" — การวิเคราะห์พาราเมตริกใช้น้ำหนักแผ่สม่ำเสมอ" if point_mode else ""))
+
+    if not all_pass:
+        alternatives = recommend("rafter", df_hr if is_hr else df_cf, section_name, geometry, load_input, materials,
+                                 combinations=combo_set, limits=limit_set,
+                                 columns=(hot_rolled_rafter_columns if is_hr else
+                                          rafter_columns if arrangement is not None else cold_formed_rafter_columns))
+        st.markdown("**💡 หน้าตัดทางเลือกที่ใกล้เคียงที่สุดที่ผ่านทุกเกณฑ์**"
+                    + (" (ตรวจด้วยน้ำหนักแผ่สม่ำเสมอ)" if point_mode else ""))
+        if alternatives.empty:
+            st.info("ไม่มีหน้าตัดที่หนักกว่าในตารางที่ผ่านทุกเกณฑ์")
+        else:
+            st.dataframe(alternatives.style.format(precision=2), use_container_width=True, hide_index=True)
+
+    with st.expander("📉 แผนภาพโมเมนต์ แรงเฉือน และการโก่งตัว", expanded=False):
+        rafter_diag = diagram(member_loading("rafter", {"section_data": section_data, "geometry": geometry,
+                                                        "materials": materials, "combinations": combo_set}, res),
+                              name="จันทัน")
+        st.plotly_chart(diagram_figure(rafter_diag), use_container_width=True)
+
+    with st.expander("📈 วิเคราะห์พาราเมตริก (Parametric Sweep)", expanded=False):
+        sweep_base = rafter_inputs(section_data, geometry, load_input, materials,
+                                   combinations=combo_set, limits=limit_set)
+        sweep_params = ['span', 'spacing', 'slope', 'Lb', 'DL', 'LL', 'WL', 'Fy']
+        sc1, sc2, sc3 = st.columns([2, 2, 1])
+        x_param = sc1.selectbox("แกน X", sweep_params, index=0,
+                                format_func=lambda k: PARAMETER_LABELS.get(k, k), key="rf_sweep_x")
+        y_param = sc2.selectbox("แกน Y", sweep_params, index=1,
+                                format_func=lambda k: PARAMETER_LABELS.get(k, k), key="rf_sweep_y")
+        n_pts = sc3.number_input("จุด/แกน", min_value=10, max_value=100, value=50, step=10, key="rf_sweep_n")
+        if x_param == y_param:
+            st.warning("เลือกพารามิเตอร์แกน X และแกน Y ให้ต่างกัน")
+        else:
+            swept = sweep("rafter", sweep_base, {
+                y_param: sweep_range(y_param, sweep_base[y_param], int(n_pts)),
+                x_param: sweep_range(x_param, sweep_base[x_param], int(n_pts)),
+            }, outputs=("Max_Ratio", "Pass"))
+            st.plotly_chart(heatmap_figure(swept, title="อัตราส่วนสูงสุด (เส้นดำ = 1.0)"), use_container_width=True)
+            sens = swept.sensitivity()
+            st.dataframe(pd.DataFrame({
+                "พารามิเตอร์": [PARAMETER_LABELS.get(k, k) for k in sens],
+                "ความไวเชิงสัมพัทธ์": list(sens.values()),
+            }).style.format(precision=2), use_container_width=True, hide_index=True)
+            st.caption(f"ประเมิน {swept['Max_Ratio'].size:,} กรณีใน {swept.elapsed * 1000:.1f} ms — "
+                       f"ผ่าน {swept.pass_fraction():.0%} ของกริด")
 
     # ── Calculation Steps ─────────────────────────────────────
     with st.expander("📝 ขั้นตอนการคำนวณแบบละเอียด", expanded=False):
@@ -387,3 +510,5 @@ if should_calc:
                                    "Rafter_Design_Report.pdf", "application/pdf")
         else:
             st.error(f"สร้างรายงานไม่สำเร็จ: {path_or_err}")
+
+timing_panel(profiler, "rafter")
@@ -1,11 +1,20 @@
 import streamlit as st # type: ignore
 import pandas as pd
 from data_utils import load_data
+from catalog_store import extend_catalog
 from theme_manager import use_theme
+from debug_panel import debug_profiler, timing_panel
 from beam_design import ColdFormedBeamDesign
+from finite_strip import FLEXURE_METHODS
+from load_combinations import COMBINATION_SETS
+from serviceability import LIMIT_PROFILES
+from diagrams import diagram, diagram_figure, member_loading
+from section_recommender import recommend
+from built_up import ARRANGEMENT_LABELS, built_up_catalog
 
 st.set_page_config(page_title="ออกแบบคานเหล็กขึ้นรูปเย็น", layout="wide")
 use_theme()
+profiler = debug_profiler("beam")
 
 st.title("🏗️ โมดูลออกแบบคาน/อเส เหล็กขึ้นรูปเย็น")
 st.caption("อ้างอิง มอก. 1228-2549 และ LRFD Load Combination ของ วสท.")
@@ -15,7 +24,12 @@ DATA_FILE = "Roof-by-Sarayut-LRFD-V.1.0.3.xlsx - Data Steel.csv"
 
 @st.cache_data
 def get_sections() -> pd.DataFrame:
-	return load_data(DATA_FILE)
+	return extend_catalog(load_data(DATA_FILE), "C")
+
+
+@st.cache_data
+def get_built_up(arrangement: str) -> pd.DataFrame:
+	return built_up_catalog(get_sections(), (arrangement,))
 
 
 sections = get_sections()
@@ -37,6 +51,18 @@ with st.sidebar:
 	live = st.number_input("น้ำหนักใช้งาน L", min_value=0.0, value=120.0, step=5.0, key="beam_live")
 	wind = st.number_input("แรงลม W", min_value=-200.0, value=60.0, step=5.0,
 						  help="ค่าบวก = แรงกด, ค่าลบ = แรงยก", key="beam_wind")
+	combo_set = st.selectbox(
+		"ชุด Load Combination", list(COMBINATION_SETS.keys()),
+		format_func=lambda k: COMBINATION_SETS[k].name, key="beam_combo_set"
+	)
+	limit_set = st.selectbox(
+		"เกณฑ์การโก่งตัว", list(LIMIT_PROFILES.keys()),
+		format_func=lambda k: LIMIT_PROFILES[k].name, key="beam_limit_set"
+	)
+	flexure_method = st.selectbox(
+		"วิธีคำนวณกำลังดัด (การโก่งเดาะเฉพาะที่)", list(FLEXURE_METHODS.keys()),
+		format_func=lambda k: FLEXURE_METHODS[k], key="beam_flexure_method"
+	)
 	
 	# Live Calculation Toggle
 	st.divider()
@@ -48,6 +74,11 @@ st.subheader("เลือกหน้าตัดจากมาตรฐาน
 col_section, col_props = st.columns([1.2, 1.0])
 
 with col_section:
+	arrangement = st.radio("รูปแบบหน้าตัด", [None, "back_to_back", "boxed"], horizontal=True,
+						   format_func=lambda a: "ตัวซีเดี่ยว" if a is None else f"2C {ARRANGEMENT_LABELS[a]}",
+						   key="beam_builtup")
+	if arrangement is not None:
+		sections = get_built_up(arrangement)
 	section_name = st.selectbox("หน้าตัด", sections["Section"].astype(str).unique())
 
 section_row = sections[sections["Section"] == section_name].iloc[0]
@@ -93,8 +124,10 @@ if should_calculate_beam:
 
 	design = ColdFormedBeamDesign(
 		section=section_data,
-		geometry={"span": span, "spacing": spacing},
-		loads={"D": dead, "L": live, "W": wind}
+		geometry={"span": span, "spacing": spacing, "flexure_method": flexure_method},
+		loads={"D": dead, "L": live, "W": wind},
+		combinations=combo_set,
+		limits=limit_set,
 	)
 
 	try:
@@ -174,8 +207,27 @@ if should_calculate_beam:
 			   "ผ่าน" if status['Shear'] else "ไม่ผ่าน",
 			   "ผ่าน" if status['Deflection'] else "ไม่ผ่าน"]
 	})
+	defl_detail = result["Checks"]["Deflection"]
+	if "Wind" in defl_detail:
+		dw = defl_detail["Wind"]
+		summary_df.loc[len(summary_df)] = ["การโก่งตัวจากแรงลม", f"{dw['value']:.3f} ซม.", f"{dw['limit']:.3f} ซม.",
+										   dw["ratio"], "ผ่าน" if dw["pass"] else "ไม่ผ่าน"]
 	st.dataframe(summary_df.style.format({"อัตราส่วน": "{:.2f}"}))
 
+	if not all_pass_beam:
+		alternatives = recommend("beam", sections, section_name, design.geometry,
+								 {"D": dead, "L": live, "W": wind}, design.material,
+								 combinations=combo_set, limits=limit_set)
+		st.markdown("**💡 หน้าตัดทางเลือกที่ใกล้เคียงที่สุดที่ผ่านทุกเกณฑ์**")
+		if alternatives.empty:
+			st.info("ไม่มีหน้าตัดที่หนักกว่าในตารางที่ผ่านทุกเกณฑ์")
+		else:
+			st.dataframe(alternatives.style.format(precision=2), use_container_width=True, hide_index=True)
+
+	with st.expander("📉 แผนภาพโมเมนต์ แรงเฉือน และการโก่งตัว", expanded=False):
+		beam_diag = diagram(member_loading("beam", result["Inputs"], result), name="คาน")
+		st.plotly_chart(diagram_figure(beam_diag), use_container_width=True)
+
 	st.subheader("บันทึกการคำนวณ")
 	with st.expander("รายละเอียดขั้นตอน", expanded=True):
 		for step in result["Steps"]:
@@ -185,3 +237,5 @@ if should_calculate_beam:
 			if step.get('note'):
 				st.markdown(f"_{step['note']}_")
 			st.markdown("---")
+
+timing_panel(profiler, "beam")
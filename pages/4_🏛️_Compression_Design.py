@@ -3,11 +3,17 @@ import math
 import pandas as pd
 import streamlit as st
 
+from built_up import ARRANGEMENT_LABELS, built_up_catalog, section_data as built_up_section_data
+from catalog_index import CatalogIndex
+from catalog_store import extend_catalog
 from compression_design import CompressionDesign
+from reliability import monte_carlo
 from theme_manager import use_theme
+from debug_panel import debug_profiler, timing_panel
 
 st.set_page_config(page_title="ออกแบบสมาชิกรับแรงอัด", layout="wide")
 use_theme()
+profiler = debug_profiler("compression")
 
 st.title("🏛️ โมดูลออกแบบสมาชิกรับแรงอัด (Compression Member)")
 st.markdown(
@@ -20,16 +26,30 @@ st.markdown("---")
 # โหลดข้อมูลหน้าตัดเหล็กรีดร้อน มอก. 1227
 # ─────────────────────────────────────────────────────────────
 DATA_HR = "tis_1227_steel.csv"
+DATA_CF = "tis_1228_steel.csv"
 
 
 @st.cache_data
 def _load_hr():
     if pd.io.common.file_exists(DATA_HR):
-        return pd.read_csv(DATA_HR)
+        return extend_catalog(pd.read_csv(DATA_HR), "H")
     return pd.DataFrame()
 
 
-df_hr = _load_hr()
+@st.cache_resource
+def _index_hr():
+    return CatalogIndex(_load_hr())
+
+
+@st.cache_data
+def _load_built_up(arrangement):
+    if not pd.io.common.file_exists(DATA_CF):
+        return pd.DataFrame()
+    return built_up_catalog(extend_catalog(pd.read_csv(DATA_CF), "C"), (arrangement,))
+
+
+hr_index = _index_hr()
+df_hr = hr_index.frame
 
 # ─────────────────────────────────────────────────────────────
 # ข้อมูลโครงการ
@@ -55,7 +75,7 @@ with col_in:
     st.subheader("1. หน้าตัดเหล็ก")
     input_mode = st.radio(
         "วิธีระบุหน้าตัด",
-        ["เลือกจาก มอก. 1227 (H-Beam)", "ป้อนค่าเอง (Manual Input)"],
+        ["เลือกจาก มอก. 1227 (H-Beam)", "ตัวซีประกอบ มอก. 1228 (2C)", "ป้อนค่าเอง (Manual Input)"],
         horizontal=True, key="cp_mode",
     )
 
@@ -64,9 +84,9 @@ with col_in:
             st.error("ไม่พบไฟล์ tis_1227_steel.csv กรุณาตรวจสอบ")
             st.stop()
         sec_name = st.selectbox(
-            "เลือกหน้าตัด H-Beam", df_hr["Section"].astype(str).unique(), key="cp_sec"
+            "เลือกหน้าตัด H-Beam", hr_index.names(), key="cp_sec"
         )
-        row = df_hr[df_hr["Section"] == sec_name].iloc[0]
+        row = hr_index.row(sec_name)
         Ag_v  = float(row.get("Area", 0))
         Ix_v  = float(row.get("Ix",   0))
         ry_v  = float(row.get("ry",   0))
@@ -89,6 +109,21 @@ with col_in:
         })
         st.dataframe(prop_df, hide_index=True, use_container_width=True)
 
+    elif input_mode == "ตัวซีประกอบ มอก. 1228 (2C)":
+        arrangement = st.radio("การประกอบ", ["back_to_back", "boxed"], horizontal=True,
+                               format_func=ARRANGEMENT_LABELS.get, key="cp_builtup")
+        df_bu = _load_built_up(arrangement)
+        if df_bu.empty:
+            st.error("ไม่พบไฟล์ tis_1228_steel.csv กรุณาตรวจสอบ")
+            st.stop()
+        sec_name = st.selectbox("เลือกหน้าตัดประกอบ", df_bu["Section"].tolist(), key="cp_sec_bu")
+        row = df_bu[df_bu["Section"] == sec_name].iloc[0]
+        data = built_up_section_data(row, "compression")
+        Ag_v, rx_v, ry_v = data["Ag"], data["rx"], data["ry"]
+        h_v, bf_v, tw_v, tf_v = data["h"], data["bf"], data["tw"], data["tf"]
+        st.caption(f"น้ำหนัก {row['Weight']:.2f} kg/m · Ag {Ag_v:.2f} cm² · rx {rx_v:.2f} cm · "
+                   f"ry {ry_v:.2f} cm · bf {bf_v:.0f} mm · tw รวม {tw_v:.1f} mm")
+
     else:  # Manual Input
         sec_name = st.text_input("ชื่อหน้าตัด", "Custom Column", key="cp_sec_name")
         c1m, c2m = st.columns(2)
@@ -291,6 +326,29 @@ with col_out:
         styled = summary.style.map(_res_style, subset=["ผล"])
         st.dataframe(styled, use_container_width=True)
 
+        with st.expander("🎲 ความน่าจะเป็นของการวิบัติ (Monte Carlo)", expanded=False):
+            lf_mc = st.number_input("ตัวคูณน้ำหนักเฉลี่ย (แปลง Pu เป็นแรงใช้งาน)", min_value=1.0,
+                                    value=1.4, step=0.05, key="cp_mc_lf")
+            mc1, mc2 = st.columns(2)
+            n_mc = mc1.selectbox("จำนวนตัวอย่าง", [100_000, 1_000_000, 5_000_000], index=1,
+                                 format_func=lambda n: f"{n:,}", key="cp_mc_n")
+            seed_mc = mc2.number_input("Seed", min_value=0, value=0, step=1, key="cp_mc_seed")
+            st.caption("สุ่ม Fy, E, คุณสมบัติหน้าตัด และน้ำหนักบรรทุกจากค่าสถิติมาตรฐาน "
+                       "(ไม่มีตัวคูณ φ และตัวคูณน้ำหนัก)")
+            if st.button("เริ่มจำลอง", key="cp_mc_run"):
+                mc = monte_carlo("compression", dict(
+                    Ag=Ag_v, rx=rx_v, ry=ry_v, h=h_v, bf=bf_v, tw=tw_v, tf=tf_v, Fy=fy_v, E=E_v,
+                    Lx=Lx_v, Ly=Ly_v, Kx=Kx_v, Ky=Ky_v, Pu=Pu_v / lf_mc,
+                ), n_samples=int(n_mc), seed=int(seed_mc))
+                r1, r2, r3 = st.columns(3)
+                r1.metric("ดัชนีความเชื่อถือได้ β", f"{mc.beta:.2f}")
+                r2.metric("Pf", f"{mc.pf:.2e}" if mc.failures else f"< {mc.pf_upper:.1e}")
+                r3.metric("β (Cornell)", f"{mc.beta_cornell:.2f}")
+                if mc.governing:
+                    st.markdown("**สภาวะขีดจำกัดที่ควบคุมการวิบัติ:** " + ", ".join(
+                        f"{k} {v:,}" for k, v in mc.governing.items() if v))
+                st.caption(f"วิบัติ {mc.failures:,} จาก {mc.n_samples:,} ตัวอย่าง ใช้เวลา {mc.elapsed:.2f} วินาที")
+
         # ── Calculation Steps ────────────
         with st.expander("📝 ขั้นตอนการคำนวณแบบละเอียด (Step-by-Step)", expanded=True):
             for step in res["Steps"]:
@@ -336,3 +394,5 @@ with col_out:
             "โดยวิศวกรที่ได้รับใบอนุญาต (สามัญวิศวกร/วุฒิวิศวกร) "
             "ตาม พ.ร.บ. วิชาชีพวิศวกรรม พ.ศ. 2542"
         )
+
+timing_panel(profiler, "compression")
@@ -3,11 +3,15 @@ import math
 import pandas as pd
 import streamlit as st
 
+from catalog_index import CatalogIndex
+from catalog_store import extend_catalog
 from tension_design import TensionDesign, SHEAR_LAG_TABLE
 from theme_manager import use_theme
+from debug_panel import debug_profiler, timing_panel
 
 st.set_page_config(page_title="ออกแบบสมาชิกรับแรงดึง", layout="wide")
 use_theme()
+profiler = debug_profiler("tension")
 
 st.title("🔩 โมดูลออกแบบสมาชิกรับแรงดึง (Tension Member)")
 st.markdown(
@@ -26,18 +30,31 @@ DATA_CF  = "Roof-by-Sarayut-LRFD-V.1.0.3.xlsx - Data Steel.csv"
 @st.cache_data
 def _load_hr():
     if pd.io.common.file_exists(DATA_HR):
-        return pd.read_csv(DATA_HR)
+        return extend_catalog(pd.read_csv(DATA_HR), "H")
     return pd.DataFrame()
 
 
 @st.cache_data
 def _load_cf():
     from data_utils import load_data
-    return load_data(DATA_CF)
+    df = load_data(DATA_CF)
+    return extend_catalog(df, "C") if not df.empty else df
 
 
-df_hr = _load_hr()
-df_cf = _load_cf()
+@st.cache_resource
+def _index_hr():
+    return CatalogIndex(_load_hr())
+
+
+@st.cache_resource
+def _index_cf():
+    return CatalogIndex(_load_cf())
+
+
+hr_index = _index_hr()
+cf_index = _index_cf()
+df_hr = hr_index.frame
+df_cf = cf_index.frame
 
 # ─────────────────────────────────────────────────────────────
 # ข้อมูลโครงการ
@@ -71,8 +88,8 @@ with col_in:
         if df_hr.empty:
             st.error("ไม่พบไฟล์ tis_1227_steel.csv")
             st.stop()
-        sec_name = st.selectbox("เลือกหน้าตัด H-Beam", df_hr["Section"].astype(str).unique(), key="tn_hr_sec")
-        row  = df_hr[df_hr["Section"] == sec_name].iloc[0]
+        sec_name = st.selectbox("เลือกหน้าตัด H-Beam", hr_index.names(), key="tn_hr_sec")
+        row  = hr_index.row(sec_name)
         Ag_v = float(row.get("Area", 0))
         Ix_v = float(row.get("Ix",   0))
         ry_v = float(row.get("ry",   0))
@@ -90,8 +107,8 @@ with col_in:
         if df_cf.empty:
             st.error("ไม่พบข้อมูลหน้าตัด มอก. 1228")
             st.stop()
-        sec_name = st.selectbox("เลือกหน้าตัด C-Channel", df_cf["Section"].astype(str).unique(), key="tn_cf_sec")
-        row  = df_cf[df_cf["Section"] == sec_name].iloc[0]
+        sec_name = st.selectbox("เลือกหน้าตัด C-Channel", cf_index.names(), key="tn_cf_sec")
+        row  = cf_index.row(sec_name)
         Ag_v = float(row.get("Area", 0))
         Ix_v = float(row.get("Ix",   0))
         h_mm = float(row.get("h",  100))
@@ -381,3 +398,5 @@ with col_out:
             "โดยวิศวกรที่ได้รับใบอนุญาต (สามัญวิศวกร/วุฒิวิศวกร) "
             "ตาม พ.ร.บ. วิชาชีพวิศวกรรม พ.ศ. 2542"
         )
+
+timing_panel(profiler, "tension")
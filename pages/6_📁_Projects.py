@@ -0,0 +1,76 @@
+import os
+
+import streamlit as st
+
+from diagrams import LOADING_BUILDERS, DiagramCache, diagram_figure
+from project_store import DEFAULT_PATH, ENGINE_NAMES, ProjectStore
+from theme_manager import use_theme
+from debug_panel import debug_profiler, timing_panel
+
+st.set_page_config(page_title="โครงการ", layout="wide")
+use_theme()
+profiler = debug_profiler("projects")
+
+st.title("📁 โครงการที่บันทึกไว้")
+st.caption("สรุปผลทุกชิ้นส่วนโหลดทันที ส่วนขั้นตอนการคำนวณโหลดเมื่อเลือกดูชิ้นส่วน")
+
+db_path = st.sidebar.text_input("ไฟล์ฐานข้อมูล", value=DEFAULT_PATH, key="proj_db")
+if not os.path.exists(db_path):
+    st.info("ยังไม่มีโครงการ — บันทึกชิ้นส่วนจากหน้าออกแบบแปก่อน")
+    st.stop()
+
+store = ProjectStore(db_path)
+buildings = store.buildings()
+if buildings.empty:
+    st.info("ยังไม่มีอาคารในฐานข้อมูลนี้")
+    st.stop()
+
+st.dataframe(buildings.drop(columns="id"), use_container_width=True, hide_index=True)
+
+building = st.selectbox("อาคาร", buildings["name"], key="proj_building")
+building_id = int(buildings.loc[buildings["name"] == building, "id"].iloc[0])
+
+f1, f2 = st.columns(2)
+engine = f1.selectbox("ประเภทชิ้นส่วน", ("ทั้งหมด",) + ENGINE_NAMES, key="proj_engine")
+failing_only = f2.checkbox("เฉพาะที่ไม่ผ่าน", key="proj_failing")
+
+summary = store.summaries(building_id, None if engine == "ทั้งหมด" else engine, failing_only)
+st.markdown(f"**{len(summary)}** ชิ้นส่วน")
+st.dataframe(
+    summary.drop(columns=["id", "updated_at"]).style.format({"max_ratio": "{:.3f}"}),
+    use_container_width=True, hide_index=True,
+)
+
+if not summary.empty:
+    member = st.selectbox("ดูรายละเอียดชิ้นส่วน", summary["name"], key="proj_member")
+    member_id = int(summary.loc[summary["name"] == member, "id"].iloc[0])
+    detail = store.load_member(member_id)
+
+    with st.expander("อินพุต"):
+        st.json(detail["inputs"])
+    if detail["result"]:
+        with st.expander("ผลลัพธ์"):
+            st.json(detail["result"])
+
+    if detail["result"] and detail["engine"] in LOADING_BUILDERS:
+        with st.expander("📉 แผนภาพโมเมนต์ แรงเฉือน และการโก่งตัว"):
+            cache = st.session_state.setdefault("proj_diagrams", DiagramCache())
+            diag = cache.get(f"{building}/{member}", detail["engine"], detail["inputs"], detail["result"])
+            st.plotly_chart(diagram_figure(diag), use_container_width=True)
+
+    with st.expander("📝 ขั้นตอนการคำนวณ"):
+        for step in store.load_steps(member_id):
+            status = step.get("status")
+            icon = "✅" if status == "PASS" else ("❌" if status == "FAIL" else "ℹ️")
+            st.markdown(f"**{icon} {step['title']}**")
+            st.latex(step["latex"])
+            if step.get("note"):
+                st.markdown(f"_{step['note']}_")
+
+    if st.button("ลบชิ้นส่วนนี้", key="proj_delete"):
+        store.delete_member(member_id)
+        st.rerun()
+
+store.close()
+
+timing_panel(profiler, "projects")
@@ -0,0 +1,360 @@
+"""
+parametric_sweep.py
+วิเคราะห์พาราเมตริก (Parametric Sweep) และความไวของผลการออกแบบต่อพารามิเตอร์
+
+ใช้ batch_checks ของแต่ละโมดูลออกแบบ (NumPy broadcasting) ประเมินทั้งกริด N มิติในครั้งเดียว
+ผลลัพธ์เป็น array มีป้ายกำกับ (dims / coords แบบ xarray) ของอัตราส่วนและผลผ่าน/ไม่ผ่าน
+
+    res = sweep("purlin", purlin_inputs(section, geometry, loads, materials),
+                {"span": np.linspace(4, 8, 100), "spacing": np.linspace(0.8, 1.8, 100)})
+    res["Max_Ratio"]            # array รูป (100, 100)
+    res.sensitivity()           # พารามิเตอร์ใดมีผลต่ออัตราส่วนมากที่สุด
+
+พารามิเตอร์ที่ไม่ใช่ตัวเลข (เช่น restraint, combinations) sweep ได้โดยวนรอบทีละค่า
+คลาสออกแบบที่ไม่มี batch_checks ใช้โหมดวนรอบ run_design ทีละจุด (ช้ากว่า แต่ได้ผลเหมือนกัน)
+"""
+
+from __future__ import annotations
+
+import inspect
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import beam_design
+import compression_design
+import purlin_design
+import rafter_design
+import tension_design
+from effective_width import section_dimensions
+
+# ─────────────────────────────────────────────────────────────
+# ทะเบียน engine: ชื่อ → ฟังก์ชัน batch_checks
+# ─────────────────────────────────────────────────────────────
+ENGINES: Dict[str, Callable[..., Dict[str, np.ndarray]]] = {
+    "purlin": purlin_design.batch_checks,
+    "rafter": rafter_design.batch_checks,
+    "beam": beam_design.batch_checks,
+    "compression": compression_design.batch_checks,
+    "tension": tension_design.batch_checks,
+}
+# ชื่อ → คลาสออกแบบ (run_design พร้อมขั้นตอน)
+DESIGN_CLASSES = {
+    "purlin": purlin_design.PurlinDesign,
+    "rafter": rafter_design.RafterDesign,
+    "beam": beam_design.ColdFormedBeamDesign,
+    "compression": compression_design.CompressionDesign,
+    "tension": tension_design.TensionDesign,
+}
+_CLASS_ENGINES = {cls: name for name, cls in DESIGN_CLASSES.items()}
+
+PARAMETER_LABELS = {
+    "span": "ช่วงพาด L (ม.)",
+    "spacing": "ระยะห่าง s (ม.)",
+    "slope": "ความชันหลังคา (องศา)",
+    "Lb": "ความยาวไม่ค้ำยัน Lb (ม.)",
+    "DL": "น้ำหนักคงที่ DL (กก./ตร.ม.)",
+    "LL": "น้ำหนักใช้งาน LL (กก./ตร.ม.)",
+    "WL": "แรงลม WL (กก./ตร.ม.)",
+    "Fy": "กำลังคราก Fy (ksc)",
+}
+
+
+def sweep_range(name: str, value: float, n: int = 50) -> np.ndarray:
+    """ช่วงค่าเริ่มต้นรอบค่าปัจจุบันสำหรับหน้า UI (±50%, ความชัน 0–30°+, ลมทั้งกดและดูด)"""
+    value = float(value)
+    if name == "slope":
+        lo, hi = 0.0, max(2.0 * value, 30.0)
+    elif name == "WL":
+        hi = 2.0 * max(abs(value), 50.0)
+        lo = -hi
+    elif value == 0:
+        lo, hi = 0.0, 100.0
+    else:
+        lo, hi = 0.5 * value, 1.5 * value
+    return np.linspace(lo, hi, n)
+
+
+# ─────────────────────────────────────────────────────────────
+# ตัวแปลงอินพุตแบบ dict ของหน้า UI → อาร์กิวเมนต์ batch_checks
+# ─────────────────────────────────────────────────────────────
+def purlin_inputs(section, geometry, loads, materials, combinations=None, limits=None) -> Dict[str, Any]:
+    """อินพุตของ PurlinDesign → อาร์กิวเมนต์ของ purlin_design.batch_checks"""
+    biaxial = bool(geometry.get('biaxial', False))
+    return dict(
+        span=geometry['span'], spacing=geometry['spacing'], slope=geometry.get('slope', 0.0),
+        DL=loads.get('DL', 0.0), LL=loads.get('LL', 0.0), WL=loads.get('WL', 0.0),
+        Weight=section.get('Weight', 0.0), Zx=section['Zx'], Ix=section['Ix'],
+        h=section['h'], t=section['t'], Fy=materials['Fy'], E=materials['E'],
+        Sy=section.get('Sy') if biaxial else None, biaxial=biaxial,
+        sag_rods=geometry.get('sag_rods', 0), Sx=section.get('Sx'), Iy=_optional(section, 'Iy'),
+        restraint=geometry.get('restraint', 'through_fastened'),
+        continuous=geometry.get('continuous', False), R=geometry.get('R'),
+        combinations=combinations, limits=limits, camber=geometry.get('camber', 0.0),
+        ponding=geometry.get('ponding'), Cp=geometry.get('Cp', 0.0),
+        flexure_method=geometry.get('flexure_method', 'effective_width'), **_dimensions(section, ('b', 'c')),
+    )
+
+
+def rafter_inputs(section, geometry, loads, materials, combinations=None, limits=None) -> Dict[str, Any]:
+    """อินพุตของ RafterDesign → อาร์กิวเมนต์ของ rafter_design.batch_checks"""
+    optional = {k: section[k] for k in ('Iy', 'J', 'h0', 'rts') if _optional(section, k) is not None}
+    return dict(
+        span=geometry['span'], spacing=geometry['spacing'], slope=geometry['slope'], Lb=geometry['Lb'],
+        DL=loads['DL'], LL=loads['LL'], WL=loads['WL'],
+        Zx=section['Zx'], Sx=section['Sx'], Ix=section['Ix'], bf=section['bf'], tf=section['tf'],
+        d=section['d'], tw=section['tw'], ry=section['ry'], Weight=section.get('Weight', 0.0),
+        Area=section.get('Area'), Fy=materials['Fy'], E=materials['E'],
+        combinations=combinations, limits=limits, camber=geometry.get('camber', 0.0),
+        ponding=geometry.get('ponding'), Cs=geometry.get('Cs', 0.0), **optional,
+    )
+
+
+def beam_inputs(section, geometry, loads, material, combinations=None, limits=None) -> Dict[str, Any]:
+    """อินพุตของ ColdFormedBeamDesign → อาร์กิวเมนต์ของ beam_design.batch_checks"""
+    return dict(
+        span=geometry['span'], D=loads.get('D', 0.0), L=loads.get('L', 0.0), W=loads.get('W', 0.0),
+        Zx=section['Zx'], Ix=section['Ix'], Fy=material['Fy'], E=material['E'],
+        Aw=_optional(section, 'Aw'), Area=section.get('Area'),
+        combinations=combinations, limits=limits, camber=geometry.get('camber', 0.0) or 0.0,
+        ponding=bool(geometry.get('ponding', False)), spacing=max(geometry.get('spacing', 1.0), 1e-6),
+        Cs=geometry.get('Cs', 0.0) or 0.0, flexure_method=geometry.get('flexure_method', 'effective_width'),
+        **_dimensions(section, ('h', 'b', 'c', 't')),
+    )
+
+
+def _dimensions(section, keys) -> Dict[str, Any]:
+    """ขนาดตัวซี / ตัวแซดสำหรับความกว้างประสิทธิผล (ว่างถ้าไม่ทราบ — ใช้ Zx เต็มตามเดิม)"""
+    dims = section_dimensions(section)
+    return {} if dims is None else {k: dims[k] for k in keys}
+
+
+def _optional(section, key):
+    """คุณสมบัติหน้าตัดที่ไม่บังคับ: None ถ้าไม่มีหรือเป็นศูนย์ (คอลัมน์ array ของทั้งตารางคืนตามเดิม)"""
+    value = section.get(key)
+    if value is None or (np.ndim(value) == 0 and not value):
+        return None
+    return value
+
+
+# ─────────────────────────────────────────────────────────────
+# ผลลัพธ์แบบมีป้ายกำกับ
+# ─────────────────────────────────────────────────────────────
+@dataclass
+class SweepResult:
+    """array N มิติที่มีชื่อแกน (dims) และค่าพิกัด (coords) — รูปแบบเดียวกับ xarray.Dataset"""
+
+    dims: Tuple[str, ...]
+    coords: Dict[str, np.ndarray]
+    data: Dict[str, np.ndarray]
+    engine: str = ""
+    elapsed: float = 0.0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.data
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(self.coords[d]) for d in self.dims)
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        return tuple(self.data)
+
+    def _index(self, dim: str, value) -> int:
+        coord = self.coords[dim]
+        if coord.dtype.kind in "fiu":
+            return int(np.argmin(np.abs(coord - float(value))))
+        matches = np.flatnonzero(coord == value)
+        if matches.size == 0:
+            raise ValueError(f"ไม่พบค่า '{value}' ในแกน '{dim}'")
+        return int(matches[0])
+
+    def sel(self, **indexers) -> "SweepResult":
+        """เลือกค่าตามพิกัด (ค่าตัวเลขใช้จุดที่ใกล้ที่สุด) แล้วตัดแกนนั้นออก"""
+        unknown = set(indexers) - set(self.dims)
+        if unknown:
+            raise ValueError(f"ไม่มีแกน: {', '.join(sorted(unknown))} (มี: {', '.join(self.dims)})")
+        index = tuple(self._index(d, indexers[d]) if d in indexers else slice(None) for d in self.dims)
+        dims = tuple(d for d in self.dims if d not in indexers)
+        return SweepResult(
+            dims, {d: self.coords[d] for d in dims}, {k: v[index] for k, v in self.data.items()},
+            self.engine, self.elapsed, {**self.attrs, **indexers},
+        )
+
+    def pass_fraction(self, var: str = "Pass") -> float:
+        return float(np.mean(self.data[var]))
+
+    def sensitivity(self, var: str = "Max_Ratio") -> Dict[str, float]:
+        """
+        ความไวเชิงสัมพัทธ์เฉลี่ย |∂R/∂x · x/R| ของแต่ละแกนตัวเลข เรียงจากมากไปน้อย
+        (ค่า 1.0 = เพิ่มพารามิเตอร์ 1% อัตราส่วนเปลี่ยนประมาณ 1%)
+        """
+        values = np.asarray(self.data[var], dtype=float)
+        out = {}
+        for axis, dim in enumerate(self.dims):
+            coord = self.coords[dim]
+            if coord.dtype.kind not in "fiu" or len(coord) < 2:
+                continue
+            grad = np.gradient(values, coord.astype(float), axis=axis)
+            shape = [1] * values.ndim
+            shape[axis] = -1
+            with np.errstate(divide="ignore", invalid="ignore"):
+                elasticity = np.abs(grad * coord.reshape(shape) / values)
+            out[dim] = float(np.nanmean(np.where(np.isfinite(elasticity), elasticity, np.nan)))
+        return dict(sorted(out.items(), key=lambda kv: -kv[1]))
+
+    def to_frame(self) -> pd.DataFrame:
+        """ตารางแบบยาว: หนึ่งแถวต่อหนึ่งจุดในกริด"""
+        mesh = np.meshgrid(*(self.coords[d] for d in self.dims), indexing="ij")
+        frame = {d: m.ravel() for d, m in zip(self.dims, mesh)}
+        frame.update({k: np.asarray(v).ravel() for k, v in self.data.items()})
+        return pd.DataFrame(frame)
+
+
+# ─────────────────────────────────────────────────────────────
+# การประเมินกริด
+# ─────────────────────────────────────────────────────────────
+def _resolve_engine(engine) -> Tuple[str, Callable[..., Dict[str, np.ndarray]]]:
+    if isinstance(engine, str):
+        try:
+            return engine, ENGINES[engine]
+        except KeyError:
+            raise ValueError(f"ไม่รู้จัก engine '{engine}' (ที่รองรับ: {', '.join(ENGINES)})") from None
+    if inspect.isclass(engine):
+        if engine in _CLASS_ENGINES:
+            name = _CLASS_ENGINES[engine]
+            return name, ENGINES[name]
+        return engine.__name__, _looped(engine)
+    if callable(engine):
+        return getattr(engine, "__module__", "custom"), engine
+    raise ValueError("engine ต้องเป็นชื่อ engine, คลาสออกแบบ หรือฟังก์ชัน batch")
+
+
+def _looped(design_cls) -> Callable[..., Dict[str, np.ndarray]]:
+    """โหมดสำรองสำหรับคลาส dataclass ที่ไม่มี batch_checks: เรียก run_design ทีละจุด"""
+    def run(**kwargs):
+        numeric = {k: np.asarray(v) for k, v in kwargs.items() if np.ndim(v) > 0}
+        shape = np.broadcast_shapes(*(v.shape for v in numeric.values())) if numeric else ()
+        numeric = {k: np.broadcast_to(v, shape) for k, v in numeric.items()}
+        rows = []
+        for idx in np.ndindex(*shape):
+            point = {**kwargs, **{k: v[idx].item() for k, v in numeric.items()}}
+            res = design_cls(**point).run_design()
+            ratios = res.get('Checks', {}).get('Ratios') or {'Ratio': res.get('Ratio', np.nan)}
+            rows.append({k: float(v) for k, v in ratios.items() if np.isscalar(v)})
+        keys = list(rows[0]) if rows else []
+        out = {k: np.array([r.get(k, np.nan) for r in rows]).reshape(shape) for k in keys}
+        out['Max_Ratio'] = np.max(np.stack([np.abs(v) for v in out.values()]), axis=0)
+        out['Pass'] = out['Max_Ratio'] <= 1.0
+        return out
+    return run
+
+
+def _accepted(func) -> Optional[set]:
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind == p.VAR_KEYWORD for p in params):
+        return None
+    return {p.name for p in params}
+
+
+def sweep(engine, base: Mapping[str, Any], ranges: Mapping[str, Sequence[Any]],
+          outputs: Optional[Sequence[str]] = None) -> SweepResult:
+    """
+    ประเมินกริดพารามิเตอร์ทุกจุดในครั้งเดียว
+
+    Args:
+        engine: ชื่อ ('purlin', 'rafter', 'beam', 'compression', 'tension'),
+                คลาสออกแบบ หรือฟังก์ชัน batch ที่รับ keyword arguments
+        base: อินพุตพื้นฐานของ engine (เช่นผลจาก purlin_inputs)
+        ranges: {ชื่อพารามิเตอร์: ลำดับค่า} ตามลำดับแกนของผลลัพธ์
+        outputs: ชื่อผลลัพธ์ที่ต้องการ (ค่าปริยาย = ทุก array ที่ engine คืน)
+
+    Returns:
+        SweepResult ที่ทุกตัวแปรมีรูป (len(ranges[d1]), len(ranges[d2]), ...)
+    """
+    name, func = _resolve_engine(engine)
+    if not ranges:
+        raise ValueError("ต้องระบุพารามิเตอร์อย่างน้อย 1 ตัวสำหรับการ sweep")
+    accepted = _accepted(func)
+    if accepted is not None:
+        unknown = set(ranges) - accepted
+        if unknown:
+            raise ValueError(f"engine '{name}' ไม่มีพารามิเตอร์: {', '.join(sorted(unknown))}")
+
+    dims = tuple(ranges)
+    coords = {d: np.asarray(list(ranges[d])) for d in dims}
+    for d, c in coords.items():
+        if c.ndim != 1 or c.size == 0:
+            raise ValueError(f"ช่วงของ '{d}' ต้องเป็นลำดับค่า 1 มิติที่ไม่ว่าง")
+    shape = tuple(len(coords[d]) for d in dims)
+    numeric = [d for d in dims if coords[d].dtype.kind in "fiu"]
+    categorical = [d for d in dims if d not in numeric]
+    numeric_shape = tuple(len(coords[d]) for d in numeric)
+
+    grid = {}
+    for axis, d in enumerate(numeric):
+        view = [1] * len(numeric)
+        view[axis] = -1
+        grid[d] = coords[d].astype(float).reshape(view)
+
+    start = time.perf_counter()
+    data: Dict[str, np.ndarray] = {}
+    for values in itertools.product(*(coords[d] for d in categorical)):
+        kwargs = {**base, **grid, **{d: v.item() if hasattr(v, "item") else v
+                                     for d, v in zip(categorical, values)}}
+        res = func(**kwargs)
+        cat_index = {d: int(np.flatnonzero(coords[d] == v)[0]) for d, v in zip(categorical, values)}
+        index = tuple(cat_index[d] if d in cat_index else slice(None) for d in dims)
+        for key, value in res.items():
+            if outputs is not None and key not in outputs:
+                continue
+            arr = np.asarray(value)
+            if arr.dtype.kind not in "fiub":
+                continue
+            if key not in data:
+                data[key] = np.empty(shape, dtype=arr.dtype)
+            data[key][index] = np.broadcast_to(arr, numeric_shape)
+    elapsed = time.perf_counter() - start
+    return SweepResult(dims, coords, data, name, elapsed, {"base": dict(base)})
+
+
+# ─────────────────────────────────────────────────────────────
+# แผนภาพ
+# ─────────────────────────────────────────────────────────────
+def heatmap_figure(result: SweepResult, var: str = "Max_Ratio", limit: float = 1.0,
+                   title: Optional[str] = None) -> go.Figure:
+    """Heatmap ของผล sweep 2 มิติ (แกน 1 = y, แกน 2 = x) พร้อมเส้นขอบ ratio = limit"""
+    if len(result.dims) != 2:
+        raise ValueError("heatmap ต้องการผล sweep 2 มิติ (ใช้ .sel() ตัดแกนที่เหลือก่อน)")
+    y_dim, x_dim = result.dims
+    z = np.asarray(result[var], dtype=float)
+    fig = go.Figure(go.Heatmap(
+        z=z, x=result.coords[x_dim], y=result.coords[y_dim],
+        colorscale="RdYlGn_r", zmin=0.0, zmax=1.5 * limit,
+        colorbar=dict(title=var),
+    ))
+    fig.add_trace(go.Contour(
+        z=z, x=result.coords[x_dim], y=result.coords[y_dim],
+        contours=dict(start=limit, end=limit, size=1, coloring="none", showlabels=True),
+        line=dict(color="black", width=2), showscale=False, hoverinfo="skip",
+    ))
+    fig.update_layout(
+        title=title or f"{var} — {result.engine}",
+        xaxis_title=PARAMETER_LABELS.get(x_dim, x_dim),
+        yaxis_title=PARAMETER_LABELS.get(y_dim, y_dim),
+        height=450, margin=dict(l=10, r=10, t=40, b=10),
+    )
+    return fig
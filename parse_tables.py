@@ -1,7 +1,9 @@
 import csv
 import re
 
-input_file = "tables_dump.txt"
+from pdf_tables import DUMP_FILE, parse_row
+
+input_file = DUMP_FILE
 output_csv = "tis_1228_steel.csv"
 
 # Regex to match H x A x C (e.g., 60 x 30 x 10 or 100 x 50 x 20)
@@ -23,7 +25,7 @@ for line in lines:
     # Check for header row and update map
     if "Zx" in line and "Ix" in line:
         try:
-            header_row = eval(line.strip())
+            header_row = parse_row(line)
             idx_map = {}
             for i, col in enumerate(header_row):
                 c = str(col).strip()
@@ -56,7 +58,7 @@ for line in lines:
         if not line.strip().startswith("["):
             continue
             
-        row = eval(line.strip())
+        row = parse_row(line)
         if len(row) < 10: continue
             
         # Extract using map
@@ -0,0 +1,251 @@
+"""
+pdf_tables.py
+ดึงตารางจากไฟล์ PDF มาตรฐาน (มอก. 1228 ฯลฯ) แบบขนาน พร้อม cache ต่อหน้า
+
+  - extract: แบ่งหน้าที่ยังไม่มีใน cache เป็นช่วงหน้าติดกัน ส่งให้ ProcessPoolExecutor
+    (แต่ละโปรเซสเปิด PDF ครั้งเดียวต่อช่วง) แล้วเก็บตารางของแต่ละหน้าเป็น JSON
+    ใน .pdf_cache/<sha256 ของไฟล์>/ — รันซ้ำหลังแก้ตัวแปลงตาราง (parse_tables.py) ไม่ต้องเปิด PDF อีก
+  - write_dump: เขียน tables_dump.txt รูปแบบเดิม (หนึ่งแถวต่อบรรทัด)
+  - parse_row: อ่านบรรทัดแถวของ tables_dump.txt กลับเป็น list ของ str
+    ตัวแปลงเฉพาะ list ของ string literal — ไม่ใช้ eval
+
+ต้องมี pdfplumber เฉพาะตอนดึงหน้าที่ยังไม่อยู่ใน cache (ไม่อยู่ใน requirements.txt ของแอป)
+
+    python pdf_tables.py --workers 4          # ดึงทุกหน้า → tables_dump.txt
+    python pdf_tables.py --pages 3-12 --text  # บางหน้า พร้อมข้อความ
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+PDF_PATH = "มอก. 1228-2549 เหล็กโครงสร้างรูปพรรณขึ้นรูปเย็น.pdf"
+CACHE_DIR = ".pdf_cache"
+DUMP_FILE = "tables_dump.txt"
+CACHE_VERSION = 1  # เพิ่มเมื่อเปลี่ยนวิธีทำความสะอาดเซลล์ (cache เดิมจะไม่ถูกใช้)
+
+Extractor = Callable[[str, Sequence[int], bool], Dict[int, dict]]
+
+
+# ─────────────────────────────────────────────────────────────
+# ดึงตารางจาก PDF
+# ─────────────────────────────────────────────────────────────
+def clean_cell(cell) -> str:
+    """เซลล์ว่าง (None) เป็น '' และขึ้นบรรทัดใหม่เป็นช่องว่าง (เหมือน tables_dump.txt เดิม)"""
+    return str(cell).replace("\n", " ") if cell else ""
+
+
+def pdfplumber_pages(pdf_path: str, pages: Sequence[int], text: bool = False) -> Dict[int, dict]:
+    """ดึงตาราง (และข้อความ) ของหน้า pages (เริ่มที่ 1) — ทำงานในโปรเซสลูก"""
+    import pdfplumber
+
+    out = {}
+    with pdfplumber.open(pdf_path) as pdf:
+        for number in pages:
+            page = pdf.pages[number - 1]
+            entry = {"tables": [[[clean_cell(c) for c in row] for row in table]
+                                for table in page.extract_tables()]}
+            if text:
+                entry["text"] = page.extract_text() or ""
+            out[number] = entry
+    return out
+
+
+def pdfplumber_page_count(pdf_path: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PageCache:
+    """cache ผลการดึงต่อหน้า: <root>/<hash>/meta.json และ p0001.json, p0002.json, ..."""
+
+    def __init__(self, pdf_path: str, root: str = CACHE_DIR) -> None:
+        self.dir = os.path.join(root, f"{file_hash(pdf_path)[:24]}-v{CACHE_VERSION}")
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def _read(self, name: str) -> Optional[dict]:
+        try:
+            with open(self._path(name), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None  # ไม่มีหรือไฟล์เสีย → ดึงใหม่
+
+    def _write(self, name: str, data: dict) -> None:
+        os.makedirs(self.dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self._path(name))
+
+    def page_count(self) -> Optional[int]:
+        meta = self._read("meta.json")
+        return meta["pages"] if meta else None
+
+    def set_page_count(self, pages: int) -> None:
+        self._write("meta.json", {"pages": pages})
+
+    def get(self, number: int, text: bool = False) -> Optional[dict]:
+        entry = self._read(f"p{number:04d}.json")
+        if entry is None or (text and "text" not in entry):
+            return None
+        return entry
+
+    def put(self, number: int, entry: dict) -> None:
+        self._write(f"p{number:04d}.json", entry)
+
+
+def _chunks(numbers: List[int], parts: int) -> List[List[int]]:
+    """แบ่งหน้าเป็น parts ช่วงที่ติดกัน (ขนาดใกล้เคียงกัน)"""
+    parts = max(1, min(parts, len(numbers)))
+    size, extra = divmod(len(numbers), parts)
+    out, start = [], 0
+    for i in range(parts):
+        stop = start + size + (i < extra)
+        out.append(numbers[start:stop])
+        start = stop
+    return [c for c in out if c]
+
+
+def extract(pdf_path: str = PDF_PATH, pages: Optional[Iterable[int]] = None, workers: Optional[int] = None,
+            cache_dir: str = CACHE_DIR, text: bool = False, extractor: Extractor = pdfplumber_pages,
+            page_count: Callable[[str], int] = pdfplumber_page_count) -> Dict[int, dict]:
+    """
+    ตารางของแต่ละหน้า {เลขหน้า: {"tables": [[[cell, ...], ...], ...], "text": ...}}
+
+    Args:
+        pages: เลขหน้า (เริ่มที่ 1) — None = ทุกหน้า
+        workers: จำนวนโปรเซส — None = จำนวน CPU, 1 = ทำในโปรเซสนี้
+        text: เก็บข้อความของหน้าด้วย (สำหรับ inspect_pdf.py)
+        extractor: ฟังก์ชันดึงหน้า (pdf_path, pages, text) → {เลขหน้า: entry} ต้อง pickle ได้
+    """
+    cache = PageCache(pdf_path, cache_dir)
+    if pages is None:
+        total = cache.page_count()
+        if total is None:
+            total = page_count(pdf_path)
+            cache.set_page_count(total)
+        pages = range(1, total + 1)
+    numbers = sorted(set(int(n) for n in pages))
+    result = {n: cache.get(n, text) for n in numbers}
+    missing = [n for n, entry in result.items() if entry is None]
+
+    if missing:
+        workers = workers or os.cpu_count() or 1
+        # สองช่วงต่อโปรเซส: ช่วงที่มีตารางหนาแน่นไม่ทำให้โปรเซสอื่นว่างนาน
+        chunks = _chunks(missing, workers * 2)
+        if workers == 1 or len(chunks) == 1:
+            done = [extractor(pdf_path, chunk, text) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                futures = [pool.submit(extractor, pdf_path, chunk, text) for chunk in chunks]
+                done = [future.result() for future in as_completed(futures)]
+        for part in done:
+            for number, entry in part.items():
+                cache.put(number, entry)
+                result[number] = entry
+    return result
+
+
+def write_dump(pages: Dict[int, dict], path: str = DUMP_FILE) -> None:
+    """เขียนตารางเป็น tables_dump.txt (รูปแบบเดียวกับ extract_tables_full.py เดิม)"""
+    with open(path, "w", encoding="utf-8") as f:
+        for number in sorted(pages):
+            tables = pages[number]["tables"]
+            if not tables:
+                continue
+            f.write(f"\n--- Page {number} Found {len(tables)} tables ---\n")
+            for j, table in enumerate(tables):
+                f.write(f"Table {j + 1}:\n")
+                for row in table:
+                    f.write(str(row) + "\n")
+
+
+# ─────────────────────────────────────────────────────────────
+# ตัวแปลงบรรทัดแถว (แทน eval)
+# ─────────────────────────────────────────────────────────────
+_ITEM = re.compile(r"""\s*(?:'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)")\s*([,\]])""", re.S)
+_ESCAPE = re.compile(r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|.)", re.S)
+_SIMPLE_ESCAPES = {"\\": "\\", "'": "'", '"': '"', "n": "\n", "r": "\r", "t": "\t",
+                   "a": "\a", "b": "\b", "f": "\f", "v": "\v", "0": "\0", "\n": ""}
+
+
+def _unescape(match: "re.Match[str]") -> str:
+    code = match.group(1)
+    if code[0] in "xuU" and len(code) > 1:
+        return chr(int(code[1:], 16))
+    return _SIMPLE_ESCAPES.get(code, "\\" + code)  # escape ที่ไม่รู้จักคงไว้ตามเดิมแบบ Python
+
+
+def parse_row(line: str) -> List[str]:
+    """
+    แปลงบรรทัด "['a', 'b', '']" (repr ของ list ของ str) เป็น list
+
+    Raises:
+        ValueError: บรรทัดไม่ใช่ list ของ string literal
+    """
+    s = line.strip()
+    if not (s.startswith("[") and s.endswith("]")):
+        raise ValueError(f"ไม่ใช่แถวตาราง: {s[:40]!r}")
+    if not s[1:-1].strip():
+        return []
+    row, pos = [], 1
+    while True:
+        match = _ITEM.match(s, pos)
+        if match is None:
+            raise ValueError(f"แถวตารางไม่ถูกต้องที่ตำแหน่ง {pos}: {s[:40]!r}")
+        raw = match.group(1) if match.group(1) is not None else match.group(2)
+        row.append(_ESCAPE.sub(_unescape, raw) if "\\" in raw else raw)
+        pos = match.end()
+        if match.group(3) == "]":
+            break
+    if pos != len(s):
+        raise ValueError(f"มีข้อความเกินหลังแถวตาราง: {s[:40]!r}")
+    return row
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ดึงตารางจาก PDF มาตรฐานแบบขนาน (มี cache ต่อหน้า)")
+    parser.add_argument("pdf", nargs="?", default=PDF_PATH)
+    parser.add_argument("--pages", help="ช่วงหน้า เช่น 3-12 หรือ 3,5,7")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--text", action="store_true", help="เก็บข้อความของหน้าด้วย")
+    parser.add_argument("--out", default=DUMP_FILE)
+    args = parser.parse_args(argv)
+
+    pages = None
+    if args.pages:
+        pages = []
+        for part in args.pages.split(","):
+            lo, _, hi = part.partition("-")
+            pages.extend(range(int(lo), int(hi or lo) + 1))
+    start = time.perf_counter()
+    result = extract(args.pdf, pages, args.workers, text=args.text)
+    write_dump(result, args.out)
+    n_tables = sum(len(entry["tables"]) for entry in result.values())
+    print(f"{len(result)} หน้า, {n_tables} ตาราง → {args.out} ({time.perf_counter() - start:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+project_store.py
+ที่เก็บโครงการแบบ SQLite: อาคาร → ชิ้นส่วน → อินพุต / ผลลัพธ์ / ขั้นตอนการคำนวณ
+
+ออกแบบสำหรับโครงการขนาดใหญ่ (หลายพันชิ้นส่วน):
+  - WAL mode + synchronous=NORMAL (อ่านพร้อมเขียนได้, commit เร็ว)
+  - ตาราง members เก็บเฉพาะสรุป (อัตราส่วนสูงสุด, ผ่าน/ไม่ผ่าน) พร้อมดัชนี
+    เปิดโครงการจึงอ่านเฉพาะสรุปก่อน ส่วนผลลัพธ์เต็มและขั้นตอนโหลดเมื่อเรียกดู
+  - บันทึกหลายชิ้นส่วนใน transaction เดียวด้วย executemany
+
+engine: purlin, rafter, beam, compression, tension (เหมือน parametric_sweep / design_service)
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_PATH = "roof_projects.db"
+ENGINE_NAMES = ("purlin", "rafter", "beam", "compression", "tension")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buildings (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,
+    meta        TEXT NOT NULL DEFAULT '{}',
+    created_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS members (
+    id          INTEGER PRIMARY KEY,
+    building_id INTEGER NOT NULL REFERENCES buildings(id) ON DELETE CASCADE,
+    name        TEXT NOT NULL,
+    engine      TEXT NOT NULL,
+    section     TEXT NOT NULL DEFAULT '',
+    max_ratio   REAL,
+    governing   TEXT,
+    passed      INTEGER,
+    updated_at  REAL NOT NULL,
+    UNIQUE (building_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_members_engine ON members (building_id, engine);
+CREATE INDEX IF NOT EXISTS idx_members_ratio ON members (building_id, max_ratio DESC);
+CREATE TABLE IF NOT EXISTS member_data (
+    member_id   INTEGER PRIMARY KEY REFERENCES members(id) ON DELETE CASCADE,
+    inputs      TEXT NOT NULL,
+    result      TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    member_id   INTEGER NOT NULL REFERENCES members(id) ON DELETE CASCADE,
+    seq         INTEGER NOT NULL,
+    title       TEXT NOT NULL,
+    status      TEXT,
+    payload     TEXT NOT NULL,
+    PRIMARY KEY (member_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+def _dumps(value: Any) -> str:
+    # numpy scalar / bool ที่หลุดมาจากผลคำนวณแปลงผ่าน float/str
+    return json.dumps(value, ensure_ascii=False, default=lambda v: v.item() if hasattr(v, "item") else str(v))
+
+
+def summarize_result(result: Mapping[str, Any]) -> Tuple[Optional[float], Optional[str], Optional[bool]]:
+    """
+    สรุปผล run_design เป็น (อัตราส่วนสูงสุด, รายการควบคุม, ผ่านทั้งหมด)
+    รองรับทั้งรูปแบบ Checks{Ratios, Status} (แป จันทัน คาน) และ Ratio/Status (รับแรงอัด แรงดึง)
+    """
+    checks = result.get("Checks")
+    if isinstance(checks, Mapping) and "Ratios" in checks:
+        status = checks.get("Status", {})
+        ratios = {k: float(v) for k, v in checks["Ratios"].items() if k in status}
+        if not ratios:
+            return None, None, None
+        governing = max(ratios, key=ratios.get)
+        return ratios[governing], governing, all(bool(v) for v in status.values())
+    if "Ratio" in result:
+        passed = bool(result.get("Status")) and bool(result.get("SlendernessOK", True))
+        return float(result["Ratio"]), "Strength", passed
+    return None, None, None
+
+
+@dataclass
+class MemberRecord:
+    """ชิ้นส่วนหนึ่งรายการสำหรับบันทึก (result มาจาก run_design รวม Steps)"""
+
+    name: str
+    engine: str
+    inputs: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    section: str = ""
+    steps: List[Dict[str, Any]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.engine not in ENGINE_NAMES:
+            raise ValueError(f"ไม่รู้จัก engine '{self.engine}' (ที่รองรับ: {', '.join(ENGINE_NAMES)})")
+        if self.result is not None and not self.steps:
+            self.steps = list(self.result.get("Steps", []))
+
+
+class ProjectStore:
+    """ฐานข้อมูลโครงการ — ใช้เป็น context manager ได้"""
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ProjectStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ─────────────────────────────────────────────────────────
+    # อาคาร
+    # ─────────────────────────────────────────────────────────
+    def create_building(self, name: str, **meta: Any) -> int:
+        """สร้างอาคาร (ถ้ามีชื่อนี้อยู่แล้วคืน id เดิมและปรับ meta)"""
+        if not name:
+            raise ValueError("ต้องระบุชื่ออาคาร")
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO buildings (name, meta, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET meta = excluded.meta",
+                (name, _dumps(meta), time.time()),
+            )
+        return self.building_id(name)
+
+    def building_id(self, name: str) -> int:
+        row = self.conn.execute("SELECT id FROM buildings WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise ValueError(f"ไม่พบอาคาร '{name}'")
+        return row["id"]
+
+    def buildings(self) -> pd.DataFrame:
+        """รายการอาคารพร้อมจำนวนชิ้นส่วนและจำนวนที่ไม่ผ่าน"""
+        return pd.read_sql_query(
+            "SELECT b.id, b.name, COUNT(m.id) AS members, "
+            "SUM(CASE WHEN m.passed = 0 THEN 1 ELSE 0 END) AS failing, MAX(m.max_ratio) AS max_ratio "
+            "FROM buildings b LEFT JOIN members m ON m.building_id = b.id GROUP BY b.id ORDER BY b.name",
+            self.conn,
+        )
+
+    def delete_building(self, building_id: int) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM buildings WHERE id = ?", (building_id,))
+
+    # ─────────────────────────────────────────────────────────
+    # ชิ้นส่วน
+    # ─────────────────────────────────────────────────────────
+    def save_member(self, building_id: int, record: MemberRecord) -> int:
+        return self.save_members(building_id, [record])[0]
+
+    def save_members(self, building_id: int, records: Iterable[MemberRecord]) -> List[int]:
+        """
+        บันทึกหลายชิ้นส่วนใน transaction เดียว (ชื่อซ้ำในอาคารเดียวกัน = เขียนทับ)
+        คืน id ตามลำดับ records
+        """
+        records = list(records)
+        if not records:
+            return []
+        now = time.time()
+        member_rows = []
+        for r in records:
+            ratio, governing, passed = summarize_result(r.result) if r.result else (None, None, None)
+            member_rows.append((building_id, r.name, r.engine, r.section, ratio, governing,
+                                None if passed is None else int(passed), now))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO members (building_id, name, engine, section, max_ratio, governing, passed, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(building_id, name) DO UPDATE SET engine = excluded.engine, "
+                "section = excluded.section, max_ratio = excluded.max_ratio, governing = excluded.governing, "
+                "passed = excluded.passed, updated_at = excluded.updated_at",
+                member_rows,
+            )
+            ids = self._member_ids(building_id, [r.name for r in records])
+            self.conn.executemany("DELETE FROM steps WHERE member_id = ?", [(i,) for i in ids])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO member_data (member_id, inputs, result) VALUES (?, ?, ?)",
+                [(i, _dumps(r.inputs),
+                  None if r.result is None else _dumps({k: v for k, v in r.result.items() if k != "Steps"}))
+                 for i, r in zip(ids, records)],
+            )
+            self.conn.executemany(
+                "INSERT INTO steps (member_id, seq, title, status, payload) VALUES (?, ?, ?, ?, ?)",
+                [(i, seq, s.get("title", ""), s.get("status"), _dumps(s))
+                 for i, r in zip(ids, records) for seq, s in enumerate(r.steps)],
+            )
+        return ids
+
+    def _member_ids(self, building_id: int, names: List[str]) -> List[int]:
+        rows = self.conn.execute("SELECT id, name FROM members WHERE building_id = ?", (building_id,))
+        lookup = {row["name"]: row["id"] for row in rows}
+        return [lookup[n] for n in names]
+
+    def summaries(self, building_id: int, engine: Optional[str] = None,
+                  failing_only: bool = False) -> pd.DataFrame:
+        """สรุปชิ้นส่วนของอาคาร (ไม่อ่านอินพุต ผลลัพธ์เต็ม หรือขั้นตอน) เรียงจากอัตราส่วนมากไปน้อย"""
+        sql = ("SELECT id, name, engine, section, max_ratio, governing, passed, updated_at "
+               "FROM members WHERE building_id = ?")
+        params: List[Any] = [building_id]
+        if engine:
+            sql += " AND engine = ?"
+            params.append(engine)
+        if failing_only:
+            sql += " AND passed = 0"
+        sql += " ORDER BY max_ratio DESC"
+        df = pd.read_sql_query(sql, self.conn, params=params)
+        df["passed"] = df["passed"].map({1: True, 0: False})
+        return df
+
+    def load_member(self, member_id: int) -> Dict[str, Any]:
+        """อินพุตและผลลัพธ์ของชิ้นส่วน (ไม่รวมขั้นตอน — ใช้ load_steps)"""
+        row = self.conn.execute(
+            "SELECT m.*, d.inputs, d.result FROM members m JOIN member_data d ON d.member_id = m.id "
+            "WHERE m.id = ?", (member_id,),
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"ไม่พบชิ้นส่วน id={member_id}")
+        return {
+            "id": row["id"], "name": row["name"], "engine": row["engine"], "section": row["section"],
+            "inputs": json.loads(row["inputs"]),
+            "result": None if row["result"] is None else json.loads(row["result"]),
+        }
+
+    def load_steps(self, member_id: int) -> List[Dict[str, Any]]:
+        """ขั้นตอนการคำนวณของชิ้นส่วน ตามลำดับเดิม"""
+        rows = self.conn.execute("SELECT payload FROM steps WHERE member_id = ? ORDER BY seq", (member_id,))
+        return [json.loads(r["payload"]) for r in rows]
+
+    def delete_member(self, member_id: int) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM members WHERE id = ?", (member_id,))
@@ -1,6 +1,37 @@
 import math
 
-from design_logging import CalculationLogMixin
+import numpy as np
+import pandas as pd
+
+from design_logging import CalculationLogMixin, CapacityCache, traced
+from effective_width import catalog_dimensions, section_dimensions
+from finite_strip import FLEXURE_METHODS, flexural_ratio, log_flexure_steps
+from inverse_design import InverseDesignMixin
+from load_combinations import get_combination_set
+from serviceability import (deflection_checks, deflection_detail, get_limit_profile, log_limit_steps,
+                            log_ponding_step, ponding_applies, ponding_coefficient, ponding_ratio,
+                            uniform_deflection)
+
+# สัมประสิทธิ์โมเมนต์แกนอ่อน M_uy = k w_t L^2 ตามจำนวนเหล็กยึดแป (sag rod)
+# 0 = ไม่มี (ช่วงเดี่ยว wL²/8), 1 = กึ่งกลางช่วง (2 ช่วงต่อเนื่อง w(L/2)²/8),
+# 2 = จุด 1/3 ช่วง (3 ช่วงต่อเนื่อง 0.1w(L/3)²)
+SAG_ROD_MOMENT_COEFF = {
+    0: 1.0 / 8.0,
+    1: 1.0 / 32.0,
+    2: 1.0 / 90.0,
+}
+# รูปแบบการยึดปีกรับแรงอัดเมื่อรับแรงลมดูด (ปีกล่างรับแรงอัด)
+RESTRAINT_LABELS = {
+    "through_fastened": "ปีกบนยึดแผ่นหลังคาด้วยสกรู (R-factor, AISI S100 I6.2.1)",
+    "unbraced": "ปีกล่างไม่มีการค้ำยัน (Lateral-Torsional Buckling)",
+}
+SAG_ROD_LABELS = {
+    0: "ไม่มีเหล็กยึดแป",
+    1: "เหล็กยึดแปที่กึ่งกลางช่วง (1/2)",
+    2: "เหล็กยึดแปที่จุด 1/3 ช่วง",
+}
+
+_CAPACITY_CACHE = CapacityCache("PurlinDesign")
 
 
 def _ensure_positive(name: str, value: float) -> float:
@@ -9,14 +40,67 @@ def _ensure_positive(name: str, value: float) -> float:
     return value
 
 
-class PurlinDesign(CalculationLogMixin):
-    def __init__(self, section_data, geometry, loads, materials):
+def _steps_by_role(steps):
+    """จัดกลุ่มขั้นตอนของเฟสกำลังรับตาม metadata['role'] ที่ _capacity กำหนด (จำนวนขั้นตอนต่างกันตามหน้าตัด/วิธี)"""
+    groups = {}
+    for step in steps:
+        groups.setdefault(step['metadata'].get('role'), []).append(step)
+    return groups
+
+
+def _sag_rod_coeff(sag_rods) -> float:
+    if sag_rods not in SAG_ROD_MOMENT_COEFF:
+        raise ValueError("จำนวนเหล็กยึดแป (sag rods) ต้องเป็น 0, 1 หรือ 2")
+    return SAG_ROD_MOMENT_COEFF[sag_rods]
+
+
+def uplift_r_factor(h_mm, continuous=False):
+    """
+    ค่า R ตาราง AISI S100 I6.2.1-1 สำหรับแปตัว C ยึดแผ่นหลังคาด้วยสกรู (รับแรงลมดูด)
+
+    Args:
+        h_mm: ความลึกหน้าตัด (mm) รับได้ทั้งค่าเดี่ยวหรือ array
+        continuous (bool): แปต่อเนื่องหลายช่วง (R = 0.60)
+    """
+    h_mm = np.asarray(h_mm, dtype=float)
+    if continuous:
+        return np.full_like(h_mm, 0.60)
+    return np.select([h_mm <= 165.0, h_mm <= 216.0], [0.70, 0.65], default=0.40)
+
+
+def _se_ratio(h, b, c, t, Fy, E, method="effective_width"):
+    """Se/S (หรือ Mn/My ตาม DSM) จากการโก่งเดาะเฉพาะที่ — 1.0 ถ้าไม่ทราบขนาดปีกและขอบพับ (b, c)"""
+    if method not in FLEXURE_METHODS:
+        raise ValueError(f"ไม่รู้จักวิธีคำนวณกำลังดัด '{method}' (ที่รองรับ: {', '.join(FLEXURE_METHODS)})")
+    if b is None or c is None or t is None:
+        return 1.0
+    return flexural_ratio(h, b, c, t, Fy, E, method)
+
+
+def _flange_ltb_factor(Fy, E, h_mm, Iy, Sx, Lb_cm):
+    """อัตราส่วน Fc/Fy ของหน้าตัด C ปีกอิสระ (AISI S100 F2.1.1 / F2.1.3, Cb = 1.0)"""
+    Fe = np.pi ** 2 * E * (h_mm / 10.0) * (Iy / 2.0) / (Sx * Lb_cm ** 2)
+    Fc = np.where(
+        Fe >= 2.78 * Fy, Fy,
+        np.where(Fe > 0.56 * Fy, (10.0 / 9.0) * Fy * (1.0 - 10.0 * Fy / (36.0 * Fe)), Fe),
+    )
+    return Fc / Fy
+
+
+class PurlinDesign(CalculationLogMixin, InverseDesignMixin):
+    ENGINE = "purlin"
+    LOAD_CASES = ("DL", "LL", "WL")
+
+    def __init__(self, section_data, geometry, loads, materials, combinations=None, limits=None):
         self.sec = section_data
         self.geo = geometry
         self.loads = loads
         self.mat = materials
+        self.combos = get_combination_set(combinations)
+        self.limits = get_limit_profile(limits)
         CalculationLogMixin.__init__(self)
 
+    @traced
     def run_design(self):
         self.reset_steps()
 
@@ -64,44 +148,69 @@ class PurlinDesign(CalculationLogMixin):
             'Wind_line': wl_line_normal,
         }
 
-        # Load Combinations ตาม มอก. 1228-2549 และ LRFD (หลัก วสท.)
-        # LC1: น้ำหนักบรรทุกถาวรและน้ำหนักใช้สอยเต็มรูป
-        wu1 = 1.4 * dl_line + 1.7 * ll_line
-        
-        # LC2: พิจารณาแรงลมร่วมด้วย (ตามหลัก LRFD ของไทย)
-        combo_base = 0.75 * (1.4 * dl_line + 1.7 * ll_line)
+        # Load Combinations จากชุดตัวคูณ (ค่าปริยาย: หลัก LRFD ของ วสท. / มอก. 1228-2549)
+        # ลมใช้ค่าสัมบูรณ์ ส่วนลมกด/ลมดูดแยกเป็น combo ± ในชุด
+        combos = self.combos
         wind_effect = abs(wl_line_normal)
-        wu2_pos = combo_base + 1.6 * wind_effect  # ลมกด
-        wu2_neg = combo_base - 1.6 * wind_effect  # ลมดูด
-
-        self.add_step(
-            "LC1: 1.4D + 1.7L (ตาม มอก. 1228-2549)",
-            r"w_{u1} = 1.4w_{DL} + 1.7w_{LL}",
-            f"= 1.4({dl_line:.2f}) + 1.7({ll_line:.2f})",
-            f"= {wu1:.2f}\\,\\text{{kg/m}}",
-            note="โหลดแฟคเตอร์ตามหลัก LRFD ของ วสท."
-        )
-        self.add_step(
-            "LC2+: 0.75(1.4D+1.7L) + 1.6W (ลมกด)",
-            r"w_{u2+} = 0.75(1.4w_{DL} + 1.7w_{LL}) + 1.6|w_W|",
-            f"= 0.75(1.4 \\times {dl_line:.2f} + 1.7 \\times {ll_line:.2f}) + 1.6({wind_effect:.2f})",
-            f"= {wu2_pos:.2f}\\,\\text{{kg/m}}",
-            note="พิจารณาแรงลมกดตามมาตรฐานไทย"
-        )
-        self.add_step(
-            "LC2-: 0.75(1.4D+1.7L) - 1.6W (ลมดูด)",
-            r"w_{u2-} = 0.75(1.4w_{DL} + 1.7w_{LL}) - 1.6|w_W|",
-            f"= 0.75(1.4 \\times {dl_line:.2f} + 1.7 \\times {ll_line:.2f}) - 1.6({wind_effect:.2f})",
-            f"= {wu2_neg:.2f}\\,\\text{{kg/m}}",
-            note="พิจารณาแรงลมดูดตามมาตรฐานไทย"
-        )
+        case_values = combos.case_vector(D=dl_line, L=ll_line, W=wind_effect)
+        factored = combos.factored(case_values)
+        for combo, wu in zip(combos.combinations, factored):
+            if combo.uplift:
+                continue
+            self.add_step(
+                f"{combo.title} ({combos.reference or combos.name})",
+                r"w_{u} = " + combo.latex((r"w_{DL}", r"w_{LL}", r"|w_W|")),
+                combo.substitution(case_values),
+                f"= {wu:.2f}\\,\\text{{kg/m}}",
+                note=combo.note
+            )
 
         wu_candidates = {
-            "1.4D+1.7L": wu1,
-            "0.75(1.4D+1.7L)+1.6W": wu2_pos,
-            "0.75(1.4D+1.7L)-1.6W": wu2_neg,
+            combo.label: float(wu)
+            for combo, wu in zip(combos.combinations, factored) if not combo.uplift
         }
-        controlling_combo, wu_design = max(wu_candidates.items(), key=lambda item: abs(item[1]))
+
+        # กำลังรับขึ้นกับหน้าตัด วัสดุ และการยึดรั้งเท่านั้น — แก้เฉพาะน้ำหนักจะใช้ค่าจาก cache
+        # ขั้นตอนของเฟสกำลังรับจัดกลุ่มตามบทบาท (role) แล้วแทรกกลับตามลำดับเดิมด้านล่าง
+        cap, cap_steps = _CAPACITY_CACHE.get(self.capacity_key(), self._capacity)
+        cap_steps = _steps_by_role(cap_steps)
+        ix, fy, E = cap['Ix'], cap['Fy'], cap['E']
+        phi_mn, phi_vn = cap['Phi_Mn'], cap['Phi_Vn']
+        r_factor, phi_mn_uplift = cap['R'], cap['Phi_Mn_Uplift']
+
+        biaxial = bool(self.geo.get('biaxial', False))
+        if biaxial:
+            sag_rods = self.geo.get('sag_rods', 0)
+            k_weak = _sag_rod_coeff(sag_rods)
+            sin_slope = math.sin(slope_rad)
+            phi_mny = cap['Phi_Mny']
+
+            # แยกน้ำหนักแรงโน้มถ่วงเป็นองค์ประกอบตั้งฉาก/ขนานผิวหลังคา ลมกระทำตั้งฉากเท่านั้น
+            gravity, lateral = combos.split_factored(case_values)
+            components = {
+                combo.label: (g * cos_slope + w, g * sin_slope)
+                for combo, g, w in zip(combos.combinations, gravity, lateral) if not combo.uplift
+            }
+            self.add_step(
+                "แยกแรงโน้มถ่วงเป็นองค์ประกอบตามแกนหน้าตัด",
+                r"w_{u,n} = " + ",\\; ".join(
+                    combo.latex((r"w_{DL}\cos\theta", r"w_{LL}\cos\theta", r"|w_W|")) for combo in combos.strength
+                ) + r",\quad w_{u,t} = w_{u,g}\sin\theta",
+                f"\\cos {slope:.1f}^\\circ = {cos_slope:.4f},\\; \\sin {slope:.1f}^\\circ = {sin_slope:.4f}",
+                ",\\; ".join(
+                    f"({n_:.2f}, {t_:.2f})" for n_, t_ in components.values()
+                ) + "\\,\\text{kg/m}",
+                note="ลำดับ (w_n, w_t): " + ", ".join(c.name or c.label for c in combos.strength)
+                     + " — ลมกระทำตั้งฉากผิวหลังคาเท่านั้น"
+            )
+
+            def _interaction(item):
+                w_n, w_t = item[1]
+                return (abs(w_n) * span ** 2 / 8) / phi_mn + (abs(w_t) * k_weak * span ** 2) / phi_mny
+
+            controlling_combo, (wu_design, wu_tan) = max(components.items(), key=_interaction)
+        else:
+            controlling_combo, wu_design = max(wu_candidates.items(), key=lambda item: abs(item[1]))
 
         mu = wu_design * span ** 2 / 8
         self.add_step(
@@ -120,50 +229,88 @@ class PurlinDesign(CalculationLogMixin):
             f"= {vu:.2f}\\,\\text{{kg}}"
         )
 
-        zx = _ensure_positive("Z_x", self.sec.get('Zx'))
-        ix = _ensure_positive("I_x", self.sec.get('Ix'))
-        fy = _ensure_positive("F_y", self.mat.get('Fy'))
-        E = _ensure_positive("E", self.mat.get('E'))
-
-        h_mm = _ensure_positive("h", self.sec.get('h'))
-        t_mm = _ensure_positive("t", self.sec.get('t'))
-        aw_cm2 = (h_mm * t_mm) / 100.0
+        if biaxial:
+            muy = wu_tan * k_weak * span ** 2
+            self.add_step(
+                "โมเมนต์ออกแบบแกนอ่อน",
+                r"M_{uy} = k\,w_{u,t} L^2",
+                f"= {k_weak:.4f} \\times {wu_tan:.2f} \\times {span:.2f}^2",
+                f"= {muy:.2f}\\,\\text{{kg-m}}",
+                note=SAG_ROD_LABELS[sag_rods]
+            )
 
-        # กำลังดัดรับ ตาม มอก. 1228-2549 (Cold-formed Steel)
-        mn = zx * fy / 100.0  # Nominal moment capacity
-        phi_mn = 0.90 * mn     # Φ = 0.90 สำหรับ bending (ตามหลัก LRFD)
-        moment_ratio = mu / phi_mn
+        # combo ควบคุมเลือกจาก |w_u| — แรงยกให้ M_u, V_u ติดลบ จึงเทียบขนาด (เหมือน batch_checks)
+        moment_ratio = abs(mu) / phi_mn
         moment_pass = moment_ratio <= 1.0
-        self.add_step(
-            "กำลังดัดรับออกแบบ (ตาม มอก. 1228-2549)",
-            r"\phi M_n = 0.90 \times F_y \times Z_x / 100",
-            f"= 0.90 \\times {fy:.0f} \\times {zx:.2f} / 100",
-            f"= {phi_mn:.2f}\\,\\text{{kg-m}}",
-            status="PASS" if moment_pass else "FAIL",
-            note="Φ = 0.90 สำหรับการดัด (LRFD)"
-        )
+        self.extend_steps(cap_steps.get('flexure', []))
+        self.extend_steps(cap_steps['moment'], status="PASS" if moment_pass else "FAIL")
 
-        # กำลังเฉือนรับ ตาม มอก. 1228-2549
-        phi_vn = 0.95 * 0.6 * fy * aw_cm2  # Φ = 0.95 สำหรับ shear (ตามหลัก LRFD)
-        shear_ratio = vu / phi_vn
+        if biaxial:
+            weak_ratio = abs(muy) / phi_mny
+            biaxial_ratio = abs(mu) / phi_mn + weak_ratio
+            biaxial_pass = biaxial_ratio <= 1.0
+            self.extend_steps(cap_steps['weak'])
+            self.add_step(
+                "ตรวจสอบการดัดสองแกน",
+                r"\frac{M_{ux}}{\phi M_{nx}} + \frac{M_{uy}}{\phi M_{ny}} \leq 1.0",
+                f"= {abs(mu):.2f}/{phi_mn:.2f} + {abs(muy):.2f}/{phi_mny:.2f}",
+                f"= {biaxial_ratio:.3f}",
+                status="PASS" if biaxial_pass else "FAIL",
+                note="สมการปฏิสัมพันธ์เชิงเส้นสำหรับการดัดสองแกน"
+            )
+
+        shear_ratio = abs(vu) / phi_vn
         shear_pass = shear_ratio <= 1.0
-        self.add_step(
-            "กำลังเฉือนรับออกแบบ (ตาม มอก. 1228-2549)",
-            r"\phi V_n = 0.95 \times 0.6 \times F_y \times A_w",
-            f"= 0.95 \\times 0.6 \\times {fy:.0f} \\times {aw_cm2:.2f}",
-            f"= {phi_vn:.2f}\\,\\text{{kg}}",
-            status="PASS" if shear_pass else "FAIL",
-            note="Φ = 0.95 สำหรับการเฉือน (LRFD), V = 0.6FyAw"
-        )
+        self.extend_steps(cap_steps['shear'], status="PASS" if shear_pass else "FAIL")
+
+        # ตรวจสอบแรงลมดูด: ปีกล่างรับแรงอัด กำลังลดลงตามการยึดรั้งปีก
+        # ชุดที่ไม่มี combo แรงยก (เช่น custom_set รับแรงโน้มถ่วงอย่างเดียว) → ไม่ต้องตรวจ เหมือนน้ำขัง
+        check_uplift = bool(combos.uplift)
+        if check_uplift:
+            uplift_values = combos.case_vector(D=dl_line * cos_slope, W=wind_effect)
+            uplift_combo, wu_uplift = min(
+                ((c, float(v)) for c, v in zip(combos.combinations, combos.factored(uplift_values)) if c.uplift),
+                key=lambda item: item[1],
+            )
+            self.add_step(
+                f"{uplift_combo.title} (แรงลมดูดสุทธิ)",
+                r"w_{u,up} = " + uplift_combo.latex((r"w_{DL}\cos\theta", r"w_{LL}", r"|w_W|")),
+                uplift_combo.substitution(uplift_values),
+                f"= {wu_uplift:.2f}\\,\\text{{kg/m}}",
+                note="ค่าติดลบ = แรงยกสุทธิ ปีกล่างรับแรงอัด"
+            )
+            self.extend_steps(cap_steps['r'])
+            mu_uplift = max(-wu_uplift, 0.0) * span ** 2 / 8
+            uplift_ratio = mu_uplift / phi_mn_uplift
+            uplift_pass = uplift_ratio <= 1.0
+            self.add_step(
+                "ตรวจสอบกำลังดัดภายใต้แรงลมดูด",
+                r"\frac{M_{u,up}}{\phi R (S_e/S) S_x F_y} \leq 1.0",
+                f"= {mu_uplift:.2f} / (0.90 \\times {r_factor:.3f} \\times {cap['Se_Ratio']:.3f} \\times {cap['Sx']:.2f}"
+                f" \\times {fy:.0f} / 100)",
+                f"= {uplift_ratio:.3f}",
+                status="PASS" if uplift_pass else "FAIL",
+                note="ไม่เกิดแรงยกสุทธิ" if wu_uplift >= 0 else "ปีกล่างรับแรงอัดจากแรงลมดูด"
+            )
+        else:
+            self.add_step(
+                "ตรวจสอบกำลังดัดภายใต้แรงลมดูด",
+                r"\text{N/A}",
+                "-",
+                "-",
+                note=f"ชุด load combination '{combos.name}' ไม่มี combo แรงยก — ไม่ต้องตรวจ"
+            )
 
         span_cm = span * 100.0
         w_total_cm = (dl_line + ll_line) / 100.0
         w_live_cm = ll_line / 100.0
+        camber = float(self.geo.get('camber', 0.0) or 0.0)
 
-        delta_total = (5 * w_total_cm * span_cm ** 4) / (384 * E * ix)
-        delta_live = (5 * w_live_cm * span_cm ** 4) / (384 * E * ix)
-        limit_total = span_cm / 240.0
-        limit_live = span_cm / 360.0
+        delta_total = float(uniform_deflection(dl_line + ll_line, span_cm, E, ix))
+        delta_live = float(uniform_deflection(ll_line, span_cm, E, ix))
+        serv = deflection_checks(span_cm, delta_total, delta_live,
+                                 uniform_deflection(wl_line_normal, span_cm, E, ix),
+                                 limits=self.limits, camber=camber)
 
         self.add_step(
             "การโก่งตัวรวม DL+LL",
@@ -179,17 +326,17 @@ class PurlinDesign(CalculationLogMixin):
             f"= {delta_live:.3f}\\,\\text{{cm}}",
             note="คำนวณการโก่งตัวจาก Live Load เพียงอย่างเดียว"
         )
-        self.add_step(
-            "เกณฑ์การโก่งตัวตามกฎกระทรวง วสท.",
-            r"\Delta_{allow,tot} = \frac{L}{240},\quad \Delta_{allow,L} = \frac{L}{360}",
-            f"= {span_cm:.1f}/240,\\; {span_cm:.1f}/360",
-            f"= {limit_total:.3f},\\; {limit_live:.3f}\\,\\text{{cm}}",
-            note="หลักเกณฑ์ตามกฎกระทรวง ฉบับที่ 55 (พ.ศ. 2543) วิศวกรรมสถานแห่งประเทศไทย"
-        )
+        log_limit_steps(self.add_step, span_cm, self.limits, serv, camber)
+
+        delta_total = float(serv['Delta_Total'])
+        limit_total = float(serv['Delta_Limit_Total'])
+        limit_live = float(serv['Delta_Limit_Live'])
 
-        defl_total_ok = delta_total <= limit_total
-        defl_live_ok = delta_live <= limit_live
-        defl_pass = defl_total_ok and defl_live_ok
+        # น้ำขัง: แปเป็นชิ้นส่วนรอง (C_s) ส่วน C_p ของจันทันรับจาก geometry
+        check_ponding = bool(ponding_applies(slope, self.geo.get('ponding')))
+        if check_ponding:
+            cs = float(ponding_coefficient(spacing, span, E, ix))
+            ponding = log_ponding_step(self.add_step, float(self.geo.get('Cp', 0.0) or 0.0), cs, primary=False)
 
         checks = {
             'Capacity': {
@@ -207,42 +354,50 @@ class PurlinDesign(CalculationLogMixin):
             'Ratios': {
                 'Moment': moment_ratio,
                 'Shear': shear_ratio,
-                'Deflection': max(
-                    delta_total / limit_total if limit_total else float('inf'),
-                    delta_live / limit_live if limit_live else float('inf'),
-                ),
-                'h/t': h_mm / t_mm,
+                'Deflection': float(serv['Deflection']),
+                'h/t': cap['h'] / cap['t'],
             },
             'Status': {
                 'Moment': moment_pass,
                 'Shear': shear_pass,
-                'Deflection': defl_pass,
+                'Deflection': bool(serv['Pass']),
             },
-            'Deflection': {
-                'Total': {
-                    'value': delta_total,
-                    'limit': limit_total,
-                    'ratio': delta_total / limit_total if limit_total else float('inf'),
-                    'pass': defl_total_ok,
-                },
-                'Live': {
-                    'value': delta_live,
-                    'limit': limit_live,
-                    'ratio': delta_live / limit_live if limit_live else float('inf'),
-                    'pass': defl_live_ok,
-                },
-            }
+            'Deflection': deflection_detail(serv),
         }
+        if 'Delta_Wind' in serv:
+            checks['Capacity']['Delta_Limit_Wind'] = float(serv['Delta_Limit_Wind'])
+            checks['Demand']['Delta_Wind'] = float(serv['Delta_Wind'])
+        if check_ponding:
+            checks['Capacity']['Cs'] = cs
+            checks['Ratios']['Ponding'] = ponding
+            checks['Status']['Ponding'] = ponding <= 1.0
 
-        combinations = {
-            'Wu1': wu1,
-            'Wu2_pos': wu2_pos,
-            'Wu2_neg': wu2_neg,
-            'Wu_design': wu_design,
-            'Controlling': controlling_combo,
-        }
+        if check_uplift:
+            checks['Capacity']['Phi_Mn_Uplift'] = phi_mn_uplift
+            checks['Capacity']['R'] = r_factor
+            checks['Demand']['Mu_Uplift'] = mu_uplift
+            checks['Ratios']['Uplift'] = uplift_ratio
+            checks['Status']['Uplift'] = uplift_pass
+
+        if biaxial:
+            checks['Capacity']['Phi_Mny'] = phi_mny
+            checks['Demand']['Muy'] = muy
+            checks['Ratios']['WeakAxis'] = weak_ratio
+            checks['Ratios']['Biaxial'] = biaxial_ratio
+            checks['Status']['Biaxial'] = biaxial_pass
+
+        combinations = {c.key: float(v) for c, v in zip(combos.combinations, factored) if not c.uplift}
+        if check_uplift:
+            combinations[uplift_combo.key] = wu_uplift
+        combinations['Wu_design'] = wu_design
+        combinations['Controlling'] = controlling_combo
+        if check_uplift:
+            combinations['Controlling_Uplift'] = uplift_combo.label
 
         forces = {'Mu_kgm': mu, 'Vu_kg': vu}
+        if biaxial:
+            combinations['Wu_tangential'] = wu_tan
+            forces['Muy_kgm'] = muy
 
         return {
             'Loads': loads,
@@ -251,3 +406,359 @@ class PurlinDesign(CalculationLogMixin):
             'Checks': checks,
             'Steps': self.steps,
         }
+
+    def batch_inputs(self):
+        """อินพุตของแปนี้ในรูปอาร์กิวเมนต์ batch_checks (ใช้กับการออกแบบย้อนกลับ)"""
+        from parametric_sweep import purlin_inputs
+        return purlin_inputs(self.sec, self.geo, self.loads, self.mat, combinations=self.combos, limits=self.limits)
+
+    def capacity_key(self):
+        """อินพุตทั้งหมดของเฟสกำลังรับ (หน้าตัด วัสดุ การยึดรั้ง) — ไม่รวมน้ำหนักบรรทุก"""
+        biaxial = bool(self.geo.get('biaxial', False))
+        restraint = self.geo.get('restraint', 'through_fastened')
+        key = tuple(self.sec.get(k) for k in ('Zx', 'Ix', 'Sx', 'h', 't'))
+        dims = section_dimensions(self.sec)
+        key += tuple(dims.values()) if dims else (None,)
+        key += (self.mat.get('Fy'), self.mat.get('E'), biaxial, restraint,
+                self.geo.get('flexure_method', 'effective_width'))
+        if biaxial:
+            key += (self.sec.get('Sy'),)
+        if restraint == 'unbraced':
+            key += (self.sec.get('Iy'), self.geo.get('span'), self.geo.get('sag_rods', 0))
+        else:
+            key += (bool(self.geo.get('continuous', False)), self.geo.get('R'))
+        return key
+
+    def capacity(self):
+        """กำลังรับที่ไม่ขึ้นกับน้ำหนัก (Phi_Mn, Phi_Vn, R, Phi_Mn_Uplift) จาก cache"""
+        return _CAPACITY_CACHE.get(self.capacity_key(), self._capacity)[0]
+
+    def _capacity(self, log):
+        """
+        เฟสกำลังรับ: กำลังดัด (แกนอ่อน), กำลังเฉือน และตัวคูณ R — ขั้นตอนยังไม่มี status
+        ทุกขั้นตอนมี metadata['role'] ('flexure', 'moment', 'weak', 'shear', 'r') ให้ run_design ค้นตามบทบาท
+        """
+        zx = _ensure_positive("Z_x", self.sec.get('Zx'))
+        ix = _ensure_positive("I_x", self.sec.get('Ix'))
+        fy = _ensure_positive("F_y", self.mat.get('Fy'))
+        E = _ensure_positive("E", self.mat.get('E'))
+        sy = _ensure_positive("S_y", self.sec.get('Sy')) if self.geo.get('biaxial', False) else None
+        h_mm = _ensure_positive("h", self.sec.get('h'))
+        t_mm = _ensure_positive("t", self.sec.get('t'))
+        aw_cm2 = (h_mm * t_mm) / 100.0
+        restraint = self.geo.get('restraint', 'through_fastened')
+        if restraint not in RESTRAINT_LABELS:
+            raise ValueError("รูปแบบการยึดปีกต้องเป็น 'through_fastened' หรือ 'unbraced'")
+
+        # โมดูลัสหน้าตัดประสิทธิผล (ความกว้างประสิทธิผล หรือ DSM) — ต้องทราบ b, c ของหน้าตัด
+        method = self.geo.get('flexure_method', 'effective_width')
+        first = len(log.steps)
+        reduction = log_flexure_steps(log, section_dimensions(self.sec), zx, fy, E, method)
+        for step in log.steps[first:]:
+            step['metadata']['role'] = 'flexure'
+        se_ratio = reduction.pop('ratio')
+        se = se_ratio * zx
+
+        # กำลังดัดรับ ตาม มอก. 1228-2549 (Cold-formed Steel)
+        mn = se * fy / 100.0  # Nominal moment capacity
+        phi_mn = 0.90 * mn     # Φ = 0.90 สำหรับ bending (ตามหลัก LRFD)
+        log.add_step(
+            "กำลังดัดรับออกแบบ (ตาม มอก. 1228-2549)",
+            r"\phi M_n = 0.90 \times F_y \times S_e / 100",
+            f"= 0.90 \\times {fy:.0f} \\times {se:.2f} / 100",
+            f"= {phi_mn:.2f}\\,\\text{{kg-m}}",
+            note="Φ = 0.90 สำหรับการดัด (LRFD)",
+            metadata={'role': 'moment'}
+        )
+        values = {'Zx': zx, 'Ix': ix, 'Fy': fy, 'E': E, 'h': h_mm, 't': t_mm, 'Phi_Mn': phi_mn,
+                  'Se': se, 'Se_Ratio': se_ratio, 'Flexure_Method': method, **reduction}
+
+        if sy is not None:
+            phi_mny = 0.90 * fy * sy / 100.0
+            log.add_step(
+                "กำลังดัดรับออกแบบแกนอ่อน",
+                r"\phi M_{ny} = 0.90 \times F_y \times S_y / 100",
+                f"= 0.90 \\times {fy:.0f} \\times {sy:.2f} / 100",
+                f"= {phi_mny:.2f}\\,\\text{{kg-m}}",
+                note="ใช้โมดูลัสหน้าตัดยืดหยุ่น S_y (ปีกปลายเปิดของหน้าตัด C)",
+                metadata={'role': 'weak'}
+            )
+            values['Phi_Mny'] = phi_mny
+
+        # กำลังเฉือนรับ ตาม มอก. 1228-2549
+        phi_vn = 0.95 * 0.6 * fy * aw_cm2  # Φ = 0.95 สำหรับ shear (ตามหลัก LRFD)
+        log.add_step(
+            "กำลังเฉือนรับออกแบบ (ตาม มอก. 1228-2549)",
+            r"\phi V_n = 0.95 \times 0.6 \times F_y \times A_w",
+            f"= 0.95 \\times 0.6 \\times {fy:.0f} \\times {aw_cm2:.2f}",
+            f"= {phi_vn:.2f}\\,\\text{{kg}}",
+            note="Φ = 0.95 สำหรับการเฉือน (LRFD), V = 0.6FyAw",
+            metadata={'role': 'shear'}
+        )
+
+        # ตัวคูณ R ของกำลังดัดภายใต้แรงลมดูด (ปีกล่างรับแรงอัด)
+        sx = self.sec.get('Sx') or zx
+        if restraint == 'through_fastened':
+            continuous = bool(self.geo.get('continuous', False))
+            r_factor = float(self.geo.get('R') or uplift_r_factor(h_mm, continuous))
+            r_expr = r"R = R_{\text{AISI I6.2.1}}"
+            r_subst = f"h = {h_mm:.0f}\\,\\text{{mm}},\\; \\text{{{'continuous' if continuous else 'simple span'}}}"
+        else:
+            iy = _ensure_positive("I_y", self.sec.get('Iy'))
+            span = _ensure_positive("span", self.geo.get('span'))
+            lb_cm = span * 100.0 / (self.geo.get('sag_rods', 0) + 1)
+            r_factor = float(_flange_ltb_factor(fy, E, h_mm, iy, sx, lb_cm))
+            r_expr = r"R = \frac{F_c}{F_y},\quad F_e = \frac{\pi^2 E d I_{yc}}{S_f L_b^2}"
+            r_subst = f"L_b = {lb_cm:.0f}\\,\\text{{cm}},\\; I_{{yc}} = {iy / 2:.2f}\\,\\text{{cm}}^4"
+        log.add_step(
+            "ตัวคูณลดกำลังจากการยึดรั้งปีก",
+            r_expr,
+            r_subst,
+            f"R = {r_factor:.3f}",
+            note=RESTRAINT_LABELS[restraint],
+            metadata={'role': 'r'}
+        )
+        values.update({'Phi_Vn': phi_vn, 'Sx': sx, 'R': r_factor,
+                       'Phi_Mn_Uplift': 0.90 * r_factor * se_ratio * sx * fy / 100.0})
+        return values
+
+
+def uplift_checks(*, span, spacing, slope, DL, WL, Weight, Zx, h, Fy, E,
+                  Sx=None, Iy=None, restraint="through_fastened", continuous=False,
+                  sag_rods=0, R=None, combinations=None, b=None, c=None, t=None,
+                  flexure_method="effective_width", se_ratio=None):
+    """
+    ตรวจสอบแรงลมดูดแบบเวกเตอร์ (combo แรงยกของชุด เช่น 0.9D - 1.6W) — สูตรเดียวกับ PurlinDesign.run_design
+    b, c, t (mm) ของหน้าตัด → ลดกำลังดัดตาม flexure_method ('effective_width' หรือ 'dsm') เหมือนคลาสออกแบบ
+    se_ratio: Se/S ที่คำนวณแล้ว (batch_checks ส่งต่อ ไม่ต้องคำนวณซ้ำ)
+
+    Returns:
+        dict ของ array: Wu_uplift, Mu_Uplift, R, Phi_Mn_Uplift, Uplift (ratio)
+        ชุดที่ไม่มี combo แรงยกคืน Uplift = 0 และ R / Phi_Mn_Uplift = NaN (ไม่ต้องตรวจ)
+    """
+    combos = get_combination_set(combinations)
+    if not combos.uplift:
+        # ชุดไม่มี combo แรงยก → ไม่ต้องตรวจ: ratio = 0 (เหมือน 'Ponding') กำลังรับเป็น NaN
+        shape = np.broadcast_shapes(*(np.shape(v) for v in (span, spacing, slope, DL, WL, Weight, Zx, h, Fy, E)))
+        zero, nan = np.zeros(shape), np.full(shape, np.nan)
+        return {'Wu_uplift': zero, 'Mu_Uplift': zero, 'R': nan, 'Phi_Mn_Uplift': nan, 'Uplift': zero}
+    if se_ratio is None:
+        se_ratio = _se_ratio(h, b, c, t, Fy, E, flexure_method)  # ก่อน broadcast: cache ต่อหน้าตัด
+    span, spacing, slope, DL, WL, Weight, Zx, h, Fy, E = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (span, spacing, slope, DL, WL, Weight, Zx, h, Fy, E))
+    )
+    sx = Zx if Sx is None else np.broadcast_to(np.asarray(Sx, dtype=float), span.shape)
+    cos_t = np.cos(np.radians(slope))
+    dl_line = np.maximum(DL, 0.0) * spacing + np.maximum(Weight, 0.0)
+    cases = combos.case_vector(D=dl_line * cos_t, W=np.abs(WL * spacing * cos_t))
+    wu_uplift = np.min(combos.factored(cases)[..., ~combos.strength_mask], axis=-1)
+
+    if restraint == "through_fastened":
+        r_factor = uplift_r_factor(h, continuous) if R is None else np.full(span.shape, float(R))
+    elif restraint == "unbraced":
+        if Iy is None:
+            raise ValueError("กรณีปีกล่างไม่มีการค้ำยันต้องมีค่า I_y ของหน้าตัด")
+        lb_cm = span * 100.0 / (sag_rods + 1)
+        r_factor = _flange_ltb_factor(Fy, E, h, np.asarray(Iy, dtype=float), sx, lb_cm)
+    else:
+        raise ValueError("รูปแบบการยึดปีกต้องเป็น 'through_fastened' หรือ 'unbraced'")
+
+    mu_uplift = np.maximum(-wu_uplift, 0.0) * span ** 2 / 8
+    phi_mn_uplift = 0.90 * r_factor * se_ratio * sx * Fy / 100.0
+    return {
+        'Wu_uplift': wu_uplift,
+        'Mu_Uplift': mu_uplift,
+        'R': r_factor,
+        'Phi_Mn_Uplift': phi_mn_uplift,
+        'Uplift': mu_uplift / phi_mn_uplift,
+    }
+
+
+def uplift_grid(section, geometry, loads, materials, slopes, wind_pressures, combinations=None):
+    """
+    ประเมินแรงลมดูดบนกริด ความชัน × แรงลม ในครั้งเดียว (ทั้งผังหลังคา)
+
+    Args:
+        section (dict): คุณสมบัติหน้าตัด (Weight, Zx, Ix, h, t และ Sx / Iy ถ้ามี)
+        geometry (dict): span, spacing และ restraint / continuous / sag_rods / flexure_method
+        loads (dict): DL, LL (kg/m2)
+        materials (dict): Fy, E (ksc)
+        slopes: ลำดับความชันหลังคา (องศา)
+        wind_pressures: ลำดับแรงลมดูด (kg/m2)
+        combinations: ชุด load combination (ชื่อหรือ LoadCombinationSet, ค่าปริยาย วสท.)
+
+    Returns:
+        dict: 'slope', 'WL' (แกนกริด) และ array รูป (len(slopes), len(wind_pressures))
+              ของ Uplift, Gravity (อัตราส่วนดัดจาก combo ด้านกำลังที่ควบคุม) และ Suction_Governs
+    """
+    dims = section_dimensions(section) or {}
+    slope_g, wl_g = np.meshgrid(np.asarray(slopes, dtype=float), np.asarray(wind_pressures, dtype=float),
+                                indexing="ij")
+    common = dict(
+        span=geometry['span'], spacing=geometry['spacing'], slope=slope_g,
+        DL=loads.get('DL', 0.0), WL=wl_g, Weight=section.get('Weight', 0.0),
+        Zx=section['Zx'], h=section['h'], Fy=materials['Fy'], E=materials['E'],
+        b=dims.get('b'), c=dims.get('c'), flexure_method=geometry.get('flexure_method', 'effective_width'),
+    )
+    up = uplift_checks(
+        **common, Sx=section.get('Sx'), Iy=section.get('Iy'),
+        restraint=geometry.get('restraint', 'through_fastened'),
+        continuous=geometry.get('continuous', False),
+        sag_rods=geometry.get('sag_rods', 0), R=geometry.get('R'), combinations=combinations,
+        t=section['t'],
+    )
+    grav = batch_checks(**common, LL=loads.get('LL', 0.0), Ix=section['Ix'], t=section['t'],
+                        with_uplift=False, combinations=combinations)
+    gravity_ratio = np.abs(grav['Moment'])
+    return {
+        'slope': np.asarray(slopes, dtype=float),
+        'WL': np.asarray(wind_pressures, dtype=float),
+        'Uplift': up['Uplift'],
+        'Gravity': gravity_ratio,
+        'Suction_Governs': up['Uplift'] > gravity_ratio,
+    }
+
+
+def batch_checks(*, span, spacing, slope, DL, LL, WL, Weight, Zx, Ix, h, t, Fy, E,
+                 Sy=None, biaxial=False, sag_rods=0, Sx=None, Iy=None,
+                 restraint="through_fastened", continuous=False, R=None, with_uplift=True,
+                 combinations=None, limits=None, camber=0.0, ponding=None, Cp=0.0, b=None, c=None,
+                 flexure_method="effective_width"):
+    """
+    ตรวจสอบแปแบบเวกเตอร์ (NumPy broadcasting) สำหรับคัดกรองทั้งตารางหน้าตัด
+
+    ทุกอาร์กิวเมนต์รับได้ทั้งค่าเดี่ยวหรือ array ที่ broadcast กันได้
+    สูตรเหมือน PurlinDesign.run_design ทุกประการ แต่ไม่บันทึกขั้นตอน
+    คืนค่า dict ของ array (ratio / demand / capacity / pass)
+    'Controlling' เป็นดัชนีใน combos.strength ของชุด load combination ที่ใช้
+    'Ponding' = 0 ในกรณีที่ไม่ต้องตรวจน้ำขัง (หลังคาลาดพอ)
+    b, c (mm) ความกว้างปีกและขอบพับ → Phi_Mn = 0.90·Se·Fy แทน 0.90·Zx·Fy
+    (Se จาก flexure_method: 'effective_width' หรือ 'dsm' — Mn/My ตาม DSM จาก finite_strip)
+    """
+    combos = get_combination_set(combinations)
+    se_ratio = _se_ratio(h, b, c, t, Fy, E, flexure_method)  # ก่อน broadcast: cache ต่อหน้าตัด / ทั้งตาราง
+    span, spacing, slope, DL, LL, WL, Weight, Zx, Ix, h, t, Fy, E = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (span, spacing, slope, DL, LL, WL, Weight, Zx, Ix, h, t, Fy, E))
+    )
+    theta = np.radians(slope)
+    cos_t = np.cos(theta)
+
+    dl_line = np.maximum(DL, 0.0) * spacing + np.maximum(Weight, 0.0)
+    ll_line = np.maximum(LL, 0.0) * spacing
+    wind = np.abs(WL * spacing * cos_t)
+
+    # แกนสุดท้าย = combo ด้านกำลัง (แยกส่วนแรงโน้มถ่วงและส่วนลม)
+    gravity, wind_part = combos.split_factored(combos.case_vector(D=dl_line, L=ll_line, W=wind))
+    gravity = gravity[..., combos.strength_mask]
+    wind_part = wind_part[..., combos.strength_mask]
+    span_c = span[..., None]
+
+    phi_mn = 0.90 * se_ratio * Zx * Fy / 100.0
+    if biaxial:
+        if Sy is None:
+            raise ValueError("โหมดดัดสองแกนต้องมีค่า S_y ของหน้าตัด")
+        k_weak = _sag_rod_coeff(sag_rods)
+        phi_mny = 0.90 * np.broadcast_to(np.asarray(Sy, dtype=float), span.shape) * Fy / 100.0
+        w_n = gravity * cos_t[..., None] + wind_part
+        w_t = gravity * np.sin(theta)[..., None]
+        interaction = ((np.abs(w_n) * span_c ** 2 / 8) / phi_mn[..., None]
+                       + (np.abs(w_t) * k_weak * span_c ** 2) / phi_mny[..., None])
+        gov = np.argmax(interaction, axis=-1)
+    else:
+        w_n = gravity + wind_part
+        gov = np.argmax(np.abs(w_n), axis=-1)
+
+    wu = np.take_along_axis(w_n, gov[..., None], axis=-1)[..., 0]
+    mu = wu * span ** 2 / 8
+    vu = wu * span / 2
+    phi_vn = 0.95 * 0.6 * Fy * (h * t) / 100.0
+
+    span_cm = span * 100.0
+    serv = deflection_checks(
+        span_cm,
+        uniform_deflection(dl_line + ll_line, span_cm, E, Ix),
+        uniform_deflection(ll_line, span_cm, E, Ix),
+        uniform_deflection(wind, span_cm, E, Ix),
+        limits=limits, camber=camber,
+    )
+    pond = np.where(ponding_applies(slope, ponding),
+                    ponding_ratio(Cp, ponding_coefficient(spacing, span, E, Ix)), 0.0)
+
+    out = {
+        'Wu_design': wu,
+        'Controlling': gov,
+        'Mu': mu,
+        'Vu': vu,
+        'Phi_Mn': phi_mn,
+        'Phi_Vn': phi_vn,
+        'Delta_Total': serv['Delta_Total'],
+        'Delta_Live': serv['Delta_Live'],
+        'Moment': mu / phi_mn,
+        'Shear': vu / phi_vn,
+        'Deflection': serv['Deflection'],
+        'Ponding': pond,
+    }
+    governing = [np.abs(out['Moment']), np.abs(out['Shear']), out['Deflection'], out['Ponding']]
+    if with_uplift:
+        up = uplift_checks(
+            span=span, spacing=spacing, slope=slope, DL=DL, WL=WL, Weight=Weight, Zx=Zx, h=h,
+            Fy=Fy, E=E, Sx=Sx, Iy=Iy, restraint=restraint, continuous=continuous,
+            sag_rods=sag_rods, R=R, combinations=combos, se_ratio=se_ratio,
+        )
+        out.update(up)
+        governing.append(out['Uplift'])
+    if biaxial:
+        wu_t = np.take_along_axis(w_t, gov[..., None], axis=-1)[..., 0]
+        muy = wu_t * k_weak * span ** 2
+        out['Muy'] = muy
+        out['Phi_Mny'] = phi_mny
+        out['WeakAxis'] = np.abs(muy) / phi_mny
+        out['Biaxial'] = np.abs(out['Moment']) + out['WeakAxis']
+        governing.append(out['Biaxial'])
+    out['Max_Ratio'] = np.max(np.stack(governing), axis=0)
+    out['Pass'] = out['Max_Ratio'] <= 1.0
+    return out
+
+
+def screen_catalog(df, geometry, loads, materials, combinations=None, limits=None):
+    """
+    คัดกรองหน้าตัดทั้งตาราง มอก. 1228 ในครั้งเดียวด้วย batch_checks
+
+    Args:
+        df (DataFrame): ตารางหน้าตัด (Section, Weight, Zx, Ix, h, t และ Sy สำหรับดัดสองแกน)
+        geometry (dict): span, spacing, slope และ biaxial / sag_rods / camber / ponding / Cp /
+                         flexure_method (ถ้ามี)
+        loads (dict): DL, LL, WL (kg/m2)
+        materials (dict): Fy, E (ksc)
+        combinations: ชุด load combination (ชื่อหรือ LoadCombinationSet, ค่าปริยาย วสท.)
+        limits: ชุดเกณฑ์การโก่งตัว (ชื่อใน serviceability.LIMIT_PROFILES หรือ DeflectionLimits)
+
+    Returns:
+        DataFrame: อัตราส่วนทุกการตรวจสอบ เรียงตามน้ำหนักจากเบาไปหนัก
+    """
+    biaxial = bool(geometry.get('biaxial', False))
+    restraint = geometry.get('restraint', 'through_fastened')
+    if restraint == 'unbraced' and 'Iy' not in df:
+        raise ValueError("กรณีปีกล่างไม่มีการค้ำยันต้องมีคอลัมน์ Iy ในตารางหน้าตัด")
+    dims = catalog_dimensions(df)
+    res = batch_checks(
+        span=geometry['span'], spacing=geometry['spacing'], slope=geometry.get('slope', 0.0),
+        DL=loads.get('DL', 0.0), LL=loads.get('LL', 0.0), WL=loads.get('WL', 0.0),
+        Weight=df['Weight'].to_numpy(), Zx=df['Zx'].to_numpy(), Ix=df['Ix'].to_numpy(),
+        h=df['h'].to_numpy(), t=df['t'].to_numpy(),
+        Fy=materials['Fy'], E=materials['E'],
+        Sy=df['Sy'].to_numpy() if biaxial else None,
+        biaxial=biaxial, sag_rods=geometry.get('sag_rods', 0),
+        Sx=df['Sx'].to_numpy() if 'Sx' in df else None,
+        Iy=df['Iy'].to_numpy() if 'Iy' in df else None,
+        restraint=restraint, continuous=geometry.get('continuous', False), R=geometry.get('R'),
+        combinations=combinations, limits=limits, camber=geometry.get('camber', 0.0),
+        ponding=geometry.get('ponding'), Cp=geometry.get('Cp', 0.0),
+        b=None if dims is None else dims['b'].to_numpy(), c=None if dims is None else dims['c'].to_numpy(),
+        flexure_method=geometry.get('flexure_method', 'effective_width'),
+    )
+    cols = ['Moment', 'Shear', 'Deflection', 'Ponding', 'Uplift'] + (['WeakAxis', 'Biaxial'] if biaxial else []) + ['Max_Ratio', 'Pass']
+    out = pd.DataFrame({c: res[c] for c in cols}, index=df.index)
+    out.insert(0, 'Weight', df['Weight'].to_numpy())
+    out.insert(0, 'Section', df['Section'].to_numpy())
+    return out.sort_values('Weight', kind='stable')
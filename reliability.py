@@ -0,0 +1,251 @@
+"""
+reliability.py
+วิเคราะห์ความเชื่อถือได้ด้วยวิธี Monte Carlo (Probability of Failure, Reliability Index β)
+
+สุ่มค่ากำลังวัสดุ คุณสมบัติหน้าตัด และน้ำหนักบรรทุกจากการแจกแจงทางสถิติ
+แล้วประเมินสมการสภาวะขีดจำกัด (limit state) ด้วย batch_checks ของแต่ละโมดูลทีละก้อน (chunk)
+หน่วยความจำจึงขึ้นกับ chunk_size เท่านั้น ไม่ขึ้นกับจำนวนตัวอย่างทั้งหมด
+
+    g = 1 - max_i (S_i / R_i)       (ค่าระบุ ไม่มีตัวคูณ φ และตัวคูณน้ำหนัก)
+    Pf = P(g < 0),  β = -Φ⁻¹(Pf)
+
+ค่าสถิติปริยาย (bias = ค่าเฉลี่ย/ค่าระบุ, COV) อ้างอิง Ellingwood et al. (NBS SP 577)
+และ Galambos & Ravindra สำหรับเหล็กรูปพรรณ
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+import compression_design
+import purlin_design
+import tension_design
+from load_combinations import custom_set
+
+_EULER_GAMMA = 0.5772156649015329
+
+
+@dataclass(frozen=True)
+class RandomVariable:
+    """ตัวแปรสุ่มกำหนดเทียบกับค่าระบุ: ค่าเฉลี่ย = bias × ค่าระบุ, ส่วนเบี่ยงเบน = COV × ค่าเฉลี่ย"""
+
+    dist: str = "normal"     # 'normal' | 'lognormal' | 'gumbel'
+    bias: float = 1.0
+    cov: float = 0.10
+
+    def __post_init__(self) -> None:
+        if self.dist not in ("normal", "lognormal", "gumbel"):
+            raise ValueError(f"ไม่รู้จักการแจกแจง '{self.dist}' (ที่รองรับ: normal, lognormal, gumbel)")
+        if self.cov < 0 or self.bias <= 0:
+            raise ValueError("bias ต้องเป็นบวกและ COV ต้องไม่ติดลบ")
+
+    def sample(self, nominal, rng: np.random.Generator, n: int) -> np.ndarray:
+        nominal = np.asarray(nominal, dtype=float)
+        mean = self.bias * nominal
+        if self.cov == 0:
+            return np.broadcast_to(mean, (n,) + nominal.shape).copy()
+        std = self.cov * np.abs(mean)
+        if self.dist == "normal":
+            return rng.normal(mean, std, size=(n,) + nominal.shape)
+        if self.dist == "lognormal":
+            sigma = math.sqrt(math.log1p(self.cov ** 2))
+            return mean * rng.lognormal(-0.5 * sigma ** 2, sigma, size=(n,) + nominal.shape)
+        # Gumbel (Extreme Type I) สำหรับน้ำหนักบรรทุกจร/แรงลมสูงสุด
+        # สุ่มบนขนาด |mean| แล้วคืนเครื่องหมาย — หางยาวต้องอยู่ด้านขนาดใหญ่ (เช่นแรงลมดูดติดลบ) ไม่ใช่ด้านศูนย์
+        scale = std * math.sqrt(6.0) / math.pi
+        return np.sign(mean) * rng.gumbel(np.abs(mean) - _EULER_GAMMA * scale, scale, size=(n,) + nominal.shape)
+
+
+# ค่าสถิติมาตรฐาน
+STEEL_YIELD = RandomVariable("lognormal", 1.10, 0.10)
+STEEL_ULTIMATE = RandomVariable("lognormal", 1.10, 0.11)
+ELASTIC_MODULUS = RandomVariable("normal", 1.00, 0.06)
+SECTION_GEOMETRY = RandomVariable("normal", 1.00, 0.05)
+DEAD_LOAD = RandomVariable("normal", 1.05, 0.10)
+LIVE_LOAD = RandomVariable("gumbel", 1.00, 0.25)
+WIND_LOAD = RandomVariable("gumbel", 0.78, 0.37)
+MEMBER_FORCE = RandomVariable("normal", 1.00, 0.15)
+
+# ─────────────────────────────────────────────────────────────
+# สมการสภาวะขีดจำกัดของแต่ละ engine
+# ─────────────────────────────────────────────────────────────
+# การรวมน้ำหนักค่าระบุ (ไม่มีตัวคูณ) สำหรับแป — ลมกด/ลมดูดแยกกรณี
+NOMINAL_PURLIN_COMBINATIONS = custom_set(
+    "ค่าระบุ (Monte Carlo)", ["D+L", "D+W", "D-W"], uplift=["D-W"],
+)
+
+
+def _purlin_limit_states(p: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    res = purlin_design.batch_checks(**{**p, "combinations": NOMINAL_PURLIN_COMBINATIONS})
+    states = {
+        "Moment": 0.90 * np.abs(res["Moment"]),
+        "Shear": 0.95 * np.abs(res["Shear"]),
+        "Uplift": 0.90 * res["Uplift"],
+    }
+    if p.get("biaxial"):
+        states["Biaxial"] = 0.90 * res["Biaxial"]
+    return states
+
+
+def _compression_limit_states(p: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    res = compression_design.batch_checks(**p)
+    return {"Compression": 0.90 * res["Ratio"]}
+
+
+def _tension_limit_states(p: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    res = tension_design.batch_checks(**p)
+    tu = np.maximum(np.asarray(p["Tu"], dtype=float), 0.0)
+    return {
+        "Yielding": tu / (res["phi_Tn_yield"] / 0.90),
+        "Fracture": tu / (res["phi_Tn_fracture"] / 0.75),
+    }
+
+
+@dataclass(frozen=True)
+class LimitStateModel:
+    """engine สำหรับ Monte Carlo: ฟังก์ชันอัตราส่วน S/R, ตัวแปรสุ่มปริยาย และคุณสมบัติหน้าตัด"""
+
+    limit_states: Callable[[Mapping[str, Any]], Dict[str, np.ndarray]]
+    variables: Dict[str, RandomVariable]
+    section_keys: Tuple[str, ...]
+
+
+MODELS: Dict[str, LimitStateModel] = {
+    "purlin": LimitStateModel(
+        _purlin_limit_states,
+        {"Fy": STEEL_YIELD, "E": ELASTIC_MODULUS, "DL": DEAD_LOAD, "Weight": DEAD_LOAD,
+         "LL": LIVE_LOAD, "WL": WIND_LOAD},
+        ("Zx", "Sx", "Ix", "Sy", "Iy", "t"),
+    ),
+    "compression": LimitStateModel(
+        _compression_limit_states,
+        {"Fy": STEEL_YIELD, "E": ELASTIC_MODULUS, "Pu": MEMBER_FORCE},
+        ("Ag", "tw", "tf"),
+    ),
+    "tension": LimitStateModel(
+        _tension_limit_states,
+        {"Fy": STEEL_YIELD, "Fu": STEEL_ULTIMATE, "Tu": MEMBER_FORCE},
+        ("Ag",),
+    ),
+}
+
+
+@dataclass
+class ReliabilityResult:
+    """ผลการจำลอง Monte Carlo"""
+
+    engine: str
+    n_samples: int
+    failures: int
+    mean_g: float
+    std_g: float
+    governing: Dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def pf(self) -> float:
+        return self.failures / self.n_samples
+
+    @property
+    def pf_upper(self) -> float:
+        """ขอบบน 95% ของ Pf (กรณีไม่พบการวิบัติใช้ rule of three: 3/n)"""
+        if self.failures == 0:
+            return 3.0 / self.n_samples
+        se = math.sqrt(self.pf * (1.0 - self.pf) / self.n_samples)
+        return min(self.pf + 1.96 * se, 1.0)
+
+    @property
+    def beta(self) -> float:
+        """β = -Φ⁻¹(Pf) (ไม่พบการวิบัติ → ค่าขอบล่างจาก pf_upper)"""
+        pf = self.pf if self.failures else self.pf_upper
+        if pf >= 1.0:
+            return -math.inf
+        return -NormalDist().inv_cdf(pf)
+
+    @property
+    def beta_cornell(self) -> float:
+        """β แบบ Cornell = μ_g / σ_g"""
+        return self.mean_g / self.std_g if self.std_g > 0 else math.inf
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "Engine": self.engine,
+            "Samples": self.n_samples,
+            "Failures": self.failures,
+            "Pf": self.pf,
+            "Pf_upper95": self.pf_upper,
+            "Beta": self.beta,
+            "Beta_Cornell": self.beta_cornell,
+            "Governing": dict(self.governing),
+            "Elapsed_s": self.elapsed,
+        }
+
+
+def monte_carlo(engine: str, base: Mapping[str, Any], variables: Optional[Mapping[str, RandomVariable]] = None,
+                n_samples: int = 1_000_000, chunk_size: int = 200_000, seed: Optional[int] = None,
+                section: Optional[RandomVariable] = SECTION_GEOMETRY) -> ReliabilityResult:
+    """
+    จำลอง Monte Carlo ของสมการสภาวะขีดจำกัด
+
+    Args:
+        engine: 'purlin', 'compression' หรือ 'tension'
+        base: อินพุตค่าระบุของ batch_checks (เช่นผลจาก parametric_sweep.purlin_inputs)
+              สำหรับ compression / tension ใช้ Pu / Tu เป็นแรงใช้งาน (ไม่คูณตัวคูณน้ำหนัก)
+        variables: ตัวแปรสุ่มแทนค่าปริยายของ engine (None = ค่ากำหนดตามค่าระบุ)
+        n_samples: จำนวนตัวอย่างทั้งหมด
+        chunk_size: จำนวนตัวอย่างต่อก้อน — กำหนดขนาดหน่วยความจำสูงสุด
+        seed: seed ของตัวสร้างเลขสุ่ม
+        section: ตัวคูณร่วมของคุณสมบัติหน้าตัด (ความคลาดเคลื่อนจากการผลิต, None = ไม่สุ่ม)
+    """
+    try:
+        model = MODELS[engine]
+    except KeyError:
+        raise ValueError(f"ไม่รู้จัก engine '{engine}' (ที่รองรับ: {', '.join(MODELS)})") from None
+    if n_samples <= 0 or chunk_size <= 0:
+        raise ValueError("จำนวนตัวอย่างและขนาด chunk ต้องเป็นค่าบวก")
+
+    rvs = dict(model.variables if variables is None else variables)
+    rvs = {k: v for k, v in rvs.items() if base.get(k) is not None}
+    section_keys = [k for k in model.section_keys if base.get(k) is not None] if section else []
+    rng = np.random.default_rng(seed)
+
+    start = time.perf_counter()
+    failures = 0
+    total = 0.0
+    total_sq = 0.0
+    governing: Dict[str, int] = {}
+    remaining = n_samples
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        remaining -= n
+        params = dict(base)
+        for name, rv in rvs.items():
+            params[name] = rv.sample(base[name], rng, n)
+        if section_keys:
+            factor = section.sample(1.0, rng, n)
+            for name in section_keys:
+                params[name] = factor * np.asarray(base[name], dtype=float)
+
+        states = model.limit_states(params)
+        names = list(states)
+        ratios = np.stack([np.broadcast_to(states[k], (n,)) for k in names])
+        g = 1.0 - ratios.max(axis=0)
+        failed = g < 0
+        failures += int(failed.sum())
+        total += float(g.sum())
+        total_sq += float(np.square(g).sum())
+        if failed.any():
+            counts = np.bincount(ratios[:, failed].argmax(axis=0), minlength=len(names))
+            for k, c in zip(names, counts):
+                governing[k] = governing.get(k, 0) + int(c)
+
+    mean_g = total / n_samples
+    std_g = math.sqrt(max(total_sq / n_samples - mean_g ** 2, 0.0))
+    return ReliabilityResult(engine, n_samples, failures, mean_g, std_g, governing,
+                             time.perf_counter() - start)
@@ -4,6 +4,8 @@ import io
 import matplotlib.pyplot as plt
 import matplotlib
 
+from design_logging import phase, traced
+
 # Set backend to Agg to avoid GUI issues in threads
 matplotlib.use('Agg')
 
@@ -94,6 +96,7 @@ class BaseReportGenerator(FPDF):
         self.set_font('', '')
         self.cell(0, 7, f"{self.sanitize(value)}", 0, 1)
 
+    @traced
     def _render_latex(self, formula, filename):
         try:
             fig = plt.figure(figsize=(0.1, 0.1))
@@ -205,6 +208,7 @@ class BaseReportGenerator(FPDF):
         self.set_fill_color(255, 255, 255)
         self.set_font('', '')
 
+    @traced
     def generate(self, output_path="report.pdf"):
         # Template method
         if self.has_thai_font:
@@ -215,14 +219,14 @@ class BaseReportGenerator(FPDF):
         self.cell(0, 15, self.sanitize(self.report_title), 0, 1, 'C')
         self.ln(5)
         
-        self.add_project_info()
-        self.add_input_summary()
-        self.add_detailed_steps()
-        self.add_calculation_summary()
-        self.add_conclusion()
+        for section in (self.add_project_info, self.add_input_summary, self.add_detailed_steps,
+                        self.add_calculation_summary, self.add_conclusion):
+            with phase(f"report.{section.__name__}"):
+                section()
         
         try:
-            self.output(output_path)
+            with phase("report.output"):
+                self.output(output_path)
             return True, output_path
         except Exception as e:
             return False, str(e)
@@ -290,11 +294,16 @@ class PurlinReportGenerator(BaseReportGenerator):
         self._check_row("Moment", f"{demand.get('Mu',0):.2f}", f"{capacity.get('Phi_Mn',0):.2f}", ratios.get('Moment',0), status.get('Moment',False))
         self._check_row("Shear", f"{demand.get('Vu',0):.2f}", f"{capacity.get('Phi_Vn',0):.2f}", ratios.get('Shear',0), status.get('Shear',False))
         self._check_row("Deflection", f"{demand.get('Delta',0):.2f}", f"{capacity.get('Delta_Limit',0):.2f}", ratios.get('Deflection',0), status.get('Deflection',False))
+        if 'Uplift' in ratios:
+            self._check_row("Uplift", f"{demand.get('Mu_Uplift',0):.2f}", f"{capacity.get('Phi_Mn_Uplift',0):.2f}", ratios.get('Uplift',0), status.get('Uplift',False))
+        if 'Biaxial' in ratios:
+            self._check_row("Biaxial", f"{demand.get('Muy',0):.2f}", f"{capacity.get('Phi_Mny',0):.2f}", ratios.get('Biaxial',0), status.get('Biaxial',False))
 
     def add_conclusion(self):
         self.ln(10)
         ratios = self.results.get('Checks', {}).get('Ratios', {})
-        max_r = max(ratios.get('Moment',0), ratios.get('Shear',0), ratios.get('Deflection',0))
+        max_r = max(ratios.get('Moment',0), ratios.get('Shear',0), ratios.get('Deflection',0),
+                    ratios.get('Uplift',0), ratios.get('Biaxial',0))
         status = "PASSED" if max_r <= 1.0 else "FAILED"
         self.set_font('', 'B')
         self.cell(0, 10, self.sanitize(f"Design Conclusion: {status} (Max Ratio: {max_r:.2f})"), 0, 1)
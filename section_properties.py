@@ -0,0 +1,459 @@
+"""
+section_properties.py
+คุณสมบัติหน้าตัดผนังบาง (thin-walled) จากเส้นกึ่งกลางความหนาแบบ polyline
+
+หน้าตัดใด ๆ (C, C มีขอบพับพร้อมมุมโค้ง, Z, Hat, I, หน้าตัดประกอบ) เขียนเป็น
+โหนด (x, y) [mm] กับชิ้นส่วนตรง (โหนด i, โหนด j, ความหนา t) — อินทิกรัลของแต่ละชิ้นส่วน
+เป็นสูตรปิด คำนวณพร้อมกันทุกชิ้นส่วนด้วย NumPy (แบบ CUFSM cutwp):
+
+  A, ตำแหน่งศูนย์ถ่วง, Ix / Iy / Ixy (รวมพจน์ t³ ของชิ้นส่วนเอง), มุมแกนหลัก θ
+  Sx / Sy จากมุมของแถบความหนา (ผิวนอกจริง), Zx / Zy จากแกนสะเทินพลาสติก (bisection)
+  J = Σ L t³ / 3 (หน้าตัดเปิด) หรือ Bredt 4A₀² / Σ(L/t) เมื่อมีช่องปิดหนึ่งช่อง
+  พิกัด sectorial ω ตามต้นไม้ของชิ้นส่วน → จุดศูนย์แรงเฉือน (xs, ys) และ Cw
+
+หน้าตัดที่มีโครงสร้างเดียวกัน (เช่นทุกแถวของ มอก. 1228) คำนวณพร้อมกันทั้งตาราง (batch_properties)
+ผลของ section_properties เก็บ cache ตาม hash ของรูปทรง — หน้าตัดกำหนดเองออกแบบได้เร็วเท่าตาราง
+
+หน่วยผลลัพธ์เหมือนตารางหน้าตัด: A ซม.², I / J ซม.⁴, S / Z ซม.³, Cw ซม.⁶, r / xs ซม., Weight กก./ม.
+แกน x เป็นแกนแข็งแรง (ดัดรอบแกน x ใช้ Ix = ∫y² dA) — เอวตั้งตามแกน y
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+STEEL_DENSITY = 7850.0  # kg/m³
+_MAX_CACHED = 512
+# ขนาดในชื่อหน้าตัด เช่น C-150x65x20x3.2 (h × b × c × t mm)
+_NAME_DIMENSIONS = re.compile(r"(\d+(?:\.\d+)?)\s*[x×X]\s*(\d+(?:\.\d+)?)\s*[x×X]\s*"
+                              r"(\d+(?:\.\d+)?)\s*[x×X]\s*(\d+(?:\.\d+)?)")
+
+
+# ─────────────────────────────────────────────────────────────
+# รูปทรง
+# ─────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class ThinWalledSection:
+    """
+    หน้าตัดผนังบาง: โหนด (n × 2, mm) และชิ้นส่วน (m × 2 ดัชนีโหนด) พร้อมความหนา (m, mm)
+
+    ชิ้นส่วนที่ไม่เชื่อมถึงกัน (เช่น C สองตัวประกบหลังที่ยึดด้วยสลักเกลียว) ใช้ได้ —
+    J และ Cw เป็นผลรวมของแต่ละส่วน
+    """
+
+    nodes: np.ndarray
+    elements: np.ndarray
+    t: np.ndarray
+    name: str = ""
+
+    def __post_init__(self) -> None:
+        nodes = np.asarray(self.nodes, dtype=float)
+        elements = np.asarray(self.elements, dtype=np.intp)
+        t = np.broadcast_to(np.asarray(self.t, dtype=float), (len(elements),)).copy()
+        if nodes.ndim != 2 or nodes.shape[1] != 2 or elements.ndim != 2 or elements.shape[1] != 2:
+            raise ValueError("โหนดต้องเป็น (n, 2) และชิ้นส่วนต้องเป็น (m, 2)")
+        if len(elements) == 0 or elements.min() < 0 or elements.max() >= len(nodes):
+            raise ValueError("ดัชนีโหนดของชิ้นส่วนไม่ถูกต้อง")
+        if (t <= 0).any() or not np.isfinite(nodes).all():
+            raise ValueError("ความหนาต้องมากกว่า 0 และพิกัดต้องเป็นค่าจำกัด")
+        for field_name, value in (("nodes", nodes), ("elements", elements), ("t", t)):
+            value.setflags(write=False)
+            object.__setattr__(self, field_name, value)
+
+    def key(self) -> str:
+        """hash ของรูปทรง (ปัดพิกัดที่ 1e-6 mm) — ใช้เป็นคีย์ cache"""
+        digest = hashlib.sha1(np.round(self.nodes, 6).tobytes())
+        digest.update(self.elements.tobytes())
+        digest.update(np.round(self.t, 6).tobytes())
+        return digest.hexdigest()
+
+    def translated(self, dx: float = 0.0, dy: float = 0.0) -> "ThinWalledSection":
+        return ThinWalledSection(self.nodes + (dx, dy), self.elements, self.t, self.name)
+
+    def mirrored(self) -> "ThinWalledSection":
+        """กลับด้านซ้าย-ขวา (x → −x)"""
+        return ThinWalledSection(self.nodes * (-1.0, 1.0), self.elements, self.t, self.name)
+
+    @staticmethod
+    def combine(*parts: "ThinWalledSection", name: str = "", tol: float = 1e-6) -> "ThinWalledSection":
+        """รวมหลายหน้าตัดเป็นหน้าตัดประกอบ — โหนดที่ตำแหน่งเดียวกัน (ภายใน tol mm) ถือเป็นจุดต่อ"""
+        nodes: List[Tuple[float, float]] = []
+        lookup: Dict[Tuple[int, int], int] = {}
+        elements, t = [], []
+        for part in parts:
+            remap = []
+            for x, y in part.nodes:
+                key = (int(round(x / tol)), int(round(y / tol)))
+                if key not in lookup:
+                    lookup[key] = len(nodes)
+                    nodes.append((x, y))
+                remap.append(lookup[key])
+            elements.extend((remap[i], remap[j]) for i, j in part.elements)
+            t.extend(part.t)
+        return ThinWalledSection(np.array(nodes), np.array(elements), np.array(t), name)
+
+
+def polyline(points: Sequence[Tuple[float, float]], t, closed: bool = False, name: str = "") -> ThinWalledSection:
+    """หน้าตัดจากเส้นต่อเนื่อง (ปิดรูปถ้า closed) — t เป็นค่าเดียวหรือหนึ่งค่าต่อช่วง"""
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    elements = [(i, i + 1) for i in range(n - 1)] + ([(n - 1, 0)] if closed else [])
+    return ThinWalledSection(points, np.array(elements), t, name)
+
+
+def _round_corners(points: np.ndarray, radius, segments: int) -> np.ndarray:
+    """
+    แทนมุมภายในของเส้น (ยกเว้นปลายทั้งสอง) ด้วยส่วนโค้งรัศมีเส้นกึ่งกลาง radius แบ่ง segments ช่วง
+
+    points เป็น (n, 2) หรือ (k, n, 2) — k เส้นที่มีรูปแบบมุมเดียวกัน (เช่นทั้งตารางหน้าตัด)
+    radius ค่าเดียวหรือ (k,) — แถวที่ radius = 0 ได้ชิ้นส่วนยาวศูนย์ที่มุม (ไม่มีผลต่อคุณสมบัติ)
+    """
+    pts = np.asarray(points, dtype=float)
+    single = pts.ndim == 2
+    if single:
+        pts = pts[None]
+    radius = np.broadcast_to(np.asarray(radius, dtype=float), (len(pts),))
+    if segments < 1 or pts.shape[1] < 3 or not (radius > 0).any():
+        return pts[0] if single else pts
+    fractions = np.linspace(0.0, 1.0, segments + 1)
+    out = [pts[:, :1]]
+    for k in range(1, pts.shape[1] - 1):
+        p = pts[:, k]
+        u = pts[:, k - 1] - p
+        v = pts[:, k + 1] - p
+        u /= np.linalg.norm(u, axis=1, keepdims=True)
+        v /= np.linalg.norm(v, axis=1, keepdims=True)
+        half = np.arccos(np.clip((u * v).sum(axis=1), -1.0, 1.0)) / 2
+        if (half <= 1e-9).any() or (np.abs(half - math.pi / 2) <= 1e-9).any():
+            out.append(p[:, None])  # แนวตรงหรือพับกลับ — ไม่มีมุมให้ลบ
+            continue
+        start = p + u * (radius / np.tan(half))[:, None]
+        end = p + v * (radius / np.tan(half))[:, None]
+        bisector = (u + v) / np.linalg.norm(u + v, axis=1, keepdims=True)
+        centre = p + bisector * (radius / np.sin(half))[:, None]
+        a0 = np.arctan2(start[:, 1] - centre[:, 1], start[:, 0] - centre[:, 0])
+        a1 = np.arctan2(end[:, 1] - centre[:, 1], end[:, 0] - centre[:, 0])
+        sweep = (a1 - a0 + math.pi) % (2 * math.pi) - math.pi
+        angles = a0[:, None] + sweep[:, None] * fractions
+        out.append(centre[:, None] + radius[:, None, None] * np.stack([np.cos(angles), np.sin(angles)], axis=-1))
+    out.append(pts[:, -1:])
+    result = np.concatenate(out, axis=1)
+    return result[0] if single else result
+
+
+def _lipped_channel_nodes(h, b, c, t, r, segments: int) -> np.ndarray:
+    """โหนดเส้นกึ่งกลางของตัวซี (k, n, 2) จาก array ของขนาดภายนอก — ทุกแถวต้องมีหรือไม่มีขอบพับเหมือนกัน"""
+    h, b, c, t, r = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float)) for v in (h, b, c, t, r)))
+    if (np.minimum(np.minimum(h, b), t) <= 0).any() or (c < 0).any() or (2 * t >= h).any() or (t >= b).any():
+        raise ValueError("ขนาดหน้าตัดตัวซีไม่ถูกต้อง")
+    if not ((c > 0).all() or (c == 0).all()):
+        raise ValueError("ทุกแถวต้องมีขอบพับ (c > 0) หรือไม่มีทั้งหมด")
+    y, x, zero = (h - t) / 2, b - t, np.zeros_like(h)
+    points = [(x, y), (zero, y), (zero, -y), (x, -y)]
+    if (c > 0).all():
+        lip = c - t / 2
+        points = [(x, y - lip)] + points + [(x, -y + lip)]
+    nodes = np.stack([np.stack(pt, axis=-1) for pt in points], axis=1)
+    return _round_corners(nodes, np.where(r > 0, r + t / 2, 0.0), segments)
+
+
+def lipped_channel(h: float, b: float, c: float, t: float, r: float = 0.0, segments: int = 4,
+                   name: str = "") -> ThinWalledSection:
+    """
+    เหล็กรูปตัวซีมีขอบพับ (มอก. 1228: C-h×b×c×t) — h, b, c เป็นขนาดภายนอก, r รัศมีดัดภายใน
+    c = 0 คือรางน้ำไม่มีขอบพับ เอวอยู่ที่ x = 0 ปีกยื่นไปทาง +x
+    """
+    return polyline(_lipped_channel_nodes(h, b, c, t, r, segments)[0], t, name=name)
+
+
+def zed(h: float, b: float, c: float, t: float, r: float = 0.0, segments: int = 4,
+        name: str = "") -> ThinWalledSection:
+    """เหล็กรูปตัวแซด (มีขอบพับถ้า c > 0) — ปีกบนยื่นไป +x ปีกล่างยื่นไป −x"""
+    if min(h, b, t) <= 0 or c < 0 or 2 * t >= h or t >= b:
+        raise ValueError("ขนาดหน้าตัดตัวแซดไม่ถูกต้อง")
+    y, x = (h - t) / 2, b - t
+    points = [(x, y), (0.0, y), (0.0, -y), (-x, -y)]
+    if c > 0:
+        lip = c - t / 2
+        points = [(x, y - lip)] + points + [(-x, -y + lip)]
+    return polyline(_round_corners(points, r + t / 2 if r > 0 else 0.0, segments), t, name=name)
+
+
+def hat(h: float, a: float, b: float, t: float, r: float = 0.0, segments: int = 4,
+        name: str = "") -> ThinWalledSection:
+    """เหล็กรูปหมวก: สูง h, ปีกบนกว้าง a, ปีกล่าง (ปีกหมวก) กว้าง b ต่อข้าง — ขนาดภายนอก"""
+    if min(h, a, b, t) <= 0 or 2 * t >= h or 2 * t >= a:
+        raise ValueError("ขนาดหน้าตัดรูปหมวกไม่ถูกต้อง")
+    y, x = (h - t) / 2, (a - t) / 2
+    points = [(-x - b + t / 2, -y), (-x, -y), (-x, y), (x, y), (x, -y), (x + b - t / 2, -y)]
+    return polyline(_round_corners(points, r + t / 2 if r > 0 else 0.0, segments), t, name=name)
+
+
+def i_section(h: float, b: float, tw: float, tf: float, name: str = "") -> ThinWalledSection:
+    """หน้าตัด H / I ปีกขนาน (เส้นกึ่งกลาง: ปีกห่างกัน h0 = h − tf)"""
+    if min(h, b, tw, tf) <= 0 or 2 * tf >= h or tw >= b:
+        raise ValueError("ขนาดหน้าตัด H ไม่ถูกต้อง")
+    y = (h - tf) / 2
+    nodes = np.array([(-b / 2, y), (0.0, y), (b / 2, y), (-b / 2, -y), (0.0, -y), (b / 2, -y)])
+    elements = np.array([(0, 1), (1, 2), (3, 4), (4, 5), (1, 4)])
+    return ThinWalledSection(nodes, elements, np.array([tf, tf, tf, tf, tw]), name)
+
+
+# ─────────────────────────────────────────────────────────────
+# โครงสร้าง (topology) — ใช้ร่วมกันทุกหน้าตัดที่มีชิ้นส่วนเหมือนกัน
+# ─────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class _Topology:
+    elements: np.ndarray      # (m, 2)
+    paths: np.ndarray         # (n, m) ±1: ω ของโหนด = paths @ dω ของชิ้นส่วน (ตามต้นไม้)
+    tree: np.ndarray          # (m,) bool — ชิ้นส่วนที่อยู่บนต้นไม้ (ที่เหลือปิดช่อง)
+    cell: Optional[np.ndarray]  # (m,) ±1 ทิศของชิ้นส่วนในช่องปิด (ถ้ามีหนึ่งช่อง) หรือ None
+    components: np.ndarray    # (m,) หมายเลขส่วนที่เชื่อมถึงกัน
+
+
+_TOPOLOGIES: Dict[bytes, _Topology] = {}
+
+
+def _topology(n_nodes: int, elements: np.ndarray) -> _Topology:
+    key = bytes(np.int64(n_nodes)) + np.ascontiguousarray(elements, dtype=np.int64).tobytes()
+    topo = _TOPOLOGIES.get(key)
+    if topo is not None:
+        return topo
+    m = len(elements)
+    adjacency: List[List[Tuple[int, int, int]]] = [[] for _ in range(n_nodes)]
+    for e, (i, j) in enumerate(elements):
+        adjacency[i].append((e, j, 1))
+        adjacency[j].append((e, i, -1))
+    paths = np.zeros((n_nodes, m))
+    parent: Dict[int, Tuple[int, int, int]] = {}
+    tree = np.zeros(m, dtype=bool)
+    components = np.full(m, -1)
+    seen = np.zeros(n_nodes, dtype=bool)
+    comp = 0
+    for root in range(n_nodes):
+        if seen[root] or not adjacency[root]:
+            continue
+        seen[root] = True
+        queue = [root]
+        while queue:
+            node = queue.pop(0)
+            for e, other, sign in adjacency[node]:
+                components[e] = comp
+                if seen[other]:
+                    continue
+                seen[other] = True
+                tree[e] = True
+                parent[other] = (node, e, sign)
+                paths[other] = paths[node]
+                paths[other, e] += sign
+                queue.append(other)
+        comp += 1
+    cell = None
+    loops = np.flatnonzero(~tree)
+    if len(loops) == 1:
+        # ช่องปิด: ชิ้นส่วนที่ปิดวง + เส้นทางบนต้นไม้ระหว่างปลายทั้งสอง
+        e = loops[0]
+        i, j = elements[e]
+        cell = paths[i] - paths[j]
+        cell[e] = 1.0
+    topo = _Topology(np.asarray(elements), paths, tree, cell, components)
+    _TOPOLOGIES[key] = topo
+    return topo
+
+
+# ─────────────────────────────────────────────────────────────
+# อินทิกรัลแบบเวกเตอร์ (k หน้าตัด × m ชิ้นส่วน)
+# ─────────────────────────────────────────────────────────────
+def _plastic_modulus(lo: np.ndarray, hi: np.ndarray, area: np.ndarray, iterations: int = 60) -> np.ndarray:
+    """Z รอบแกนสะเทินพลาสติก — พื้นที่ของชิ้นส่วนกระจายสม่ำเสมอบนช่วง [lo, hi] ของพิกัด"""
+    total = area.sum(axis=1)
+    a, b = lo.min(axis=1), hi.max(axis=1)
+    span = np.maximum(hi - lo, 1e-12)
+    for _ in range(iterations):
+        p = (a + b) / 2
+        below = (area * np.clip((p[:, None] - lo) / span, 0.0, 1.0)).sum(axis=1)
+        low = below < total / 2
+        a, b = np.where(low, p, a), np.where(low, b, p)
+    p = ((a + b) / 2)[:, None]
+    mid = (lo + hi) / 2
+    inside = area / span * ((p - lo) ** 2 + (hi - p) ** 2) / 2
+    return np.where(p <= lo, area * (mid - p), np.where(p >= hi, area * (p - mid), inside)).sum(axis=1)
+
+
+def batch_properties(nodes: np.ndarray, elements: np.ndarray, t: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    คุณสมบัติของ k หน้าตัดที่มีชิ้นส่วนชุดเดียวกัน
+
+    Args:
+        nodes: (k, n, 2) พิกัดโหนด mm
+        elements: (m, 2) ดัชนีโหนดของชิ้นส่วน (เหมือนกันทุกหน้าตัด)
+        t: (k, m) หรือ (k,) ความหนา mm
+
+    Returns:
+        dict ของ array ยาว k (หน่วยตามหัวไฟล์)
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    if nodes.ndim == 2:
+        nodes = nodes[None]
+    elements = np.asarray(elements, dtype=np.intp)
+    k, m = len(nodes), len(elements)
+    t = np.asarray(t, dtype=float)
+    t = np.broadcast_to(t[:, None] if t.ndim == 1 else t, (k, m))
+    topo = _topology(nodes.shape[1], elements)
+
+    xi, yi = nodes[:, elements[:, 0], 0], nodes[:, elements[:, 0], 1]
+    xj, yj = nodes[:, elements[:, 1], 0], nodes[:, elements[:, 1], 1]
+    dx, dy = xj - xi, yj - yi
+    L = np.hypot(dx, dy)
+    dA = L * t
+    A = dA.sum(axis=1)
+    xc = (dA * (xi + xj) / 2).sum(axis=1) / A
+    yc = (dA * (yi + yj) / 2).sum(axis=1) / A
+    # พิกัดเทียบศูนย์ถ่วง
+    xi, xj = xi - xc[:, None], xj - xc[:, None]
+    yi, yj = yi - yc[:, None], yj - yc[:, None]
+
+    # พจน์ t³ ของชิ้นส่วนเอง (ทิศความหนาตั้งฉากกับชิ้นส่วน)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cx, cy = np.where(L > 0, dx / L, 0.0), np.where(L > 0, dy / L, 0.0)
+    own = L * t ** 3 / 12
+    Ix = (dA * (yi ** 2 + yi * yj + yj ** 2) / 3 + own * cx ** 2).sum(axis=1)
+    Iy = (dA * (xi ** 2 + xi * xj + xj ** 2) / 3 + own * cy ** 2).sum(axis=1)
+    Ixy = (dA * (2 * xi * yi + xi * yj + xj * yi + 2 * xj * yj) / 6 - own * cx * cy).sum(axis=1)
+    theta = 0.5 * np.arctan2(-2 * Ixy, Ix - Iy)
+    root = np.sqrt(((Ix - Iy) / 2) ** 2 + Ixy ** 2)
+    I1, I2 = (Ix + Iy) / 2 + root, (Ix + Iy) / 2 - root
+
+    # ผิวนอก: มุมของแถบความหนา (ปลายชิ้นส่วน ± t/2 ตามแนวตั้งฉาก)
+    half_x, half_y = -cy * t / 2, cx * t / 2
+    corner_x = np.concatenate([xi + half_x, xi - half_x, xj + half_x, xj - half_x], axis=1)
+    corner_y = np.concatenate([yi + half_y, yi - half_y, yj + half_y, yj - half_y], axis=1)
+    Sx = Ix / np.abs(corner_y).max(axis=1)
+    Sy = Iy / np.abs(corner_x).max(axis=1)
+    # Z: พื้นที่ชิ้นส่วนกระจายบนช่วงพิกัด (รวมความหนาตามทิศนั้น)
+    ext_y, ext_x = np.abs(cx) * t / 2, np.abs(cy) * t / 2
+    Zx = _plastic_modulus(np.minimum(yi, yj) - ext_y, np.maximum(yi, yj) + ext_y, dA)
+    Zy = _plastic_modulus(np.minimum(xi, xj) - ext_x, np.maximum(xi, xj) + ext_x, dA)
+
+    # การบิด
+    J_open = (L * t ** 3 / 3)
+    if topo.cell is not None:
+        # Bredt: 4A₀² / Σ(L/t) ของช่องปิด + ชิ้นส่วนเปิดที่เหลือ
+        in_cell = topo.cell != 0
+        area0 = np.abs((topo.cell * (xi * yj - xj * yi)).sum(axis=1)) / 2
+        J = 4 * area0 ** 2 / (L[:, in_cell] / t[:, in_cell]).sum(axis=1) + J_open[:, ~in_cell].sum(axis=1)
+    else:
+        J = J_open.sum(axis=1)
+
+    # พิกัด sectorial เทียบศูนย์ถ่วง → จุดศูนย์แรงเฉือน → Cw
+    d_omega = xi * yj - xj * yi
+    omega = (d_omega * topo.tree) @ topo.paths.T
+    wi, wj = omega[:, elements[:, 0]], omega[:, elements[:, 1]]
+    Iwx = (dA * (2 * wi * xi + wi * xj + wj * xi + 2 * wj * xj) / 6).sum(axis=1)
+    Iwy = (dA * (2 * wi * yi + wi * yj + wj * yi + 2 * wj * yj) / 6).sum(axis=1)
+    det = Ix * Iy - Ixy ** 2
+    xs = (Iwy * Iy - Iwx * Ixy) / det
+    ys = -(Iwx * Ix - Iwy * Ixy) / det
+    if topo.cell is not None:
+        # ช่องปิด: Cw ≈ 0 และจุดศูนย์แรงเฉือน ≈ ศูนย์ถ่วง (เหมาะกับกล่องสมมาตร)
+        xs, ys = np.zeros(k), np.zeros(k)
+        Cw = np.zeros(k)
+    else:
+        node_x, node_y = nodes[:, :, 0] - xc[:, None], nodes[:, :, 1] - yc[:, None]
+        # ย้ายขั้วไปที่จุดศูนย์แรงเฉือน: ω_s = ω − xs·y + ys·x (+ ค่าคงที่ต่อส่วนที่เชื่อมกัน)
+        omega_s = omega - xs[:, None] * node_y + ys[:, None] * node_x
+        wi, wj = omega_s[:, elements[:, 0]], omega_s[:, elements[:, 1]]
+        Cw = np.zeros(k)
+        for comp in np.unique(topo.components):
+            sel = topo.components == comp
+            mean = (dA[:, sel] * (wi[:, sel] + wj[:, sel]) / 2).sum(axis=1) / dA[:, sel].sum(axis=1)
+            a, b = wi[:, sel] - mean[:, None], wj[:, sel] - mean[:, None]
+            Cw += (dA[:, sel] * (a ** 2 + a * b + b ** 2) / 3).sum(axis=1)
+
+    depth = corner_y.max(axis=1) - corner_y.min(axis=1)
+    width = corner_x.max(axis=1) - corner_x.min(axis=1)
+    rx, ry = np.sqrt(Ix / A), np.sqrt(Iy / A)
+    ro = np.sqrt(rx ** 2 + ry ** 2 + xs ** 2 + ys ** 2)
+    with np.errstate(invalid="ignore"):
+        rts = np.sqrt(np.sqrt(Iy * Cw) / Sx)
+    return {
+        "Area": A / 1e2, "Weight": A * 1e-6 * STEEL_DENSITY,
+        "xc": xc / 10, "yc": yc / 10,
+        "Ix": Ix / 1e4, "Iy": Iy / 1e4, "Ixy": Ixy / 1e4, "I1": I1 / 1e4, "I2": I2 / 1e4,
+        "theta": np.degrees(theta),
+        "Sx": Sx / 1e3, "Sy": Sy / 1e3, "Zx": Zx / 1e3, "Zy": Zy / 1e3,
+        "rx": rx / 10, "ry": ry / 10, "ro": ro / 10, "rts": rts / 10,
+        "J": J / 1e4, "Cw": Cw / 1e6, "xs": xs / 10, "ys": ys / 10,
+        "h": depth, "b": width,
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# หน้าตัดเดี่ยว (มี cache) และทั้งตาราง
+# ─────────────────────────────────────────────────────────────
+_CACHE: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+
+
+def section_properties(section: ThinWalledSection) -> Dict[str, float]:
+    """คุณสมบัติของหน้าตัดเดียว — เก็บ cache ตาม hash ของรูปทรง (คืนสำเนา)"""
+    key = section.key()
+    props = _CACHE.get(key)
+    if props is None:
+        props = {k: float(v[0]) for k, v in batch_properties(section.nodes, section.elements,
+                                                             section.t[None]).items()}
+        _CACHE[key] = props
+        if len(_CACHE) > _MAX_CACHED:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(key)
+    return dict(props)
+
+
+def lipped_channel_catalog(df: pd.DataFrame, r: float = 0.0, segments: int = 4) -> pd.DataFrame:
+    """
+    คุณสมบัติของทุกหน้าตัดตัวซีในตาราง (คอลัมน์ h, b, c, t mm) ในการเรียกครั้งเดียว
+
+    ทุกแถวมีชิ้นส่วนชุดเดียวกัน จึงสร้างโหนดเป็น array (k, n, 2) แล้วส่งเข้า batch_properties
+    r คือรัศมีดัดภายใน (mm) — ตัวเลขหรือชื่อคอลัมน์ก็ได้ (แถวที่ r = 0 ได้มุมแหลม)
+    """
+    h, b, c, t = (df[col].to_numpy(dtype=float) for col in ("h", "b", "c", "t"))
+    radius = df[r].to_numpy(dtype=float) if isinstance(r, str) else np.full(len(df), float(r))
+    nodes = _lipped_channel_nodes(h, b, c, t, radius, segments)
+    n = nodes.shape[1]
+    props = batch_properties(nodes, np.column_stack([np.arange(n - 1), np.arange(1, n)]), t)
+    out = pd.DataFrame(props, index=df.index)
+    if "Section" in df:
+        out.insert(0, "Section", df["Section"])
+    return out
+
+
+def dimensions_from_names(names) -> pd.DataFrame:
+    """ขนาด h, b, c, t (mm) จากชื่อหน้าตัดรูปแบบ C-h×b×c×t — แถวที่อ่านไม่ได้เป็น NaN"""
+    names = names if isinstance(names, pd.Series) else pd.Series(list(names), dtype=object)
+    parsed = names.astype(str).str.extract(_NAME_DIMENSIONS).astype(float)
+    parsed.columns = ["h", "b", "c", "t"]
+    return parsed
+
+
+def name_dimensions(name: str) -> Optional[Dict[str, float]]:
+    """ขนาด h, b, c, t (mm) ของชื่อหน้าตัดเดียว — None ถ้าอ่านไม่ได้"""
+    match = _NAME_DIMENSIONS.search(name)
+    return dict(zip(("h", "b", "c", "t"), map(float, match.groups()))) if match else None
+
+
+def section_data(props: Dict[str, float], name: str = "", t: Optional[float] = None) -> Dict[str, float]:
+    """แปลงผลเป็นแถวแบบตารางหน้าตัด (คีย์เดียวกับ tis_1228 / tis_1227) สำหรับคลาสออกแบบ"""
+    data = {key: props[key] for key in ("Weight", "Area", "Ix", "Iy", "Sx", "Sy", "Zx", "rx", "ry",
+                                         "J", "Cw", "rts", "h", "b")}
+    data["Section"] = name
+    if t is not None:
+        data["t"] = t
+    return data
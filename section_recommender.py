@@ -0,0 +1,266 @@
+"""
+section_recommender.py
+แนะนำหน้าตัดทางเลือกที่ใกล้เคียงที่สุดเมื่อหน้าตัดที่เลือกไม่ผ่าน
+
+ดัชนีเชิงพื้นที่ (KD-tree) ของแต่ละตารางหน้าตัดบนคุณสมบัติ (Zx, Ix, Weight, h) ที่ปรับมาตรฐานแล้ว
+(log แล้วหารด้วยส่วนเบี่ยงเบนมาตรฐาน — คุณสมบัติหน้าตัดต่างกันหลายเท่าตัว ระยะจึงวัดเป็นสัดส่วน)
+สร้างครั้งเดียวต่อตารางแล้วเก็บไว้ใน cache เมื่อหน้าตัดไม่ผ่านจึงดึง k หน้าตัดที่หนักกว่าและใกล้ที่สุด
+ตรวจด้วย batch_checks (NumPy) ในครั้งเดียว — ไม่ต้องตรวจทั้งตารางใหม่ทุกครั้งที่แก้อินพุต
+
+    alt = recommend("purlin", df, "C-100x50x20x2.3", geometry, loads, materials, k=5)
+
+ถ้า k หน้าตัดแรกผ่านไม่ครบ ขยายการค้นหาเป็นสองเท่าจนได้ครบหรือหมดหน้าตัดที่หนักกว่า
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from effective_width import DIMENSIONS, catalog_dimensions
+from inverse_design import CHECKS
+
+FEATURES = ("Zx", "Ix", "Weight", "h")
+
+
+# ─────────────────────────────────────────────────────────────
+# KD-tree (NumPy ล้วน)
+# ─────────────────────────────────────────────────────────────
+class KDTree:
+    """
+    KD-tree แบบ array สำหรับค้นหาเพื่อนบ้านใกล้สุด k จุด (ระยะ Euclidean)
+
+    แบ่งโหนดตามแกนที่กระจายมากที่สุด ณ ค่ามัธยฐาน ใบมีจุดไม่เกิน leaf_size
+    query ค้นแบบ best-first และข้ามจุดที่ mask เป็น False
+    """
+
+    def __init__(self, points, leaf_size: int = 8) -> None:
+        self.points = np.asarray(points, dtype=float)
+        if self.points.ndim != 2 or not np.isfinite(self.points).all():
+            raise ValueError("จุดของ KD-tree ต้องเป็น array 2 มิติที่มีค่าจำกัดทุกตัว")
+        self.leaf_size = max(int(leaf_size), 1)
+        self.order = np.arange(len(self.points))
+        # โหนด: (start, end, แกน, ค่าแบ่ง, ลูกซ้าย, ลูกขวา) — ใบมีแกน = -1
+        self.nodes: list = []
+        if len(self.points):
+            self._build()
+
+    def _build(self) -> None:
+        stack = [(0, len(self.points), None, False)]
+        while stack:
+            start, end, parent, right = stack.pop()
+            index = len(self.nodes)
+            self.nodes.append([start, end, -1, 0.0, -1, -1])
+            if parent is not None:
+                self.nodes[parent][5 if right else 4] = index
+            if end - start <= self.leaf_size:
+                continue
+            idx = self.order[start:end]
+            pts = self.points[idx]
+            axis = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+            mid = (end - start) // 2
+            part = np.argpartition(pts[:, axis], mid)
+            self.order[start:end] = idx[part]
+            self.nodes[index][2] = axis
+            self.nodes[index][3] = float(self.points[self.order[start + mid], axis])
+            stack.append((start + mid, end, index, True))
+            stack.append((start, start + mid, index, False))
+
+    def query(self, x, k: int = 1, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """k จุดที่ใกล้ x ที่สุด (เฉพาะจุดที่ mask เป็น True) → (ระยะ, ดัชนี) เรียงจากใกล้ไปไกล"""
+        x = np.asarray(x, dtype=float)
+        best: list = []  # max-heap ของ (-d², ดัชนี)
+        if not self.nodes or k <= 0:
+            return np.empty(0), np.empty(0, dtype=int)
+        queue = [(0.0, 0)]
+        while queue:
+            bound, node = heapq.heappop(queue)
+            if len(best) == k and bound > -best[0][0]:
+                break
+            start, end, axis, split, left, right = self.nodes[node]
+            if axis < 0:
+                idx = self.order[start:end]
+                if mask is not None:
+                    idx = idx[mask[idx]]
+                d2 = np.sum((self.points[idx] - x) ** 2, axis=1)
+                for dist, i in zip(d2.tolist(), idx.tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist, i))
+                    elif dist < -best[0][0]:
+                        heapq.heapreplace(best, (-dist, i))
+                continue
+            diff = x[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            heapq.heappush(queue, (bound, near))
+            heapq.heappush(queue, (max(bound, diff * diff), far))
+        best.sort(key=lambda item: -item[0])
+        return (np.sqrt([-d for d, _ in best]), np.array([i for _, i in best], dtype=int))
+
+
+# ─────────────────────────────────────────────────────────────
+# ดัชนีของตารางหน้าตัด
+# ─────────────────────────────────────────────────────────────
+@dataclass
+class SectionIndex:
+    """KD-tree ของตารางหน้าตัดหนึ่งตาราง (เฉพาะแถวที่มีคุณสมบัติเป็นบวกครบทุกคอลัมน์)"""
+
+    frame: pd.DataFrame
+    features: Tuple[str, ...]
+    center: np.ndarray
+    scale: np.ndarray
+    tree: KDTree
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, features: Sequence[str] = FEATURES) -> "SectionIndex":
+        features = tuple(f for f in features if f in df)
+        if "Weight" not in features:
+            raise ValueError("ตารางหน้าตัดต้องมีคอลัมน์ Weight สำหรับการแนะนำหน้าตัด")
+        values = df[list(features)].apply(pd.to_numeric, errors="coerce")
+        frame = df[(values > 0).all(axis=1)]
+        logs = np.log(frame[list(features)].to_numpy(dtype=float))
+        center = logs.mean(axis=0) if len(logs) else np.zeros(len(features))
+        scale = logs.std(axis=0) if len(logs) else np.ones(len(features))
+        scale = np.where(scale > 0, scale, 1.0)
+        return cls(frame, features, center, scale, KDTree((logs - center) / scale))
+
+    def transform(self, values: Mapping[str, float]) -> np.ndarray:
+        """คุณสมบัติหน้าตัด → พิกัดในดัชนี"""
+        return (np.log([float(values[f]) for f in self.features]) - self.center) / self.scale
+
+    def nearest(self, values: Mapping[str, float], k: int = 5, heavier: bool = True) -> pd.DataFrame:
+        """k หน้าตัดที่ใกล้ที่สุด (heavier=True: เฉพาะที่หนักกว่า values['Weight']) พร้อมคอลัมน์ Distance"""
+        mask = None
+        if heavier:
+            mask = self.frame["Weight"].to_numpy(dtype=float) > float(values["Weight"])
+        dist, idx = self.tree.query(self.transform(values), k, mask)
+        out = self.frame.iloc[idx].copy()
+        out["Distance"] = dist
+        return out
+
+
+_INDEXES: "OrderedDict[Tuple, SectionIndex]" = OrderedDict()
+_MAX_INDEXES = 16
+
+
+def get_index(df: pd.DataFrame, features: Sequence[str] = FEATURES) -> SectionIndex:
+    """SectionIndex ของตาราง (สร้างครั้งแรกแล้วเก็บ cache ตามเนื้อหาของตาราง)"""
+    cols = [c for c in ("Section", *features) if c in df]
+    key = (tuple(features), tuple(cols), int(pd.util.hash_pandas_object(df[cols], index=True).sum()))
+    index = _INDEXES.get(key)
+    if index is None:
+        index = SectionIndex.build(df, features)
+        _INDEXES[key] = index
+        if len(_INDEXES) > _MAX_INDEXES:
+            _INDEXES.popitem(last=False)
+    else:
+        _INDEXES.move_to_end(key)
+    return index
+
+
+# ─────────────────────────────────────────────────────────────
+# ตัวแปลงตารางหน้าตัด → section_data ของแต่ละ engine (คอลัมน์ array)
+# ─────────────────────────────────────────────────────────────
+def catalog_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    ตารางที่คอลัมน์ตรงกับ section_data อยู่แล้ว (แป, คาน มอก. 1228)
+
+    ขนาด b, c ที่ไม่มีในตาราง (Data Steel) อ่านจากชื่อหน้าตัด — ใช้กับความกว้างประสิทธิผล
+    """
+    cols = {c: df[c].to_numpy(dtype=float) for c in df.columns if pd.api.types.is_numeric_dtype(df[c])}
+    if "b" not in cols or "c" not in cols:
+        dims = catalog_dimensions(df)
+        if dims is not None:
+            cols.update({k: dims[k].to_numpy() for k in DIMENSIONS if k not in cols})
+    return cols
+
+
+def hot_rolled_rafter_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """ตาราง มอก. 1227 (h, b, tw, tf เป็น มม.) → section_data ของ RafterDesign (ซม.)"""
+    cols = catalog_columns(df)
+    out = {"d": cols["h"] / 10.0, "bf": cols["b"] / 10.0, "tf": cols["tf"] / 10.0, "tw": cols["tw"] / 10.0}
+    out.update({k: cols[k] for k in ("Area", "Ix", "Zx", "Sx", "ry", "Weight", "Iy", "J", "h0", "rts") if k in cols})
+    return out
+
+
+def cold_formed_rafter_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """ตาราง มอก. 1228 (h, b, t เป็น มม.) → section_data ของ RafterDesign ตามค่าประมาณของหน้าจันทัน"""
+    cols = catalog_columns(df)
+    d = cols["h"] / 10.0
+    out = {"d": d, "bf": cols.get("b", np.zeros(len(df))) / 10.0, "tf": cols["t"] / 10.0, "tw": cols["t"] / 10.0,
+           "ry": d * 0.28, "Sx": cols.get("Sx", cols["Zx"])}
+    out.update({k: cols[k] for k in ("Area", "Ix", "Zx", "Weight") if k in cols})
+    return out
+
+
+def _builders() -> Dict[str, Callable[..., Dict[str, Any]]]:
+    from parametric_sweep import beam_inputs, purlin_inputs, rafter_inputs
+
+    return {"purlin": purlin_inputs, "beam": beam_inputs, "rafter": rafter_inputs}
+
+
+def check_sections(engine: str, df: pd.DataFrame, geometry: Mapping[str, Any], loads: Mapping[str, Any],
+                   materials: Mapping[str, Any], combinations=None, limits=None,
+                   columns: Callable[[pd.DataFrame], Dict[str, np.ndarray]] = catalog_columns) -> pd.DataFrame:
+    """ตรวจหลายหน้าตัดด้วย batch_checks ในครั้งเดียว → Max_Ratio, Governing, Pass ต่อแถว"""
+    from parametric_sweep import ENGINES
+
+    builders = _builders()
+    if engine not in builders:
+        raise ValueError(f"การแนะนำหน้าตัดรองรับ engine: {', '.join(builders)}")
+    res = ENGINES[engine](**builders[engine](columns(df), geometry, loads, materials,
+                                             combinations=combinations, limits=limits))
+    n = len(df)
+    checks = [k for k in CHECKS if k in res]
+    stacked = np.stack([np.abs(np.broadcast_to(np.asarray(res[k], dtype=float), (n,))) for k in checks])
+    ratio = np.broadcast_to(np.asarray(res["Max_Ratio"], dtype=float), (n,))
+    return pd.DataFrame({
+        "Max_Ratio": ratio,
+        "Governing": np.asarray(checks, dtype=object)[np.argmax(np.nan_to_num(stacked, nan=np.inf), axis=0)],
+        "Pass": ratio <= 1.0,
+    }, index=df.index)
+
+
+def recommend(engine: str, df: pd.DataFrame, current: Union[str, Mapping[str, float]],
+              geometry: Mapping[str, Any], loads: Mapping[str, Any], materials: Mapping[str, Any],
+              k: int = 5, combinations=None, limits=None,
+              columns: Callable[[pd.DataFrame], Dict[str, np.ndarray]] = catalog_columns,
+              features: Sequence[str] = FEATURES) -> pd.DataFrame:
+    """
+    หน้าตัดที่หนักกว่าและใกล้เคียงหน้าตัดปัจจุบันที่สุดซึ่งผ่านทุกเกณฑ์
+
+    Args:
+        engine: 'purlin', 'beam' หรือ 'rafter'
+        df: ตารางหน้าตัด (คอลัมน์ Section, Weight และคุณสมบัติใน features)
+        current: ชื่อหน้าตัดใน df หรือ dict คุณสมบัติ (Weight, Zx, Ix, h)
+        geometry, loads, materials: อินพุตเดียวกับคลาสออกแบบ
+        k: จำนวนหน้าตัดทางเลือกที่ต้องการ
+        columns: ตัวแปลงตาราง → section_data แบบคอลัมน์ (เช่น hot_rolled_rafter_columns)
+
+    Returns:
+        DataFrame: Section, Weight, Distance, Max_Ratio, Governing — เฉพาะที่ผ่าน เรียงตามระยะ
+    """
+    index = get_index(df, features)
+    if isinstance(current, str):
+        match = df[df["Section"].astype(str) == current]
+        if match.empty:
+            raise ValueError(f"ไม่พบหน้าตัด '{current}' ในตาราง")
+        current = match.iloc[0]
+    n_heavier = int((index.frame["Weight"].to_numpy(dtype=float) > float(current["Weight"])).sum())
+    cols = ["Section", "Weight", "Distance", "Max_Ratio", "Governing"]
+    if n_heavier == 0:
+        return pd.DataFrame(columns=cols)
+    n = max(int(k), 1)
+    while True:
+        candidates = index.nearest(current, min(n, n_heavier))
+        checked = pd.concat([candidates, check_sections(engine, candidates, geometry, loads, materials,
+                                                         combinations, limits, columns)], axis=1)
+        found = checked[checked["Pass"]]
+        if len(found) >= k or n >= n_heavier:
+            break
+        n *= 2
+    return found[[c for c in cols if c in found]].head(k)
@@ -0,0 +1,204 @@
+"""
+serviceability.py
+สภาวะใช้งาน (serviceability): เกณฑ์การโก่งตัว, การโก่งตัวจากแรงลม, ระยะแอ่น (camber) และน้ำขัง (ponding)
+
+ใช้ร่วมกันทั้งแป คาน และจันทัน ทั้ง run_design (ค่าเดี่ยว) และ batch_checks (array) —
+ทุกฟังก์ชันเป็น NumPy broadcasting จึงแทบไม่เพิ่มเวลาการคัดกรองทั้งตารางหน้าตัด
+
+ชุดเกณฑ์การโก่งตัว (LIMIT_PROFILES) เลือกต่อโครงการได้แบบเดียวกับชุด load combination:
+  - EIT:            L/240 (DL+LL), L/360 (LL) ตามกฎกระทรวง ฉบับที่ 55 — ค่าปริยาย ไม่ตรวจลม
+  - ROOF_NO_CEILING: หลังคาไม่มีฝ้า L/120, L/180, ลม L/180     (IBC 2018 Table 1604.3)
+  - ROOF_CEILING:    หลังคามีฝ้าเบา L/180, L/240, ลม L/240
+  - ROOF_PLASTER:    หลังคามีฝ้าฉาบ L/240, L/360, ลม L/360
+
+ระยะแอ่น (camber) หักออกจากการโก่งตัวรวม DL+LL เท่านั้น (การโก่งตัวจาก LL และลมไม่เปลี่ยน)
+
+น้ำขัง — AISC 360-16 Appendix 2.1 (หลังคาลาดน้อยกว่า 1/4 นิ้ว/ฟุต ≈ 1.19°):
+    C_p = γ_w L_s L_p⁴ / (π⁴ E I_p),   C_s = γ_w S L_s⁴ / (π⁴ E I_s)
+    C_p + 0.9 C_s ≤ 0.25
+    (รูปทั่วไปของ 32 L_s L_p⁴ / 10⁷ I_p ในหน่วยฟุต/นิ้ว)
+    ชิ้นส่วนหลัก (จันทัน/คาน) ใช้ C_p ของตัวเอง + C_s ของแปถ้าระบุ, แปใช้ C_s ของตัวเอง + C_p ของจันทันถ้าระบุ
+
+หน่วย: ความยาว ซม. (ช่วงพาด ระยะห่าง รับเป็น ม.), น้ำหนัก กก./ม., E กก./ตร.ซม., I ซม.⁴
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+WATER_DENSITY = 1.0e-3                                   # กก./ลบ.ซม.
+PONDING_LIMIT = 0.25
+PONDING_SLOPE_DEG = math.degrees(math.atan(1.0 / 48.0))  # 1/4 นิ้ว ต่อ 1 ฟุต
+
+
+@dataclass(frozen=True)
+class DeflectionLimits:
+    """ตัวหารเกณฑ์การโก่งตัว L/n (None = ไม่ตรวจ)"""
+
+    name: str
+    total: float = 240.0
+    live: float = 360.0
+    wind: Optional[float] = None
+    reference: str = ""
+
+    def latex(self) -> str:
+        parts = [rf"\Delta_{{allow,tot}} = \frac{{L}}{{{self.total:g}}}", rf"\Delta_{{allow,L}} = \frac{{L}}{{{self.live:g}}}"]
+        if self.wind:
+            parts.append(rf"\Delta_{{allow,W}} = \frac{{L}}{{{self.wind:g}}}")
+        return r",\; ".join(parts)
+
+
+EIT_LIMITS = DeflectionLimits("กฎกระทรวง ฉบับที่ 55 (วสท.)", 240.0, 360.0, None,
+                              "กฎกระทรวง ฉบับที่ 55 (พ.ศ. 2543)")
+
+LIMIT_PROFILES: Dict[str, DeflectionLimits] = {
+    "EIT": EIT_LIMITS,
+    "ROOF_NO_CEILING": DeflectionLimits("หลังคาไม่มีฝ้า", 120.0, 180.0, 180.0, "IBC 2018 Table 1604.3"),
+    "ROOF_CEILING": DeflectionLimits("หลังคามีฝ้าเบา (ไม่ใช่ฝ้าฉาบ)", 180.0, 240.0, 240.0, "IBC 2018 Table 1604.3"),
+    "ROOF_PLASTER": DeflectionLimits("หลังคามีฝ้าฉาบ", 240.0, 360.0, 360.0, "IBC 2018 Table 1604.3"),
+}
+
+
+def get_limit_profile(name_or_limits=None) -> DeflectionLimits:
+    """คืนชุดเกณฑ์จากชื่อใน LIMIT_PROFILES หรือ DeflectionLimits ที่ส่งเข้ามา ค่าปริยาย = EIT"""
+    if name_or_limits is None:
+        return EIT_LIMITS
+    if isinstance(name_or_limits, DeflectionLimits):
+        return name_or_limits
+    try:
+        return LIMIT_PROFILES[name_or_limits]
+    except KeyError:
+        raise ValueError(f"ไม่พบชุดเกณฑ์การโก่งตัว '{name_or_limits}'") from None
+
+
+# ─────────────────────────────────────────────────────────────
+# การโก่งตัว
+# ─────────────────────────────────────────────────────────────
+def uniform_deflection(w, span_cm, E, I):
+    """δ กึ่งกลางช่วงของคานช่วงเดียวรับน้ำหนักแผ่ 5 w L⁴ / (384 E I) — w กก./ม. → ซม."""
+    return 5 * (np.asarray(w, dtype=float) / 100.0) * np.asarray(span_cm, dtype=float) ** 4 / (384 * E * I)
+
+
+def deflection_checks(span_cm, delta_total, delta_live, delta_wind=None, limits=None,
+                      camber=0.0) -> Dict[str, np.ndarray]:
+    """
+    เทียบการโก่งตัวกับชุดเกณฑ์ (array broadcast ได้)
+
+    Returns:
+        dict: Delta_Total (สุทธิหลังหัก camber), Delta_Live, Delta_Wind,
+              Delta_Limit_*, Ratio_* ของแต่ละรายการ, Deflection (อัตราส่วนสูงสุด) และ Pass
+    """
+    lim = get_limit_profile(limits)
+    span_cm = np.asarray(span_cm, dtype=float)
+    net_total = np.asarray(delta_total, dtype=float) - camber
+    out = {
+        'Delta_Total': net_total,
+        'Delta_Live': np.asarray(delta_live, dtype=float),
+        'Delta_Limit_Total': span_cm / lim.total,
+        'Delta_Limit_Live': span_cm / lim.live,
+    }
+    out['Ratio_Total'] = np.abs(net_total) / out['Delta_Limit_Total']
+    out['Ratio_Live'] = np.abs(out['Delta_Live']) / out['Delta_Limit_Live']
+    ratio = np.maximum(out['Ratio_Total'], out['Ratio_Live'])
+    if lim.wind and delta_wind is not None:
+        out['Delta_Wind'] = np.abs(np.asarray(delta_wind, dtype=float))
+        out['Delta_Limit_Wind'] = span_cm / lim.wind
+        out['Ratio_Wind'] = out['Delta_Wind'] / out['Delta_Limit_Wind']
+        ratio = np.maximum(ratio, out['Ratio_Wind'])
+    out['Deflection'] = ratio
+    out['Pass'] = ratio <= 1.0
+    return out
+
+
+def deflection_detail(checks: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+    """ผลของ deflection_checks (ค่าเดี่ยว) → Checks['Deflection'] รูปแบบเดิม {'Total': {...}, 'Live': {...}}"""
+    detail = {}
+    for key in ('Total', 'Live', 'Wind'):
+        if f'Delta_{key}' in checks:
+            ratio = float(checks[f'Ratio_{key}'])
+            detail[key] = {
+                'value': float(checks[f'Delta_{key}']),
+                'limit': float(checks[f'Delta_Limit_{key}']),
+                'ratio': ratio,
+                'pass': bool(ratio <= 1.0),
+            }
+    return detail
+
+
+# ─────────────────────────────────────────────────────────────
+# น้ำขัง (ponding)
+# ─────────────────────────────────────────────────────────────
+def ponding_applies(slope, ponding=None):
+    """ตรวจน้ำขังเมื่อระบุ ponding=True หรือ (ponding=None) หลังคาลาดน้อยกว่า 1/4 นิ้ว/ฟุต"""
+    if ponding is not None:
+        return np.broadcast_to(bool(ponding), np.shape(slope))
+    return np.asarray(slope, dtype=float) < PONDING_SLOPE_DEG
+
+
+def ponding_coefficient(spacing, span, E, I):
+    """C = γ_w s L⁴ / (π⁴ E I) — spacing, span เป็น ม."""
+    s_cm = np.asarray(spacing, dtype=float) * 100.0
+    l_cm = np.asarray(span, dtype=float) * 100.0
+    return WATER_DENSITY * s_cm * l_cm ** 4 / (math.pi ** 4 * E * I)
+
+
+def ponding_ratio(cp, cs=0.0):
+    """(C_p + 0.9 C_s) / 0.25"""
+    return (np.asarray(cp, dtype=float) + 0.9 * np.asarray(cs, dtype=float)) / PONDING_LIMIT
+
+
+# ─────────────────────────────────────────────────────────────
+# ขั้นตอนการคำนวณ (ใช้ร่วมกับ add_step ของทุกโมดูล)
+# ─────────────────────────────────────────────────────────────
+def log_limit_steps(add_step: Callable[..., None], span_cm: float, limits, checks: Dict[str, np.ndarray],
+                    camber: float = 0.0) -> None:
+    """บันทึกเกณฑ์การโก่งตัว, camber และการโก่งตัวจากแรงลม"""
+    lim = get_limit_profile(limits)
+    values = [f"{float(checks['Delta_Limit_Total']):.3f}", f"{float(checks['Delta_Limit_Live']):.3f}"]
+    subst = [f"{span_cm:.1f}/{lim.total:g}", f"{span_cm:.1f}/{lim.live:g}"]
+    if 'Delta_Limit_Wind' in checks:
+        values.append(f"{float(checks['Delta_Limit_Wind']):.3f}")
+        subst.append(f"{span_cm:.1f}/{lim.wind:g}")
+    add_step(
+        f"เกณฑ์การโก่งตัว — {lim.name}",
+        lim.latex(),
+        "= " + ",\\; ".join(subst),
+        "= " + ",\\; ".join(values) + "\\,\\text{cm}",
+        note=f"อ้างอิง {lim.reference}" if lim.reference else None
+    )
+    if camber:
+        add_step(
+            "การโก่งตัวสุทธิหลังหักระยะแอ่น (camber)",
+            r"\Delta_{net} = \Delta_{tot} - \Delta_{camber}",
+            f"= {float(checks['Delta_Total']) + camber:.3f} - {camber:.3f}",
+            f"= {float(checks['Delta_Total']):.3f}\\,\\text{{cm}}",
+            status="PASS" if float(checks['Ratio_Total']) <= 1.0 else "FAIL",
+        )
+    if 'Delta_Wind' in checks:
+        add_step(
+            "การโก่งตัวจากแรงลม",
+            r"\Delta_W \leq \Delta_{allow,W}",
+            f"{float(checks['Delta_Wind']):.3f} \\leq {float(checks['Delta_Limit_Wind']):.3f}",
+            f"\\text{{ratio}} = {float(checks['Ratio_Wind']):.3f}",
+            status="PASS" if float(checks['Ratio_Wind']) <= 1.0 else "FAIL",
+            note="แรงลมใช้งาน (ไม่คูณตัวคูณน้ำหนัก)"
+        )
+
+
+def log_ponding_step(add_step: Callable[..., None], cp: float, cs: float, primary: bool) -> float:
+    """บันทึกการตรวจน้ำขัง คืนอัตราส่วน (C_p + 0.9 C_s) / 0.25"""
+    ratio = float(ponding_ratio(cp, cs))
+    own, other = ("C_p", "C_s") if primary else ("C_s", "C_p")
+    add_step(
+        "ตรวจสอบน้ำขังบนหลังคา (Ponding)",
+        rf"{own} = \frac{{\gamma_w S L^4}}{{\pi^4 E I}},\quad C_p + 0.9 C_s \leq 0.25",
+        f"C_p = {cp:.4f},\\; C_s = {cs:.4f}",
+        f"(C_p + 0.9 C_s)/0.25 = {ratio:.3f}",
+        status="PASS" if ratio <= 1.0 else "FAIL",
+        note=f"AISC 360-16 Appendix 2.1 — {other} ของชิ้นส่วนอีกระบบกำหนดผ่าน geometry (ค่าปริยาย 0)"
+    )
+    return ratio
@@ -15,7 +15,9 @@ import math
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
-from design_logging import CalculationLogMixin
+import numpy as np
+
+from design_logging import CalculationLogMixin, CapacityCache, traced
 
 
 def _pos(name: str, value: float) -> float:
@@ -24,6 +26,9 @@ def _pos(name: str, value: float) -> float:
     return float(value)
 
 
+_CAPACITY_CACHE = CapacityCache("TensionDesign")
+
+
 # ─────────────────────────────────────────────────────────────
 # ตาราง Shear Lag Factor U (AISC 360-16 Table D3.1)
 # ─────────────────────────────────────────────────────────────
@@ -89,14 +94,62 @@ class TensionDesign(CalculationLogMixin):
     steps: List[Dict[str, Any]] = field(default_factory=list)
 
     # ------------------------------------------------------------------
+    @traced
     def run_design(self) -> Dict[str, Any]:
-        """คำนวณและตรวจสอบกำลังรับแรงดึง — คืนค่า dict ผลลัพธ์ครบถ้วน"""
+        """
+        คำนวณและตรวจสอบกำลังรับแรงดึง — คืนค่า dict ผลลัพธ์ครบถ้วน
+
+        เฟสกำลังรับ (L/r, An, Ae, φtTn) มาจาก _CAPACITY_CACHE ตามหน้าตัด วัสดุ และรายละเอียดจุดต่อ
+        เปลี่ยนเฉพาะ Tu จึงคำนวณเฉพาะขั้นตอนตรวจสอบ
+        """
         self.reset_steps()
+        capacity, steps = _CAPACITY_CACHE.get(self.capacity_key(), self._capacity)
+        self.extend_steps(steps)
+        Tu = max(self.Tu, 0.0)
+        phi_Tn = capacity["Capacity"]["phi_Tn"]
+
+        # ══════════════════════════════════════════════════════════════
+        # 7. ตรวจสอบ Tu ≤ φtTn
+        # ══════════════════════════════════════════════════════════════
+        ratio = Tu / phi_Tn if phi_Tn > 0 else 999.0
+        tens_pass = ratio <= 1.0
 
+        self.add_step(
+            "ตรวจสอบความปลอดภัย Tu ≤ φtTn (Tension Check)",
+            r"\frac{T_u}{\phi_t T_n} \leq 1.0",
+            rf"\frac{{{Tu:,.2f}}}{{{phi_Tn:,.2f}}} = {ratio:.4f}",
+            rf"{ratio:.4f} \;{'\\leq' if tens_pass else '>'}\; 1.0 "
+            rf"\;\Rightarrow\; \text{{{'PASS ✓' if tens_pass else 'FAIL ✗'}}}",
+            status="PASS" if tens_pass else "FAIL",
+            note="AISC 360-16 Chapter D: ต้องการ Tu ≤ φtTn",
+        )
+
+        # ══════════════════════════════════════════════════════════════
+        # Return
+        # ══════════════════════════════════════════════════════════════
+        return {
+            **capacity,
+            "Demand": {"Tu": Tu},
+            "Ratio":  ratio,
+            "Status": tens_pass,
+            "SlendernessOK": capacity["Slenderness"]["OK"],
+            "Steps":  self.steps,
+        }
+
+    def capacity_key(self) -> tuple:
+        """อินพุตทั้งหมดของเฟสกำลังรับ (ทุกฟิลด์ยกเว้น Tu และชื่อหน้าตัด)"""
+        return (self.Ag, self.r_min, self.Fy, self.Fu, self.L, self.connection_type, self.U_key,
+                self.U_custom, self.n_bolt_lines, self.bolt_diameter, self.t_element)
+
+    def capacity(self) -> Dict[str, Any]:
+        """ผลของเฟสกำลังรับ (Slenderness, NetArea, Capacity) จาก cache"""
+        return _CAPACITY_CACHE.get(self.capacity_key(), self._capacity)[0]
+
+    def _capacity(self, log: CalculationLogMixin) -> Dict[str, Any]:
+        """เฟสกำลังรับ: ความชะลูด, An, U และ Ae, การคราก/การแตกหัก และ φtTn"""
         Fy  = _pos("Fy", self.Fy)
         Fu  = _pos("Fu", self.Fu)
         Ag  = _pos("Ag", self.Ag)
-        Tu  = max(self.Tu, 0.0)
         L_cm = self.L * 100.0
 
         # ══════════════════════════════════════════════════════════════
@@ -106,7 +159,7 @@ class TensionDesign(CalculationLogMixin):
         if r_min > 0:
             L_r = L_cm / r_min
             slen_ok = L_r <= 300.0
-            self.add_step(
+            log.add_step(
                 "ความชะลูด L/r (AISC 360-16 Sec. D1 — ข้อแนะนำ)",
                 r"\frac{L}{r_{\min}} \leq 300",
                 rf"\frac{{{L_cm:.1f}}}{{{r_min:.3f}}} = {L_r:.2f}",
@@ -121,7 +174,7 @@ class TensionDesign(CalculationLogMixin):
         else:
             L_r = 0.0
             slen_ok = True
-            self.add_step(
+            log.add_step(
                 "ความชะลูด L/r",
                 r"\text{ไม่ได้ระบุ } r_{\min} \text{ — ข้ามการตรวจสอบ}",
                 None,
@@ -137,7 +190,7 @@ class TensionDesign(CalculationLogMixin):
             dh_cm = self.bolt_diameter + 0.32
             hole_area = self.n_bolt_lines * dh_cm * self.t_element  # cm²
             An = max(Ag - hole_area, 0.0)
-            self.add_step(
+            log.add_step(
                 "พื้นที่หน้าตัดสุทธิ An — การต่อสลักเกลียว (Bolted)",
                 r"A_n = A_g - n_{lines}\cdot(d_h + \tfrac{3.2}{10})\cdot t",
                 (
@@ -152,7 +205,7 @@ class TensionDesign(CalculationLogMixin):
             )
         else:
             An = Ag
-            self.add_step(
+            log.add_step(
                 "พื้นที่หน้าตัดสุทธิ An — การต่อด้วยการเชื่อม (Welded)",
                 r"A_n = A_g \quad (\text{ไม่มีรูสลักเกลียว})",
                 rf"A_n = {An:.4f}\;\text{{cm}}^2",
@@ -174,7 +227,7 @@ class TensionDesign(CalculationLogMixin):
         U = float(U)
         Ae = U * An
 
-        self.add_step(
+        log.add_step(
             "ตัวคูณ Shear Lag U และพื้นที่ประสิทธิผล Ae",
             r"A_e = U \times A_n",
             rf"U = {U:.3f}\quad (\text{{{u_note}}})",
@@ -187,7 +240,7 @@ class TensionDesign(CalculationLogMixin):
         # ══════════════════════════════════════════════════════════════
         phi_t1 = 0.90
         Tn_yield = phi_t1 * Fy * Ag
-        self.add_step(
+        log.add_step(
             "กรณีที่ 1: การคราก Gross Section Yielding (AISC 360-16 Eq. D2-1)",
             r"\phi_t T_n = 0.90 \times F_y \times A_g",
             rf"= 0.90 \times {Fy:.0f} \times {Ag:.4f}",
@@ -200,7 +253,7 @@ class TensionDesign(CalculationLogMixin):
         # ══════════════════════════════════════════════════════════════
         phi_t2 = 0.75
         Tn_fracture = phi_t2 * Fu * Ae
-        self.add_step(
+        log.add_step(
             "กรณีที่ 2: การแตกหัก Net Section Fracture (AISC 360-16 Eq. D2-2)",
             r"\phi_t T_n = 0.75 \times F_u \times A_e",
             rf"= 0.75 \times {Fu:.0f} \times {Ae:.4f}",
@@ -213,7 +266,7 @@ class TensionDesign(CalculationLogMixin):
         # ══════════════════════════════════════════════════════════════
         phi_Tn = min(Tn_yield, Tn_fracture)
         ctrl   = "การคราก (Yielding)" if Tn_yield <= Tn_fracture else "การแตกหัก (Fracture)"
-        self.add_step(
+        log.add_step(
             "กำลังรับแรงดึงออกแบบ φtTn (Design Tensile Strength)",
             r"\phi_t T_n = \min\!\left(\phi_t T_{n,\text{yield}},\;\phi_t T_{n,\text{fracture}}\right)",
             rf"= \min\!\left({Tn_yield:.2f},\;{Tn_fracture:.2f}\right)",
@@ -221,25 +274,6 @@ class TensionDesign(CalculationLogMixin):
             note=f"สภาวะขีดจำกัดที่ควบคุม: {ctrl}",
         )
 
-        # ══════════════════════════════════════════════════════════════
-        # 7. ตรวจสอบ Tu ≤ φtTn
-        # ══════════════════════════════════════════════════════════════
-        ratio = Tu / phi_Tn if phi_Tn > 0 else 999.0
-        tens_pass = ratio <= 1.0
-
-        self.add_step(
-            "ตรวจสอบความปลอดภัย Tu ≤ φtTn (Tension Check)",
-            r"\frac{T_u}{\phi_t T_n} \leq 1.0",
-            rf"\frac{{{Tu:,.2f}}}{{{phi_Tn:,.2f}}} = {ratio:.4f}",
-            rf"{ratio:.4f} \;{'\\leq' if tens_pass else '>'}\; 1.0 "
-            rf"\;\Rightarrow\; \text{{{'PASS ✓' if tens_pass else 'FAIL ✗'}}}",
-            status="PASS" if tens_pass else "FAIL",
-            note="AISC 360-16 Chapter D: ต้องการ Tu ≤ φtTn",
-        )
-
-        # ══════════════════════════════════════════════════════════════
-        # Return
-        # ══════════════════════════════════════════════════════════════
         return {
             "Slenderness": {
                 "L_r":    L_r,
@@ -259,9 +293,55 @@ class TensionDesign(CalculationLogMixin):
                 "phi_Tn":          phi_Tn,
                 "Controlling":     ctrl,
             },
-            "Demand": {"Tu": Tu},
-            "Ratio":  ratio,
-            "Status": tens_pass,
-            "SlendernessOK": slen_ok,
-            "Steps":  self.steps,
         }
+
+
+# ─────────────────────────────────────────────────────────────
+# ตรวจสอบแบบเวกเตอร์ (ไม่บันทึกขั้นตอน)
+# ─────────────────────────────────────────────────────────────
+def batch_checks(*, Ag, Tu, L=3.0, r_min=0.0, Fy=2500.0, Fu=4080.0, connection_type="welded",
+                 U_key="welded_all", U_custom=1.0, n_bolt_lines=1, bolt_diameter=2.0,
+                 t_element=1.0) -> Dict[str, np.ndarray]:
+    """
+    TensionDesign.run_design แบบ NumPy broadcasting — สูตรเดียวกันทุกขั้น
+    อาร์กิวเมนต์เชิงตัวเลขรับค่าเดี่ยวหรือ array, connection_type / U_key เป็นค่าเดี่ยว
+    """
+    Ag, Tu, L, r_min, Fy, Fu, U_custom, n_bolt_lines, bolt_diameter, t_element = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in
+          (Ag, Tu, L, r_min, Fy, Fu, U_custom, n_bolt_lines, bolt_diameter, t_element))
+    )
+    if np.any(Ag <= 0):
+        raise ValueError("ต้องระบุ 'Ag' เป็นค่าบวก")
+    Tu = np.maximum(Tu, 0.0)
+
+    L_r = np.where(r_min > 0, L * 100.0 / np.where(r_min > 0, r_min, 1.0), 0.0)
+
+    if connection_type == "bolted":
+        An = np.maximum(Ag - n_bolt_lines * (bolt_diameter + 0.32) * t_element, 0.0)
+    else:
+        An = Ag
+
+    if U_key == "custom":
+        U = U_custom
+    else:
+        entry = SHEAR_LAG_TABLE.get(U_key, (1.0, ""))
+        U = np.full(Ag.shape, entry[0]) if entry[0] is not None else U_custom
+    Ae = U * An
+
+    Tn_yield = 0.90 * Fy * Ag
+    Tn_fracture = 0.75 * Fu * Ae
+    phi_Tn = np.minimum(Tn_yield, Tn_fracture)
+    ratio = np.where(phi_Tn > 0, Tu / np.where(phi_Tn > 0, phi_Tn, 1.0), 999.0)
+
+    return {
+        "L_r": L_r,
+        "An": An,
+        "Ae": Ae,
+        "phi_Tn_yield": Tn_yield,
+        "phi_Tn_fracture": Tn_fracture,
+        "phi_Tn": phi_Tn,
+        "Slenderness": L_r / 300.0,
+        "Ratio": ratio,
+        "Max_Ratio": ratio,
+        "Pass": ratio <= 1.0,
+    }
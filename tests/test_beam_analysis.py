@@ -0,0 +1,72 @@
+"""ทดสอบการวิเคราะห์คานช่วงเดียวด้วยฟังก์ชันอิทธิพล และ Cb จากแผนภาพโมเมนต์"""
+import numpy as np
+import pytest
+
+from beam_analysis import (cb_factor, point_load_kernels, sample_points, segment_moments, simple_span_response,
+                           uniform_cb, unbraced_segments)
+from load_combinations import custom_set
+from rafter_design import RafterDesign
+
+L = 6.0
+RAFTER = {'name': 'H-200x100x5.5x8', 'Zx': 200.0, 'Sx': 181.0, 'Ix': 1810.0, 'Iy': 134.0, 'ry': 2.22,
+          'bf': 100.0, 'tf': 8.0, 'd': 200.0, 'tw': 5.5, 'Weight': 0.0, 'Area': 27.16}
+MATERIALS = {'Fy': 2400.0, 'E': 2.04e6}
+
+
+def test_uniform_and_midspan_point_load_closed_forms():
+    x = np.array([0.0, L / 2, L])
+    M, V, D = simple_span_response(x, L, 2.0, [L / 2], [10.0], EI=3.0)
+    assert M[1] == pytest.approx(2.0 * L ** 2 / 8 + 10.0 * L / 4)
+    assert V[0] == pytest.approx(2.0 * L / 2 + 10.0 / 2)
+    assert D[1] == pytest.approx((5 * 2.0 * L ** 4 / 384 + 10.0 * L ** 3 / 48) / 3.0)
+    assert M[0] == M[2] == 0.0
+
+
+def test_kernels_are_reciprocal_and_vectorised_over_cases():
+    pts = np.array([0.7, 2.0, 4.5])
+    _, _, k_d = point_load_kernels(pts, pts, L)
+    np.testing.assert_allclose(k_d, k_d.T)    # Maxwell–Betti
+    loads = np.array([[1.0, 2.0], [0.0, 1.0], [3.0, 0.0]])
+    x = sample_points(L, pts)
+    M, _, _ = simple_span_response(x, L, np.array([0.5, 1.5]), pts, loads)
+    for case in range(2):
+        single, _, _ = simple_span_response(x, L, [0.5, 1.5][case], pts, loads[:, case])
+        np.testing.assert_allclose(M[:, case], single)
+
+
+def test_cb_factor():
+    assert cb_factor(1.0, 1.0, 1.0, 1.0) == pytest.approx(1.0)
+    assert cb_factor(1.0, 0.75, 1.0, 0.75) == pytest.approx(12.5 / 11.0)     # น้ำหนักแผ่ทั้งช่วง
+    assert cb_factor(1.0, 0.0, 0.0, 0.0) == 3.0
+
+
+@pytest.mark.parametrize('Lb', [0.0, 1.0, 1.5, 2.5, 4.0])
+def test_uniform_cb_matches_segment_scan(Lb):
+    segments = unbraced_segments(L, Lb)
+    assert segments[0, 0] == 0.0 and segments[-1, 1] == L
+    moment = lambda x: x * (L - x) / 2  # noqa: E731
+    m_max, cb = segment_moments(moment, segments, shear_at=lambda x: L / 2 - x)
+    k = int(np.argmax(m_max))
+    cb_u, seg = uniform_cb(L, Lb)
+    assert float(cb_u) == pytest.approx(cb[k])
+    assert float(seg) == pytest.approx(segments[k, 1] - segments[k, 0])
+
+
+def test_rafter_point_load_design():
+    combos = custom_set('แรงโน้มถ่วง', ['1.4D+1.7L'])
+    loads = {'DL': 0.0, 'LL': 0.0, 'WL': 0.0, 'point_loads': [{'x': L / 2, 'D': 1000.0}]}
+    res = RafterDesign(RAFTER, {'span': L, 'spacing': 1.0, 'slope': 0.0, 'Lb': L}, loads, MATERIALS,
+                       combinations=combos).run_design()
+    forces = res['Forces']
+    assert forces['Mu_kgm'] == pytest.approx(1.4 * 1000.0 * L / 4)
+    assert forces['Vu_kg'] == pytest.approx(1.4 * 1000.0 / 2)
+    assert forces['R_eave'] + forces['R_ridge'] == pytest.approx(1.4 * 1000.0)
+    assert res['Checks']['Capacity']['Cb'] == pytest.approx(12.5 / 9.5)
+    assert res['Checks']['Demand']['Delta_Total'] == pytest.approx(
+        1000.0 * (L * 100) ** 3 / (48 * MATERIALS['E'] * RAFTER['Ix']))
+
+
+def test_rafter_point_load_outside_span_raises():
+    loads = {'DL': 0.0, 'LL': 0.0, 'WL': 0.0, 'point_loads': [{'x': L + 1.0, 'D': 100.0}]}
+    with pytest.raises(ValueError):
+        RafterDesign(RAFTER, {'span': L, 'spacing': 1.0, 'slope': 0.0, 'Lb': L}, loads, MATERIALS).run_design()
@@ -0,0 +1,58 @@
+"""ทดสอบชุด benchmark: การเทียบ baseline, การบันทึกแบบ merge และความครบของ baseline ที่ commit ไว้"""
+import json
+
+import pytest
+
+import benchmarks
+from benchmarks import BENCHMARKS, Timing, compare, load_baseline, save_baseline
+
+
+def _timing(name, median, minimum=None):
+    return Timing(name, 'engine', median, median if minimum is None else minimum, 0.0, 10, 5)
+
+
+BASELINE = {'results': {'a': {'median': 1.0, 'min': 1.0}, 'b': {'median': 1.0, 'min': 1.0},
+                        'c': {'median': 1.0, 'min': 1.0}, 'd': {'median': 1.0, 'min': 1.0}}}
+
+
+def test_compare_statuses():
+    rows = compare([_timing('a', 1.5), _timing('b', 1.5, 1.1), _timing('c', 0.5), _timing('d', 1.1),
+                    _timing('e', 1.0)], BASELINE, threshold=0.25)
+    status = {r['name']: r['status'] for r in rows}
+    # b: median ช้าแต่ min ไม่ช้า → ถือเป็นสัญญาณรบกวน
+    assert status == {'a': 'regressed', 'b': 'ok', 'c': 'improved', 'd': 'ok', 'e': 'new'}
+    assert rows[0]['ratio'] == pytest.approx(1.5)
+
+
+def test_save_baseline_merges(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    assert load_baseline(path) == {}
+    save_baseline([_timing('a', 1.0), _timing('b', 2.0)], path)
+    save_baseline([_timing('b', 3.0)], path)
+    results = load_baseline(path)['results']
+    assert results['a']['median'] == 1.0 and results['b']['median'] == 3.0
+    save_baseline([_timing('c', 1.0)], path, merge=False)
+    assert list(load_baseline(path)['results']) == ['c']
+
+
+def test_committed_baseline_covers_every_benchmark():
+    with open(benchmarks.BASELINE_FILE, encoding='utf-8') as f:
+        results = json.load(f)['results']
+    assert set(BENCHMARKS) <= set(results)
+    for name, entry in results.items():
+        assert entry['median'] > 0 and entry['min'] <= entry['median'], name
+
+
+def test_quick_benchmarks_run(monkeypatch):
+    monkeypatch.setattr(benchmarks, 'MIN_TIME', 0.0)
+    timings = benchmarks.run(['design.purlin', 'design.tension'], repeat=2)
+    assert timings and all(t.median > 0 and t.repeat == 2 for t in timings)
+
+
+def test_main_flags_regression(tmp_path, monkeypatch, capsys):
+    path = tmp_path / 'baseline.json'
+    path.write_text(json.dumps({'machine': benchmarks.machine_info(),
+                                'results': {'design.tension': {'median': 1e-12, 'min': 1e-12}}}))
+    monkeypatch.setattr(benchmarks, 'MIN_TIME', 0.0)
+    assert benchmarks.main(['-k', 'design.tension', '--repeat', '2', '--baseline', str(path)]) == 1
+    assert 'regressed' in capsys.readouterr().out
@@ -0,0 +1,163 @@
+"""
+ทดสอบหน้าตัดประกอบ: ทฤษฎีแกนขนานเทียบการคำนวณมือและเทียบหน้าตัดผนังบางที่ประกอบจริง
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from built_up import (angle_members, built_up_catalog, channel_members, compose_channels, compose_pair,
+                      double_angles, pairings, section_data)
+from section_properties import ThinWalledSection, lipped_channel, polyline, section_properties
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def tis_1228():
+    return pd.read_csv(os.path.join(ROOT, 'tis_1228_steel.csv'))
+
+
+def _row(df, name):
+    return df[df['Section'] == name].iloc[0]
+
+
+def test_channel_members_take_table_values(tis_1228):
+    members = channel_members(tis_1228)
+    row = members.iloc[14]
+    table = tis_1228.iloc[14]
+    for col in ('Area', 'Weight', 'Ix', 'Zx'):
+        assert row[col] == table[col]
+    own = section_properties(lipped_channel(table['h'], table['b'], table['c'], table['t']))
+    assert row['Iy'] == pytest.approx(own['Iy'])
+    assert row['e'] == pytest.approx(own['xc'] + table['t'] / 20)  # จากผิวนอกเอว
+
+
+@pytest.mark.parametrize('gap', [0.0, 9.0])
+def test_back_to_back_matches_hand_parallel_axis(tis_1228, gap):
+    table = _row(tis_1228, 'C-150x50x20x2.3')
+    member = channel_members(pd.DataFrame([table])).iloc[0]
+    built = compose_pair(table, gap=gap)
+    d = gap / 20 + member['e']  # ซม. จากแกนสมมาตร
+    assert built['Iy'] == pytest.approx(2 * (member['Iy'] + member['Area'] * d ** 2))
+    assert built['Ix'] == pytest.approx(2 * table['Ix'])
+    assert built['Area'] == pytest.approx(2 * table['Area'])
+    assert built['Sx'] == pytest.approx(2 * table['Ix'] / (table['h'] / 20))
+    assert built['Sy'] == pytest.approx(built['Iy'] / ((gap / 2 + table['b']) / 10))
+    assert built['b'] == pytest.approx(2 * table['b'] + gap)
+    h0 = (table['h'] - table['t']) / 10
+    assert built['Cw'] == pytest.approx(built['Iy'] * h0 ** 2 / 4)
+    assert built['Section'] == '2×C-150x50x20x2.3 (BB)'
+
+
+def test_back_to_back_iy_matches_assembled_thin_walled_section(tis_1228):
+    table = _row(tis_1228, 'C-200x75x20x3.2')
+    h, b, c, t = table['h'], table['b'], table['c'], table['t']
+    gap = 6.0
+    right = lipped_channel(h, b, c, t).translated(gap / 2 + t / 2)
+    both = section_properties(ThinWalledSection.combine(right, right.mirrored()))
+    built = compose_pair(table, gap=gap)
+    assert built['Iy'] == pytest.approx(both['Iy'], rel=1e-4)  # A·d² ใช้ Area จากตาราง (ปัด 4 หลัก)
+    assert both['xc'] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_unequal_pair_uses_common_centroid(tis_1228):
+    p, q = _row(tis_1228, 'C-150x50x20x2.3'), _row(tis_1228, 'C-150x75x20x4.0')
+    mp, mq = channel_members(pd.DataFrame([p, q])).iloc[0], channel_members(pd.DataFrame([p, q])).iloc[1]
+    x = np.array([-mp['e'], mq['e']])
+    a = np.array([mp['Area'], mq['Area']])
+    xbar = (a * x).sum() / a.sum()
+    built = compose_pair(p, q)
+    assert built['Iy'] == pytest.approx(mp['Iy'] + mq['Iy'] + (a * (x - xbar) ** 2).sum())
+    assert built['Ix'] == pytest.approx(p['Ix'] + q['Ix'])
+    assert built['Sy'] == pytest.approx(built['Iy'] / max(xbar + p['b'] / 10, q['b'] / 10 - xbar))
+    assert built['Section'] == 'C-150x50x20x2.3 + C-150x75x20x4.0 (BB)'
+
+
+def test_boxed_pair_hand_calculation(tis_1228):
+    table = _row(tis_1228, 'C-200x75x20x3.2')
+    member = channel_members(pd.DataFrame([table])).iloc[0]
+    built = compose_pair(table, arrangement='boxed')
+    b, t = table['b'] / 10, table['t'] / 10
+    assert built['Iy'] == pytest.approx(2 * (member['Iy'] + member['Area'] * (b - member['e']) ** 2))
+    h0, width0 = (table['h'] - table['t']) / 10, 2 * b - t
+    assert built['J'] == pytest.approx(4 * (h0 * width0) ** 2 / (2 * h0 / t + 2 * (2 * b - t) / t))
+    assert built['Cw'] == 0.0
+    assert built['J'] > 100 * compose_pair(table)['J']
+    assert built['Section'].endswith('(BOX)')
+
+
+def test_double_angle_matches_assembled_thin_walled_section():
+    b, t, gap = 65.0, 6.0, 10.0
+    built = double_angles([b], [t], gap=gap).iloc[0]
+    leg = b - t / 2
+    x0 = gap / 2 + t / 2
+    right = polyline([(x0, leg), (x0, 0.0), (x0 + leg, 0.0)], t)
+    both = section_properties(ThinWalledSection.combine(right, right.mirrored()))
+    assert built['Iy'] == pytest.approx(both['Iy'], rel=1e-9)
+    assert built['Ix'] == pytest.approx(both['Ix'], rel=1e-9)
+    assert built['Area'] == pytest.approx(both['Area'])
+    assert built['Section'] == '2L-65x65x6'
+    with pytest.raises(ValueError):
+        angle_members([10.0], [6.0])
+
+
+def test_pairings_require_matching_geometry(tis_1228):
+    members = channel_members(tis_1228)
+    h, b = members['h'].to_numpy(), members['b'].to_numpy()
+    i, j = pairings(members, 'back_to_back')
+    assert np.all(i <= j) and np.all(h[i] == h[j])
+    expected = sum(n * (n + 1) // 2 for n in members.groupby('h').size())
+    assert len(i) == expected
+    ib, jb = pairings(members, 'boxed')
+    assert np.all(b[ib] == b[jb]) and len(ib) < len(i)
+    ii, jj = pairings(members, identical=True)
+    assert np.array_equal(ii, jj) and len(ii) == len(members)
+
+
+def test_vectorised_compose_matches_single_pairs(tis_1228):
+    members = channel_members(tis_1228)
+    i, j = pairings(members, 'boxed')
+    table = compose_channels(members, i, j, arrangement='boxed')
+    for k in (0, len(i) // 2, len(i) - 1):
+        single = compose_pair(tis_1228.iloc[i[k]], tis_1228.iloc[j[k]], arrangement='boxed')
+        for col in ('Area', 'Ix', 'Iy', 'Sx', 'Sy', 'J', 'rts'):
+            assert table.iloc[k][col] == pytest.approx(single[col], rel=1e-12), col
+
+
+def test_catalog_is_cached_sorted_copy(tis_1228):
+    first = built_up_catalog(tis_1228)
+    n_bb, n_box = len(pairings(channel_members(tis_1228), 'back_to_back')[0]), \
+        len(pairings(channel_members(tis_1228), 'boxed')[0])
+    assert len(first) == n_bb + n_box
+    for _, group in first.groupby('Type'):
+        assert group['Weight'].is_monotonic_increasing
+    first.loc[0, 'Ix'] = -1.0
+    assert (built_up_catalog(tis_1228)['Ix'] > 0).all()
+    assert len(built_up_catalog(tis_1228, identical=True)) == 2 * len(tis_1228)
+
+
+def test_dimensions_parsed_from_section_names(tis_1228):
+    names_only = tis_1228.drop(columns=['b', 'c'])
+    a = channel_members(tis_1228)
+    b = channel_members(names_only)
+    assert np.allclose(a[['b', 'c', 'Iy', 'e']], b[['b', 'c', 'Iy', 'e']])
+    with pytest.raises(ValueError):
+        channel_members(pd.DataFrame({'Section': ['C-100'], 'h': [100.0]}))
+
+
+def test_section_data_for_engines(tis_1228):
+    built = compose_pair(_row(tis_1228, 'C-150x50x20x2.3'))
+    rafter = section_data(built, 'rafter')
+    assert rafter['d'] == pytest.approx(15.0) and rafter['tw'] == pytest.approx(0.46)
+    assert rafter['name'] == built['Section']
+    beam = section_data(built, 'beam')
+    assert beam['Aw'] == pytest.approx(2 * (150 - 4.6) * 2.3 / 100)
+    compression = section_data(built, 'compression')
+    assert compression['Ag'] == built['Area'] and compression['bf'] == built['b']
+    assert compression['section_name'] == built['Section']
+    with pytest.raises(ValueError):
+        section_data(built, 'purlin')
+    with pytest.raises(ValueError):
+        compose_pair(_row(tis_1228, 'C-150x50x20x2.3'), arrangement='stacked')
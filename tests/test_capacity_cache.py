@@ -0,0 +1,88 @@
+"""ทดสอบ CapacityCache: LRU, สำเนาที่คืน และผลของ run_design ที่ได้จาก cache ต้องเหมือนการคำนวณใหม่"""
+import pytest
+
+from beam_design import ColdFormedBeamDesign
+from compression_design import CompressionDesign
+from design_logging import CAPACITY_CACHES, CapacityCache, clear_capacity_caches
+from purlin_design import PurlinDesign
+from rafter_design import RafterDesign
+from tension_design import TensionDesign
+
+PURLIN_SECTION = {'name': 'C-150x50x20x2.3', 'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'Area': 7.012, 'h': 150.0,
+                  't': 2.3, 'Weight': 5.5}
+RAFTER_SECTION = {'name': 'H-200x100x5.5x8', 'Zx': 200.0, 'Sx': 181.0, 'Ix': 1810.0, 'Iy': 134.0, 'ry': 2.22,
+                  'bf': 100.0, 'tf': 8.0, 'd': 200.0, 'tw': 5.5, 'Weight': 21.3, 'Area': 27.16}
+COLUMN = {'section_name': 'H-150x150x7x10', 'Ag': 40.14, 'rx': 6.39, 'ry': 3.75,
+          'h': 150.0, 'bf': 150.0, 'tw': 7.0, 'tf': 10.0, 'Lx': 4.0, 'Ly': 4.0}
+
+# (คลาส, ฟังก์ชันสร้างจากน้ำหนัก)
+ENGINES = {
+    'PurlinDesign': lambda w: PurlinDesign(PURLIN_SECTION, {'span': 5.0, 'spacing': 1.2, 'slope': 10.0},
+                                           {'DL': 15.0, 'LL': w, 'WL': -60.0}, {'Fy': 2450.0, 'E': 2.04e6}),
+    'ColdFormedBeamDesign': lambda w: ColdFormedBeamDesign(PURLIN_SECTION, {'span': 4.0, 'spacing': 1.0},
+                                                           {'D': 150.0, 'L': w, 'W': 0.0}),
+    'RafterDesign': lambda w: RafterDesign(RAFTER_SECTION, {'span': 6.0, 'spacing': 1.0, 'slope': 15.0, 'Lb': 1.5},
+                                           {'DL': 10.0, 'LL': w, 'WL': 0.0}, {'Fy': 2400.0, 'E': 2.04e6}),
+    'CompressionDesign': lambda w: CompressionDesign(**COLUMN, Pu=100.0 * w),
+    'TensionDesign': lambda w: TensionDesign(Ag=2.0, Tu=100.0 * w),
+}
+
+
+def _strip(result):
+    return {k: v for k, v in result.items() if k != 'Steps'}
+
+
+def test_lru_eviction_and_copies():
+    cache = CapacityCache('test-lru', maxsize=2)
+    calls = []
+
+    def compute(key):
+        def run(log):
+            calls.append(key)
+            log.add_step(f"step {key}", "x", None, None)
+            return {'value': key, 'nested': {'k': key}}
+        return run
+
+    for key in ('a', 'b', 'a', 'c', 'b'):
+        cache.get(key, compute(key))
+    assert calls == ['a', 'b', 'c', 'b']            # 'b' ถูกไล่ออกเมื่อเพิ่ม 'c'
+    assert cache.info() == {'hits': 1, 'misses': 4, 'size': 2, 'maxsize': 2}
+
+    values, steps = cache.get('b', compute('b'))
+    values['nested']['k'] = 'changed'
+    steps[0]['status'] = 'FAIL'
+    values, steps = cache.get('b', compute('b'))
+    assert values['nested']['k'] == 'b' and steps[0]['status'] is None
+    del CAPACITY_CACHES['test-lru']
+
+
+def test_errors_are_not_cached():
+    cache = CapacityCache('test-error')
+
+    def fail(log):
+        raise ValueError('bad section')
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.get('x', fail)
+    assert cache.info()['size'] == 0
+    del CAPACITY_CACHES['test-error']
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_cached_run_design_matches_fresh(engine):
+    clear_capacity_caches()
+    fresh = ENGINES[engine](30.0).run_design()
+    cache = CAPACITY_CACHES[engine]
+    assert cache.misses == 1 and cache.hits == 0
+
+    again = ENGINES[engine](30.0).run_design()
+    assert cache.hits == 1
+    assert _strip(again) == _strip(fresh)
+    assert again['Steps'] == fresh['Steps']
+
+    # เปลี่ยนเฉพาะน้ำหนัก → ใช้กำลังรับเดิม แต่ผลต้องเท่ากับการคำนวณใหม่ทั้งหมด
+    cached = ENGINES[engine](80.0).run_design()
+    assert cache.hits == 2
+    clear_capacity_caches()
+    assert _strip(ENGINES[engine](80.0).run_design()) == _strip(cached)
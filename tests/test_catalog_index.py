@@ -0,0 +1,63 @@
+"""ทดสอบดัชนีตารางหน้าตัด: ผลการค้นหาช่วงค่า/ชนิดต้องเท่ากับการกรองด้วย boolean mask"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalog_index import CatalogIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOT_ROLLED = pd.read_csv(os.path.join(ROOT, 'tis_1227_steel.csv'))
+INDEX = CatalogIndex(HOT_ROLLED)
+
+
+def _mask(df, types=None, **ranges):
+    mask = np.ones(len(df), dtype=bool)
+    if types is not None:
+        mask &= df['Type'].isin([types] if isinstance(types, str) else list(types)).to_numpy()
+    for key, (lo, hi) in ranges.items():
+        mask &= ((df[key] >= lo) & (df[key] <= hi)).to_numpy()
+    return df[mask]
+
+
+@pytest.mark.parametrize('types, ranges', [
+    (None, {}),
+    ('HN', {}),
+    (['HW', 'I'], {}),
+    (None, {'h': (150, 300)}),
+    ('HN', {'h': (150, 300), 'Weight': (10.0, 40.0)}),
+    (['HM', 'HN'], {'Zx': (100.0, 1000.0), 'Ix': (0.0, 20000.0)}),
+    ('HN', {'h': (301, 299)}),
+    ('XX', {'h': (0, 1000)}),
+])
+def test_query_matches_mask(types, ranges):
+    expected = _mask(HOT_ROLLED, types, **ranges)
+    result = INDEX.query(types, **ranges)
+    pd.testing.assert_frame_equal(result, expected)
+    assert INDEX.names(types, **ranges) == list(dict.fromkeys(expected['Section']))
+
+
+def test_groups_values_and_bounds():
+    assert INDEX.groups(['HW', 'ZZ']) == ['HW', 'HN', 'HM', 'I']
+    hn = HOT_ROLLED[HOT_ROLLED['Type'] == 'HN']
+    assert INDEX.values('h', 'HN') == sorted(hn['h'].unique().tolist())
+    assert all(isinstance(v, int) for v in INDEX.values('h'))
+    assert INDEX.bounds('Weight', 'HN') == (hn['Weight'].min(), hn['Weight'].max())
+
+
+def test_row_lookup_and_errors():
+    assert INDEX.row('HN-125x60x6x8')['Weight'] == 12.67
+    with pytest.raises(ValueError):
+        INDEX.row('HN-1x1')
+    with pytest.raises(ValueError):
+        INDEX.query(tw=(0, 10))
+    with pytest.raises(ValueError):
+        INDEX.bounds('h', 'XX')
+
+
+def test_nan_values_are_excluded():
+    df = pd.DataFrame({'Section': ['A', 'B', 'C'], 'h': [100.0, np.nan, 200.0]})
+    index = CatalogIndex(df)
+    assert list(index.query(h=(0, 1000))['Section']) == ['A', 'C']
+    assert index.values('h') == [100.0, 200.0]
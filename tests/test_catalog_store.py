@@ -0,0 +1,142 @@
+"""
+ทดสอบการนำเข้าตารางผู้ผลิต: หาหัวตาราง แปลงหน่วย แยกตระกูล และเก็บเป็น shard
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from catalog_store import CatalogStore, depth_band, extend_catalog, family_of, normalize, read_vendor_tables
+
+VENDOR_CSV = """ACME Steel Co.,,,,,,,,,,
+Cold-formed sections,,,,,,,,,,
+Designation,Mass (kg/m),Area (mm²),Ix (mm⁴),Sx (mm³),Iy (mm⁴),Sy (mm³),d (mm),b (mm),lip (mm),t (mm)
+C-100x50x20x2.3,"4.06",517,"1,810,000","36,200","380,000","11,200",100,50,20,2.3
+C-150x50x20x2.3,4.96,632,"2,100,000","28,000","220,000","6,330",150,50,20,2.3
+Z-200x75x20x2.3,6.76,861,"5,100,000","51,000","780,000","14,000",200,75,20,2.3
+"""
+
+
+def _write_vendor(tmp_path, text=VENDOR_CSV, name='acme.csv'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_header_detection_and_unit_conversion(tmp_path):
+    tables = read_vendor_tables(_write_vendor(tmp_path))
+    assert len(tables) == 1
+    df = normalize(tables[0], 'ACME')
+    row = df.set_index('Section').loc['C-100x50x20x2.3']
+    assert row['Area'] == pytest.approx(5.17)   # mm² → cm²
+    assert row['Ix'] == pytest.approx(181.0)    # mm⁴ → cm⁴
+    assert row['Sx'] == pytest.approx(36.2)     # mm³ → cm³
+    assert row['Zx'] == pytest.approx(36.2)     # มอก. 1228: Zx = Sx
+    assert row['h'] == 100.0 and row['c'] == 20.0
+    assert list(df['Family']) == ['C', 'C', 'Z']
+    assert set(df['Vendor']) == {'ACME'}
+
+
+def test_family_of():
+    assert family_of('C-100x50x20x2.3') == 'C'
+    assert family_of('LZ 200x75') == 'Z'
+    assert family_of('HAT-60') == 'Hat'
+    assert family_of('HN-200x100') == 'H'
+    assert family_of('X-1', 'HW') == 'H'
+    assert family_of('unknown') is None
+
+
+def test_hot_rolled_derived_properties():
+    raw = pd.DataFrame({'Section': ['HN-200x100x5.5x8'], 'Weight': [21.3], 'A (cm2)': [27.16],
+                        'Ix (cm4)': [1840.0], 'Iy (cm4)': [134.0], 'Sx (cm3)': [184.0], 'Zx (cm3)': [209.0],
+                        'h': [200.0], 'b': [100.0], 'tw': [5.5], 'tf': [8.0]})
+    row = normalize(raw, 'ACME').iloc[0]
+    assert row['Family'] == 'H' and row['Type'] == 'HN'
+    j = (2 * 100 * 8 ** 3 + (200 - 16) * 5.5 ** 3) / 3 / 1e4
+    h0 = (200 - 8) / 10
+    cw = 134.0 * h0 ** 2 / 4
+    assert row['J'] == pytest.approx(j)
+    assert row['h0'] == pytest.approx(h0)
+    assert row['Cw'] == pytest.approx(cw)
+    assert row['rts'] == pytest.approx(((134.0 * cw) ** 0.5 / 184.0) ** 0.5)
+    assert row['ry'] == pytest.approx((134.0 / 27.16) ** 0.5)
+
+
+def test_normalize_errors():
+    with pytest.raises(ValueError):
+        normalize(pd.DataFrame({'Section': ['C-1']}), '')
+    with pytest.raises(ValueError):
+        normalize(pd.DataFrame({'Section': ['C-1']}), 'ACME', family='L')
+    with pytest.raises(ValueError):
+        normalize(pd.DataFrame({'Section': ['???'], 'Weight': [1.0]}), 'ACME')
+    with pytest.raises(ValueError):  # ขาด Ix
+        normalize(pd.DataFrame({'Section': ['C-100'], 'Weight': [1.0], 'Zx': [1.0], 'Area': [1.0],
+                                'h': [100.0], 't': [2.0]}), 'ACME')
+    with pytest.raises(ValueError):
+        normalize(pd.DataFrame({'Section': ['C-100'], 'Ix (ft4)': [1.0]}), 'ACME')
+
+
+def test_depth_band():
+    assert depth_band(60) == (0, 100)
+    assert depth_band(100) == (100, 150)
+    assert depth_band(150) == (150, 200)
+    assert depth_band(800) == (600, None)
+
+
+def test_ingest_shards_and_manifest(tmp_path):
+    root = tmp_path / 'catalogs'
+    store = CatalogStore(str(root))
+    summary = store.ingest([_write_vendor(tmp_path)], 'ACME')
+    assert summary['Rows'].sum() == 3
+    shards = {(s['family'], tuple(s['band'])): s for s in store.shards()}
+    assert set(shards) == {('C', (100, 150)), ('C', (150, 200)), ('Z', (200, 300))}
+    assert (root / 'C' / 'C_100-150.csv').exists()
+    manifest = json.loads((root / 'manifest.json').read_text(encoding='utf-8'))
+    assert manifest['bands'] == [100, 150, 200, 300, 400, 600]
+    assert shards[('C', (150, 200))]['vendors'] == ['ACME']
+
+    c = store.load('C')
+    assert sorted(c['Section']) == ['C-100x50x20x2.3', 'C-150x50x20x2.3']
+    assert list(store.load(('C', 'Z'), h=(140, 210))['Section']) == ['C-150x50x20x2.3', 'Z-200x75x20x2.3']
+    assert store.load('C', vendors=['Other']).empty
+    assert store.load('Hat').empty
+
+
+def test_reingest_replaces_vendor_rows_only(tmp_path):
+    store = CatalogStore(str(tmp_path / 'catalogs'))
+    store.ingest([_write_vendor(tmp_path)], 'ACME')
+    other = pd.DataFrame({'Section': ['C-150x65x20x3.2'], 'Weight': [7.5], 'Ix': [330.0], 'Zx': [44.0],
+                          'Area': [9.5], 'h': [150.0], 't': [3.2]})
+    store.ingest([other], 'Other')
+    assert set(store.load('C', h=(150, 150))['Vendor']) == {'ACME', 'Other'}
+
+    # แคตตาล็อกฉบับใหม่ของ ACME ไม่มีหน้าตัด Z และ C-100 แล้ว — shard Z ถูกลบ ของ Other คงอยู่
+    new = VENDOR_CSV.replace('C-100x50x20x2.3', 'C-150x75x20x2.3').replace('Z-200x75x20x2.3', 'C-160x75x20x2.3')
+    store.ingest([_write_vendor(tmp_path, new, 'acme2.csv')], 'ACME')
+    assert not any(s['family'] == 'Z' for s in store.shards())
+    assert not (tmp_path / 'catalogs' / 'Z' / 'Z_200-300.csv').exists()
+    c = store.load('C')
+    assert 'C-100x50x20x2.3' not in set(c['Section'])
+    assert set(c.loc[c['Vendor'] == 'Other', 'Section']) == {'C-150x65x20x3.2'}
+
+    # append ไม่ลบของเดิม
+    store.ingest([other.assign(Section='C-150x65x20x4.0')], 'Other', replace=False)
+    assert len(store.load('C', vendors=['Other'])) == 2
+
+
+def test_read_cache_is_row_bounded(tmp_path):
+    store = CatalogStore(str(tmp_path / 'catalogs'), cache_rows=1)
+    store.ingest([_write_vendor(tmp_path)], 'ACME')
+    store.load(('C', 'Z'))
+    assert len(store._cache) == 1  # เก็บอย่างน้อยหนึ่ง shard แม้เกินจำนวนแถว
+
+
+def test_extend_catalog_renames_clashes(tmp_path):
+    root = str(tmp_path / 'catalogs')
+    base = pd.DataFrame({'Section': ['C-150x50x20x2.3'], 'Weight': [5.5]})
+    assert extend_catalog(base, 'C', root) is base  # ไม่มีที่เก็บ
+    CatalogStore(root).ingest([_write_vendor(tmp_path)], 'ACME')
+    extended = extend_catalog(base, 'C', root)
+    assert list(extended['Section']) == ['C-150x50x20x2.3', 'C-100x50x20x2.3', 'C-150x50x20x2.3 (ACME)']
+    assert 'Family' not in extended
+    assert extend_catalog(base, 'Hat', root) is base
@@ -0,0 +1,82 @@
+"""ทดสอบกราฟการพึ่งพา: คำนวณซ้ำเฉพาะชิ้นส่วนที่ได้รับผลกระทบ และตัดการส่งต่อเมื่ออินพุตไม่เปลี่ยน"""
+import pytest
+
+from design_graph import DesignModel, Derived, Ref, Upstream
+from purlin_design import PurlinDesign
+from tension_design import TensionDesign
+
+SECTION = {'name': 'C-150x50x20x2.3', 'Zx': 28.1, 'Ix': 210.0, 'h': 150.0, 't': 2.3, 'Weight': 5.5}
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+
+
+def _model():
+    model = DesignModel()
+    model.update({'roof.DL': 15.0, 'span.P1': 5.0, 'span.P2': 6.0, 'section:C-150': SECTION})
+    for name in ('P1', 'P2'):
+        model.add_member(name, 'purlin', {
+            'section_data': Ref('section:C-150'),
+            'geometry': {'span': Ref(f'span.{name}'), 'spacing': 1.2, 'slope': 10.0},
+            'loads': {'DL': Ref('roof.DL'), 'LL': 30.0, 'WL': -60.0},
+            'materials': MATERIALS,
+        }, section=SECTION['name'])
+    # แขวนปลายแปทั้งสองด้วยเหล็กเส้นรับแรงดึง
+    model.add_member('T1', 'tension', {
+        'Ag': 2.0, 'Tu': Derived(lambda a, b: a + b, Upstream('P1', 'Forces.Vu_kg'), Upstream('P2', 'Forces.Vu_kg')),
+    })
+    return model
+
+
+def test_initial_recompute_matches_direct_designs():
+    model = _model()
+    report = model.recompute()
+    assert sorted(report.recomputed) == ['P1', 'P2', 'T1'] and not report.failed
+    direct = PurlinDesign(SECTION, {'span': 5.0, 'spacing': 1.2, 'slope': 10.0},
+                          {'DL': 15.0, 'LL': 30.0, 'WL': -60.0}, MATERIALS).run_design()
+    assert model.result('P1')['Forces'] == direct['Forces']
+    tu = model.result('P1')['Forces']['Vu_kg'] + model.result('P2')['Forces']['Vu_kg']
+    assert model.result('T1')['Ratio'] == pytest.approx(TensionDesign(Ag=2.0, Tu=tu).run_design()['Ratio'])
+
+
+def test_only_affected_members_recompute():
+    model = _model()
+    model.recompute()
+    assert model.set('roof.DL', 15.0) is False
+    assert model.recompute().recomputed == []
+
+    assert model.affected_by('span.P2') == {'P2', 'T1'}
+    model.set('span.P2', 7.0)
+    assert model.dirty == {'P2'}
+    assert model.recompute().recomputed == ['P2', 'T1']
+
+
+def test_unchanged_upstream_output_stops_propagation():
+    model = _model()
+    model.recompute()
+    # Ix มีผลต่อการโก่งตัวเท่านั้น แรงเฉือนที่ส่งต่อเท่าเดิม
+    model.set('section:C-150', {**SECTION, 'Ix': 250.0})
+    report = model.recompute()
+    assert sorted(report.recomputed) == ['P1', 'P2']
+    assert report.unchanged == ['T1']
+
+
+def test_structure_errors():
+    model = _model()
+    with pytest.raises(ValueError):
+        model.add_member('T2', 'tension', {'Ag': 2.0, 'Tu': Upstream('P9', 'Forces.Vu_kg')})
+    with pytest.raises(ValueError):
+        model.add_member('P1', 'purlin', {'section_data': Upstream('T1', 'Ratio')})
+    with pytest.raises(ValueError):
+        model.remove_member('P1')
+    with pytest.raises(ValueError):
+        model.add_member('X', 'truss', {})
+    model.remove_member('T1')
+    assert 'T1' not in model.members
+
+
+def test_missing_parameter_fails_downstream():
+    model = _model()
+    del model.params['span.P1']
+    report = model.recompute()
+    assert set(report.failed) == {'P1', 'T1'}
+    assert model.result('P1') is None and model.result('P2') is not None
+    assert [r.name for r in model.records()] == ['P2']
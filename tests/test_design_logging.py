@@ -0,0 +1,75 @@
+"""ทดสอบ Profiler: การจับเวลาต่อขั้นตอน/phase, สถิติ และ Chrome trace"""
+import json
+
+from design_logging import Profiler, active_profiler, clear_capacity_caches, phase, profiling, traced
+from purlin_design import PurlinDesign
+from rafter_design import RafterDesign
+
+PURLIN = ({'name': 'P1', 'Zx': 28.1, 'Ix': 210.0, 'h': 150.0, 't': 2.3, 'Weight': 5.5},
+          {'span': 5.0, 'spacing': 1.2, 'slope': 10.0}, {'DL': 15.0, 'LL': 30.0, 'WL': -60.0},
+          {'Fy': 2450.0, 'E': 2.04e6})
+
+
+def test_inactive_by_default():
+    assert active_profiler() is None
+    res = PurlinDesign(*PURLIN).run_design()
+    assert res['Steps']
+
+
+def test_steps_and_run_design_phase_recorded():
+    clear_capacity_caches()
+    with profiling() as prof:
+        res = PurlinDesign(*PURLIN).run_design()
+    assert active_profiler() is None
+    steps = [e for e in prof.events if e['kind'] == 'step']
+    # ขั้นตอนกำลังรับบันทึกใน phase ของ cache ก่อน แล้วจึงแทรกกลับตามตำแหน่งเดิมในรายการคำนวณ
+    assert sorted(e['name'] for e in steps) == sorted(s['title'] for s in res['Steps'])
+    phases = {e['name']: e for e in prof.events if e['kind'] == 'phase'}
+    assert set(phases) == {'PurlinDesign.run_design', 'PurlinDesign.capacity'}
+    assert {e['args']['phase'] for e in steps} == set(phases)
+    assert sum(e['dur'] for e in steps) <= phases['PurlinDesign.run_design']['dur'] + 1e-9
+
+    with profiling() as prof:
+        PurlinDesign(*PURLIN).run_design()
+    assert 'PurlinDesign.capacity' not in {e['name'] for e in prof.events}
+
+
+def test_rafter_steps_are_instrumented():
+    rafter = RafterDesign({'name': 'H-200x100x5.5x8', 'Zx': 200.0, 'Sx': 181.0, 'Ix': 1810.0, 'Iy': 134.0,
+                           'ry': 2.22, 'bf': 100.0, 'tf': 8.0, 'd': 200.0, 'tw': 5.5, 'Weight': 21.3,
+                           'Area': 27.16},
+                          {'span': 6.0, 'spacing': 1.0, 'slope': 15.0, 'Lb': 1.5},
+                          {'DL': 10.0, 'LL': 20.0, 'WL': 0.0}, {'Fy': 2400.0, 'E': 2.04e6})
+    clear_capacity_caches()
+    with profiling() as prof:
+        res = rafter.run_design()
+    assert sum(e['kind'] == 'step' for e in prof.events) == len(res['Steps'])
+
+
+def test_nested_phases_stats_and_trace(tmp_path):
+    @traced
+    def work():
+        with phase('inner'):
+            sum(range(1000))
+
+    with profiling(memory=True) as prof:
+        work()
+        work()
+    stats = {(r['Kind'], r['Name']): r for r in prof.stats()}
+    assert stats[('phase', 'inner')]['Calls'] == 2
+    outer = stats[('phase', f'{work.__qualname__}')]
+    assert outer['Total_ms'] >= stats[('phase', 'inner')]['Total_ms']
+    assert 'Peak_KiB' in outer
+
+    path = tmp_path / 'trace.json'
+    prof.save_trace(str(path))
+    trace = json.loads(path.read_text())
+    assert len(trace['traceEvents']) == 4
+    assert {e['ph'] for e in trace['traceEvents']} == {'X'}
+    assert all('alloc_bytes' in e['args'] for e in trace['traceEvents'])
+
+
+def test_phase_without_profiler_is_noop():
+    with phase('nothing'):
+        pass
+    assert Profiler().stats() == []
@@ -0,0 +1,127 @@
+"""
+ทดสอบบริการ HTTP/JSON: ยิงคำขอจริงผ่าน socket แล้วเทียบกับ batch_checks โดยตรง
+"""
+import asyncio
+import json
+
+import pytest
+
+from beam_design import ColdFormedBeamDesign
+from design_service import BENCH_PURLIN, DesignService, _split_inputs
+from purlin_design import batch_checks as purlin_batch
+
+BIAXIAL = {'biaxial': True, 'Sy': 6.33, 'Iy': 22.0}
+
+
+async def _request(port, method, path, body=b""):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = int([h for h in head.split(b"\r\n") if h.lower().startswith(b"content-length")][0].split(b":")[1])
+    data = json.loads(await reader.readexactly(length))
+    writer.close()
+    await writer.wait_closed()
+    return status, data
+
+
+def _round_trip(path, payload, method='POST'):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+
+    async def run():
+        service = DesignService(workers=1)
+        server = await service.start('127.0.0.1', 0)
+        try:
+            return await _request(server.sockets[0].getsockname()[1], method, path, body)
+        finally:
+            await service.close()
+
+    return asyncio.run(run())
+
+
+def test_split_inputs_groups_by_static_inputs():
+    key1, static, numeric = _split_inputs({**BENCH_PURLIN, 'restraint': 'unbraced'})
+    key2, _, _ = _split_inputs({**BENCH_PURLIN, 'span': 4.0, 'restraint': 'unbraced'})
+    key3, _, _ = _split_inputs({**BENCH_PURLIN, 'restraint': 'through_fastened'})
+    assert static == {'restraint': 'unbraced'}
+    assert numeric['span'] == 6.0
+    assert key1 == key2 != key3
+
+
+def test_check_purlin_items_match_batch():
+    items = [{**BENCH_PURLIN, 'span': span, 'WL': wl} for span in (4.0, 6.0, 8.0) for wl in (-60.0, 40.0)]
+    status, data = _round_trip('/check/purlin', {'items': items})
+    assert status == 200
+    results = data['results']
+    assert len(results) == len(items)
+    for item, result in zip(items, results):
+        expected = purlin_batch(**item)
+        for key in ('Moment', 'Shear', 'Deflection', 'Max_Ratio'):
+            assert result[key] == pytest.approx(float(expected[key]), rel=1e-12), key
+        assert result['Pass'] == bool(expected['Pass'])
+
+
+def test_check_single_object_returns_object():
+    status, data = _round_trip('/check/purlin', BENCH_PURLIN)
+    assert status == 200
+    assert data['Max_Ratio'] == pytest.approx(float(purlin_batch(**BENCH_PURLIN)['Max_Ratio']))
+
+
+@pytest.mark.parametrize('method, path, body, expected', [
+    ('POST', '/check/truss', b'{}', 404),
+    ('GET', '/check/purlin', b'', 405),
+    ('POST', '/check/purlin', b'{not json', 400),
+    ('POST', '/check/purlin', b'[1, 2]', 400),
+    ('GET', '/nowhere', b'', 404),
+])
+def test_request_errors(method, path, body, expected):
+    status, data = _round_trip(path, body, method)
+    assert status == expected
+    assert 'error' in data
+
+
+def test_health():
+    status, data = _round_trip('/health', b'', 'GET')
+    assert status == 200 and 'purlin' in data['engines']
+
+
+def test_design_beam_keeps_class_defaults():
+    # ไม่ส่ง material มา → ใช้ค่าปริยายของคลาส ไม่ใช่ {}
+    payload = {'section': {'name': 'C-150x50x20x2.3', 'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'Area': 7.012,
+                           'h': 150.0, 't': 2.3, 'Weight': 5.5},
+               'geometry': {'span': 4.0, 'spacing': 1.0}, 'loads': {'D': 150.0, 'L': 200.0, 'W': 0.0}}
+    status, data = _round_trip('/design/beam', payload)
+    assert status == 200
+    expected = ColdFormedBeamDesign(**payload).run_design()
+    for key, value in expected['Checks']['Ratios'].items():
+        assert data['Checks']['Ratios'][key] == pytest.approx(value), key
+
+
+def test_split_inputs_keeps_lookup_keys_static():
+    key1, static, numeric = _split_inputs({**BENCH_PURLIN, **BIAXIAL, 'sag_rods': 1})
+    key2, _, _ = _split_inputs({**BENCH_PURLIN, **BIAXIAL, 'sag_rods': 2})
+    assert static['sag_rods'] == 1 and static['biaxial'] is True
+    assert 'sag_rods' not in numeric and 'span' in numeric
+    assert key1 != key2  # จำนวน sag rods ต่างกันต้องแยก batch
+
+
+def test_check_purlin_round_trip_with_sag_rods():
+    items = [{**BENCH_PURLIN, **BIAXIAL, 'sag_rods': n, 'span': span} for n in (0, 1, 2) for span in (4.0, 6.0)]
+    status, data = _round_trip('/check/purlin', {'items': items})
+    assert status == 200
+    results = data['results']
+    assert len(results) == len(items)
+    for item, result in zip(items, results):
+        assert 'error' not in result, result
+        expected = purlin_batch(**item)
+        for key in ('Moment', 'WeakAxis', 'Biaxial', 'Uplift', 'Max_Ratio'):
+            assert result[key] == pytest.approx(float(expected[key]), rel=1e-12), key
+        assert result['Pass'] == bool(expected['Pass'])
+
+
+def test_check_purlin_invalid_sag_rods_reports_error():
+    status, data = _round_trip('/check/purlin', {**BENCH_PURLIN, **BIAXIAL, 'sag_rods': 5})
+    assert status == 200
+    assert 'error' in data
@@ -0,0 +1,69 @@
+"""ทดสอบแผนภาพ M/V/δ: ค่าสูงสุดตรงกับผลออกแบบ จุดแบบปรับตัว และแคชรายชิ้นส่วน"""
+import numpy as np
+import pytest
+
+from design_graph import DesignModel
+from diagrams import DiagramCache, adaptive_points, diagram, member_loading, project_diagrams
+from purlin_design import PurlinDesign
+from rafter_design import RafterDesign
+
+PURLIN = {'section_data': {'name': 'C-150x50x20x2.3', 'Zx': 28.1, 'Ix': 210.0, 'h': 150.0, 't': 2.3, 'Weight': 5.5},
+          'geometry': {'span': 5.0, 'spacing': 1.2, 'slope': 10.0},
+          'loads': {'DL': 15.0, 'LL': 30.0, 'WL': -60.0}, 'materials': {'Fy': 2450.0, 'E': 2.04e6}}
+RAFTER = {'section_data': {'name': 'H-200x100x5.5x8', 'Zx': 200.0, 'Sx': 181.0, 'Ix': 1810.0, 'Iy': 134.0,
+                           'ry': 2.22, 'bf': 100.0, 'tf': 8.0, 'd': 200.0, 'tw': 5.5, 'Weight': 21.3, 'Area': 27.16},
+          'geometry': {'span': 6.0, 'spacing': 1.0, 'slope': 15.0, 'Lb': 1.5},
+          'loads': {'DL': 10.0, 'LL': 20.0, 'WL': 0.0,
+                    'point_loads': [{'x': 1.0, 'D': 120.0, 'L': 200.0}, {'x': 4.5, 'D': 80.0, 'L': 150.0}]},
+          'materials': {'Fy': 2400.0, 'E': 2.04e6}}
+
+
+def test_purlin_diagram_matches_design_forces():
+    res = PurlinDesign(**PURLIN).run_design()
+    diag = diagram(member_loading('purlin', PURLIN, res))
+    assert diag.M_max == pytest.approx(res['Forces']['Mu_kgm'], rel=1e-9)
+    assert diag.V_max == pytest.approx(res['Forces']['Vu_kg'], rel=1e-9)
+    assert diag.x[0] == 0.0 and diag.x[-1] == 5.0
+
+
+def test_rafter_diagram_matches_point_load_design():
+    res = RafterDesign(**RAFTER).run_design()
+    diag = diagram(member_loading('rafter', RAFTER, res))
+    assert diag.M_max == pytest.approx(res['Forces']['Mu_kgm'], rel=1e-9)
+    assert diag.V_max == pytest.approx(res['Forces']['Vu_kg'], rel=1e-9)
+    assert diag.combo == res['Combinations']['Controlling']
+    assert np.all(diag.delta_live <= diag.delta + 1e-12)
+
+
+def test_adaptive_points_meet_tolerance():
+    loading = member_loading('rafter', RAFTER, RafterDesign(**RAFTER).run_design())
+    x = adaptive_points(loading, tol=1e-4)
+    assert {1.0, 4.5} <= set(np.round(x, 12))
+    mid = (x[1:] + x[:-1]) / 2
+    m = loading.strength(x)[0]
+    err = np.abs(loading.strength(mid)[0] - (m[1:] + m[:-1]) / 2)
+    assert err.max() <= 1e-4 * np.abs(m).max() * (1 + 1e-9)
+    assert len(x) > len(adaptive_points(loading, tol=1e-2))
+
+
+def test_cache_recomputes_only_changed_members():
+    model = DesignModel()
+    model.add_member('P1', 'purlin', PURLIN)
+    model.add_member('P2', 'purlin', {**PURLIN, 'geometry': {**PURLIN['geometry'], 'span': 6.0}})
+    model.add_member('T1', 'tension', {'Ag': 2.0, 'Tu': 100.0})
+    model.recompute()
+    cache = DiagramCache()
+    diagrams = project_diagrams(model, cache)
+    assert set(diagrams) == {'P1', 'P2'} and cache.misses == 2
+    model.add_member('P2', 'purlin', {**PURLIN, 'loads': {**PURLIN['loads'], 'DL': 25.0}})
+    model.recompute()
+    project_diagrams(model, cache)
+    assert (cache.hits, cache.misses) == (1, 3)
+    model.remove_member('P1')
+    project_diagrams(model, cache)
+    assert set(cache.entries) == {'P2'}
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError):
+        member_loading('tension', {}, {})
@@ -0,0 +1,166 @@
+"""
+ทดสอบวิธีความกว้างประสิทธิผล (AISI S100): สมดุลของหน้าตัดประสิทธิผล, เส้นทาง cache / ตารางประมาณค่า
+และการลดกำลังดัดในคลาสออกแบบ
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from beam_design import ColdFormedBeamDesign
+from built_up import built_up_catalog
+from effective_width import (catalog_dimensions, catalog_effective, effective_ratio, effective_section,
+                             reduction_factor, section_dimensions)
+from purlin_design import PurlinDesign
+from purlin_design import batch_checks as purlin_batch
+from section_properties import ThinWalledSection, lipped_channel, section_properties
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+E = 2.04e6
+
+
+def test_reduction_factor():
+    assert reduction_factor(10.0, 4.0, 2450.0, E) == 1.0
+    lam = 1.052 / np.sqrt(4.0) * 80.0 * np.sqrt(2450.0 / E)
+    assert reduction_factor(80.0, 4.0, 2450.0, E) == pytest.approx((1 - 0.22 / lam) / lam)
+    assert reduction_factor(80.0, 4.0, 0.0, E) == 1.0
+
+
+def _effective_shape(h, b, c, t, res):
+    """หน้าตัดเส้นกึ่งกลางที่ตัดส่วนไม่มีประสิทธิผลออก (ชิ้นส่วนไม่ต่อเนื่องได้)"""
+    yf, x = (h - t) / 2, b - t
+    L_lip = c - t / 2
+    lost_flange = (b - 2 * t) - res['b_flange']
+    lost_lip = (c - t) - res['ds_lip']
+    top_flat = h / 2 - t
+    y_na = -res['ycg']
+    lost_web = max(top_flat - y_na - res['b1'] - res['b2'], 0.0)
+    web_cut = top_flat - res['b1']
+    nodes = [(x, yf - L_lip + lost_lip), (x, yf),                     # ขอบพับบน (ปลายหาย)
+             (0.0, yf), (x - lost_flange, yf),                        # ปีกบน
+             (0.0, web_cut), (0.0, web_cut - lost_web), (0.0, -yf),   # เอว (ช่วงที่หาย)
+             (x, -yf), (x, -yf + L_lip)]                              # ปีกล่างและขอบพับล่าง
+    elements = [(0, 1), (2, 3), (2, 4), (5, 6), (6, 7), (7, 8)]
+    return ThinWalledSection(np.array(nodes), np.array(elements), t)
+
+
+@pytest.mark.parametrize('dims,fy', [((200.0, 75.0, 20.0, 1.6), 3500.0), ((150.0, 65.0, 20.0, 1.6), 2450.0),
+                                     ((250.0, 100.0, 25.0, 2.0), 3500.0), ((200.0, 75.0, 20.0, 2.3), 3500.0)])
+def test_effective_section_is_in_equilibrium(dims, fy):
+    res = {k: float(v) for k, v in effective_section(*dims, fy, E).items()}
+    assert res['ratio'] < 1.0
+    assert res['ycg'] > 0  # ปีกรับแรงอัดเสียประสิทธิผล → แกนสะเทินเลื่อนลง
+    full = section_properties(lipped_channel(*dims))
+    assert res['S'] == pytest.approx(full['Sx'], rel=1e-12)
+
+    shape = section_properties(_effective_shape(*dims, res))
+    assert shape['yc'] * 10 == pytest.approx(-res['ycg'], abs=1e-3 * dims[0])  # ลู่เข้าแล้ว
+    assert shape['Ix'] == pytest.approx(res['Ie'], rel=1e-3)
+    assert res['Se'] == pytest.approx(res['Ie'] / ((dims[0] / 2 + res['ycg']) / 10), rel=1e-9)
+
+
+def test_stocky_section_is_fully_effective():
+    res = effective_section(100.0, 50.0, 20.0, 3.2, 2450.0, E)
+    assert float(res['ratio']) == 1.0
+    assert float(res['ycg']) == 0.0
+    assert float(res['Se']) == pytest.approx(float(res['S']))
+
+
+def test_ratio_trends():
+    fy = np.array([2000.0, 2450.0, 3000.0, 3500.0, 4500.0])
+    ratios = effective_section(200.0, 75.0, 20.0, 1.6, fy, E)['ratio']
+    assert np.all(np.diff(ratios) < 0)
+    thick = effective_section(200.0, 75.0, 20.0, np.array([1.6, 2.0, 2.3, 3.2]), 3500.0, E)['ratio']
+    assert np.all(np.diff(thick) >= 0)
+    # ไม่มีขอบพับ: ปีกเป็นชิ้นส่วนไม่มีขอบยึด ลดลงมากกว่า
+    assert float(effective_section(150.0, 65.0, 0.0, 1.6, 2450.0, E)['ratio']) < \
+        float(effective_section(150.0, 65.0, 20.0, 1.6, 2450.0, E)['ratio'])
+
+
+def test_effective_ratio_paths_agree():
+    dims = (200.0, 75.0, 20.0, 1.6)
+    single = effective_ratio(*dims, 3500.0)
+    assert single.shape == ()
+    assert float(single) == pytest.approx(float(effective_section(*dims, 3500.0, E)['ratio']))
+
+    df = pd.read_csv(os.path.join(ROOT, 'tis_1228_steel.csv'))
+    cols = [df[k].to_numpy() for k in ('h', 'b', 'c', 't')]
+    table = effective_ratio(*cols, 3500.0)
+    assert np.array_equal(table, effective_section(*cols, 3500.0, E)['ratio'])
+    assert effective_ratio(*cols, 3500.0) is table or np.array_equal(effective_ratio(*cols, 3500.0), table)
+
+    # Monte Carlo: ขนาดเดียว t / Fy สุ่ม → ตารางประมาณค่า (คลาดไม่เกิน ~0.2 %)
+    rng = np.random.default_rng(7)
+    t = rng.normal(1.6, 0.05, 2000)
+    fy = rng.lognormal(np.log(3500.0), 0.08, 2000)
+    approx = effective_ratio(200.0, 75.0, 20.0, t, fy)
+    exact = effective_section(200.0, 75.0, 20.0, t, fy, E)['ratio']
+    assert approx.shape == (2000,)
+    assert np.max(np.abs(approx / exact - 1)) < 3e-3
+
+
+def test_invalid_inputs_raise():
+    with pytest.raises(ValueError):
+        effective_section(150.0, 65.0, 20.0, 0.0, 2450.0, E)
+    with pytest.raises(ValueError):
+        effective_section(150.0, 65.0, 20.0, 1.6, -1.0, E)
+
+
+def test_section_dimensions():
+    assert section_dimensions({'h': 150, 'b': 65, 'c': 20, 't': 1.6}) == {'h': 150, 'b': 65, 'c': 20, 't': 1.6}
+    assert section_dimensions({'name': 'C-150x65x20x1.6'}) == {'h': 150.0, 'b': 65.0, 'c': 20.0, 't': 1.6}
+    assert section_dimensions({'Section': 'Z-200x75x20x2.3', 't': 2.2})['t'] == 2.2
+    assert section_dimensions({'name': 'C-150x50x20x2.3 + C-150x50x20x3.2 (BB)'}) is None
+    assert section_dimensions({'name': 'H-200x100x5.5x8'}) is None
+    assert section_dimensions({'name': 'C-150'}) is None
+
+
+def test_catalog_dimensions_and_effective():
+    data_steel = pd.read_csv(os.path.join(ROOT, 'Roof-by-Sarayut-LRFD-V.1.0.3.xlsx - Data Steel.csv'))
+    dims = catalog_dimensions(data_steel)
+    assert dims is not None
+    assert dims.iloc[0].tolist() == [60.0, 30.0, 10.0, 1.6]
+    tis = pd.read_csv(os.path.join(ROOT, 'tis_1228_steel.csv'))
+    assert catalog_dimensions(built_up_catalog(tis)) is None
+
+    out = catalog_effective(tis, 3500.0)
+    assert list(out['Section']) == list(tis['Section'])
+    assert np.allclose(out['Se'], tis['Sx'] * out['ratio'])
+    assert (out['ratio'] < 1).any() and (out['ratio'] == 1).any()
+    with pytest.raises(ValueError):
+        catalog_effective(pd.DataFrame({'Section': ['H-1'], 'Sx': [1.0]}), 3500.0)
+
+
+SLENDER = {'name': 'C-200x75x20x1.6', 'Zx': 38.0, 'Sx': 38.0, 'Ix': 380.0, 'Iy': 30.0, 'Area': 6.0,
+           'h': 200.0, 't': 1.6, 'Weight': 4.7}
+MATERIALS = {'Fy': 3500.0, 'E': E}
+
+
+def test_purlin_flexure_uses_effective_modulus():
+    ratio = float(effective_ratio(200.0, 75.0, 20.0, 1.6, 3500.0, E))
+    geometry = {'span': 5.0, 'spacing': 1.2, 'slope': 10.0}
+    loads = {'DL': 15.0, 'LL': 30.0, 'WL': -80.0}
+    res = PurlinDesign(SLENDER, geometry, loads, MATERIALS).run_design()
+    cap = res['Checks']['Capacity']
+    assert cap['Phi_Mn'] == pytest.approx(0.90 * 3500.0 * ratio * 38.0 / 100.0)
+    assert cap['Phi_Mn_Uplift'] == pytest.approx(0.90 * cap['R'] * ratio * 38.0 * 3500.0 / 100.0)
+    assert any('โมดูลัสหน้าตัดประสิทธิผล' in step['title'] for step in res['Steps'])
+
+    unnamed = {k: v for k, v in SLENDER.items() if k != 'name'}
+    full = PurlinDesign(unnamed, geometry, loads, MATERIALS).run_design()['Checks']['Capacity']
+    assert full['Phi_Mn'] == pytest.approx(0.90 * 3500.0 * 38.0 / 100.0)
+
+    batch = purlin_batch(span=5.0, spacing=1.2, slope=10.0, DL=15.0, LL=30.0, WL=-80.0, Weight=4.7,
+                         Zx=38.0, Ix=380.0, h=200.0, t=1.6, Fy=3500.0, E=E, b=75.0, c=20.0)
+    assert float(batch['Phi_Mn']) == pytest.approx(cap['Phi_Mn'])
+    assert float(batch['Phi_Mn_Uplift']) == pytest.approx(cap['Phi_Mn_Uplift'])
+
+
+def test_beam_flexure_uses_effective_modulus():
+    ratio = float(effective_ratio(200.0, 75.0, 20.0, 1.6, 3500.0, E))
+    beam = ColdFormedBeamDesign(SLENDER, {'span': 4.0, 'spacing': 1.0}, {'D': 100.0, 'L': 100.0, 'W': 0.0},
+                                MATERIALS)
+    cap = beam.capacity()
+    assert cap['Se_Ratio'] == pytest.approx(ratio)
+    assert cap['Phi_Mn'] == pytest.approx(0.90 * 3500.0 * ratio * 38.0 / 100.0)
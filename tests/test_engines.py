@@ -0,0 +1,136 @@
+"""
+ทดสอบความสอดคล้องระหว่าง run_design (รายการคำนวณ) กับ batch_checks (เวกเตอร์)
+ภายใต้ชุด load combination มาตรฐานและชุดกำหนดเอง
+"""
+import math
+
+import numpy as np
+import pytest
+
+from beam_design import ColdFormedBeamDesign
+from beam_design import batch_checks as beam_batch
+from load_combinations import custom_set
+from parametric_sweep import beam_inputs, purlin_inputs
+from purlin_design import PurlinDesign, uplift_checks
+from purlin_design import batch_checks as purlin_batch
+from rafter_design import RafterDesign
+
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+PURLIN_SECTION = {'name': 'C-150x50x20x2.3', 'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'Iy': 22.0, 'Sy': 6.33,
+                  'Area': 7.012, 'h': 150.0, 't': 2.3, 'Weight': 5.5}
+SLENDER_SECTION = {'name': 'C-150x65x20x1.6', 'Zx': 22.0, 'Sx': 22.0, 'Ix': 165.0, 'Iy': 30.0, 'Sy': 6.5,
+                   'Area': 5.0, 'h': 150.0, 't': 1.6, 'Weight': 4.0}
+
+COMBINATION_SETS = {
+    'EIT': None,
+    'ASCE7': 'ASCE7',
+    'uplift_governs': custom_set('ลมดูดควบคุม', ['1.4D+1.7L', '0.9D-1.6W'], uplift=['0.9D-1.6W']),
+    'gravity_only': custom_set('แรงโน้มถ่วง', ['1.4D+1.7L', '1.2D+1.6L']),
+}
+
+# อัตราส่วนที่ batch_checks รวมเข้า Max_Ratio ('h/t' และ 'WeakAxis' ไม่นับ)
+GOVERNING = ('Moment', 'Shear', 'Deflection', 'Ponding', 'Uplift', 'Biaxial')
+
+
+def _governing_ratio(ratios):
+    return max(abs(v) for k, v in ratios.items() if k in GOVERNING)
+
+
+@pytest.mark.parametrize('combinations', COMBINATION_SETS.values(), ids=COMBINATION_SETS.keys())
+@pytest.mark.parametrize('loads', [{'D': 150.0, 'L': 200.0, 'W': 0.0}, {'D': 10.0, 'L': 0.0, 'W': 300.0}],
+                         ids=['gravity', 'suction'])
+def test_beam_run_design_matches_batch(combinations, loads):
+    geometry = {'span': 4.0, 'spacing': 1.0}
+    res = ColdFormedBeamDesign(PURLIN_SECTION, geometry, loads, MATERIALS, combinations=combinations).run_design()
+    batch = beam_batch(**beam_inputs(PURLIN_SECTION, geometry, loads, MATERIALS, combinations=combinations))
+
+    ratios, status = res['Checks']['Ratios'], res['Checks']['Status']
+    for key in ('Moment', 'Shear', 'Deflection'):
+        assert abs(float(batch[key])) == pytest.approx(ratios[key], rel=1e-9)
+    assert float(batch['Max_Ratio']) == pytest.approx(_governing_ratio(ratios), rel=1e-9)
+    assert bool(batch['Pass']) == all(status.values())
+
+
+@pytest.mark.parametrize('combinations', COMBINATION_SETS.values(), ids=COMBINATION_SETS.keys())
+@pytest.mark.parametrize('wind', [-120.0, 60.0], ids=['suction', 'pressure'])
+@pytest.mark.parametrize('biaxial', [False, True], ids=['strong', 'biaxial'])
+def test_purlin_run_design_matches_batch(combinations, wind, biaxial):
+    section = SLENDER_SECTION if biaxial else PURLIN_SECTION
+    geometry = {'span': 5.0, 'spacing': 1.2, 'slope': 15.0, 'biaxial': biaxial, 'sag_rods': 1}
+    loads = {'DL': 15.0, 'LL': 30.0, 'WL': wind}
+    res = PurlinDesign(section, geometry, loads, MATERIALS, combinations=combinations).run_design()
+    batch = purlin_batch(**purlin_inputs(section, geometry, loads, MATERIALS, combinations=combinations))
+
+    ratios, status = res['Checks']['Ratios'], res['Checks']['Status']
+    for key in ratios.keys() & GOVERNING:
+        assert abs(float(batch[key])) == pytest.approx(ratios[key], rel=1e-9), key
+    assert float(batch['Max_Ratio']) == pytest.approx(_governing_ratio(ratios), rel=1e-9)
+    assert bool(batch['Pass']) == all(status.values())
+
+
+def test_purlin_gravity_only_set_skips_uplift():
+    combinations = COMBINATION_SETS['gravity_only']
+    geometry = {'span': 6.0, 'spacing': 1.0, 'slope': 10.0}
+    loads = {'DL': 10.0, 'LL': 50.0, 'WL': -100.0}
+    res = PurlinDesign(PURLIN_SECTION, geometry, loads, MATERIALS, combinations=combinations).run_design()
+    assert 'Uplift' not in res['Checks']['Ratios']
+    assert 'Controlling_Uplift' not in res['Combinations']
+
+    up = uplift_checks(span=np.array([4.0, 6.0]), spacing=1.0, slope=10.0, DL=10.0, WL=-100.0, Weight=5.5,
+                       Zx=28.1, h=150.0, Fy=2450.0, E=2.04e6, combinations=combinations)
+    assert up['Uplift'].shape == (2,)
+    assert np.all(up['Uplift'] == 0.0)
+    assert np.all(np.isnan(up['Phi_Mn_Uplift']))
+
+
+def test_purlin_uplift_label_follows_combination_set():
+    geometry = {'span': 5.0, 'spacing': 1.2, 'slope': 15.0}
+    loads = {'DL': 15.0, 'LL': 30.0, 'WL': -120.0}
+    eit = PurlinDesign(PURLIN_SECTION, geometry, loads, MATERIALS).run_design()
+    asce = PurlinDesign(PURLIN_SECTION, geometry, loads, MATERIALS, combinations='ASCE7').run_design()
+    assert eit['Combinations']['Controlling_Uplift'] == '0.9D-1.6W'
+    assert asce['Combinations']['Controlling_Uplift'] == '0.9D-1.0W'
+
+
+def test_rafter_reactions_use_vertical_loads():
+    section = {'name': 'H-200x100x5.5x8', 'Zx': 200.0, 'Sx': 181.0, 'Ix': 1810.0, 'Iy': 134.0, 'ry': 2.22,
+               'bf': 100.0, 'tf': 8.0, 'd': 200.0, 'tw': 5.5, 'Weight': 21.3, 'Area': 27.16}
+    geometry = {'span': 8.0, 'spacing': 4.0, 'slope': 30.0, 'Lb': 1.0}
+    combinations = COMBINATION_SETS['gravity_only']
+    res = RafterDesign(section, geometry, {'DL': 20.0, 'LL': 50.0, 'WL': 0.0}, {'Fy': 2400.0, 'E': 2.04e6},
+                       combinations=combinations).run_design()
+    forces = res['Forces']
+    w_dl, w_ll = 20.0 * 4.0 + 21.3, 50.0 * 4.0
+    span_slope = 8.0 / math.cos(math.radians(30.0))
+    total = (1.4 * w_dl + 1.7 * w_ll) * span_slope  # ไม่คูณ cos θ
+    assert forces['R_eave'] + forces['R_ridge'] == pytest.approx(total, rel=1e-9)
+
+
+@pytest.mark.parametrize('biaxial', [False, True], ids=['strong', 'biaxial'])
+def test_purlin_capacity_steps_keep_their_status(biaxial):
+    # หน้าตัดในตารางมีขั้นตอน Se ก่อน φMn — ขั้นตอนกำลังรับต้องได้ status ของการตรวจที่ถูกต้อง
+    geometry = {'span': 5.0, 'spacing': 1.2, 'slope': 15.0, 'biaxial': biaxial, 'sag_rods': 1}
+    res = PurlinDesign(PURLIN_SECTION, geometry, {'DL': 15.0, 'LL': 30.0, 'WL': 60.0}, MATERIALS).run_design()
+    steps = {step['title']: step for step in res['Steps']}
+    status = res['Checks']['Status']
+
+    assert 'โมดูลัสหน้าตัดประสิทธิผล (AISI S100 วิธีความกว้างประสิทธิผล)' in steps
+    moment = steps['กำลังดัดรับออกแบบ (ตาม มอก. 1228-2549)']
+    assert moment['status'] == ('PASS' if status['Moment'] else 'FAIL')
+    shear = steps['กำลังเฉือนรับออกแบบ (ตาม มอก. 1228-2549)']
+    assert shear['status'] == ('PASS' if status['Shear'] else 'FAIL')
+    assert steps['ตัวคูณลดกำลังจากการยึดรั้งปีก']['status'] is None
+    assert ('กำลังดัดรับออกแบบแกนอ่อน' in steps) == biaxial
+
+
+@pytest.mark.parametrize('combinations, wind_terms', [(None, ('1.6|w_W|',)), ('ASCE7', ('1|w_W|',))],
+                         ids=['EIT', 'ASCE7'])
+def test_purlin_biaxial_split_step_follows_combination_set(combinations, wind_terms):
+    geometry = {'span': 5.0, 'spacing': 1.2, 'slope': 15.0, 'biaxial': True, 'sag_rods': 1}
+    res = PurlinDesign(SLENDER_SECTION, geometry, {'DL': 15.0, 'LL': 30.0, 'WL': 60.0}, MATERIALS,
+                       combinations=combinations).run_design()
+    step = next(s for s in res['Steps'] if s['title'] == 'แยกแรงโน้มถ่วงเป็นองค์ประกอบตามแกนหน้าตัด')
+    for term in wind_terms:
+        assert term in step['latex']
+    if combinations == 'ASCE7':
+        assert '1.6w_W' not in step['latex'] and '1.6|w_W|' not in step['latex']
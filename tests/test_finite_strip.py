@@ -0,0 +1,187 @@
+"""
+ทดสอบ finite strip: ทฤษฎีแผ่นบาง, ตัวอย่าง CUFSM 9CS2.5x059, cache ของ signature curve และ DSM
+(cache บนดิสก์ชี้ไปที่ tmp_path — ไม่เขียน .fsm_cache ในโปรเจกต์)
+"""
+import numpy as np
+import pytest
+
+import finite_strip as fs
+from beam_design import ColdFormedBeamDesign
+from effective_width import effective_ratio
+from purlin_design import PurlinDesign
+from purlin_design import batch_checks as purlin_batch
+
+E = 2.04e6
+# 9CS2.5x059 (in → mm), E/Fy = 29500/55 ksi
+CS9 = (9.0 * 25.4, 2.5 * 25.4, 0.773 * 25.4, 0.059 * 25.4)
+E_FY = 29500.0 / 55.0
+
+
+@pytest.fixture(autouse=True)
+def curve_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(fs, '_DISK', fs.CurveCache(str(tmp_path / 'fsm')))
+    monkeypatch.setattr(fs, '_CURVES', type(fs._CURVES)())
+    return tmp_path / 'fsm'
+
+
+def test_square_tube_local_buckling_matches_plate_theory():
+    w, t, n = 100.0, 1.0, 8
+    corners = [(0.0, 0.0), (w, 0.0), (w, w), (0.0, w)]
+    nodes = np.array([(a[0] + (b[0] - a[0]) * s, a[1] + (b[1] - a[1]) * s)
+                      for a, b in zip(corners, corners[1:] + corners[:1]) for s in np.arange(n) / n])
+    count = len(nodes)
+    model = fs.StripModel(nodes, np.column_stack([np.arange(count), (np.arange(count) + 1) % count]), t,
+                          np.ones(count))
+    plate = 4 * np.pi ** 2 / (12 * (1 - fs.POISSON ** 2)) * (t / w) ** 2  # k = 4 ที่ครึ่งคลื่น = w
+    assert fs.load_factors(model, [w])[0] == pytest.approx(plate, rel=1e-3)
+    assert fs.load_factors(model, [0.5 * w, 2 * w]).min() > plate
+
+
+def test_cufsm_channel_example():
+    bending = fs.critical_stresses(*CS9, 'bending')
+    assert bending['local'] * E_FY == pytest.approx(0.67, rel=0.04)
+    assert bending['distortional'] * E_FY == pytest.approx(0.85, rel=0.04)
+    assert bending['L_local'] < bending['L_distortional']
+    assert bending['global'] == np.inf
+    compression = fs.critical_stresses(*CS9, 'compression')
+    assert compression['local'] * E_FY == pytest.approx(0.12, rel=0.04)
+    assert compression['distortional'] * E_FY == pytest.approx(0.27, rel=0.04)
+
+
+def test_load_factors_scale_with_thickness_squared_for_local_mode():
+    thin, thick = (fs.critical_stresses(*CS9[:3], t)['local'] for t in (1.5, 3.0))
+    assert thick / thin == pytest.approx(4.0, rel=0.05)
+
+
+def test_signature_curve_is_cached_in_memory_and_on_disk(curve_cache, monkeypatch):
+    lengths, factors = fs.signature_curve(*CS9)
+    assert np.array_equal(lengths, fs.LENGTHS) and factors.shape == fs.LENGTHS.shape
+    assert len(list(curve_cache.glob('*.json'))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError('ไม่ควรคำนวณ curve ใหม่')
+
+    monkeypatch.setattr(fs, 'load_factors', fail)
+    assert fs.signature_curve(*CS9)[1] is factors  # หน่วยความจำ
+    fs._CURVES.clear()
+    assert np.array_equal(fs.signature_curve(*CS9)[1], factors)  # ดิสก์
+
+    # persist=False ไม่อ่านดิสก์
+    fs._CURVES.clear()
+    with pytest.raises(AssertionError):
+        fs.signature_curve(*CS9, persist=False)
+
+
+def test_curve_cache_ignores_broken_or_mismatched_files(curve_cache):
+    cache = fs.CurveCache(str(curve_cache))
+    key = fs._curve_key(*CS9, 'bending')
+    cache.put(key, np.full(len(fs.LENGTHS), np.inf))
+    assert np.all(np.isinf(cache.get(key)))
+    with open(cache._path(key), 'w') as f:
+        f.write('{broken')
+    assert cache.get(key) is None
+    assert cache.get(fs._curve_key(*CS9, 'compression')) is None
+
+
+def test_buckling_minima_on_synthetic_curve():
+    lengths = np.geomspace(10.0, 10000.0, 200)
+    x = np.log(lengths)
+    factors = np.exp((x - np.log(100.0)) ** 2 - 0.5 * np.exp(-(x - np.log(1000.0)) ** 2 * 8))
+    minima = fs.buckling_minima(lengths, factors)
+    assert minima[0][0] == pytest.approx(100.0, rel=0.02)
+    assert minima[0][1] == pytest.approx(factors.min(), rel=1e-3)
+    assert len(minima) == 1 or minima[1][0] > minima[0][0]
+
+
+def test_dsm_flexure_follows_s100_equations():
+    fy = 55.0 / 29500.0 * E
+    res = fs.dsm_flexure(*CS9, fy, E)
+    mcrl, mcrd = res['Mcrl_My'], res['Mcrd_My']
+    rl = mcrl ** 0.4
+    mnl = (1 - 0.15 * rl) * rl if np.sqrt(1 / mcrl) > 0.776 else 1.0
+    rd = mcrd ** 0.5
+    mnd = (1 - 0.22 * rd) * rd if np.sqrt(1 / mcrd) > 0.673 else 1.0
+    assert res['Mne_My'] == 1.0
+    assert res['Mnl_My'] == pytest.approx(mnl) and res['Mnd_My'] == pytest.approx(mnd)
+    assert res['ratio'] == pytest.approx(min(mnl, mnd))
+    braced = res['ratio']
+    assert fs.dsm_flexure(*CS9, fy, E, length=3000.0)['ratio'] < braced
+    # หน้าตัดหนา: ไม่ลด
+    assert fs.dsm_flexure(100.0, 50.0, 20.0, 4.5, 2450.0, E)['ratio'] == 1.0
+
+
+def test_dsm_compression_ratio():
+    fy = 55.0 / 29500.0 * E
+    res = fs.dsm_compression(*CS9, fy, E)
+    assert res['Pne_Py'] == 1.0
+    assert 0 < res['ratio'] < 1 and res['ratio'] == min(res['Pnl_Py'], res['Pnd_Py'])
+    assert fs.dsm_compression(*CS9, fy, E, length=2000.0)['Pne_Py'] < 1.0
+
+
+def test_flexural_ratio_methods():
+    h = np.array([150.0, 200.0, 200.0])
+    b, c, t = np.array([65.0, 75.0, 75.0]), 20.0, np.array([1.6, 1.6, 2.3])
+    assert np.array_equal(fs.flexural_ratio(h, b, c, t, 3500.0, E), effective_ratio(h, b, c, t, 3500.0, E))
+    dsm = fs.flexural_ratio(h, b, c, t, 3500.0, E, 'dsm')
+    for i in range(3):
+        assert dsm[i] == pytest.approx(fs.dsm_flexure(h[i], b[i], c, t[i], 3500.0, E)['ratio'])
+    with pytest.raises(ValueError):
+        fs.flexural_ratio(h, b, c, t, 3500.0, E, 'exact')
+
+
+def test_random_thickness_interpolates_between_cached_curves():
+    rng = np.random.default_rng(3)
+    t = rng.normal(1.6, 0.04, 200)
+    approx = fs.flexural_ratio(200.0, 75.0, 20.0, t, 3500.0, E, 'dsm')
+    assert len(fs._CURVES) < 10  # curve ที่ t คงที่ ไม่ใช่หนึ่ง curve ต่อตัวอย่าง
+    for i in (0, 1, 2):
+        exact = fs.dsm_flexure(200.0, 75.0, 20.0, t[i], 3500.0, E)['ratio']
+        assert approx[i] == pytest.approx(exact, rel=0.01)
+
+
+def test_invalid_strip_models():
+    with pytest.raises(ValueError):
+        fs.lipped_channel(150.0, 50.0, 20.0, 1.6, load='torsion')
+    with pytest.raises(ValueError):
+        fs.lipped_channel(150.0, 2.0, 20.0, 1.6)
+
+
+SLENDER = {'name': 'C-200x75x20x1.6', 'Zx': 38.0, 'Sx': 38.0, 'Ix': 380.0, 'Iy': 30.0, 'Area': 6.0,
+           'h': 200.0, 't': 1.6, 'Weight': 4.7}
+MATERIALS = {'Fy': 3500.0, 'E': E}
+
+
+def test_design_classes_use_selected_method():
+    ratio = fs.dsm_flexure(200.0, 75.0, 20.0, 1.6, 3500.0, E)['ratio']
+    geometry = {'span': 5.0, 'spacing': 1.2, 'slope': 10.0, 'flexure_method': 'dsm'}
+    res = PurlinDesign(SLENDER, geometry, {'DL': 15.0, 'LL': 30.0, 'WL': -80.0}, MATERIALS).run_design()
+    assert res['Checks']['Capacity']['Phi_Mn'] == pytest.approx(0.90 * 3500.0 * ratio * 38.0 / 100.0)
+    batch = purlin_batch(span=5.0, spacing=1.2, slope=10.0, DL=15.0, LL=30.0, WL=-80.0, Weight=4.7, Zx=38.0,
+                         Ix=380.0, h=200.0, t=1.6, Fy=3500.0, E=E, b=75.0, c=20.0, flexure_method='dsm')
+    assert float(batch['Phi_Mn']) == pytest.approx(res['Checks']['Capacity']['Phi_Mn'])
+
+    beam = ColdFormedBeamDesign(SLENDER, {'span': 4.0, 'spacing': 1.0, 'flexure_method': 'dsm'},
+                                {'D': 100.0, 'L': 100.0, 'W': 0.0}, MATERIALS).capacity()
+    assert beam['Se_Ratio'] == pytest.approx(ratio) and beam['Flexure_Method'] == 'dsm'
+    assert beam['Mcrl_My'] > 0
+    with pytest.raises(ValueError):
+        ColdFormedBeamDesign(SLENDER, {'span': 4.0, 'spacing': 1.0, 'flexure_method': 'exact'},
+                             {'D': 100.0, 'L': 100.0, 'W': 0.0}, MATERIALS).capacity()
+
+
+@pytest.mark.parametrize('biaxial', [False, True], ids=['strong', 'biaxial'])
+def test_purlin_dsm_steps_precede_moment_check(biaxial):
+    section = {**SLENDER, 'Sy': 8.0, 'Iy': 40.0}
+    geometry = {'span': 5.0, 'spacing': 1.2, 'slope': 10.0, 'flexure_method': 'dsm', 'biaxial': biaxial}
+    res = PurlinDesign(section, geometry, {'DL': 15.0, 'LL': 30.0, 'WL': -80.0}, MATERIALS).run_design()
+    titles = [step['title'] for step in res['Steps']]
+    status = res['Checks']['Status']
+
+    signature = titles.index('แรงโก่งเดาะยืดหยุ่นจาก finite strip (signature curve)')
+    dsm = titles.index('กำลังดัดระบุตาม Direct Strength Method (AISI S100 F3.2 / F4)')
+    moment = titles.index('กำลังดัดรับออกแบบ (ตาม มอก. 1228-2549)')
+    shear = titles.index('กำลังเฉือนรับออกแบบ (ตาม มอก. 1228-2549)')
+    assert signature + 1 == dsm and dsm + 1 == moment
+    assert res['Steps'][signature]['status'] is None and res['Steps'][dsm]['status'] is None
+    assert res['Steps'][moment]['status'] == ('PASS' if status['Moment'] else 'FAIL')
+    assert res['Steps'][shear]['status'] == ('PASS' if status['Shear'] else 'FAIL')
@@ -0,0 +1,91 @@
+"""ทดสอบการออกแบบย้อนกลับ: ค่าสูงสุดต้องผ่านที่ −1 % และไม่ผ่านที่ +1 % เมื่อตรวจด้วย run_design ค่าเดี่ยว"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from beam_design import ColdFormedBeamDesign
+from inverse_design import solve_catalog, solve_max
+from parametric_sweep import purlin_inputs
+from purlin_design import PurlinDesign
+from rafter_design import RafterDesign
+
+PURLIN_SECTION = {'name': 'C-150x50x20x2.3', 'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'Iy': 22.0, 'Area': 7.012,
+                  'h': 150.0, 't': 2.3, 'Weight': 5.5}
+RAFTER_SECTION = {'name': 'H-200x100x5.5x8', 'Zx': 200.0, 'Sx': 181.0, 'Ix': 1810.0, 'Iy': 134.0, 'ry': 2.22,
+                  'bf': 100.0, 'tf': 8.0, 'd': 200.0, 'tw': 5.5, 'Weight': 21.3, 'Area': 27.16}
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+PURLIN_GEOMETRY = {'span': 5.0, 'spacing': 1.2, 'slope': 10.0}
+PURLIN_LOADS = {'DL': 15.0, 'LL': 30.0, 'WL': -60.0}
+
+
+def _passes(design):
+    return all(design.run_design()['Checks']['Status'].values())
+
+
+def _purlin(geometry=None, loads=None):
+    return PurlinDesign(PURLIN_SECTION, {**PURLIN_GEOMETRY, **(geometry or {})},
+                        {**PURLIN_LOADS, **(loads or {})}, MATERIALS)
+
+
+def _beam(geometry=None, loads=None):
+    return ColdFormedBeamDesign(PURLIN_SECTION, {'span': 4.0, 'spacing': 1.0, **(geometry or {})},
+                                {'D': 150.0, 'L': 200.0, 'W': 0.0, **(loads or {})})
+
+
+def _rafter(geometry=None, loads=None):
+    return RafterDesign(RAFTER_SECTION, {'span': 6.0, 'spacing': 1.0, 'slope': 15.0, 'Lb': 1.5, **(geometry or {})},
+                        {'DL': 10.0, 'LL': 20.0, 'WL': 0.0, **(loads or {})}, MATERIALS)
+
+
+CASES = [
+    (_purlin, 'span', {}), (_purlin, 'span', {'restraint': 'unbraced'}), (_purlin, 'span', {'camber': 0.3}),
+    (_purlin, 'spacing', {}), (_purlin, 'LL', {}),
+    (_beam, 'span', {}), (_beam, 'L', {}),
+    (_rafter, 'span', {}), (_rafter, 'LL', {}),
+]
+
+
+@pytest.mark.parametrize('factory, parameter, extra', CASES,
+                         ids=[f"{f.__name__[1:]}-{p}{'-' + '-'.join(e) if e else ''}" for f, p, e in CASES])
+def test_max_value_brackets_scalar_design(factory, parameter, extra):
+    design = factory(extra)
+    res = design.max_value(parameter)
+    assert res['Method'] in ('closed-form', 'bracketed')
+    assert res['Max_Ratio'] <= 1.0 + 1e-6
+    value = res['Value']
+    load = parameter in ('LL', 'L')
+    for scale, expected in ((0.99, True), (1.01, False)):
+        change = {parameter: value * scale}
+        assert _passes(factory(extra, change) if load else factory({**extra, **change})) is expected, scale
+
+
+def test_closed_form_used_for_purlin_span():
+    assert _purlin().max_span()['Method'] == 'closed-form'
+    assert _purlin({'restraint': 'unbraced'}).max_span()['Method'] == 'bracketed'
+
+
+def test_bounds_and_errors():
+    assert _purlin().max_span(hi=1.0)['Method'] == 'upper-bound'
+    assert _purlin({'span': 12.0}).max_spacing(lo=4.0)['Method'] == 'infeasible'
+    assert np.isnan(_purlin({'span': 12.0}).max_spacing(lo=4.0)['Value'])
+    with pytest.raises(ValueError):
+        _purlin().max_load('X')
+    with pytest.raises(ValueError):
+        solve_max('purlin', purlin_inputs(PURLIN_SECTION, PURLIN_GEOMETRY, PURLIN_LOADS, MATERIALS), 'nothing')
+    with pytest.raises(ValueError):
+        _purlin().max_span(lo=5.0, hi=2.0)
+
+
+def test_solve_catalog_matches_single_sections():
+    sections = pd.DataFrame([
+        {'Section': 'C-150x50x20x2.3', 'Weight': 5.5, 'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'h': 150.0, 't': 2.3},
+        {'Section': 'C-100x50x20x2.3', 'Weight': 4.06, 'Zx': 16.1, 'Sx': 16.1, 'Ix': 80.7, 'h': 100.0, 't': 2.3},
+        {'Section': 'C-125x50x20x3.2', 'Weight': 6.13, 'Zx': 27.7, 'Sx': 27.7, 'Ix': 181.0, 'h': 125.0, 't': 3.2},
+    ])
+    table = solve_catalog('purlin', sections, PURLIN_GEOMETRY, PURLIN_LOADS, MATERIALS, 'span')
+    assert list(table['Section']) == ['C-100x50x20x2.3', 'C-150x50x20x2.3', 'C-125x50x20x3.2']
+    for _, row in table.iterrows():
+        section = sections.set_index('Section').loc[row['Section']].to_dict()
+        single = PurlinDesign(section, PURLIN_GEOMETRY, PURLIN_LOADS, MATERIALS).max_span()
+        assert row['Max_span'] == pytest.approx(single['Value'], rel=1e-9)
+        assert row['Governing'] == single['Governing']
@@ -0,0 +1,64 @@
+"""ทดสอบชุด load combination แบบเมทริกซ์ตัวคูณ"""
+import numpy as np
+import pytest
+
+from load_combinations import (ASCE7_LRFD, EIT_LRFD, LoadCombination, LoadCombinationSet, custom_set,
+                               get_combination_set, parse_combination)
+
+
+def test_parse_combination_factors():
+    assert parse_combination('1.2D+1.6L+0.5W').factors == (1.2, 1.6, 0.5)
+    assert parse_combination('0.9D-1.0W').factors == (0.9, 0.0, -1.0)
+    assert parse_combination('D+L').factors == (1.0, 1.0, 0.0)
+    assert parse_combination('1.05D + 1.275L + 1.6W').factors == (1.05, 1.275, 1.6)
+
+
+@pytest.mark.parametrize('label', ['1.2D+1.6X', '1.2D*1.6L', '1.2D+'])
+def test_parse_combination_rejects_bad_labels(label):
+    with pytest.raises(ValueError):
+        parse_combination(label)
+
+
+def test_factored_matches_hand_calculation():
+    cases = EIT_LRFD.case_vector(D=100.0, L=50.0, W=40.0)
+    expected = [sum(f * v for f, v in zip(c.factors, (100.0, 50.0, 40.0))) for c in EIT_LRFD.combinations]
+    np.testing.assert_allclose(EIT_LRFD.factored(cases), expected)
+    assert EIT_LRFD.evaluate(D=100.0, L=50.0, W=40.0)['Wu1'] == pytest.approx(1.4 * 100.0 + 1.7 * 50.0)
+
+
+def test_factored_broadcasts_over_arrays():
+    cases = ASCE7_LRFD.case_vector(D=np.array([10.0, 20.0, 30.0]), L=5.0)
+    out = ASCE7_LRFD.factored(cases)
+    assert out.shape == (3, len(ASCE7_LRFD.combinations))
+    np.testing.assert_allclose(out[1], ASCE7_LRFD.factored(ASCE7_LRFD.case_vector(D=20.0, L=5.0)))
+
+
+def test_split_factored_sums_to_total():
+    cases = EIT_LRFD.case_vector(D=80.0, L=40.0, W=-60.0)
+    gravity, lateral = EIT_LRFD.split_factored(cases)
+    np.testing.assert_allclose(gravity + lateral, EIT_LRFD.factored(cases))
+
+
+def test_governing_skips_uplift_combos():
+    combos = custom_set('ทดสอบ', ['1.4D'], uplift=['0.9D-5W'])
+    factored = combos.factored(combos.case_vector(D=10.0, W=100.0))
+    assert combos.governing(factored) == 0
+    assert combos.governing(factored, include_uplift=True) == 1
+    assert [c.key for c in combos.uplift] == ['Wu_uplift1']
+
+
+def test_set_validation_and_lookup():
+    with pytest.raises(ValueError):
+        LoadCombinationSet('ผิด', (LoadCombination('Wu1', '1.4D', (1.4,)),))
+    with pytest.raises(ValueError):
+        EIT_LRFD.case_vector(S=1.0)
+    assert get_combination_set() is EIT_LRFD
+    assert get_combination_set('ASCE7') is ASCE7_LRFD
+    with pytest.raises(ValueError):
+        get_combination_set('NBCC')
+
+
+def test_latex_and_substitution():
+    combo = parse_combination('0.9D-1.6W')
+    assert combo.latex(('w_D', 'w_L', 'w_W')) == '0.9w_D - 1.6w_W'
+    assert combo.substitution((10.0, 0.0, 20.0)) == '= 0.9(10.00) - 1.6(20.00)'
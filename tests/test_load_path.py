@@ -0,0 +1,75 @@
+"""ทดสอบเส้นทางถ่ายแรง แป → จันทัน → เสา ของทั้งอาคาร"""
+import math
+
+import numpy as np
+import pytest
+
+from load_path import BuildingLayout, build_model, design_building, summary_frame
+
+PURLIN = {'name': 'C-150x50x20x2.3', 'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'h': 150.0, 't': 2.3, 'Weight': 5.5}
+RAFTER = {'name': 'H-200x100x5.5x8', 'Zx': 200.0, 'Sx': 181.0, 'Ix': 1810.0, 'Iy': 134.0, 'ry': 2.22,
+          'bf': 100.0, 'tf': 8.0, 'd': 200.0, 'tw': 5.5, 'Weight': 21.3, 'Area': 27.16}
+COLUMN = {'section_name': 'H-150x150x7x10', 'Ag': 40.14, 'rx': 6.39, 'ry': 3.75,
+          'h': 150.0, 'bf': 150.0, 'tw': 7.0, 'tf': 10.0}
+KWARGS = {'purlin_section': PURLIN, 'rafter_section': RAFTER, 'column_section': COLUMN,
+          'loads': {'DL': 15.0, 'LL': 30.0, 'WL': -40.0}, 'materials': {'Fy': 2450.0, 'E': 2.04e6}}
+LAYOUT = BuildingLayout(bays=[5.0, 6.0], width=12.0, purlin_spacing=1.2, slope=15.0)
+
+
+def test_layout_geometry():
+    x = LAYOUT.purlin_positions()
+    assert x[0] == 0.0 and x[-1] == pytest.approx(LAYOUT.rafter_slope_length)
+    assert np.max(np.diff(x)) <= 1.2 + 1e-9
+    assert LAYOUT.tributary_widths().sum() == pytest.approx(6.0 / math.cos(math.radians(15.0)))
+    assert BuildingLayout(bays=[5.0], width=8.0, purlin_spacing=1.0, slope=5.0, gable=False).rafter_span == 8.0
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'bays': [], 'width': 12.0, 'purlin_spacing': 1.2, 'slope': 15.0},
+    {'bays': [5.0, -1.0], 'width': 12.0, 'purlin_spacing': 1.2, 'slope': 15.0},
+    {'bays': [5.0], 'width': 0.0, 'purlin_spacing': 1.2, 'slope': 15.0},
+    {'bays': [5.0], 'width': 12.0, 'purlin_spacing': 1.2, 'slope': 90.0},
+])
+def test_invalid_layout_raises(kwargs):
+    with pytest.raises(ValueError):
+        BuildingLayout(**kwargs)
+
+
+def test_design_building_covers_every_member():
+    model, report = design_building(LAYOUT, **KWARGS)
+    n_purlins = len(LAYOUT.purlin_positions())
+    expected = 2 * (2 * n_purlins + 3 + 3)
+    assert len(model.members) == expected
+    assert len(report.recomputed) == expected and not report.failed
+    summary = summary_frame(model)
+    assert len(summary) == expected and summary['Max_Ratio'].notna().all()
+
+
+def test_column_load_follows_rafter_reactions():
+    model, _ = design_building(LAYOUT, **KWARGS)
+    for k in range(3):
+        forces = model.result(f'RL{k}')['Forces']
+        assert model.members[f'CL{k}'].resolved['Pu'] == pytest.approx(forces['R_eave'] + forces['R_ridge'])
+
+
+def test_rafter_receives_purlin_reactions():
+    model, _ = design_building(LAYOUT, **KWARGS)
+    positions = LAYOUT.purlin_positions()
+    points = model.members['RL1'].resolved['loads']['point_loads']
+    np.testing.assert_allclose([p['x'] for p in points], positions)
+    # โครงกลางรับครึ่งช่วงจากทั้งสองข้าง ณ แนวแปแต่ละแนว
+    for i, point in enumerate(points):
+        expected = sum(model.result(f'PL{j}-{i}')['Loads']['DL_line'] * span / 2
+                       for j, span in enumerate(LAYOUT.bays))
+        assert point['D'] == pytest.approx(expected)
+
+
+def test_bay_change_recomputes_adjacent_frames_only():
+    model = build_model(LAYOUT, **KWARGS)
+    model.recompute()
+    model.set('bay0.span', 5.5)
+    report = model.recompute()
+    recomputed = set(report.recomputed)
+    assert {'RL0', 'RL1', 'CL0', 'CL1', 'RR0', 'RR1', 'CR0', 'CR1'} <= recomputed
+    assert not {'RL2', 'CL2', 'RR2', 'CR2'} & recomputed
+    assert not any(name.startswith(('PL1-', 'PR1-')) for name in recomputed)
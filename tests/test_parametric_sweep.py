@@ -0,0 +1,66 @@
+"""ทดสอบ sweep พารามิเตอร์แบบกริด (เทียบกับการเรียก batch_checks ทีละจุด)"""
+import numpy as np
+import pytest
+
+from parametric_sweep import purlin_inputs, sweep, sweep_range
+from purlin_design import PurlinDesign, batch_checks
+
+SECTION = {'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'Iy': 22.0, 'h': 150.0, 't': 2.3, 'Weight': 5.5}
+GEOMETRY = {'span': 5.0, 'spacing': 1.2, 'slope': 10.0}
+LOADS = {'DL': 15.0, 'LL': 30.0, 'WL': -60.0}
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+BASE = purlin_inputs(SECTION, GEOMETRY, LOADS, MATERIALS)
+
+
+def test_grid_matches_pointwise_batch():
+    spans, dls = [3.0, 4.5, 6.0], [10.0, 25.0]
+    res = sweep('purlin', BASE, {'span': spans, 'DL': dls})
+    assert res.dims == ('span', 'DL') and res.shape == (3, 2)
+    for i, span in enumerate(spans):
+        for j, dl in enumerate(dls):
+            point = batch_checks(**{**BASE, 'span': span, 'DL': dl})
+            assert res['Max_Ratio'][i, j] == pytest.approx(float(point['Max_Ratio']))
+            assert bool(res['Pass'][i, j]) == bool(point['Pass'])
+
+
+def test_categorical_axis():
+    res = sweep('purlin', BASE, {'span': [4.0, 6.0], 'restraint': ['through_fastened', 'unbraced']})
+    assert res.shape == (2, 2)
+    braced = res.sel(restraint='through_fastened')
+    assert braced.dims == ('span',)
+    assert np.all(res.sel(restraint='unbraced')['Uplift'] >= braced['Uplift'])
+
+
+def test_class_engine_resolves_to_batch():
+    assert sweep(PurlinDesign, BASE, {'span': [5.0]}).engine == 'purlin'
+
+
+def test_sel_and_sensitivity():
+    res = sweep('purlin', {**BASE, 'WL': 0.0}, {'span': np.linspace(3.0, 6.0, 31)})
+    assert float(res.sel(span=4.04)['Moment']) == pytest.approx(float(res['Moment'][10]))
+    # M ∝ L² → ความไวเชิงสัมพัทธ์ของอัตราส่วนโมเมนต์ต่อช่วงพาด ≈ 2
+    assert res.sensitivity('Moment')['span'] == pytest.approx(2.0, rel=0.02)
+
+
+def test_to_frame_has_one_row_per_point():
+    res = sweep('purlin', BASE, {'span': [4.0, 5.0, 6.0], 'spacing': [1.0, 1.2]})
+    frame = res.to_frame()
+    assert len(frame) == 6
+    assert {'span', 'spacing', 'Max_Ratio'} <= set(frame.columns)
+
+
+def test_invalid_sweeps_raise():
+    with pytest.raises(ValueError):
+        sweep('purlin', BASE, {})
+    with pytest.raises(ValueError):
+        sweep('purlin', BASE, {'bogus': [1.0]})
+    with pytest.raises(ValueError):
+        sweep('truss', BASE, {'span': [1.0]})
+    with pytest.raises(ValueError):
+        sweep('purlin', BASE, {'span': []})
+
+
+def test_sweep_range_defaults():
+    np.testing.assert_allclose(sweep_range('span', 6.0, 3), [3.0, 6.0, 9.0])
+    assert sweep_range('WL', -60.0, 3)[0] == pytest.approx(-120.0)
+    assert sweep_range('slope', 10.0, 2)[-1] == pytest.approx(30.0)
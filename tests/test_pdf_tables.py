@@ -0,0 +1,123 @@
+"""
+ทดสอบ pdf_tables: ตัวแปลงแถว (แทน eval) และ cache ต่อหน้าของการดึงตาราง (ไม่ต้องมี pdfplumber)
+"""
+import ast
+import os
+
+import pytest
+
+from pdf_tables import PageCache, _chunks, extract, parse_row, write_dump
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def fake_pages(pdf_path, pages, text=False):
+    """ตัวดึงแทน pdfplumber (ระดับโมดูลเพื่อให้ pickle ได้)"""
+    out = {}
+    for n in pages:
+        entry = {'tables': [[[f'p{n}', "it's", 'a\\b', ''], ['x', 'y', 'ก', '"q"']]] if n % 3 else []}
+        if text:
+            entry['text'] = f'page {n}'
+        out[n] = entry
+    return out
+
+
+def no_pages(pdf_path, pages, text=False):
+    raise AssertionError(f'ไม่ควรเปิด PDF (หน้า {list(pages)})')
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    path = tmp_path / 'doc.pdf'
+    path.write_bytes(b'%PDF-1.4 fake')
+    return str(path)
+
+
+@pytest.mark.parametrize('row', [
+    [], [''], ['a', 'b'], ["it's"], ['say "hi"', "both ' and \""], ['back\\slash', 'tab\there', 'new\nline'],
+    ['\x00\x7fé', 'มอก. 1228', '\U0001f600', '\u200b'],
+])
+def test_parse_row_matches_literal_eval(row):
+    line = repr(row)
+    assert parse_row(line) == ast.literal_eval(line) == row
+    assert parse_row(line + '\n') == row
+
+
+def test_parse_row_matches_tables_dump():
+    with open(os.path.join(ROOT, 'tables_dump.txt'), encoding='utf-8') as f:
+        lines = [line for line in f if line.startswith('[')]
+    assert lines
+    for line in lines:
+        assert parse_row(line) == ast.literal_eval(line)
+
+
+@pytest.mark.parametrize('line', [
+    'print(1)', "['a', 1]", "['a' + 'b']", "['a'] + ['b']", "['a',, 'b']", "['a' 'b']",
+    "[__import__('os')]", "['unterminated]",
+])
+def test_parse_row_rejects_non_literals(line):
+    with pytest.raises(ValueError):
+        parse_row(line)
+
+
+def test_chunks_are_contiguous_and_balanced():
+    numbers = list(range(1, 11))
+    chunks = _chunks(numbers, 4)
+    assert [n for c in chunks for n in c] == numbers
+    assert sorted(len(c) for c in chunks) == [2, 2, 3, 3]
+    assert _chunks([1, 2], 8) == [[1], [2]]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_extract_caches_every_page(pdf, tmp_path, workers):
+    cache_dir = str(tmp_path / 'cache')
+    first = extract(pdf, workers=workers, cache_dir=cache_dir, extractor=fake_pages, page_count=lambda p: 7)
+    assert first == fake_pages(pdf, range(1, 8))
+    # รอบสองอ่านจาก cache ทั้งหมด — ไม่เรียกตัวดึงหรือนับหน้าอีก
+    again = extract(pdf, workers=workers, cache_dir=cache_dir, extractor=no_pages, page_count=no_pages)
+    assert again == first
+
+
+def test_extract_only_fetches_missing_pages(pdf, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    extract(pdf, pages=[2, 3], workers=1, cache_dir=cache_dir, extractor=fake_pages)
+    seen = []
+
+    def tracking(path, pages, text=False):
+        seen.extend(pages)
+        return fake_pages(path, pages, text)
+
+    result = extract(pdf, pages=range(1, 6), workers=1, cache_dir=cache_dir, extractor=tracking)
+    assert sorted(seen) == [1, 4, 5]
+    assert sorted(result) == [1, 2, 3, 4, 5]
+
+    # ขอข้อความด้วย: หน้าใน cache ที่ไม่มีข้อความต้องดึงใหม่
+    seen.clear()
+    result = extract(pdf, pages=[2, 3], workers=1, cache_dir=cache_dir, text=True, extractor=tracking)
+    assert sorted(seen) == [2, 3] and result[2]['text'] == 'page 2'
+
+
+def test_page_cache_keyed_by_content(pdf, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    cache = PageCache(pdf, cache_dir)
+    cache.put(1, {'tables': []})
+    assert cache.get(1) == {'tables': []}
+    assert cache.get(1, text=True) is None
+    with open(os.path.join(cache.dir, 'p0002.json'), 'w') as f:
+        f.write('{broken')
+    assert cache.get(2) is None  # ไฟล์เสียถือว่าไม่มี
+
+    with open(pdf, 'ab') as f:
+        f.write(b' changed')
+    assert PageCache(pdf, cache_dir).get(1) is None
+
+
+def test_write_dump_round_trips_through_parse_row(tmp_path):
+    pages = fake_pages('', range(1, 5))
+    path = tmp_path / 'dump.txt'
+    write_dump(pages, str(path))
+    text = path.read_text(encoding='utf-8')
+    assert '--- Page 3 Found' not in text  # หน้าไม่มีตารางถูกข้าม
+    assert text.count('--- Page') == 3
+    rows = [parse_row(line) for line in text.splitlines() if line.startswith('[')]
+    assert rows == [row for n in (1, 2, 4) for row in pages[n]['tables'][0]]
@@ -0,0 +1,85 @@
+"""ทดสอบที่เก็บโครงการ SQLite: บันทึก/โหลดชิ้นส่วน สรุปผล และการลบแบบ cascade"""
+import pytest
+
+from project_store import MemberRecord, ProjectStore, summarize_result
+from purlin_design import PurlinDesign
+from tension_design import TensionDesign
+
+SECTION = {'name': 'C-150x50x20x2.3', 'Zx': 28.1, 'Ix': 210.0, 'h': 150.0, 't': 2.3, 'Weight': 5.5}
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+
+
+def _purlin(span):
+    inputs = {'section_data': SECTION, 'geometry': {'span': span, 'spacing': 1.2, 'slope': 10.0},
+              'loads': {'DL': 15.0, 'LL': 30.0, 'WL': -60.0}, 'materials': MATERIALS}
+    return MemberRecord(f"P{span:g}", 'purlin', inputs, PurlinDesign(**inputs).run_design(), SECTION['name'])
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ProjectStore(str(tmp_path / 'project.db')) as s:
+        yield s
+
+
+def test_summarize_result_formats():
+    ratio, governing, passed = summarize_result(
+        {'Checks': {'Ratios': {'Moment': 0.8, 'Shear': 0.2, 'h/t': 60.0}, 'Status': {'Moment': True, 'Shear': True}}})
+    assert (ratio, governing, passed) == (0.8, 'Moment', True)
+    assert summarize_result({'Ratio': 1.2, 'Status': False}) == (1.2, 'Strength', False)
+    assert summarize_result({}) == (None, None, None)
+
+
+def test_round_trip_and_summaries(store):
+    bid = store.create_building('โกดัง A', width=20.0)
+    records = [_purlin(span) for span in (4.0, 6.0, 9.0)]
+    ids = store.save_members(bid, records)
+    assert len(ids) == 3
+
+    summary = store.summaries(bid)
+    assert list(summary['max_ratio']) == sorted(summary['max_ratio'], reverse=True)
+    assert summary.iloc[0]['name'] == 'P9'
+
+    loaded = store.load_member(ids[1])
+    assert loaded['inputs']['geometry']['span'] == 6.0
+    assert 'Steps' not in loaded['result']
+    steps = store.load_steps(ids[1])
+    assert [s['title'] for s in steps] == [s['title'] for s in records[1].steps]
+
+
+def test_overwrite_by_name_replaces_steps(store):
+    bid = store.create_building('โกดัง A')
+    first = store.save_member(bid, _purlin(4.0))
+    record = _purlin(4.0)
+    record.steps = record.steps[:2]
+    assert store.save_member(bid, record) == first
+    assert len(store.load_steps(first)) == 2
+    assert len(store.summaries(bid)) == 1
+
+
+def test_filters_and_building_totals(store):
+    bid = store.create_building('โกดัง B')
+    tension = TensionDesign(Ag=2.0, Tu=20_000.0).run_design()
+    store.save_members(bid, [_purlin(4.0), MemberRecord('T1', 'tension', {'Ag': 2.0}, tension)])
+    assert list(store.summaries(bid, engine='tension')['name']) == ['T1']
+    failing = store.summaries(bid, failing_only=True)
+    assert list(failing['name']) == ['T1'] and not failing.iloc[0]['passed']
+    row = store.buildings().set_index('name').loc['โกดัง B']
+    assert row['members'] == 2 and row['failing'] == 1
+
+
+def test_delete_cascades(store):
+    bid = store.create_building('โกดัง C')
+    mid = store.save_member(bid, _purlin(5.0))
+    store.delete_building(bid)
+    assert store.conn.execute('SELECT COUNT(*) FROM steps').fetchone()[0] == 0
+    with pytest.raises(ValueError):
+        store.load_member(mid)
+    with pytest.raises(ValueError):
+        store.building_id('โกดัง C')
+
+
+def test_invalid_inputs_raise(store):
+    with pytest.raises(ValueError):
+        MemberRecord('X', 'truss', {})
+    with pytest.raises(ValueError):
+        store.create_building('')
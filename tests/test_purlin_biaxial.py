@@ -0,0 +1,52 @@
+"""ทดสอบการดัดสองแกนของแปและสัมประสิทธิ์โมเมนต์ตามจำนวนเหล็กยึดแป"""
+import pandas as pd
+import pytest
+
+from purlin_design import SAG_ROD_MOMENT_COEFF, PurlinDesign, batch_checks, screen_catalog
+
+SECTION = {'Zx': 28.1, 'Ix': 210.0, 'Sy': 6.33, 'h': 150.0, 't': 2.3, 'Weight': 5.5}
+GEOMETRY = {'span': 5.0, 'spacing': 1.2, 'slope': 15.0, 'biaxial': True}
+LOADS = {'DL': 15.0, 'LL': 30.0, 'WL': 0.0}
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+
+
+def _run(sag_rods):
+    return PurlinDesign(SECTION, {**GEOMETRY, 'sag_rods': sag_rods}, LOADS, MATERIALS).run_design()
+
+
+@pytest.mark.parametrize('sag_rods', [0, 1, 2])
+def test_weak_axis_moment_uses_sag_rod_coefficient(sag_rods):
+    res = _run(sag_rods)
+    w_t = res['Combinations']['Wu_tangential']
+    assert res['Forces']['Muy_kgm'] == pytest.approx(SAG_ROD_MOMENT_COEFF[sag_rods] * w_t * 5.0 ** 2)
+
+
+def test_sag_rods_reduce_weak_axis_ratio():
+    ratios = [_run(n)['Checks']['Ratios']['WeakAxis'] for n in (0, 1, 2)]
+    assert ratios[0] > ratios[1] > ratios[2] > 0.0
+
+
+@pytest.mark.parametrize('sag_rods', [0, 1, 2])
+def test_batch_matches_run_design(sag_rods):
+    ratios = _run(sag_rods)['Checks']['Ratios']
+    res = batch_checks(span=5.0, spacing=1.2, slope=15.0, DL=15.0, LL=30.0, WL=0.0, Weight=5.5, Zx=28.1,
+                       Ix=210.0, h=150.0, t=2.3, Fy=2450.0, E=2.04e6, Sy=6.33, biaxial=True, sag_rods=sag_rods)
+    assert float(res['WeakAxis']) == pytest.approx(ratios['WeakAxis'])
+    assert float(res['Biaxial']) == pytest.approx(ratios['Biaxial'])
+
+
+def test_invalid_inputs_raise():
+    with pytest.raises(ValueError):
+        _run(3)
+    with pytest.raises(ValueError):
+        batch_checks(span=5.0, spacing=1.2, slope=15.0, DL=15.0, LL=30.0, WL=0.0, Weight=5.5, Zx=28.1,
+                     Ix=210.0, h=150.0, t=2.3, Fy=2450.0, E=2.04e6, biaxial=True)
+
+
+def test_screen_catalog_sorts_by_weight():
+    df = pd.DataFrame({'Section': ['B', 'A'], 'Weight': [7.0, 5.5], 'Zx': [35.0, 28.1], 'Ix': [260.0, 210.0],
+                       'Sy': [8.0, 6.33], 'h': [150.0, 150.0], 't': [3.2, 2.3]})
+    out = screen_catalog(df, {**GEOMETRY, 'sag_rods': 1}, LOADS, MATERIALS)
+    assert list(out['Section']) == ['A', 'B']
+    assert {'WeakAxis', 'Biaxial', 'Max_Ratio', 'Pass'} <= set(out.columns)
+    assert out['Max_Ratio'].iloc[0] > out['Max_Ratio'].iloc[1]
@@ -0,0 +1,46 @@
+"""ทดสอบการตรวจแรงลมดูดของแป (ค่า R ตาม AISI S100 และการค้ำยันปีกล่าง)"""
+import numpy as np
+import pytest
+
+from purlin_design import PurlinDesign, batch_checks, uplift_checks, uplift_r_factor
+
+SECTION = {'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'Iy': 22.0, 'h': 150.0, 't': 2.3, 'Weight': 5.5}
+GEOMETRY = {'span': 5.0, 'spacing': 1.2, 'slope': 10.0}
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+UPLIFT = dict(span=5.0, spacing=1.2, slope=10.0, DL=15.0, Weight=5.5, Zx=28.1, h=150.0, Fy=2450.0, E=2.04e6)
+
+
+def test_r_factor_table():
+    np.testing.assert_allclose(uplift_r_factor([150.0, 165.0, 200.0, 216.0, 250.0]),
+                               [0.70, 0.70, 0.65, 0.65, 0.40])
+    np.testing.assert_allclose(uplift_r_factor([150.0, 250.0], continuous=True), [0.60, 0.60])
+
+
+def test_run_design_matches_batch():
+    res = PurlinDesign(SECTION, GEOMETRY, {'DL': 15.0, 'LL': 30.0, 'WL': -120.0}, MATERIALS).run_design()
+    out = batch_checks(**UPLIFT, LL=30.0, WL=-120.0, Ix=210.0, t=2.3, Sx=28.1)
+    assert res['Checks']['Capacity']['R'] == pytest.approx(0.70)
+    assert float(out['Uplift']) == pytest.approx(res['Checks']['Ratios']['Uplift'])
+    assert float(out['Phi_Mn_Uplift']) == pytest.approx(res['Checks']['Capacity']['Phi_Mn_Uplift'])
+
+
+def test_uplift_ratio_grows_with_suction():
+    ratios = uplift_checks(**{**UPLIFT, 'WL': np.array([-40.0, -80.0, -160.0])})['Uplift']
+    assert np.all(np.diff(ratios) > 0.0)
+
+
+def test_no_net_uplift_gives_zero_demand():
+    out = uplift_checks(**UPLIFT, WL=-5.0)
+    assert float(out['Mu_Uplift']) == 0.0
+    assert float(out['Uplift']) == 0.0
+
+
+def test_unbraced_flange_is_weaker_and_needs_iy():
+    braced = uplift_checks(**UPLIFT, WL=-120.0, Sx=28.1, Iy=22.0)
+    unbraced = uplift_checks(**UPLIFT, WL=-120.0, Sx=28.1, Iy=22.0, restraint='unbraced')
+    assert float(unbraced['R']) < 1.0
+    assert float(unbraced['Phi_Mn_Uplift']) != pytest.approx(float(braced['Phi_Mn_Uplift']))
+    with pytest.raises(ValueError):
+        uplift_checks(**UPLIFT, WL=-120.0, restraint='unbraced')
+    with pytest.raises(ValueError):
+        uplift_checks(**UPLIFT, WL=-120.0, restraint='welded')
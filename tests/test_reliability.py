@@ -0,0 +1,79 @@
+"""ทดสอบ Monte Carlo: การสุ่มตัวแปร สถิติ Pf/β และความไม่ขึ้นกับขนาด chunk"""
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from parametric_sweep import purlin_inputs
+from reliability import RandomVariable, ReliabilityResult, monte_carlo
+
+SECTION = {'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'Iy': 22.0, 'h': 150.0, 't': 2.3, 'Weight': 5.5}
+GEOMETRY = {'span': 5.0, 'spacing': 1.2, 'slope': 10.0}
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+
+
+@pytest.mark.parametrize('dist', ['normal', 'lognormal', 'gumbel'])
+def test_sample_moments(dist):
+    rv = RandomVariable(dist, 1.10, 0.20)
+    x = rv.sample(100.0, np.random.default_rng(1), 400_000)
+    assert x.mean() == pytest.approx(110.0, rel=5e-3)
+    assert x.std() == pytest.approx(22.0, rel=2e-2)
+
+
+@pytest.mark.parametrize('dist', ['normal', 'lognormal', 'gumbel'])
+def test_negative_nominal_mirrors_the_distribution(dist):
+    # แรงลมดูดมีค่าระบุติดลบ — |W| ต้องมีการกระจาย (รวมหางยาวของ Gumbel) เท่ากับกรณีค่าบวก
+    rv = RandomVariable(dist, 0.78, 0.37)
+    pos = rv.sample(120.0, np.random.default_rng(4), 200_000)
+    neg = rv.sample(-120.0, np.random.default_rng(4), 200_000)
+    assert neg.mean() == pytest.approx(-pos.mean(), rel=1e-2)
+    q = [0.01, 0.5, 0.99, 0.999]
+    assert np.quantile(np.abs(neg), q) == pytest.approx(np.quantile(np.abs(pos), q), rel=2e-2)
+
+
+def test_zero_cov_is_deterministic():
+    x = RandomVariable('gumbel', 0.9, 0.0).sample(np.array([10.0, 20.0]), np.random.default_rng(0), 3)
+    assert x.shape == (3, 2)
+    assert np.all(x == [9.0, 18.0])
+
+
+def test_invalid_variables_raise():
+    with pytest.raises(ValueError):
+        RandomVariable('weibull')
+    with pytest.raises(ValueError):
+        RandomVariable('normal', 0.0, 0.1)
+    with pytest.raises(ValueError):
+        monte_carlo('truss', {})
+    with pytest.raises(ValueError):
+        monte_carlo('tension', {'Tu': 1.0}, n_samples=0)
+
+
+def test_result_statistics():
+    res = ReliabilityResult('tension', 1000, 0, 0.5, 0.1)
+    assert res.pf == 0.0 and res.pf_upper == pytest.approx(3e-3)
+    assert res.beta == pytest.approx(-NormalDist().inv_cdf(3e-3))
+    assert res.beta_cornell == pytest.approx(5.0)
+    assert ReliabilityResult('tension', 10, 10, -1.0, 0.1).beta == -math.inf
+
+
+def test_tension_pf_matches_closed_form():
+    # Fy lognormal อย่างเดียว: Pf = P(Fy·Ag < Tu) หาได้แบบปิด
+    base = {'Ag': 10.0, 'Fy': 2400.0, 'Fu': 1e9, 'Tu': 24_000.0 * 0.85}
+    rv = RandomVariable('lognormal', 1.10, 0.10)
+    res = monte_carlo('tension', base, {'Fy': rv}, n_samples=400_000, chunk_size=50_000, seed=3, section=None)
+    sigma = math.sqrt(math.log1p(0.01))
+    mu = math.log(2400.0 * 1.10) - 0.5 * sigma ** 2
+    expected = NormalDist().cdf((math.log(0.85 * 2400.0) - mu) / sigma)
+    assert res.pf == pytest.approx(expected, rel=0.1)
+    assert res.governing['Yielding'] == res.failures
+
+
+def test_purlin_pf_grows_with_load():
+    light = purlin_inputs(SECTION, GEOMETRY, {'DL': 10.0, 'LL': 30.0, 'WL': -40.0}, MATERIALS)
+    heavy = purlin_inputs(SECTION, GEOMETRY, {'DL': 10.0, 'LL': 150.0, 'WL': -40.0}, MATERIALS)
+    r_light = monte_carlo('purlin', light, n_samples=20_000, seed=5)
+    r_heavy = monte_carlo('purlin', heavy, n_samples=20_000, seed=5)
+    assert r_light.pf < r_heavy.pf
+    assert r_light.beta > r_heavy.beta
+    assert r_heavy.to_dict()['Failures'] == r_heavy.failures
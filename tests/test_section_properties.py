@@ -0,0 +1,161 @@
+"""
+ทดสอบคุณสมบัติหน้าตัดผนังบางเทียบสูตรปิด (ราง, I, กล่อง) และตาราง มอก. 1228
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from section_properties import (ThinWalledSection, batch_properties, hat, i_section, lipped_channel,
+                                lipped_channel_catalog, polyline, section_data, section_properties, zed)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_plain_channel_closed_forms():
+    h, b, t = 150.0, 50.0, 2.0
+    props = section_properties(lipped_channel(h, b, 0.0, t))
+    hw, bf = h - t, b - t  # ขนาดเส้นกึ่งกลาง
+    A = t * (hw + 2 * bf)
+    x_bar = bf ** 2 * t / A
+    e = 3 * bf ** 2 / (hw + 6 * bf)  # จุดศูนย์แรงเฉือนหลังเอว
+    assert props['Area'] == pytest.approx(A / 1e2)
+    assert props['Ix'] == pytest.approx((t * hw ** 3 / 12 + bf * t * hw ** 2 / 2 + 2 * bf * t ** 3 / 12) / 1e4)
+    assert props['xc'] == pytest.approx(x_bar / 10)
+    assert props['xs'] == pytest.approx(-(e + x_bar) / 10, rel=1e-3)  # สูตรปิดละพจน์ t³ ของปีก
+    assert props['ys'] == pytest.approx(0.0, abs=1e-9)
+    assert props['J'] == pytest.approx(t ** 3 * (hw + 2 * bf) / 3 / 1e4)
+    assert props['Cw'] == pytest.approx(t * bf ** 3 * hw ** 2 / 12 * (3 * bf + 2 * hw) / (6 * bf + hw) / 1e6,
+                                        rel=1e-6)
+    assert props['Ixy'] == pytest.approx(0.0, abs=1e-9)
+    assert props['Sx'] == pytest.approx(props['Ix'] / (h / 2 / 10))  # ผิวนอกจริง
+    assert props['h'] == pytest.approx(h) and props['b'] == pytest.approx(b - t / 2)
+
+
+def test_i_section_closed_forms():
+    h, b, tw, tf = 200.0, 100.0, 5.5, 8.0
+    props = section_properties(i_section(h, b, tw, tf))
+    h0, hw = h - tf, h - tf
+    Ix = 2 * b * tf * (h0 / 2) ** 2 + tw * hw ** 3 / 12 + 2 * b * tf ** 3 / 12
+    assert props['Ix'] == pytest.approx(Ix / 1e4)
+    assert props['Iy'] == pytest.approx((2 * tf * b ** 3 / 12 + hw * tw ** 3 / 12) / 1e4)
+    assert props['Cw'] == pytest.approx(tf * b ** 3 * h0 ** 2 / 24 / 1e6, rel=1e-9)
+    assert props['J'] == pytest.approx((2 * b * tf ** 3 + hw * tw ** 3) / 3 / 1e4)
+    assert props['xs'] == pytest.approx(0.0, abs=1e-9) and props['ys'] == pytest.approx(0.0, abs=1e-9)
+    # Zx: ปีกรับทั้งหมด + เอวครึ่งบน/ล่าง (ชิ้นส่วนเส้นกึ่งกลาง)
+    assert props['Zx'] == pytest.approx((b * tf * h0 + tw * hw ** 2 / 4) / 1e3, rel=1e-6)
+
+
+def test_box_uses_bredt_torsion():
+    b, h, t = 100.0, 200.0, 4.0
+    props = section_properties(polyline([(0, 0), (b, 0), (b, h), (0, h)], t, closed=True))
+    assert props['J'] == pytest.approx(2 * t * b ** 2 * h ** 2 / (b + h) / 1e4)
+    assert props['Cw'] == 0.0
+    open_props = section_properties(polyline([(0, 0), (b, 0), (b, h), (0, h), (0, 1e-9)], t))
+    assert open_props['J'] < props['J'] / 100
+
+
+def test_zed_principal_axes():
+    props = section_properties(zed(200.0, 75.0, 20.0, 2.3))
+    assert abs(props['Ixy']) > 0.1 * props['Iy']
+    assert props['I1'] + props['I2'] == pytest.approx(props['Ix'] + props['Iy'])
+    assert props['I1'] > props['Ix'] and props['I2'] < props['Iy']
+    assert props['xs'] == pytest.approx(0.0, abs=1e-9)  # สมมาตรจุด: จุดศูนย์แรงเฉือน = ศูนย์ถ่วง
+
+
+def test_hat_is_symmetric_about_web_axis():
+    props = section_properties(hat(100.0, 60.0, 20.0, 2.0, r=3.0))
+    assert props['Ixy'] == pytest.approx(0.0, abs=1e-9)
+    assert props['xs'] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_rigid_motion_leaves_properties_unchanged():
+    section = lipped_channel(150.0, 50.0, 20.0, 2.3, r=3.45)
+    base = section_properties(section)
+    for moved in (section.translated(37.0, -12.0), section.mirrored()):
+        props = section_properties(moved)
+        for key in ('Area', 'Ix', 'Iy', 'Sx', 'Zx', 'J', 'Cw', 'rts'):
+            assert props[key] == pytest.approx(base[key], rel=1e-9), key
+    assert section_properties(section.mirrored())['xs'] == pytest.approx(-base['xs'])
+
+
+def test_cache_returns_independent_copies():
+    section = lipped_channel(100.0, 50.0, 20.0, 2.3)
+    first = section_properties(section)
+    first['Ix'] = -1.0
+    again = section_properties(lipped_channel(100.0, 50.0, 20.0, 2.3))
+    assert again['Ix'] > 0
+    assert section.key() == lipped_channel(100.0, 50.0, 20.0, 2.3).key()
+    assert section.key() != lipped_channel(100.0, 50.0, 20.0, 2.6).key()
+
+
+def test_rounded_corners_reduce_area_only_slightly():
+    sharp = section_properties(lipped_channel(150.0, 50.0, 20.0, 2.3))
+    rounded = section_properties(lipped_channel(150.0, 50.0, 20.0, 2.3, r=2.3))
+    assert rounded['Area'] < sharp['Area']
+    assert rounded['Area'] == pytest.approx(sharp['Area'], rel=0.03)
+
+
+def test_catalog_matches_single_sections_and_table():
+    df = pd.read_csv(os.path.join(ROOT, 'tis_1228_steel.csv'))
+    out = lipped_channel_catalog(df)
+    assert list(out['Section']) == list(df['Section'])
+    # แถวที่สอดคล้องกับขนาดในชื่อหน้าตัด (ตัวเลขในตารางปัด 3–4 หลัก) — แถวอื่นของตารางคลาด 1–12 %
+    error = pd.concat([(out[c] / df[c] - 1).abs() for c in ('Area', 'Ix', 'Sx')], axis=1).max(axis=1)
+    good = error < 3e-3
+    assert good.sum() >= 29
+    assert (error[good & (df['Ix'] >= 100)] < 1e-3).all()
+    rounded = lipped_channel_catalog(df, r='t')
+    for i in (0, len(df) // 2, len(df) - 1):
+        row = df.iloc[i]
+        single = section_properties(lipped_channel(row['h'], row['b'], row['c'], row['t'], r=row['t']))
+        for key in ('Area', 'Ix', 'Iy', 'Sx', 'Sy', 'Zx', 'J', 'Cw', 'xs', 'rts'):
+            assert rounded.iloc[i][key] == pytest.approx(single[key], rel=1e-9), key
+
+
+def test_batch_matches_individual_calls():
+    sections = [lipped_channel(h, 50.0, 15.0, t) for h, t in ((100.0, 1.6), (125.0, 2.3), (150.0, 3.2))]
+    batch = batch_properties(np.stack([s.nodes for s in sections]), sections[0].elements,
+                             np.array([s.t[0] for s in sections]))
+    for i, section in enumerate(sections):
+        single = section_properties(section)
+        for key, values in batch.items():
+            assert values[i] == pytest.approx(single[key], rel=1e-12, abs=1e-12), key
+
+
+def test_combine_merges_coincident_nodes():
+    c = lipped_channel(150.0, 50.0, 0.0, 2.0)
+    back_to_back = ThinWalledSection.combine(c, c.mirrored())
+    assert len(back_to_back.nodes) == 2 * len(c.nodes) - 2  # เอวที่ซ้อนกันใช้โหนดร่วม
+    one = section_properties(c)
+    both = section_properties(back_to_back)
+    assert both['Area'] == pytest.approx(2 * one['Area'])
+    assert both['Ix'] == pytest.approx(2 * one['Ix'])
+    assert both['xc'] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_section_data_has_design_keys():
+    data = section_data(section_properties(lipped_channel(150.0, 50.0, 20.0, 2.3)), 'custom', t=2.3)
+    assert data['Section'] == 'custom' and data['t'] == 2.3
+    assert {'Weight', 'Area', 'Ix', 'Iy', 'Sx', 'Sy', 'Zx', 'J', 'Cw', 'rts'} <= set(data)
+
+
+@pytest.mark.parametrize('build', [
+    lambda: lipped_channel(150.0, 50.0, 20.0, 0.0),
+    lambda: lipped_channel(4.0, 50.0, 20.0, 2.3),
+    lambda: zed(150.0, 50.0, -1.0, 2.3),
+    lambda: hat(100.0, 3.0, 20.0, 2.0),
+    lambda: i_section(200.0, 5.0, 5.5, 8.0),
+    lambda: ThinWalledSection(np.zeros((2, 2)), np.array([[0, 2]]), 1.0),
+    lambda: ThinWalledSection(np.array([[0.0, 0.0], [np.nan, 1.0]]), np.array([[0, 1]]), 1.0),
+])
+def test_invalid_geometry_raises(build):
+    with pytest.raises(ValueError):
+        build()
+
+
+def test_catalog_rejects_mixed_lips():
+    df = pd.DataFrame({'h': [100.0, 100.0], 'b': [50.0, 50.0], 'c': [20.0, 0.0], 't': [2.0, 2.0]})
+    with pytest.raises(ValueError):
+        lipped_channel_catalog(df)
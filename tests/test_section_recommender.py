@@ -0,0 +1,75 @@
+"""ทดสอบ KD-tree และการแนะนำหน้าตัดทางเลือก เทียบกับการค้นหาแบบตรวจทุกจุด"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from purlin_design import PurlinDesign
+from section_recommender import KDTree, check_sections, get_index, recommend
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG = pd.read_csv(os.path.join(ROOT, 'tis_1228_steel.csv'))
+GEOMETRY = {'span': 6.0, 'spacing': 1.2, 'slope': 10.0}
+LOADS = {'DL': 15.0, 'LL': 30.0, 'WL': -60.0}
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+
+
+@pytest.mark.parametrize('leaf_size', [1, 4, 16])
+def test_kdtree_matches_brute_force(leaf_size):
+    rng = np.random.default_rng(7)
+    points = rng.normal(size=(300, 4))
+    mask = rng.random(300) > 0.3
+    tree = KDTree(points, leaf_size)
+    for x in rng.normal(size=(20, 4)):
+        dist, idx = tree.query(x, 6, mask)
+        d_all = np.linalg.norm(points - x, axis=1)
+        d_all[~mask] = np.inf
+        expected = np.argsort(d_all)[:6]
+        np.testing.assert_array_equal(idx, expected)
+        np.testing.assert_allclose(dist, d_all[expected])
+
+
+def test_kdtree_edge_cases():
+    assert KDTree(np.empty((0, 2))).query([0.0, 0.0], 3)[1].size == 0
+    assert len(KDTree([[0.0, 0.0], [1.0, 1.0]]).query([0.0, 0.0], 5)[1]) == 2
+    with pytest.raises(ValueError):
+        KDTree([[0.0, np.nan]])
+
+
+def test_index_is_cached_and_filters_heavier():
+    index = get_index(CATALOG)
+    assert get_index(CATALOG.copy()) is index
+    current = CATALOG.iloc[5]
+    near = index.nearest(current, k=4)
+    assert len(near) == 4 and (near['Weight'] > current['Weight']).all()
+    assert list(near['Distance']) == sorted(near['Distance'])
+
+
+def test_recommend_matches_exhaustive_search():
+    current = 'C-100x50x20x2.3'
+    alt = recommend('purlin', CATALOG, current, GEOMETRY, LOADS, MATERIALS, k=3)
+    assert len(alt) == 3
+
+    weight = float(CATALOG.set_index('Section').loc[current, 'Weight'])
+    heavier = CATALOG[CATALOG['Weight'] > weight]
+    checked = check_sections('purlin', heavier, GEOMETRY, LOADS, MATERIALS)
+    passing = heavier[checked['Pass']]
+    index = get_index(CATALOG)
+    target = index.transform(CATALOG.set_index('Section').loc[current])
+    dist = np.linalg.norm([index.transform(row) - target for _, row in passing.iterrows()], axis=1)
+    assert list(alt['Section']) == list(passing['Section'].to_numpy()[np.argsort(dist)][:3])
+
+    for _, row in alt.iterrows():
+        section = CATALOG.set_index('Section').loc[row['Section']].to_dict()
+        res = PurlinDesign(section, GEOMETRY, LOADS, MATERIALS).run_design()
+        assert all(res['Checks']['Status'].values())
+
+
+def test_recommend_heaviest_and_unknown():
+    heaviest = CATALOG.loc[CATALOG['Weight'].idxmax(), 'Section']
+    assert recommend('purlin', CATALOG, heaviest, GEOMETRY, LOADS, MATERIALS).empty
+    with pytest.raises(ValueError):
+        recommend('purlin', CATALOG, 'C-999', GEOMETRY, LOADS, MATERIALS)
+    with pytest.raises(ValueError):
+        check_sections('tension', CATALOG, GEOMETRY, LOADS, MATERIALS)
@@ -0,0 +1,70 @@
+"""ทดสอบเกณฑ์การโก่งตัว การโก่งตัวจากลม camber และน้ำขัง"""
+import math
+
+import numpy as np
+import pytest
+
+from parametric_sweep import purlin_inputs
+from purlin_design import PurlinDesign, batch_checks
+from serviceability import (EIT_LIMITS, DeflectionLimits, deflection_checks, get_limit_profile, ponding_applies,
+                            ponding_coefficient, ponding_ratio, uniform_deflection)
+
+SECTION = {'name': 'C-150x50x20x2.3', 'Zx': 28.1, 'Sx': 28.1, 'Ix': 210.0, 'h': 150.0, 't': 2.3, 'Weight': 5.5}
+MATERIALS = {'Fy': 2450.0, 'E': 2.04e6}
+LOADS = {'DL': 15.0, 'LL': 30.0, 'WL': -60.0}
+
+
+def test_limit_profiles():
+    assert get_limit_profile() is EIT_LIMITS and EIT_LIMITS.wind is None
+    custom = DeflectionLimits('กำหนดเอง', 200.0, 300.0, 150.0)
+    assert get_limit_profile(custom) is custom
+    assert get_limit_profile('ROOF_NO_CEILING').total == 120.0
+    with pytest.raises(ValueError):
+        get_limit_profile('L/999')
+
+
+def test_uniform_deflection_closed_form():
+    # 5 w L⁴ / 384 EI ด้วย w 100 กก./ม. = 1 กก./ซม.
+    assert uniform_deflection(100.0, 500.0, 2.04e6, 210.0) == pytest.approx(5 * 500.0 ** 4 / (384 * 2.04e6 * 210.0))
+
+
+def test_deflection_checks_with_camber_and_wind():
+    out = deflection_checks(500.0, 2.5, 1.0, delta_wind=-3.0, limits='ROOF_CEILING', camber=0.5)
+    assert out['Delta_Total'] == pytest.approx(2.0)
+    assert out['Ratio_Total'] == pytest.approx(2.0 / (500.0 / 180.0))
+    assert out['Ratio_Live'] == pytest.approx(1.0 / (500.0 / 240.0))
+    assert out['Ratio_Wind'] == pytest.approx(3.0 / (500.0 / 240.0))
+    assert out['Deflection'] == pytest.approx(out['Ratio_Wind']) and not out['Pass']
+    assert 'Ratio_Wind' not in deflection_checks(500.0, 2.5, 1.0, delta_wind=-3.0)
+
+
+def test_ponding():
+    assert bool(ponding_applies(0.5)) and not bool(ponding_applies(5.0))
+    assert bool(ponding_applies(5.0, True)) and not bool(ponding_applies(0.5, False))
+    cs = ponding_coefficient(1.2, 5.0, 2.04e6, 210.0)
+    assert cs == pytest.approx(1e-3 * 120.0 * 500.0 ** 4 / (math.pi ** 4 * 2.04e6 * 210.0))
+    assert ponding_ratio(0.1, 0.05) == pytest.approx((0.1 + 0.045) / 0.25)
+
+
+@pytest.mark.parametrize('limits', [None, 'ROOF_NO_CEILING', 'ROOF_PLASTER'])
+@pytest.mark.parametrize('geometry', [
+    {'span': 5.0, 'spacing': 1.2, 'slope': 10.0},
+    {'span': 6.0, 'spacing': 1.2, 'slope': 0.5, 'camber': 0.8, 'Cp': 0.05},
+])
+def test_purlin_serviceability_matches_batch(limits, geometry):
+    res = PurlinDesign(SECTION, geometry, LOADS, MATERIALS, limits=limits).run_design()
+    batch = batch_checks(**purlin_inputs(SECTION, geometry, LOADS, MATERIALS, limits=limits))
+    ratios = res['Checks']['Ratios']
+    assert float(batch['Deflection']) == pytest.approx(ratios['Deflection'], rel=1e-9)
+    assert ('Wind' in res['Checks']['Deflection']) == (get_limit_profile(limits).wind is not None)
+    assert ('Ponding' in ratios) == (geometry['slope'] < 1.0)
+    assert float(batch['Ponding']) == pytest.approx(ratios.get('Ponding', 0.0), rel=1e-9)
+
+
+def test_camber_reduces_total_deflection_only():
+    base = {'span': 6.0, 'spacing': 1.2, 'slope': 10.0}
+    plain = PurlinDesign(SECTION, base, LOADS, MATERIALS).run_design()['Checks']['Deflection']
+    cambered = PurlinDesign(SECTION, {**base, 'camber': 0.5}, LOADS, MATERIALS).run_design()['Checks']['Deflection']
+    assert cambered['Total']['value'] == pytest.approx(plain['Total']['value'] - 0.5)
+    assert cambered['Live']['value'] == pytest.approx(plain['Live']['value'])
+    assert np.isfinite(cambered['Total']['ratio'])
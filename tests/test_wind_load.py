@@ -0,0 +1,69 @@
+"""ทดสอบแรงลมบนหลังคา (มยผ. 1311-50 วิธีอย่างง่าย)"""
+import numpy as np
+import pytest
+
+from wind_load import (AIR_DENSITY, GRAVITY, ROOF_ZONES, RoofWindLoad, end_zone_width, exposure_factor,
+                       governing_pressure, reference_pressure, roof_pressures)
+
+BUILDING = dict(eave_height=6.0, width=20.0, length=40.0)
+
+
+def test_reference_pressure_by_region():
+    assert reference_pressure('1') == pytest.approx(0.5 * AIR_DENSITY * 25.0 ** 2 / GRAVITY)
+    assert reference_pressure('4A') == pytest.approx(0.5 * AIR_DENSITY * (1.2 * 25.0) ** 2 / GRAVITY)
+    with pytest.raises(ValueError):
+        reference_pressure('9')
+
+
+def test_exposure_factor_floors_and_growth():
+    np.testing.assert_allclose(exposure_factor([2.0, 10.0, 20.0], 'A'), [0.9, 1.0, 2.0 ** 0.2])
+    np.testing.assert_allclose(exposure_factor([3.0, 12.0], 'B'), [0.7, 0.7])
+    with pytest.raises(ValueError):
+        exposure_factor(10.0, 'C')
+
+
+def test_end_zone_width_minimum():
+    assert float(end_zone_width(20.0, 40.0, 6.0)) == pytest.approx(6.0)
+    assert float(end_zone_width(100.0, 200.0, 30.0)) == pytest.approx(2.0 * 10.0)
+
+
+def test_pressures_broadcast_over_slopes():
+    slopes = np.array([5.0, 15.0, 25.0])
+    res = roof_pressures(**BUILDING, slope=slopes)
+    assert res['p_max'].shape == (3, len(ROOF_ZONES))
+    assert np.all(res['p_min'] < 0.0)
+    assert np.all(res['p_max'] >= res['p_min'])
+    single = roof_pressures(**BUILDING, slope=15.0)
+    np.testing.assert_allclose(res['p_min'][1], single['p_min'])
+
+
+def test_importance_and_openings_scale_pressure():
+    base = roof_pressures(**BUILDING, slope=10.0)
+    high = roof_pressures(**BUILDING, slope=10.0, importance='high')
+    np.testing.assert_allclose(high['p_min'], 1.15 * base['p_min'])
+    open_ = roof_pressures(**BUILDING, slope=10.0, opening_category=3)
+    assert np.all(open_['p_min'] < base['p_min'])
+
+
+def test_governing_pressure_keeps_sign():
+    np.testing.assert_allclose(governing_pressure([30.0, 50.0], [-60.0, -20.0]), [-60.0, 50.0])
+
+
+def test_invalid_inputs_raise():
+    with pytest.raises(ValueError):
+        roof_pressures(**BUILDING, slope=-5.0)
+    with pytest.raises(ValueError):
+        roof_pressures(**BUILDING, slope=10.0, limit_state='fatigue')
+    with pytest.raises(ValueError):
+        roof_pressures(eave_height=-1.0, width=20.0, slope=10.0)
+
+
+def test_roof_wind_load_matches_vectorised_pressures():
+    res = RoofWindLoad(slope=15.0, **BUILDING).run_design()
+    vec = roof_pressures(**BUILDING, slope=15.0)
+    assert set(res['Zones']) == set(ROOF_ZONES)
+    for i, zone in enumerate(ROOF_ZONES):
+        assert res['Zones'][zone]['p_min'] == pytest.approx(float(vec['p_min'][i]))
+        assert res['Zones'][zone]['p_design'] == pytest.approx(
+            float(governing_pressure(vec['p_max'][i], vec['p_min'][i])))
+    assert len(res['Steps']) == 4 + len(ROOF_ZONES)
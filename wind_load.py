@@ -0,0 +1,298 @@
+"""
+wind_load.py
+คำนวณแรงลมบนหลังคา (Roof Wind Pressure) สำหรับอาคารเตี้ย
+อ้างอิง: มยผ. 1311-50 มาตรฐานการคำนวณแรงลมและการตอบสนองของอาคาร
+         (กรมโยธาธิการและผังเมือง) — วิธีการอย่างง่าย สำหรับอาคารเตี้ย
+
+    p = I_w q C_e (C_p C_g) - I_w q C_ei (C_pi C_gi)
+
+ค่าบวก = แรงกดเข้าหาผิวหลังคา (ตรงกับ WL บวกของ PurlinDesign / RafterDesign)
+ค่าลบ  = แรงดูดออกจากผิวหลังคา
+
+หน่วยที่ใช้ภายใน:
+  ความเร็วลม : m/s
+  หน่วยแรง   : kg/m²
+  ความยาว    : m
+  มุม        : องศา
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import numpy as np
+
+from design_logging import CalculationLogMixin, traced
+
+GRAVITY = 9.81          # m/s²
+AIR_DENSITY = 1.25      # kg/m³
+
+# ─────────────────────────────────────────────────────────────
+# ความเร็วลมอ้างอิง V50 และตัวคูณไต้ฝุ่น T_F ตามกลุ่มพื้นที่ (มยผ. 1311-50 ตาราง 2.2)
+# ─────────────────────────────────────────────────────────────
+WIND_REGIONS = {
+    "1":  (25.0, 1.00, "กลุ่มที่ 1 — ภาคกลาง ภาคเหนือ และส่วนใหญ่ของประเทศ"),
+    "2":  (27.0, 1.00, "กลุ่มที่ 2 — ภาคตะวันออกเฉียงเหนือตอนบนและพื้นที่ใกล้ชายฝั่ง"),
+    "3":  (29.0, 1.00, "กลุ่มที่ 3 — ภาคตะวันออกเฉียงเหนือตอนล่างและภาคตะวันออก"),
+    "4A": (25.0, 1.20, "กลุ่มที่ 4A — ภาคใต้ฝั่งตะวันออก (ชายฝั่งอ่าวไทย)"),
+    "4B": (25.0, 1.08, "กลุ่มที่ 4B — ภาคใต้ฝั่งตะวันตก (ชายฝั่งทะเลอันดามัน)"),
+}
+
+# ตัวประกอบความสำคัญของแรงลม I_w (สภาวะจำกัดด้านกำลัง, ด้านการใช้งาน)
+IMPORTANCE_FACTORS = {
+    "low":       (0.80, 0.75, "อาคารที่มีความสำคัญน้อย"),
+    "normal":    (1.00, 0.75, "อาคารทั่วไป"),
+    "high":      (1.15, 0.75, "อาคารที่มีความสำคัญมาก"),
+    "very_high": (1.15, 0.75, "อาคารที่มีความสำคัญมากต่อสาธารณชน"),
+}
+
+TERRAIN_LABELS = {
+    "A": "สภาพภูมิประเทศแบบ A — พื้นที่โล่ง",
+    "B": "สภาพภูมิประเทศแบบ B — ชานเมือง / พื้นที่มีสิ่งกีดขวาง",
+}
+
+# ค่าสัมประสิทธิ์หน่วยแรงลมภายใน C_pi (ต่ำสุด, สูงสุด) และค่าประกอบเนื่องจากการกระโชก C_gi
+INTERNAL_PRESSURE = {
+    1: (-0.15, 0.00, "ประเภท 1 — ไม่มีช่องเปิดขนาดใหญ่"),
+    2: (-0.45, 0.30, "ประเภท 2 — ช่องเปิดกระจายไม่สม่ำเสมอ"),
+    3: (-0.70, 0.70, "ประเภท 3 — มีช่องเปิดขนาดใหญ่"),
+}
+INTERNAL_GUST = 2.0
+
+# ─────────────────────────────────────────────────────────────
+# ค่า C_p C_g ภายนอกของหลังคาจั่ว (อาคารเตี้ย, ลมตั้งฉากสันหลังคา)
+# โซน 2 = หลังคาด้านต้นลม, 3 = หลังคาด้านท้ายลม, E = โซนขอบอาคาร
+# ค่าระหว่างความชันในตารางใช้การประมาณค่าเชิงเส้น
+# ─────────────────────────────────────────────────────────────
+ROOF_ZONES = ("2", "2E", "3", "3E")
+ROOF_ZONE_LABELS = {
+    "2":  "หลังคาด้านต้นลม",
+    "2E": "หลังคาด้านต้นลม (ขอบอาคาร)",
+    "3":  "หลังคาด้านท้ายลม",
+    "3E": "หลังคาด้านท้ายลม (ขอบอาคาร)",
+}
+_SLOPE_TABLE = np.array([0.0, 5.0, 20.0, 30.0, 45.0, 90.0])
+_CPCG_PERPENDICULAR = np.array([
+    # 2     2E     3     3E
+    [-1.3, -2.0, -0.7, -1.0],   # 0°
+    [-1.3, -2.0, -0.7, -1.0],   # 5°
+    [-1.3, -2.0, -0.9, -1.3],   # 20°
+    [0.4,  0.5,  -0.8, -1.0],   # 30°
+    [0.4,  0.5,  -0.8, -1.0],   # 45°
+    [1.05, 1.3,  -0.7, -0.9],   # 90°
+])
+# ลมขนานสันหลังคา ใช้ค่าของหลังคาความชัน 0°–5° ทุกความชัน
+_CPCG_PARALLEL = _CPCG_PERPENDICULAR[0]
+
+
+def _pos(name: str, value) -> np.ndarray:
+    arr = np.asarray(value, dtype=float)
+    if np.any(~np.isfinite(arr)) or np.any(arr <= 0):
+        raise ValueError(f"ต้องระบุ '{name}' เป็นค่าบวก")
+    return arr
+
+
+def _lookup(table: Dict[str, Any], key, name: str):
+    try:
+        return table[key]
+    except KeyError:
+        raise ValueError(f"ไม่รู้จัก{name} '{key}' (ที่รองรับ: {', '.join(map(str, table))})") from None
+
+
+def reference_pressure(region: str = "1", air_density: float = AIR_DENSITY):
+    """หน่วยแรงลมอ้างอิง q = ½ρ(T_F V50)² / g  (kg/m²)"""
+    v50, typhoon, _ = _lookup(WIND_REGIONS, region, "กลุ่มพื้นที่ความเร็วลม ")
+    return 0.5 * air_density * (typhoon * v50) ** 2 / GRAVITY
+
+
+def exposure_factor(z, terrain: str = "A"):
+    """
+    ค่าประกอบเนื่องจากสภาพภูมิประเทศ C_e ที่ความสูง z (m) — รับ array ได้
+      แบบ A: (z/10)^0.2 ≥ 0.9
+      แบบ B: 0.7(z/12)^0.3 ≥ 0.7
+    """
+    z = np.asarray(z, dtype=float)
+    if terrain == "A":
+        return np.maximum((z / 10.0) ** 0.2, 0.9)
+    if terrain == "B":
+        return np.maximum(0.7 * (z / 12.0) ** 0.3, 0.7)
+    raise ValueError("สภาพภูมิประเทศต้องเป็น 'A' หรือ 'B'")
+
+
+def mean_roof_height(eave_height, width, slope):
+    """ความสูงเฉลี่ยหลังคาจั่ว h = h_eave + (B/2) tanθ / 2"""
+    return np.asarray(eave_height, dtype=float) + 0.25 * np.asarray(width, dtype=float) * np.tan(np.radians(slope))
+
+
+def end_zone_width(width, length, height):
+    """
+    ความกว้างโซนขอบอาคาร y = max(6 m, 2z)
+    z = min(0.1 × ด้านแคบ, 0.4h) แต่ไม่น้อยกว่า max(0.04 × ด้านแคบ, 1 m)
+    """
+    least = np.minimum(np.asarray(width, dtype=float), np.asarray(length, dtype=float))
+    z = np.minimum(0.1 * least, 0.4 * np.asarray(height, dtype=float))
+    z = np.maximum(z, np.maximum(0.04 * least, 1.0))
+    return np.maximum(6.0, 2.0 * z)
+
+
+def roof_coefficients(slope):
+    """
+    ค่า C_p C_g ภายนอกของโซนหลังคา คืน (ลมตั้งฉากสัน, ลมขนานสัน) รูป (..., n_zones)
+    """
+    slope = np.asarray(slope, dtype=float)
+    if np.any((slope < 0) | (slope > 90)):
+        raise ValueError("ความชันหลังคาต้องอยู่ระหว่าง 0–90 องศา")
+    perpendicular = np.stack(
+        [np.interp(slope, _SLOPE_TABLE, _CPCG_PERPENDICULAR[:, i]) for i in range(len(ROOF_ZONES))],
+        axis=-1,
+    )
+    parallel = np.broadcast_to(_CPCG_PARALLEL, perpendicular.shape)
+    return perpendicular, parallel
+
+
+def roof_pressures(*, eave_height, width, length=None, slope, region="1", terrain="A",
+                   importance="normal", opening_category=1, limit_state="strength",
+                   topography=1.0):
+    """
+    หน่วยแรงลมออกแบบของทุกโซนหลังคาแบบเวกเตอร์ (NumPy broadcasting)
+
+    อาร์กิวเมนต์เชิงเรขาคณิต (eave_height, width, length, slope, topography) รับ array ที่
+    broadcast กันได้ จึงคำนวณทั้งชุดอาคาร/ความชันได้ในครั้งเดียว
+
+    Returns:
+        dict: 'zones', 'q', 'I_w', 'h', 'C_e', 'C_ei', 'y_end' และ array รูป (..., n_zones)
+              ของ 'CpCg', 'p_external', 'p_max' (แรงกดสุทธิมากสุด) และ 'p_min' (แรงดูดสุทธิมากสุด)
+              ค่า p_max / p_min ใช้เป็น WL (kg/m²) ของ PurlinDesign / batch_checks ได้โดยตรง
+    """
+    eave_height = _pos("ความสูงชายคา", eave_height)
+    width = _pos("ความกว้างอาคาร", width)
+    length = width if length is None else _pos("ความยาวอาคาร", length)
+    topography = _pos("ค่าประกอบสภาพภูมิประเทศ", topography)
+    q = reference_pressure(region)
+    uls, sls, _ = _lookup(IMPORTANCE_FACTORS, importance, "ระดับความสำคัญ ")
+    if limit_state not in ("strength", "serviceability"):
+        raise ValueError("limit_state ต้องเป็น 'strength' หรือ 'serviceability'")
+    i_w = uls if limit_state == "strength" else sls
+    cpi_min, cpi_max, _ = _lookup(INTERNAL_PRESSURE, opening_category, "ประเภทช่องเปิด ")
+
+    h = mean_roof_height(eave_height, width, slope)
+    c_e = exposure_factor(h, terrain) * topography
+    c_ei = exposure_factor(0.5 * h, terrain) * topography
+    perpendicular, parallel = roof_coefficients(slope)
+
+    # ใช้ค่าสุดขั้วของทั้งสองทิศทางลม
+    cpcg_max = np.maximum(perpendicular, parallel)
+    cpcg_min = np.minimum(perpendicular, parallel)
+    qe = (i_w * q * c_e)[..., None]
+    qi = (i_w * q * c_ei)[..., None]
+    p_max = qe * cpcg_max - qi * (cpi_min * INTERNAL_GUST)
+    p_min = qe * cpcg_min - qi * (cpi_max * INTERNAL_GUST)
+
+    return {
+        'zones': ROOF_ZONES,
+        'q': q,
+        'I_w': i_w,
+        'h': h,
+        'C_e': c_e,
+        'C_ei': c_ei,
+        'y_end': end_zone_width(width, length, h),
+        'CpCg': perpendicular,
+        'p_external': qe * perpendicular,
+        'p_max': p_max,
+        'p_min': p_min,
+    }
+
+
+def governing_pressure(p_max, p_min):
+    """เลือกค่าที่มีขนาดมากกว่าระหว่างแรงกดสุทธิและแรงดูดสุทธิ (คงเครื่องหมาย)"""
+    p_max = np.asarray(p_max, dtype=float)
+    p_min = np.asarray(p_min, dtype=float)
+    return np.where(np.abs(p_min) > np.abs(p_max), p_min, p_max)
+
+
+@dataclass
+class RoofWindLoad(CalculationLogMixin):
+    """คำนวณแรงลมบนหลังคาจั่วพร้อมบันทึกขั้นตอน (มยผ. 1311-50, อาคารเตี้ย)"""
+
+    eave_height: float
+    width: float
+    length: float
+    slope: float
+    region: str = "1"
+    terrain: str = "A"
+    importance: str = "normal"
+    opening_category: int = 1
+
+    def __post_init__(self) -> None:
+        CalculationLogMixin.__init__(self)
+
+    @traced
+    def run_design(self) -> Dict[str, Any]:
+        self.reset_steps()
+
+        res = roof_pressures(
+            eave_height=self.eave_height, width=self.width, length=self.length, slope=self.slope,
+            region=self.region, terrain=self.terrain, importance=self.importance,
+            opening_category=self.opening_category,
+        )
+        v50, typhoon, region_label = WIND_REGIONS[self.region]
+        h = float(res['h'])
+        c_e = float(res['C_e'])
+        c_ei = float(res['C_ei'])
+
+        self.add_step(
+            "หน่วยแรงลมอ้างอิง",
+            r"q = \frac{1}{2}\rho (T_F V_{50})^2 / g",
+            f"= 0.5 \\times {AIR_DENSITY:.2f} \\times ({typhoon:.2f} \\times {v50:.1f})^2 / {GRAVITY:.2f}",
+            f"= {res['q']:.2f}\\,\\text{{kg/m}}^2",
+            note=region_label
+        )
+        self.add_step(
+            "ความสูงเฉลี่ยหลังคา",
+            r"h = h_{eave} + \frac{B}{4}\tan\theta",
+            f"= {self.eave_height:.2f} + {self.width:.2f}/4 \\times \\tan {self.slope:.1f}^\\circ",
+            f"= {h:.2f}\\,\\text{{m}}"
+        )
+        expo = r"C_e = (h/10)^{0.2} \geq 0.9" if self.terrain == "A" else r"C_e = 0.7(h/12)^{0.3} \geq 0.7"
+        self.add_step(
+            "ค่าประกอบเนื่องจากสภาพภูมิประเทศ",
+            expo,
+            f"h = {h:.2f}\\,\\text{{m}},\\; h/2 = {h / 2:.2f}\\,\\text{{m}}",
+            f"C_e = {c_e:.3f},\\; C_{{ei}} = {c_ei:.3f}",
+            note=TERRAIN_LABELS[self.terrain]
+        )
+        cpi_min, cpi_max, cpi_label = INTERNAL_PRESSURE[self.opening_category]
+        self.add_step(
+            "หน่วยแรงลมภายใน",
+            r"p_i = I_w q C_{ei} C_{pi} C_{gi}",
+            f"C_{{pi}} = {cpi_min:.2f} \\ldots {cpi_max:.2f},\\; C_{{gi}} = {INTERNAL_GUST:.1f},\\; I_w = {res['I_w']:.2f}",
+            f"p_i = {res['I_w'] * res['q'] * c_ei * cpi_min * INTERNAL_GUST:.2f} \\ldots "
+            f"{res['I_w'] * res['q'] * c_ei * cpi_max * INTERNAL_GUST:.2f}\\,\\text{{kg/m}}^2",
+            note=cpi_label
+        )
+
+        zones = {}
+        for i, zone in enumerate(ROOF_ZONES):
+            cpcg = float(res['CpCg'][i])
+            p_max = float(res['p_max'][i])
+            p_min = float(res['p_min'][i])
+            zones[zone] = {'CpCg': cpcg, 'p_max': p_max, 'p_min': p_min,
+                           'p_design': float(governing_pressure(p_max, p_min))}
+            self.add_step(
+                f"โซน {zone}: {ROOF_ZONE_LABELS[zone]}",
+                r"p = I_w q C_e C_p C_g - p_i",
+                f"= {res['I_w']:.2f} \\times {res['q']:.2f} \\times {c_e:.3f} \\times ({cpcg:.2f}) - p_i",
+                f"p_{{max}} = {p_max:.2f},\\; p_{{min}} = {p_min:.2f}\\,\\text{{kg/m}}^2",
+                note="รวมกรณีลมขนานสันหลังคา (ใช้ค่า C_pC_g ของหลังคาความชัน 0–5°)"
+            )
+
+        return {
+            'Inputs': {
+                'eave_height': self.eave_height, 'width': self.width, 'length': self.length,
+                'slope': self.slope, 'region': self.region, 'terrain': self.terrain,
+                'importance': self.importance, 'opening_category': self.opening_category,
+            },
+            'Reference': {'q': float(res['q']), 'I_w': res['I_w'], 'h': h, 'C_e': c_e, 'C_ei': c_ei,
+                          'y_end': float(res['y_end'])},
+            'Zones': zones,
+            'Steps': self.steps,
+        }